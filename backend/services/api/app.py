@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import os
 from typing import List
 
@@ -8,6 +9,7 @@ from backend.services.api.routers.llm import router as llm_router
 from backend.services.api.routers.streaming import router as streaming_router
 from backend.services.api.routers.auth import router as auth_router
 from backend.services.api.routers.conversation import router as conversation_router
+from backend.services.api.warmup import start_model_warmup, get_warmup_status
 
 app = FastAPI(
     title="Real Estate for the Young API",
@@ -52,4 +54,17 @@ async def root():
     return {
         "message": "Real Estate for the Young API",
         "docs": "/docs"
-    }
\ No newline at end of file
+    }
+
+
+@app.on_event("startup")
+async def warmup_models():
+    """모델 로드 + 더미 실행을 백그라운드에서 시작 (첫 요청 지연 제거, RAG_WARMUP=false로 비활성화)"""
+    start_model_warmup()
+
+
+@app.get("/health/ready")
+async def readiness():
+    """워밍업이 끝나야 200, 그 전(또는 실패 시)에는 503 (로드 밸런서 readiness probe용)"""
+    status = get_warmup_status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
@@ -8,6 +8,7 @@ app_name = 'llm'
 
 urlpatterns = [
     path('health', views.health_view, name='health'),
+    path('health/ready', views.ready_view, name='health-ready'),
     path('chat', views.chat_view, name='chat'),
     path('ask', views.ask_view, name='ask'),
     path('ask-langgraph', views.ask_langgraph_view, name='ask-langgraph'),
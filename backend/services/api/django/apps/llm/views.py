@@ -22,6 +22,27 @@ def health_view(request):
     return Response({'status': 'ok'}, status=status.HTTP_200_OK)
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def ready_view(request):
+    """
+    Readiness check endpoint (모델 워밍업 완료 전 또는 실패 시 503)
+
+    GET /api/llm/health/ready
+
+    gunicorn에서는 post_fork에서 워밍업이 시작되고, runserver 등 그 외 실행에서는
+    첫 readiness 요청이 워밍업을 시작함 (이미 시작했으면 상태만 반환)
+    """
+    from backend.services.api.warmup import get_warmup_status, start_model_warmup
+
+    start_model_warmup()
+    warmup_status = get_warmup_status()
+    return Response(
+        warmup_status,
+        status=status.HTTP_200_OK if warmup_status['ready'] else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def chat_view(request):
@@ -0,0 +1,44 @@
+"""
+gunicorn 설정 (프로덕션)
+preload 후 fork: 마스터에서 임베딩/요약 모델 가중치를 한 번 로드하고 워커를 fork해
+copy-on-write로 공유 (워커 수만큼 모델 메모리가 늘어나지 않음)
+- 환경 변수:
+  - WEB_CONCURRENCY: 워커 수 (기본값: 4)
+  - RAG_PRELOAD_MODELS: 마스터 preload 여부 (기본값: true, false면 워커별 로드)
+  - RAG_TORCH_THREADS: 워커당 torch 스레드 수 (기본값: CPU 코어 / 워커 수)
+
+사용 예:
+    # Django (WSGI)
+    cd backend/services/api/django && gunicorn config.wsgi:application -c ../gunicorn.conf.py
+    # FastAPI (ASGI)
+    gunicorn backend.services.api.app:app -k uvicorn.workers.UvicornWorker -c backend/services/api/gunicorn.conf.py
+"""
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+
+# 앱(모듈 import)을 마스터에서 로드한 뒤 fork
+_preload_models = os.getenv("RAG_PRELOAD_MODELS", "true").lower() == "true"
+preload_app = _preload_models
+
+# fork 이후 HuggingFace fast tokenizer 병렬 처리 교착 방지 (워커는 요청 단위 스레드로 병렬 처리)
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+
+def when_ready(server):
+    """마스터: 워커 fork 직전 모델 가중치 로드 (forward는 실행하지 않음)"""
+    if not _preload_models:
+        return
+    from backend.services.api.warmup import preload_models
+    try:
+        preload_models()
+    except Exception:
+        # preload 실패 시 워커가 각자 로드 (서비스는 계속)
+        server.log.exception("Model preload failed, workers will load models themselves")
+
+
+def post_fork(server, worker):
+    """워커: torch 스레드 수 설정 + 워커 내 워밍업 시작"""
+    from backend.services.api.warmup import on_worker_fork
+    on_worker_fork(server.cfg.workers)
@@ -5,16 +5,23 @@ RAG 시스템을 사용한 LLM 기능을 위한 FastAPI 엔드포인트
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 import logging
 import os
+import threading
 
 from backend.services.rag.rag_system import RAGSystem
 from backend.services.rag.models.config import EmbeddingModelType
 from backend.services.rag.generation.generator import OllamaGenerator, GenerationConfig
 from backend.services.rag.retrieval.reranker import KeywordReranker
 from backend.services.rag.augmentation.formatters import EnhancedPromptFormatter
+from backend.services.rag.vectorstore.pool import get_pool_stats
+from backend.services.rag.retrieval.search_logger import get_search_log_stats
+from backend.services.rag.models.batcher import get_batcher_stats
+from backend.services.rag.models.loader import ModelFactory
+from backend.services.rag.models.remote import get_embedding_worker_stats
 from backend.services.api.utils.summarizer import summarize_title, summarize_conversation_batch
 
 from typing import Literal
@@ -28,6 +35,7 @@ router = APIRouter(prefix="/api/llm", tags=["LLM"])
 
 # RAG 시스템 인스턴스 (싱글톤 패턴)
 _rag_system: Optional[RAGSystem] = None
+_rag_system_lock = threading.Lock()
 
 
 def get_db_config() -> dict:
@@ -62,33 +70,43 @@ def get_rag_system() -> RAGSystem:
     
     # 인스턴스가 없거나 모델 타입이 변경된 경우 재생성
     if _rag_system is None or _rag_system.retriever.model_type != current_model_type:
-        # 기존 인스턴스가 있으면 로그 출력
-        if _rag_system is not None:
-            logger.info(f"Model type changed, recreating RAG system: {_rag_system.retriever.model_type.value} -> {current_model_type.value}")
-        
-        # DB 설정 가져오기
-        db_config = get_db_config()
-        
-        # LLM Generator 초기화
-        # Ollama URL 환경 변수에서 읽기 (도커에서는 host.docker.internal 사용)
-        ollama_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-        llm_generator = OllamaGenerator(
-            base_url=ollama_url,
-            default_model="gemma3:4b"
-        )
+        # 워밍업 스레드와 첫 요청이 동시에 생성하지 않도록 잠금
+        with _rag_system_lock:
+            if _rag_system is None or _rag_system.retriever.model_type != current_model_type:
+                # 기존 인스턴스가 있으면 로그 출력
+                if _rag_system is not None:
+                    logger.info(f"Model type changed, recreating RAG system: {_rag_system.retriever.model_type.value} -> {current_model_type.value}")
+        
+                # DB 설정 가져오기
+                db_config = get_db_config()
+        
+                # LLM Generator 초기화
+                # Ollama URL 환경 변수에서 읽기 (도커에서는 host.docker.internal 사용)
+                ollama_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+                llm_generator = OllamaGenerator(
+                    base_url=ollama_url,
+                    default_model="gemma3:4b"
+                )
         
-        # RAG 시스템 초기화
-        _rag_system = RAGSystem(
-            model_type=current_model_type,
-            db_config=db_config,
-            reranker=KeywordReranker(
-                use_llm_extraction=False  # Regex 사용 (속도 향상: LLM 호출 제거)
-            ),
-            formatter=EnhancedPromptFormatter(),
-            llm_generator=llm_generator,
-            enable_generation=True
-        )
-        logger.info(f"RAG System initialized with {current_model_type.value}")
+                # RAG 시스템 초기화
+                _rag_system = RAGSystem(
+                    model_type=current_model_type,
+                    db_config=db_config,
+                    reranker=KeywordReranker(
+                        use_llm_extraction=False  # Regex 사용 (속도 향상: LLM 호출 제거)
+                    ),
+                    formatter=EnhancedPromptFormatter(),
+                    llm_generator=llm_generator,
+                    enable_generation=True
+                )
+                logger.info(f"RAG System initialized with {current_model_type.value}")
+
+                # 운영 임베딩 모델은 메모리 예산 초과 시에도 내보내지 않음
+                ModelFactory.pin(current_model_type)
+
+                # 동시 요청의 쿼리 임베딩을 모아 배치 인코딩 (RAG_EMBED_BATCHING=false로 비활성화)
+                if os.getenv('RAG_EMBED_BATCHING', 'true').lower() == 'true':
+                    _rag_system.retriever.encoder.enable_batching()
     
     return _rag_system
 
@@ -189,7 +207,9 @@ async def ask_question(request: QuestionRequest, rag_system: RAGSystem = Depends
     """
     try:
         # RAG 시스템으로 전체 파이프라인 실행 (top_k=3으로 속도 개선)
-        response = rag_system.generate_answer(
+        # 스레드 풀에서 실행해 동시 요청이 이벤트 루프를 막지 않고 임베딩 배치에 합류
+        response = await run_in_threadpool(
+            rag_system.generate_answer,
             query=request.question,
             top_k=3,  # 비교 자료 기준으로 3개 사용 (속도 개선)
             use_reranker=True,
@@ -252,7 +272,8 @@ async def ask_question_with_agent(request: QuestionRequest, rag_system: RAGSyste
         if enable_profiling:
             from backend.services.rag.profiler import RAGProfiler
             profiler = RAGProfiler(enable_detailed_logging=True)
-            profile = profiler.profile_full_pipeline(
+            profile = await run_in_threadpool(
+                profiler.profile_full_pipeline,
                 rag_system=rag_system,
                 query=request.question,
                 top_k=3,
@@ -266,7 +287,8 @@ async def ask_question_with_agent(request: QuestionRequest, rag_system: RAGSyste
             )
             profiler.print_profile(profile)
             # 프로파일링 후에도 정상 응답 반환
-            response = rag_system.generate_answer(
+            response = await run_in_threadpool(
+                rag_system.generate_answer,
                 query=request.question,
                 top_k=3,
                 use_reranker=True,
@@ -279,8 +301,10 @@ async def ask_question_with_agent(request: QuestionRequest, rag_system: RAGSyste
             )
         else:
             # RAG 시스템으로 전체 파이프라인 실행 (리랭킹 포함, top_k=3으로 속도 개선)
+            # 스레드 풀에서 실행해 동시 요청이 이벤트 루프를 막지 않고 임베딩 배치에 합류
             try:
-                response = rag_system.generate_answer(
+                response = await run_in_threadpool(
+                    rag_system.generate_answer,
                     query=request.question,
                     top_k=3,  # 비교 자료 기준으로 3개 사용 (속도 개선)
                     use_reranker=True,  # 리랭킹 사용 (이미 Regex로 최적화됨)
@@ -464,8 +488,9 @@ async def chat(request: ChatRequest, rag_system: RAGSystem = Depends(get_rag_sys
         # 디버깅: 히스토리 내용 로깅
         logger.info(f"Total messages: {total_messages}, History included: {len(recent_messages_for_context)} messages")
         
-        # RAG 시스템으로 검색 및 컨텍스트 생성
-        rag_response = rag_system.retrieve_and_augment(
+        # RAG 시스템으로 검색 및 컨텍스트 생성 (스레드 풀에서 실행해 이벤트 루프를 막지 않음)
+        rag_response = await run_in_threadpool(
+            rag_system.retrieve_and_augment,
             query=last_user_message,
             top_k=3,
             use_reranker=True
@@ -665,10 +690,25 @@ async def chat(request: ChatRequest, rag_system: RAGSystem = Depends(get_rag_sys
 
 @router.get("/health")
 async def health_check():
-    """서비스 상태 확인"""
+    """서비스 상태 확인 (liveness, HEALTHCHECK용이므로 I/O 없이 즉시 응답)"""
     return {"status": "healthy", "service": "LLM API"}
 
 
+@router.get("/stats")
+def service_stats():
+    """
+    커넥션 풀 / 검색 로그 / 배치 인코딩 / 모델 / 임베딩 워커 통계
+    임베딩 워커 조회는 소켓 연결 + 응답 대기(최대 수 초)가 있으므로 동기 함수로 두어 스레드풀에서 실행
+    """
+    return {
+        "db_pool": get_pool_stats(),
+        "search_log": get_search_log_stats(),
+        "embedding_batcher": get_batcher_stats(),
+        "models": ModelFactory.stats(),
+        "embedding_worker": get_embedding_worker_stats()
+    }
+
+
 @router.post("/clear-memory")
 async def clear_memory(model_type: ModelType = "ollama"):
     """대화 기록 초기화"""
@@ -3,12 +3,15 @@ mT5-base를 사용한 텍스트 요약 유틸리티
 """
 import logging
 import os
+import threading
 from typing import Optional, List, Dict
 import torch
 from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
 from dotenv import load_dotenv
 import re
 
+from backend.services.rag.models.loader import ModelFactory
+
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
@@ -17,6 +20,7 @@ logger = logging.getLogger(__name__)
 # 싱글톤 패턴으로 모델 로드
 _summarizer_model = None
 _summarizer_tokenizer = None
+_summarizer_lock = threading.Lock()
 
 
 def get_mt5_summarizer():
@@ -24,61 +28,84 @@ def get_mt5_summarizer():
     global _summarizer_model, _summarizer_tokenizer
     
     if _summarizer_model is None or _summarizer_tokenizer is None:
-        try:
-            model_name = "google/mt5-base"
-            device = "cuda" if torch.cuda.is_available() else "cpu"
+        # 워밍업 스레드와 첫 요청이 동시에 로드하지 않도록 잠금
+        with _summarizer_lock:
+            if _summarizer_model is None or _summarizer_tokenizer is None:
+                try:
+                    model_name = "google/mt5-base"
+                    device = "cuda" if torch.cuda.is_available() else "cpu"
             
-            logger.info(f"🔄 mT5-base 요약 모델 로딩 시작 (디바이스: {device})...")
+                    logger.info(f"🔄 mT5-base 요약 모델 로딩 시작 (디바이스: {device})...")
             
-            # HuggingFace 토큰 가져오기 (.env에서 로드)
-            hf_token = (
-                os.getenv('HF_API_TOKEN') or 
-                os.getenv('HF_TOKEN') or 
-                os.getenv('HUGGING_FACE_HUB_TOKEN')
-            )
+                    # HuggingFace 토큰 가져오기 (.env에서 로드)
+                    hf_token = (
+                        os.getenv('HF_API_TOKEN') or 
+                        os.getenv('HF_TOKEN') or 
+                        os.getenv('HUGGING_FACE_HUB_TOKEN')
+                    )
             
-            if hf_token:
-                logger.info("✅ HuggingFace API token 발견됨")
-            else:
-                logger.warning("⚠️ HuggingFace API token 없음. 일부 모델에 접근하지 못할 수 있습니다.")
+                    if hf_token:
+                        logger.info("✅ HuggingFace API token 발견됨")
+                    else:
+                        logger.warning("⚠️ HuggingFace API token 없음. 일부 모델에 접근하지 못할 수 있습니다.")
             
-            tokenizer_kwargs = {"token": hf_token} if hf_token else {}
-            model_kwargs = {"token": hf_token} if hf_token else {}
+                    tokenizer_kwargs = {"token": hf_token} if hf_token else {}
+                    model_kwargs = {"token": hf_token} if hf_token else {}
             
-            logger.info(f"📥 토크나이저 다운로드 중: {model_name}")
-            # T5 계열 모델은 SentencePiece 토크나이저 사용, use_fast=False로 안정적으로 로드
-            try:
-                _summarizer_tokenizer = AutoTokenizer.from_pretrained(
-                    model_name,
-                    use_fast=False,  # fast tokenizer 변환 오류 방지
-                    **tokenizer_kwargs
-                )
-            except Exception as e:
-                logger.warning(f"Fast tokenizer 로드 실패, slow tokenizer 사용: {e}")
-                # T5Tokenizer를 직접 사용하여 안정적으로 로드
-                from transformers import T5Tokenizer
-                _summarizer_tokenizer = T5Tokenizer.from_pretrained(
-                    model_name,
-                    **tokenizer_kwargs
-                )
+                    logger.info(f"📥 토크나이저 다운로드 중: {model_name}")
+                    # T5 계열 모델은 SentencePiece 토크나이저 사용, use_fast=False로 안정적으로 로드
+                    try:
+                        _summarizer_tokenizer = AutoTokenizer.from_pretrained(
+                            model_name,
+                            use_fast=False,  # fast tokenizer 변환 오류 방지
+                            **tokenizer_kwargs
+                        )
+                    except Exception as e:
+                        logger.warning(f"Fast tokenizer 로드 실패, slow tokenizer 사용: {e}")
+                        # T5Tokenizer를 직접 사용하여 안정적으로 로드
+                        from transformers import T5Tokenizer
+                        _summarizer_tokenizer = T5Tokenizer.from_pretrained(
+                            model_name,
+                            **tokenizer_kwargs
+                        )
             
-            logger.info(f"📥 모델 다운로드 중: {model_name}")
-            _summarizer_model = AutoModelForSeq2SeqLM.from_pretrained(
-                model_name,
-                **model_kwargs
-            ).to(device)
+                    logger.info(f"📥 모델 다운로드 중: {model_name}")
+                    _summarizer_model = AutoModelForSeq2SeqLM.from_pretrained(
+                        model_name,
+                        **model_kwargs
+                    ).to(device)
             
-            _summarizer_model.eval()  # 평가 모드
+                    _summarizer_model.eval()  # 평가 모드
             
-            logger.info(f"✅ mT5-base 요약 모델 로딩 완료 (디바이스: {device})")
+                    logger.info(f"✅ mT5-base 요약 모델 로딩 완료 (디바이스: {device})")
+
+                    # 임베딩 모델과 같은 메모리 예산(RAG_MODEL_MEMORY_BUDGET_MB)에 포함
+                    ModelFactory.register_external(model_name, _summarizer_model, _unload_mt5_summarizer)
             
-        except Exception as e:
-            logger.error(f"❌ mT5-base 요약 모델 로딩 실패: {e}", exc_info=True)
-            raise
+                except Exception as e:
+                    logger.error(f"❌ mT5-base 요약 모델 로딩 실패: {e}", exc_info=True)
+                    raise
     
+    ModelFactory.touch("google/mt5-base")
     return _summarizer_model, _summarizer_tokenizer
 
 
+def warmup_mt5_summarizer():
+    """mT5-base 로드 후 짧은 입력으로 1회 생성 (첫 요청의 초기화 지연 제거)"""
+    model, tokenizer = get_mt5_summarizer()
+    device = next(model.parameters()).device
+    inputs = tokenizer("청년 전세자금 대출 안내", return_tensors="pt").to(device)
+    with torch.no_grad():
+        model.generate(inputs.input_ids, max_length=8, num_beams=1, do_sample=False)
+
+
+def _unload_mt5_summarizer():
+    """메모리 예산 초과 시 ModelFactory가 호출 (다음 요청에서 다시 로드)"""
+    global _summarizer_model, _summarizer_tokenizer
+    _summarizer_model = None
+    _summarizer_tokenizer = None
+
+
 def summarize_title(text: str, max_length: int = 25) -> str:
     """
     mT5-base를 사용하여 텍스트를 제목 형식으로 요약
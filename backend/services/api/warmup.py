@@ -0,0 +1,181 @@
+"""
+API 시작 시 모델 워밍업
+- 서버 시작 직후 백그라운드 스레드에서 RAG 시스템(임베딩 모델)과 mT5 요약 모델을 로드하고
+  더미 입력으로 1회 실행해 첫 사용자 요청의 로딩 지연을 제거
+- 단계별 소요 시간을 로그와 readiness 응답(/health/ready, Django는 /api/llm/health/ready)에 기록
+- 환경 변수:
+  - RAG_WARMUP: 워밍업 사용 여부 (기본값: true, false면 즉시 ready)
+  - RAG_WARMUP_SUMMARIZER: mT5 요약 모델 워밍업 여부 (기본값: true)
+- gunicorn preload_app 모드(gunicorn.conf.py)에서는 마스터가 preload_models()로 가중치만 로드하고
+  워커는 fork 후 on_worker_fork()에서 더미 실행만 수행 (가중치는 copy-on-write로 공유)
+"""
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WARMUP_QUERY = "청년 전세자금 대출 조건"
+
+
+class ModelWarmup:
+    """워밍업 단계 실행 및 상태 보관 (프로세스당 1개)"""
+
+    def __init__(self):
+        self.status = "pending"  # pending → warming → ready / failed / skipped
+        self.phases: List[Dict[str, Any]] = []
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.status in ("ready", "skipped")
+
+    def start(self) -> Optional[threading.Thread]:
+        """백그라운드 워밍업 시작 (이미 시작했으면 무시)"""
+        with self._lock:
+            if self._thread is not None or self.status != "pending":
+                return self._thread
+            if os.getenv("RAG_WARMUP", "true").lower() != "true":
+                self.status = "skipped"
+                logger.info("Model warm-up disabled (RAG_WARMUP=false)")
+                return None
+            self.status = "warming"
+            self._thread = threading.Thread(target=self.run, name="model-warmup", daemon=True)
+            self._thread.start()
+            return self._thread
+
+    def run(self):
+        """설정된 단계를 순서대로 실행 (한 단계가 실패하면 중단하고 failed)"""
+        self.status = "warming"
+        self.started_at = time.time()
+        start = time.perf_counter()
+        try:
+            for name, step in self._steps():
+                self._run_phase(name, step)
+        except Exception:
+            self.status = "failed"
+        else:
+            self.status = "ready"
+        finally:
+            self.finished_at = time.time()
+        logger.info(f"Model warm-up {self.status} in {time.perf_counter() - start:.1f}s")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """상태 + 단계별 소요 시간"""
+        return {
+            "ready": self.ready,
+            "status": self.status,
+            "phases": [dict(phase) for phase in self.phases],
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    def _steps(self) -> List[tuple]:
+        steps = [
+            ("rag_system", _load_rag_system),
+            ("embedding", _warm_embedding),
+        ]
+        if _summarizer_enabled():
+            steps += [
+                ("summarizer_load", _load_summarizer),
+                ("summarizer", _warm_summarizer),
+            ]
+        return steps
+
+    def _run_phase(self, name: str, step: Callable[[], None]):
+        phase: Dict[str, Any] = {"name": name, "status": "running", "seconds": None}
+        self.phases.append(phase)
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            phase.update(status="failed", seconds=round(time.perf_counter() - start, 3), error=str(e))
+            logger.exception(f"Warm-up phase failed: {name}")
+            raise
+        phase.update(status="done", seconds=round(time.perf_counter() - start, 3))
+        logger.info(f"Warm-up phase done: {name} ({phase['seconds']:.2f}s)")
+
+
+def _summarizer_enabled() -> bool:
+    return os.getenv("RAG_WARMUP_SUMMARIZER", "true").lower() == "true"
+
+
+def _load_rag_system():
+    from backend.services.api.routers.llm import get_rag_system
+    get_rag_system()
+
+
+def _warm_embedding():
+    """더미 쿼리 1회 인코딩 (커널 선택/메모리 할당 등 첫 forward 비용을 미리 지불)"""
+    from backend.services.api.routers.llm import get_rag_system
+    encoder = get_rag_system().retriever.encoder
+    if hasattr(encoder, 'ping'):
+        # 임베딩 워커 사용 시 워커에 연결되어야 ready (연결 실패 시 예외)
+        encoder.ping()
+    encoder.encode_query_array(WARMUP_QUERY)
+
+
+def _load_summarizer():
+    from backend.services.api.utils.summarizer import get_mt5_summarizer
+    get_mt5_summarizer()
+
+
+def _warm_summarizer():
+    from backend.services.api.utils.summarizer import warmup_mt5_summarizer
+    warmup_mt5_summarizer()
+
+
+_warmup = ModelWarmup()
+
+
+def start_model_warmup() -> Optional[threading.Thread]:
+    """API 시작 시 호출 (백그라운드 스레드, 요청 처리는 막지 않음)"""
+    return _warmup.start()
+
+
+def get_warmup_status() -> Dict[str, Any]:
+    """워밍업 상태 반환 (FastAPI /health/ready, Django /api/llm/health/ready)"""
+    return _warmup.snapshot()
+
+
+def preload_models() -> bool:
+    """
+    preload_app 마스터에서 워커 fork 전에 호출: 모델 가중치만 로드 (forward 없음)
+
+    Returns:
+        preload 여부 (GPU 사용 등으로 건너뛰면 False, 워커가 각자 로드)
+    """
+    from backend.services.rag.models.preload import can_preload, limit_threads_for_preload, prepare_for_fork
+
+    if not can_preload():
+        return False
+    limit_threads_for_preload()
+
+    steps = [("rag_system", _load_rag_system)]
+    if _summarizer_enabled():
+        steps.append(("summarizer_load", _load_summarizer))
+    start = time.perf_counter()
+    for name, step in steps:
+        phase_start = time.perf_counter()
+        step()
+        logger.info(f"Preload phase done: {name} ({time.perf_counter() - phase_start:.2f}s)")
+    prepare_for_fork()
+    logger.info(f"Models preloaded in master in {time.perf_counter() - start:.1f}s, workers will share weights")
+    return True
+
+
+def on_worker_fork(workers: int):
+    """
+    fork된 워커에서 호출: torch 스레드 수를 워커 수에 맞추고 워커 내 워밍업(더미 실행) 시작
+    (로드 단계는 마스터에서 받은 모델을 재사용하므로 즉시 끝남)
+    """
+    from backend.services.rag.models.preload import configure_worker_threads
+
+    threads = configure_worker_threads(workers)
+    logger.info(f"Worker {os.getpid()} forked (torch threads: {threads})")
+    start_model_warmup()
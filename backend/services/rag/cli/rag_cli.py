@@ -6,7 +6,19 @@ RAG 시스템 통합 CLI
 Usage:
   rag eval embedding <query>      # 임베딩 모델 비교 평가
   rag eval answering [query]      # 답변 비교 평가 (query 미지정 시 test_queries.txt 사용)
+  rag eval cascade                 # 캐스케이드 검색(작은 모델 후보 + 큰 모델 재정렬) vs 단일 모델 비교
   rag generate <query>             # RAG 전체 파이프라인 (검색 + 증강 + 생성)
+  rag index build|sync|stats       # 로컬 벡터 인덱스 관리 (pgvector 대체 백엔드)
+  rag index partial                # 소스 타입별 부분 HNSW 인덱스 생성 (필터 검색 가속)
+  rag bench vector                 # 벡터 인코딩 마이크로 벤치마크 (텍스트 리터럴 vs 바이너리)
+  rag bench recall                 # 검색 정확도 프로파일별 recall@k / 지연 시간 비교
+  rag quantize build|drop|stats    # halfvec / binary 양자화 HNSW 인덱스 관리
+  rag bench quantization           # float32 대비 양자화 인덱스 크기 / 생성 시간 / recall / 지연 시간
+  rag bench encoder                # PyTorch vs ONNX(int8) 임베딩 인코더 코사인 유사도 / 지연 시간 / 처리량
+  rag bench batching               # 문서 인코딩 고정 배치 vs 토큰 길이 버킷팅 처리량 / 패딩 효율
+  rag bench fork                   # 워커별 모델 로드 vs preload 후 fork 메모리 (PSS/USS) 비교
+  rag keywords backfill            # 키워드가 없는 기존 청크의 키워드 추출 및 저장 (KeywordReranker용)
+  rag worker                       # 임베딩 워커 프로세스 실행 (Unix 소켓, 웹 프로세스는 RAG_EMBEDDING_WORKER로 연결)
 """
 
 import os
@@ -20,10 +32,11 @@ from typing import List, Optional, Any
 project_root = Path(__file__).resolve().parents[4]
 sys.path.insert(0, str(project_root))
 
-from backend.services.rag.models.config import EmbeddingModelType, get_model_config
+from backend.services.rag.models.config import EmbeddingModelType, MODEL_ALIASES, get_model_config
 from backend.services.rag.core.evaluator import RAGEvaluator
 from backend.services.rag.rag_system import RAGSystem
-from backend.services.rag.retrieval.reranker import KeywordReranker, SemanticReranker, CombinedReranker
+from backend.services.rag.vectorstore.filters import SearchFilter
+from backend.services.rag.retrieval.reranker import KeywordReranker, SemanticReranker, CombinedReranker, create_reranker
 from backend.services.rag.augmentation.formatters import (
     PromptFormatter,
     MarkdownFormatter,
@@ -164,7 +177,7 @@ def print_comparison_table(results: dict):
         return
 
     # 헤더
-    print(f"{'모델명':<40} {'평균 Latency':>15} {'P95 Latency':>15} {'유사도':>10} {'Recall@5':>12} {'MRR':>10}")
+    print(f"{'모델명':<40} {'평균 Latency':>15} {'P95 Latency':>15} {'유사도':>10} {'Recall@5':>12} {'MRR':>10} {'QPS(배치)':>12}")
     print("-"*120)
 
     # 각 모델 정보
@@ -174,16 +187,21 @@ def print_comparison_table(results: dict):
         recall = comparisons.get('recall', {}).get(model_name, 0)
         mrr = comparisons.get('mrr', {}).get(model_name, 0)
 
-        avg_lat = latency.get('avg', 0)
-        p95_lat = latency.get('p95', 0)
+        throughput = comparisons.get('throughput', {}).get(model_name)
+
+        # 배치 검색은 쿼리별 latency가 없으므로 N/A
+        avg_lat = f"{latency['avg']:>13.2f}ms" if latency else f"{'N/A':>15}"
+        p95_lat = f"{latency['p95']:>13.2f}ms" if latency else f"{'N/A':>15}"
+        qps = f"{throughput['queries_per_second']:>12.2f}" if throughput else f"{'N/A':>12}"
 
         print(
             f"{model_name:<40} "
-            f"{avg_lat:>13.2f}ms "
-            f"{p95_lat:>13.2f}ms "
+            f"{avg_lat} "
+            f"{p95_lat} "
             f"{accuracy:>10.4f} "
             f"{recall:>12.4f} "
-            f"{mrr:>10.4f}"
+            f"{mrr:>10.4f} "
+            f"{qps}"
         )
 
     print("="*120)
@@ -215,13 +233,7 @@ def print_reranking_comparison(reranking_effects: dict):
 
 def get_model_type_from_name(model_name: str) -> EmbeddingModelType:
     """모델 이름을 EmbeddingModelType으로 변환"""
-    mapping = {
-        "E5_SMALL": EmbeddingModelType.MULTILINGUAL_E5_SMALL,
-        "E5_BASE": EmbeddingModelType.MULTILINGUAL_E5_BASE,
-        "E5_LARGE": EmbeddingModelType.MULTILINGUAL_E5_LARGE,
-        "KAKAO": EmbeddingModelType.KAKAOBANK_DEBERTA
-    }
-    return mapping.get(model_name.upper(), EmbeddingModelType.MULTILINGUAL_E5_SMALL)
+    return MODEL_ALIASES.get(model_name.upper(), EmbeddingModelType.MULTILINGUAL_E5_SMALL)
 
 
 def get_formatter_from_name(format_name: str):
@@ -465,6 +477,32 @@ def run_eval_answering_command(args, db_config: dict) -> bool:
         return False
 
 
+def run_eval_cascade_command(args, db_config: dict) -> bool:
+    """캐스케이드 검색 평가 명령어 실행 (후보 모델 단독 / 재정렬 모델 단독 / 캐스케이드)"""
+    try:
+        evaluator = RAGEvaluator(db_config)
+        queries = load_benchmark_queries(args.queries_file) if args.queries_file else None
+        results = evaluator.evaluate_cascade(
+            candidate_model=get_model_type_from_name(args.candidate_model),
+            rescore_model=get_model_type_from_name(args.model),
+            queries=queries,
+            top_k=args.top_k,
+            candidate_k=args.candidates
+        )
+
+        print(results['summary'])
+        print_comparison_table(results)
+
+        if args.save:
+            output_path = evaluator.save_results(results)
+            print(f"\n✅ 캐스케이드 평가 결과 저장: {output_path}")
+        return True
+
+    except Exception as e:
+        logger.exception(f"캐스케이드 평가 중 오류 발생: {e}")
+        return False
+
+
 def run_generate_command(args, db_config: dict) -> bool:
     """전체 RAG 파이프라인 실행 (검색 + 증강 + 생성)"""
     try:
@@ -473,7 +511,9 @@ def run_generate_command(args, db_config: dict) -> bool:
 
         # Reranker 설정 (리랭킹 사용 시 LLM 키워드 추출 기본 활성화)
         reranker = None
-        if args.reranking:
+        if args.reranker:
+            reranker = create_reranker(args.reranker)
+        elif args.reranking:
             reranker = KeywordReranker()  # 기본값: LLM 키워드 추출 활성화, gemma3:4b 사용
 
         # LLM Generator 초기화
@@ -505,7 +545,8 @@ def run_generate_command(args, db_config: dict) -> bool:
             reranker=reranker,
             formatter=formatter,
             llm_generator=llm_generator,
-            enable_generation=True
+            enable_generation=True,
+            retrieval_mode="hybrid" if args.hybrid else ("cascade" if args.cascade else None)
         )
 
         # 생성 설정
@@ -527,7 +568,8 @@ def run_generate_command(args, db_config: dict) -> bool:
             top_k=args.top_k,
             use_reranker=args.reranking,
             context_type=args.context_type,
-            generation_config=gen_config
+            generation_config=gen_config,
+            filters=SearchFilter.create(source_type=args.source_type, chunk_type=args.chunk_type)
         )
 
         # 결과 출력
@@ -596,6 +638,373 @@ def run_generate_command(args, db_config: dict) -> bool:
         return False
 
 
+def run_index_command(args, db_config: dict) -> bool:
+    """로컬 벡터 인덱스 / 부분 HNSW 인덱스 관리 명령어 실행"""
+    try:
+        from backend.services.rag.vectorstore.ingestion.store import PgVectorStore
+        from backend.services.rag.vectorstore.local_index import LocalVectorIndex
+
+        model_type = get_model_type_from_name(args.model)
+
+        if args.index_action == "partial":
+            print(f"\n🔨 소스 타입별 부분 HNSW 인덱스 생성 중... (모델: {args.model}, 최소 행 수: {args.min_rows})")
+            store = PgVectorStore(db_config)
+            try:
+                index_names = store.create_partial_indexes(model_type, min_rows=args.min_rows)
+            finally:
+                store.disconnect()
+            for index_name in index_names:
+                print(f"  {index_name}")
+            print(f"✅ 완료: {len(index_names)}개 인덱스")
+            return True
+
+        local_index = LocalVectorIndex(model_type, index_dir=args.index_dir)
+
+        if args.index_action == "stats":
+            if not local_index.exists():
+                print(f"\n❌ 로컬 인덱스가 없습니다: {local_index.path}")
+                return False
+            for key, value in local_index.stats().items():
+                print(f"  {key}: {value}")
+            return True
+
+        store = PgVectorStore(db_config)
+        try:
+            if args.index_action == "build":
+                print(f"\n🔨 로컬 인덱스 생성 중... (모델: {args.model}, dtype: {args.dtype}, nlist: {args.nlist})")
+                count = local_index.build(store, dtype=args.dtype, nlist=args.nlist)
+            else:
+                print(f"\n🔄 로컬 인덱스 동기화 중... (모델: {args.model})")
+                count = local_index.sync(store)
+        finally:
+            store.disconnect()
+
+        print(f"✅ 완료: {count}개 벡터 → {local_index.path}")
+        return True
+
+    except Exception as e:
+        logger.exception(f"로컬 인덱스 처리 중 오류 발생: {e}")
+        return False
+
+
+def run_bench_vector_command(args, db_config: dict) -> bool:
+    """벡터 인코딩 마이크로 벤치마크 실행 (텍스트 리터럴 vs 바이너리)"""
+    try:
+        from backend.services.rag.vectorstore.pool import get_pool
+        from backend.services.rag.vectorstore.vector_adapter import benchmark_encodings
+
+        print(f"\n⏱️ 벡터 인코딩 벤치마크 (dim={args.dim}, n={args.n}, DB={'사용' if args.db else '미사용'})")
+        if args.db:
+            with get_pool(db_config).connection() as conn:
+                results = benchmark_encodings(args.dim, args.n, conn=conn)
+        else:
+            results = benchmark_encodings(args.dim, args.n)
+
+        print(f"\n{'항목':<24} {'벡터당 (µs)':>12}")
+        print("-" * 38)
+        for name, micros in results.items():
+            print(f"{name:<24} {micros:>12.1f}")
+        return True
+
+    except Exception as e:
+        logger.exception(f"벤치마크 중 오류 발생: {e}")
+        return False
+
+
+def load_benchmark_queries(queries_file: Optional[str] = None) -> List[str]:
+    """벤치마크용 쿼리 로드 (test_queries.txt 포맷: 쿼리|키워드, # 주석)"""
+    path = Path(queries_file) if queries_file else Path(__file__).parent / "test_queries.txt"
+    queries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            queries.append(line.split('|', 1)[0].strip())
+    return queries
+
+
+def run_bench_recall_command(args, db_config: dict) -> bool:
+    """검색 정확도 프로파일별 recall@k 및 p50/p95 지연 시간 측정 (exact 결과 기준)"""
+    try:
+        import time
+        import numpy as np
+        from backend.services.rag.models.encoder import EmbeddingEncoder
+        from backend.services.rag.vectorstore.ingestion.store import PgVectorStore
+        from backend.services.rag.vectorstore.recall import RECALL_PROFILES
+
+        model_type = get_model_type_from_name(args.model)
+        profiles = args.profiles or list(RECALL_PROFILES)
+        unknown = [name for name in profiles if name not in RECALL_PROFILES]
+        if unknown:
+            print(f"\n❌ 알 수 없는 프로파일: {', '.join(unknown)}")
+            return False
+
+        queries = load_benchmark_queries(args.queries_file)
+        if not queries:
+            print("\n❌ 벤치마크 쿼리가 없습니다.")
+            return False
+
+        print(f"\n⏱️ 검색 정확도 벤치마크 (모델: {args.model}, Top-K: {args.top_k}, 쿼리: {len(queries)}개)")
+        encoder = EmbeddingEncoder(model_type=model_type)
+        embeddings = encoder.encode_queries_array(queries)
+        store = PgVectorStore(db_config)
+
+        def run_profile(profile_name: str):
+            latencies, hits = [], []
+            for embedding in embeddings:
+                start = time.perf_counter()
+                results = store.search_similar(
+                    embedding, model_type, top_k=args.top_k, recall_profile=profile_name
+                )
+                latencies.append((time.perf_counter() - start) * 1000)
+                hits.append([result['chunk_id'] for result in results])
+            return hits, latencies
+
+        try:
+            # 정답 집합: 인덱스를 사용하지 않는 정확 검색
+            ground_truth, _ = run_profile('exact')
+
+            print(f"\n{'프로파일':<10} {'recall@' + str(args.top_k):>10} {'p50 (ms)':>10} {'p95 (ms)':>10}")
+            print("-" * 44)
+            for profile_name in profiles:
+                hits, latencies = run_profile(profile_name)
+                recalls = [
+                    len(set(found) & set(expected)) / len(expected)
+                    for found, expected in zip(hits, ground_truth) if expected
+                ]
+                recall = float(np.mean(recalls)) if recalls else 0.0
+                p50, p95 = np.percentile(latencies, [50, 95])
+                print(f"{profile_name:<10} {recall:>10.3f} {p50:>10.2f} {p95:>10.2f}")
+        finally:
+            store.disconnect()
+        return True
+
+    except Exception as e:
+        logger.exception(f"벤치마크 중 오류 발생: {e}")
+        return False
+
+
+def _format_bytes(size: Optional[int]) -> str:
+    if size is None:
+        return "-"
+    return f"{size / (1024 * 1024):.1f}MB"
+
+
+def run_quantize_command(args, db_config: dict) -> bool:
+    """양자화 HNSW 인덱스 관리 명령어 실행"""
+    try:
+        from backend.services.rag.vectorstore.ingestion.store import PgVectorStore
+
+        model_type = get_model_type_from_name(args.model)
+        store = PgVectorStore(db_config)
+        try:
+            if args.quantize_action == "build":
+                print(f"\n🔨 양자화 인덱스 생성 중... (모델: {args.model}, 방식: {args.mode})")
+                info = store.build_quantized_index(model_type, args.mode)
+                print(f"✅ 완료: {info['index']} ({info['build_seconds']:.1f}s)")
+                print(f"  양자화 인덱스: {_format_bytes(info['index_bytes'])}")
+                print(f"  float32 인덱스: {_format_bytes(info['float_index_bytes'])}")
+                print(f"\n검색에 사용: export RAG_VECTOR_QUANTIZATION={args.mode}")
+            elif args.quantize_action == "drop":
+                store.drop_quantized_index(model_type, args.mode)
+                print(f"✅ 삭제 완료 (모델: {args.model}, 방식: {args.mode})")
+            else:
+                for name, size in store.get_relation_sizes(model_type).items():
+                    print(f"  {name:<48} {_format_bytes(size):>10}")
+        finally:
+            store.disconnect()
+        return True
+
+    except Exception as e:
+        logger.exception(f"양자화 인덱스 처리 중 오류 발생: {e}")
+        return False
+
+
+def run_keywords_command(args, db_config: dict) -> bool:
+    """청크 키워드 백필 명령어 실행"""
+    try:
+        from backend.services.rag.core.ingest_data import DataIngestionPipeline
+
+        method = "정규식" if args.regex else "LLM"
+        print(f"\n🔑 키워드가 없는 청크의 키워드 추출 중... (방식: {method}, 배치: {args.batch_size})")
+        pipeline = DataIngestionPipeline(db_config=db_config)
+        try:
+            count = pipeline.backfill_keywords(use_llm=not args.regex, batch_size=args.batch_size)
+        finally:
+            pipeline.vector_store.disconnect()
+        print(f"✅ 완료: {count}개 청크")
+        return True
+
+    except Exception as e:
+        logger.exception(f"키워드 백필 중 오류 발생: {e}")
+        return False
+
+
+def run_bench_quantization_command(args, db_config: dict) -> bool:
+    """float32 인덱스 대비 양자화 인덱스 비교 (크기, 생성 시간, recall@k, p50/p95 지연 시간)"""
+    try:
+        from backend.services.rag.models.encoder import EmbeddingEncoder
+        from backend.services.rag.vectorstore.ingestion.store import PgVectorStore
+        from backend.services.rag.vectorstore.quantization import benchmark_quantization
+
+        model_type = get_model_type_from_name(args.model)
+        queries = load_benchmark_queries(args.queries_file)
+        if not queries:
+            print("\n❌ 벤치마크 쿼리가 없습니다.")
+            return False
+
+        print(f"\n⏱️ 양자화 벤치마크 (모델: {args.model}, Top-K: {args.top_k}, 쿼리: {len(queries)}개)")
+        embeddings = EmbeddingEncoder(model_type=model_type).encode_queries_array(queries)
+        store = PgVectorStore(db_config)
+        try:
+            report = benchmark_quantization(
+                store, model_type, embeddings, top_k=args.top_k, modes=args.modes, build=args.build
+            )
+        finally:
+            store.disconnect()
+
+        print(f"\n{'방식':<8} {'인덱스 크기':>12} {'생성 (s)':>10} {'recall@' + str(args.top_k):>10} {'p50 (ms)':>10} {'p95 (ms)':>10}")
+        print("-" * 66)
+        for row in report:
+            if row['mode'] == 'table':
+                print(f"\n테이블 크기 (float32 원본, 모든 방식 공통): {_format_bytes(row['index_bytes'])}")
+                continue
+            build_seconds = f"{row['build_seconds']:.1f}" if row['build_seconds'] is not None else "-"
+            print(
+                f"{row['mode']:<8} {_format_bytes(row['index_bytes']):>12} {build_seconds:>10} "
+                f"{row['recall']:>10.3f} {row['p50_ms']:>10.2f} {row['p95_ms']:>10.2f}"
+            )
+        return True
+
+    except Exception as e:
+        logger.exception(f"벤치마크 중 오류 발생: {e}")
+        return False
+
+
+def run_bench_encoder_command(args, db_config: dict) -> bool:
+    """PyTorch vs ONNX(int8) 인코더 비교 (코사인 유사도, 쿼리 p50/p95, 문서 처리량)"""
+    try:
+        from backend.services.rag.models.onnx_encoder import benchmark_encoder_backends
+        from backend.services.rag.vectorstore.pool import get_pool
+
+        model_type = get_model_type_from_name(args.model)
+        queries = load_benchmark_queries(args.queries_file)
+        with get_pool(db_config).connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT content FROM vector_db.document_chunks ORDER BY id LIMIT %s", (args.docs,))
+            documents = [row[0] for row in cur.fetchall()]
+        if not queries or not documents:
+            print("\n❌ 벤치마크 쿼리 또는 문서가 없습니다.")
+            return False
+
+        print(f"\n⏱️ 인코더 백엔드 벤치마크 (모델: {args.model}, 쿼리: {len(queries)}개, 문서: {len(documents)}개)")
+        report = benchmark_encoder_backends(model_type, queries, documents)
+
+        print(f"\n{'백엔드':<8} {'쿼리 p50 (ms)':>14} {'쿼리 p95 (ms)':>14} {'문서/초':>10}")
+        print("-" * 50)
+        for backend in ('torch', 'onnx'):
+            row = report[backend]
+            print(
+                f"{backend:<8} {row['query_p50_ms']:>14.2f} {row['query_p95_ms']:>14.2f} "
+                f"{row['documents_per_second']:>10.1f}"
+            )
+        for name, label in (('query_cosine', '쿼리'), ('document_cosine', '문서')):
+            if name in report:
+                print(
+                    f"\n{label} 코사인 유사도 (PyTorch 대비): 최소 {report[name]['min_cosine']:.4f}, "
+                    f"평균 {report[name]['mean_cosine']:.4f}"
+                )
+        return True
+
+    except Exception as e:
+        logger.exception(f"벤치마크 중 오류 발생: {e}")
+        return False
+
+
+def run_bench_batching_command(args, db_config: dict) -> bool:
+    """수집 코퍼스(document_chunks)로 고정 크기 배치 vs 토큰 길이 버킷팅 문서 인코딩 처리량 비교"""
+    try:
+        from backend.services.rag.models.encoder import EmbeddingEncoder, benchmark_document_batching
+        from backend.services.rag.vectorstore.pool import get_pool
+
+        model_type = get_model_type_from_name(args.model)
+        with get_pool(db_config).connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT content FROM vector_db.document_chunks ORDER BY id LIMIT %s", (args.docs,))
+            documents = [row[0] for row in cur.fetchall()]
+        if not documents:
+            print("\n❌ 벤치마크 문서가 없습니다.")
+            return False
+
+        encoder = EmbeddingEncoder(model_type=model_type)
+        print(
+            f"\n⏱️ 문서 배치 벤치마크 (모델: {args.model}, 백엔드: {encoder.backend}, "
+            f"문서: {len(documents)}개, 배치: {args.batch_size or encoder.config.batch_size})"
+        )
+        report = benchmark_document_batching(
+            encoder, documents, batch_size=args.batch_size, token_budget=args.token_budget
+        )
+
+        print(f"\n{'방식':<10} {'시간 (s)':>10} {'문서/초':>10} {'배치 수':>8} {'패딩 효율':>10}")
+        print("-" * 52)
+        for name, row in report.items():
+            print(
+                f"{name:<10} {row['seconds']:>10.2f} {row['docs_per_second']:>10.1f} "
+                f"{row['batches']:>8} {row['padding_efficiency']:>10.1%}"
+            )
+        print(f"\n고정 배치 대비 최대 절대 오차: {report['bucketed']['max_abs_diff']:.2e}")
+        return True
+
+    except Exception as e:
+        logger.exception(f"벤치마크 중 오류 발생: {e}")
+        return False
+
+
+def run_bench_fork_command(args, db_config: dict) -> bool:
+    """워커별 모델 로드 vs 마스터 preload 후 fork 메모리 비교 (gunicorn.conf.py 서빙 방식 검증)"""
+    try:
+        from backend.services.rag.models.preload import benchmark_fork_sharing
+
+        model_type = get_model_type_from_name(args.model)
+        queries = load_benchmark_queries(args.queries_file)[:args.queries]
+        print(f"\n⏱️ fork 메모리 벤치마크 (모델: {args.model}, 워커: {args.workers}개, 워커당 쿼리: {len(queries)}개)")
+        report = benchmark_fork_sharing(model_type, queries, workers=args.workers)
+
+        mb = 2 ** 20
+        print(f"\n{'방식':<12} {'총 PSS (MB)':>12} {'총 RSS (MB)':>12} {'워커 USS (MB)':>14} {'워커 공유 (MB)':>15} {'준비 (s)':>9}")
+        print("-" * 80)
+        for name, row in report.items():
+            print(
+                f"{name:<12} {row['total_pss'] / mb:>12.0f} {row['total_rss'] / mb:>12.0f} "
+                f"{row['worker_uss'] / mb:>14.0f} {row['worker_shared'] / mb:>15.0f} {row['load_seconds']:>9.2f}"
+            )
+        saved = report['per_worker']['total_pss'] - report['preload']['total_pss']
+        print(f"\npreload 후 fork 절감: {saved / mb:.0f} MB (총 PSS 기준)")
+        return True
+
+    except Exception as e:
+        logger.exception(f"벤치마크 중 오류 발생: {e}")
+        return False
+
+
+def run_worker_command(args, db_config: dict) -> bool:
+    """임베딩 워커 프로세스 실행 (모델 소유, 웹 프로세스는 Unix 소켓으로 인코딩 요청)"""
+    try:
+        from backend.services.rag.models.remote import EmbeddingWorkerServer
+
+        model_types = [get_model_type_from_name(name.strip().upper()) for name in args.models.split(',') if name.strip()]
+        server = EmbeddingWorkerServer(args.socket, model_types, device=args.device)
+        print(f"\n🚀 임베딩 워커 시작: {server.address} (모델: {', '.join(t.value for t in model_types)})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n임베딩 워커 종료")
+        return True
+
+    except Exception as e:
+        logger.exception(f"임베딩 워커 실행 중 오류 발생: {e}")
+        return False
+
+
 def main():
     # 환경 변수 설정
     os.environ.setdefault("PG_USER", "postgres")
@@ -623,6 +1032,15 @@ def main():
     p_eval_answering = eval_subparsers.add_parser("answering", help="임베딩 모델별 답변 비교 평가 (compare_answers_simple.py)")
     p_eval_answering.add_argument("query", type=str, nargs="?", default=None, help="테스트 쿼리 (미지정 시 --queries-file 사용)")
 
+    # 캐스케이드 검색 평가
+    p_eval_cascade = eval_subparsers.add_parser("cascade", help="캐스케이드 검색(작은 모델 후보 + 큰 모델 재정렬) vs 단일 모델 비교")
+    p_eval_cascade.add_argument("--candidate-model", type=str, default="E5_SMALL", choices=["E5_SMALL", "E5_BASE", "E5_LARGE", "KAKAO"], help="후보 검색 모델")
+    p_eval_cascade.add_argument("--model", type=str, default="E5_LARGE", choices=["E5_SMALL", "E5_BASE", "E5_LARGE", "KAKAO"], help="재정렬 모델")
+    p_eval_cascade.add_argument("--top-k", type=int, default=5, help="검색할 결과 수")
+    p_eval_cascade.add_argument("--candidates", type=int, default=None, help="후보 수 (기본값: RAG_CASCADE_CANDIDATES 또는 max(top_k * 10, 50))")
+    p_eval_cascade.add_argument("--queries-file", type=str, default=None, help="쿼리 파일 (기본값: cli/test_queries.txt)")
+    p_eval_cascade.add_argument("--save", action="store_true", help="결과를 JSON 파일로 저장")
+
     # RAG 생성 (전체 파이프라인)
     p_generate = subparsers.add_parser("generate", help="RAG 전체 파이프라인 (검색 + 증강 + 생성)")
     p_generate.add_argument("query", type=str, help="질문")
@@ -630,6 +1048,11 @@ def main():
     p_generate.add_argument("--llm-model", type=str, default="gemma2:2b", help="LLM 모델 (예: gemma2:2b)")
     p_generate.add_argument("--top-k", type=int, default=5, help="검색할 결과 수")
     p_generate.add_argument("--reranking", action="store_true", help="리랭킹 사용 (LLM 키워드 추출 포함, gemma3:4b)")
+    p_generate.add_argument("--reranker", type=str, default=None, choices=["keyword", "default", "cross_encoder", "keyword_cross_encoder"], help="리랭커 종류 (cross_encoder: CPU cross-encoder 배치 점수화)")
+    p_generate.add_argument("--hybrid", action="store_true", help="하이브리드 검색 (전문 검색 + 벡터 검색 RRF 결합)")
+    p_generate.add_argument("--cascade", action="store_true", help="캐스케이드 검색 (E5-small 후보 → --model 저장 벡터로 재정렬, 보통 --model E5_LARGE)")
+    p_generate.add_argument("--source-type", type=str, nargs="+", default=None, help="검색할 소스 타입 (document_sources.source_type)")
+    p_generate.add_argument("--chunk-type", type=str, nargs="+", default=None, help="검색할 청크 타입 (예: text, table)")
     p_generate.add_argument("--format", type=str, default="enhanced", choices=["prompt", "markdown", "json", "policy", "enhanced"], help="컨텍스트 포맷")
     p_generate.add_argument("--context-type", type=str, default="general", choices=["general", "qa", "summarization"], help="컨텍스트 타입")
     p_generate.add_argument("--temperature", type=float, default=0.7, help="생성 온도 (0.0-1.0)")
@@ -638,6 +1061,66 @@ def main():
     p_generate.add_argument("--save", action="store_true", help="결과를 JSON 파일로 저장")
     p_generate.add_argument("--output-dir", type=str, default="results", help="저장할 디렉토리")
 
+    # 로컬 벡터 인덱스 (pgvector 대체 백엔드)
+    p_index = subparsers.add_parser("index", help="로컬 벡터 인덱스 관리 (RAG_VECTOR_BACKEND=local)")
+    p_index.add_argument("index_action", choices=["build", "sync", "stats", "partial"], help="build: 전체 재생성, sync: DB와 동기화, stats: 정보 출력, partial: 소스 타입별 부분 HNSW 인덱스 생성")
+    p_index.add_argument("--model", type=str, default="E5_LARGE", choices=["E5_SMALL", "E5_BASE", "E5_LARGE", "KAKAO"], help="임베딩 모델")
+    p_index.add_argument("--dtype", type=str, default="float32", choices=["float32", "float16"], help="저장 dtype")
+    p_index.add_argument("--nlist", type=int, default=0, help="IVF 리스트 수 (0이면 정확 검색)")
+    p_index.add_argument("--index-dir", type=str, default=None, help="인덱스 디렉토리 (기본값: RAG_LOCAL_INDEX_DIR)")
+    p_index.add_argument("--min-rows", type=int, default=1000, help="partial: 부분 인덱스를 만들 소스 타입의 최소 행 수")
+
+    # 벤치마크
+    p_bench = subparsers.add_parser("bench", help="성능 마이크로 벤치마크")
+    bench_subparsers = p_bench.add_subparsers(dest="bench_mode", help="벤치마크 종류")
+    p_bench_vector = bench_subparsers.add_parser("vector", help="벡터 인코딩 비교 (텍스트 리터럴 vs pgvector 바이너리)")
+    p_bench_vector.add_argument("--dim", type=int, default=1024, help="벡터 차원 (E5-large: 1024)")
+    p_bench_vector.add_argument("-n", type=int, default=1000, help="반복 횟수")
+    p_bench_vector.add_argument("--db", action="store_true", help="DB 왕복(INSERT/COPY, 쿼리 바인딩)도 측정 (임시 테이블 사용)")
+    p_bench_recall = bench_subparsers.add_parser("recall", help="검색 정확도 프로파일별 recall@k / p50·p95 지연 시간 (exact 기준)")
+    p_bench_recall.add_argument("--model", type=str, default="E5_LARGE", choices=["E5_SMALL", "E5_BASE", "E5_LARGE", "KAKAO"], help="임베딩 모델")
+    p_bench_recall.add_argument("--top-k", type=int, default=5, help="검색할 결과 수")
+    p_bench_recall.add_argument("--queries-file", type=str, default=None, help="쿼리 파일 (기본값: cli/test_queries.txt)")
+    p_bench_recall.add_argument("--profiles", type=str, nargs="+", default=None, help="비교할 프로파일 (기본값: 전체)")
+    p_bench_quant = bench_subparsers.add_parser("quantization", help="float32 대비 halfvec/binary 인덱스 크기, 생성 시간, recall@k, 지연 시간")
+    p_bench_quant.add_argument("--model", type=str, default="E5_LARGE", choices=["E5_SMALL", "E5_BASE", "E5_LARGE", "KAKAO"], help="임베딩 모델")
+    p_bench_quant.add_argument("--top-k", type=int, default=5, help="검색할 결과 수")
+    p_bench_quant.add_argument("--queries-file", type=str, default=None, help="쿼리 파일 (기본값: cli/test_queries.txt)")
+    p_bench_quant.add_argument("--modes", type=str, nargs="+", default=None, choices=["none", "halfvec", "binary"], help="비교할 방식 (기본값: 전체)")
+    p_bench_quant.add_argument("--build", action="store_true", help="인덱스를 생성하며 생성 시간 측정 (float32는 임시 인덱스로 측정 후 삭제)")
+    p_bench_encoder = bench_subparsers.add_parser("encoder", help="PyTorch vs ONNX(int8) 임베딩 인코더 코사인 유사도, 쿼리 지연 시간, 문서 처리량")
+    p_bench_encoder.add_argument("--model", type=str, default="E5_LARGE", choices=["E5_SMALL", "E5_BASE", "E5_LARGE", "KAKAO"], help="임베딩 모델")
+    p_bench_encoder.add_argument("--queries-file", type=str, default=None, help="쿼리 파일 (기본값: cli/test_queries.txt)")
+    p_bench_encoder.add_argument("--docs", type=int, default=200, help="인코딩할 문서(청크) 수")
+    p_bench_batching = bench_subparsers.add_parser("batching", help="문서 인코딩 고정 배치 vs 토큰 길이 버킷팅 (처리량, 패딩 효율)")
+    p_bench_batching.add_argument("--model", type=str, default="E5_LARGE", choices=["E5_SMALL", "E5_BASE", "E5_LARGE", "KAKAO"], help="임베딩 모델")
+    p_bench_batching.add_argument("--docs", type=int, default=1000, help="인코딩할 문서(청크) 수")
+    p_bench_batching.add_argument("--batch-size", type=int, default=None, help="고정 배치 크기 (기본값: 모델 설정)")
+    p_bench_batching.add_argument("--token-budget", type=int, default=None, help="버킷팅 배치당 토큰 수 (기본값: RAG_ENCODE_TOKEN_BUDGET 또는 배치 크기 × 256)")
+    p_bench_fork = bench_subparsers.add_parser("fork", help="워커별 모델 로드 vs preload 후 fork 메모리 비교 (Linux)")
+    p_bench_fork.add_argument("--model", type=str, default="E5_LARGE", choices=["E5_SMALL", "E5_BASE", "E5_LARGE", "KAKAO"], help="임베딩 모델")
+    p_bench_fork.add_argument("--workers", type=int, default=4, help="워커 프로세스 수")
+    p_bench_fork.add_argument("--queries", type=int, default=20, help="워커당 인코딩할 쿼리 수")
+    p_bench_fork.add_argument("--queries-file", type=str, default=None, help="쿼리 파일 (기본값: cli/test_queries.txt)")
+
+    # 양자화 인덱스
+    p_quantize = subparsers.add_parser("quantize", help="halfvec / binary 양자화 HNSW 인덱스 관리 (RAG_VECTOR_QUANTIZATION)")
+    p_quantize.add_argument("quantize_action", choices=["build", "drop", "stats"], help="build: 인덱스 생성, drop: 삭제, stats: 테이블/인덱스 크기")
+    p_quantize.add_argument("--model", type=str, default="E5_LARGE", choices=["E5_SMALL", "E5_BASE", "E5_LARGE", "KAKAO"], help="임베딩 모델")
+    p_quantize.add_argument("--mode", type=str, default="halfvec", choices=["halfvec", "binary"], help="양자화 방식")
+
+    # 청크 키워드
+    p_keywords = subparsers.add_parser("keywords", help="청크 키워드 관리 (document_chunks.keywords, KeywordReranker)")
+    p_keywords.add_argument("keywords_action", choices=["backfill"], help="backfill: 키워드가 없는 청크의 키워드 추출 및 저장")
+    p_keywords.add_argument("--regex", action="store_true", help="LLM 대신 정규식으로 추출")
+    p_keywords.add_argument("--batch-size", type=int, default=200, help="한 번에 추출/저장할 청크 수")
+
+    # 임베딩 워커
+    p_worker = subparsers.add_parser("worker", help="임베딩 워커 프로세스 실행 (모델을 호스트당 1벌만 로드, RAG_EMBEDDING_WORKER)")
+    p_worker.add_argument("--socket", type=str, default=None, help="Unix 소켓 경로 (기본값: RAG_EMBEDDING_WORKER 또는 $XDG_RUNTIME_DIR/rag-embedding-worker.sock)")
+    p_worker.add_argument("--models", type=str, default="E5_LARGE", help="시작 시 로드할 모델 (쉼표 구분, 예: E5_LARGE,E5_SMALL)")
+    p_worker.add_argument("--device", type=str, default=None, choices=["cuda", "cpu"], help="디바이스 (기본값: 자동)")
+
 
     args = parser.parse_args()
 
@@ -649,7 +1132,7 @@ def main():
         logging.getLogger().setLevel(logging.DEBUG)
 
     # DB 연결 테스트
-    if args.command not in ['list']:
+    if args.command not in ['list', 'worker']:
         logger.info("DB 연결 테스트 중...")
         if not test_connection():
             logger.error("DB 연결 실패")
@@ -670,6 +1153,8 @@ def main():
             success = run_eval_embedding_command(args, db_config)
         elif args.eval_mode == "answering":
             success = run_eval_answering_command(args, db_config)
+        elif args.eval_mode == "cascade":
+            success = run_eval_cascade_command(args, db_config)
         else:
             logger.error(f"알 수 없는 평가 모드: {args.eval_mode}")
             success = False
@@ -677,6 +1162,35 @@ def main():
     elif args.command == "generate":
         success = run_generate_command(args, db_config)
 
+    elif args.command == "index":
+        success = run_index_command(args, db_config)
+
+    elif args.command == "bench":
+        if not args.bench_mode:
+            parser.parse_args([args.command, "--help"])
+            sys.exit(1)
+        if args.bench_mode == "vector":
+            success = run_bench_vector_command(args, db_config)
+        elif args.bench_mode == "recall":
+            success = run_bench_recall_command(args, db_config)
+        elif args.bench_mode == "quantization":
+            success = run_bench_quantization_command(args, db_config)
+        elif args.bench_mode == "encoder":
+            success = run_bench_encoder_command(args, db_config)
+        elif args.bench_mode == "batching":
+            success = run_bench_batching_command(args, db_config)
+        elif args.bench_mode == "fork":
+            success = run_bench_fork_command(args, db_config)
+
+    elif args.command == "quantize":
+        success = run_quantize_command(args, db_config)
+
+    elif args.command == "keywords":
+        success = run_keywords_command(args, db_config)
+
+    elif args.command == "worker":
+        success = run_worker_command(args, db_config)
+
 
     if success:
         logger.info(f"{args.command} 명령이 성공적으로 완료되었습니다.")
@@ -11,7 +11,8 @@ from pathlib import Path
 
 from ..models.config import EmbeddingModelType
 from .ingest_data import DataIngestionPipeline
-from ..vectorstore.ingestion.store import PgVectorStore
+from ..models.config import get_embedding_table
+from ..vectorstore.pool import get_pool
 
 logger = logging.getLogger(__name__)
 
@@ -113,64 +114,42 @@ class MultiModelEmbedder:
     def _clear_model_embeddings(self, model_type: EmbeddingModelType):
         """특정 모델의 기존 임베딩을 삭제합니다 (모델별 테이블)."""
 
-        # 모델별 테이블 이름 매핑
-        from ..models.config import EmbeddingModelType
-        table_mapping = {
-            EmbeddingModelType.MULTILINGUAL_E5_SMALL: 'embeddings_e5_small',
-            EmbeddingModelType.MULTILINGUAL_E5_BASE: 'embeddings_e5_base',
-            EmbeddingModelType.MULTILINGUAL_E5_LARGE: 'embeddings_e5_large',
-            EmbeddingModelType.KAKAOBANK_DEBERTA: 'embeddings_kakaobank',
-        }
-
-        embedding_table = table_mapping.get(model_type)
-        if not embedding_table:
+        try:
+            embedding_table = get_embedding_table(model_type)
+        except ValueError:
             logger.warning(f"알 수 없는 모델 타입: {model_type}")
             return
 
-        store = PgVectorStore()
         try:
-            store.connect()
-
-            # 해당 모델 테이블의 모든 임베딩 삭제
-            delete_query = f"DELETE FROM vector_db.{embedding_table}"
-            store.execute_query(delete_query)
+            # 공유 커넥션 풀 사용 (호출마다 새 연결을 만들지 않음)
+            with get_pool(self.db_config).connection() as conn, conn.cursor() as cur:
+                # 해당 모델 테이블의 모든 임베딩 삭제
+                cur.execute(f"DELETE FROM vector_db.{embedding_table}")
+                conn.commit()
 
             logger.info(f"{model_type.value} 기존 데이터 정리 완료")
 
         except Exception as e:
             logger.warning(f"기존 데이터 정리 실패: {e}")
-        finally:
-            store.disconnect()
     
     def _get_embedding_count(self, model_type: EmbeddingModelType) -> int:
         """특정 모델의 임베딩 개수를 조회합니다 (모델별 테이블)."""
 
-        # 모델별 테이블 이름 매핑
-        table_mapping = {
-            EmbeddingModelType.MULTILINGUAL_E5_SMALL: 'embeddings_e5_small',
-            EmbeddingModelType.MULTILINGUAL_E5_BASE: 'embeddings_e5_base',
-            EmbeddingModelType.MULTILINGUAL_E5_LARGE: 'embeddings_e5_large',
-            EmbeddingModelType.KAKAOBANK_DEBERTA: 'embeddings_kakaobank',
-        }
-
-        embedding_table = table_mapping.get(model_type)
-        if not embedding_table:
+        try:
+            embedding_table = get_embedding_table(model_type)
+        except ValueError:
             logger.error(f"알 수 없는 모델 타입: {model_type}")
             return 0
 
-        store = PgVectorStore()
         try:
-            store.connect()
-
-            count_query = f"SELECT COUNT(*) FROM vector_db.{embedding_table}"
-            result = store.execute_query(count_query)
-            return result[0][0] if result else 0
+            with get_pool(self.db_config).connection() as conn, conn.cursor() as cur:
+                cur.execute(f"SELECT COUNT(*) FROM vector_db.{embedding_table}")
+                result = cur.fetchone()
+            return result[0] if result else 0
 
         except Exception as e:
             logger.error(f"임베딩 개수 조회 실패: {e}")
             return 0
-        finally:
-            store.disconnect()
     
     def get_summary(self) -> str:
         """임베딩 결과 요약을 반환합니다."""
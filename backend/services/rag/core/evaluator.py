@@ -3,9 +3,10 @@ RAG 성능 평가기
 
 다양한 모델의 검색 성능을 평가하고 비교합니다.
 - 표준 검색 메트릭 (Precision@K, Recall@K, MRR, NDCG)
-- Latency 메트릭 (percentiles)
+- Latency 메트릭 (percentiles, 쿼리별 검색 시) / 처리량 메트릭 (배치 검색 시)
 - 한국어 이해도 메트릭
 - 리랭킹 전후 성능 비교
+- 캐스케이드(작은 모델 후보 + 큰 모델 재정렬) 검색 비교
 """
 
 import time
@@ -17,6 +18,7 @@ from datetime import datetime
 
 from ..models.config import EmbeddingModelType
 from .search import VectorRetriever
+from ..retrieval.cascade import CascadeRetriever
 from .metrics import MetricsCalculator
 
 logger = logging.getLogger(__name__)
@@ -91,7 +93,8 @@ class RAGEvaluator:
         queries: List[str] = None,
         top_k: int = 5,
         use_reranking: bool = False,
-        save_search_results: bool = False
+        save_search_results: bool = False,
+        per_query_latency: bool = False
     ) -> Dict[str, Any]:
         """
         단일 모델의 성능을 평가합니다.
@@ -102,6 +105,8 @@ class RAGEvaluator:
             top_k: 검색할 결과 수
             use_reranking: 리랭킹 사용 여부
             save_search_results: 검색 결과를 저장할지 여부 (False=메트릭만, True=전체)
+            per_query_latency: 쿼리를 하나씩 검색해 쿼리별 latency(P50/P95/P99) 측정
+                (False면 배치 검색 1회, latency 대신 처리량 메트릭만 계산, 리랭킹은 항상 쿼리별)
 
         Returns:
             평가 결과 딕셔너리
@@ -115,35 +120,44 @@ class RAGEvaluator:
 
         try:
             # 검색 수행
-            search_results = {}
-            for query in queries:
-                logger.info(f"쿼리 검색 중: {query}")
+            batch_time_ms = None
+            if use_reranking or per_query_latency:
+                search_results = {}
+                for query in queries:
+                    logger.info(f"쿼리 검색 중: {query}")
+                    start_time = time.time()
+
+                    if use_reranking:
+                        results = retriever.search_with_reranking(
+                            query=query,
+                            top_k=top_k,
+                            rerank_top_k=top_k * 4  # 4배 많이 가져와서 리랭킹
+                        )
+                    else:
+                        results = retriever.search(
+                            query=query,
+                            top_k=top_k
+                        )
+
+                    search_time = (time.time() - start_time) * 1000  # ms
+
+                    search_results[query] = {
+                        'results': results,
+                        'search_time_ms': search_time,
+                        'result_count': len(results)
+                    }
+            else:
+                # 전체 쿼리를 배치 인코딩 1회 + SQL 1회로 검색 (쿼리별 시간이 없으므로 처리량으로 보고)
+                logger.info(f"쿼리 {len(queries)}개 배치 검색 중")
                 start_time = time.time()
-
-                if use_reranking:
-                    results = retriever.search_with_reranking(
-                        query=query,
-                        top_k=top_k,
-                        rerank_top_k=top_k * 4  # 4배 많이 가져와서 리랭킹
-                    )
-                else:
-                    results = retriever.search(
-                        query=query,
-                        top_k=top_k
-                    )
-
-                search_time = (time.time() - start_time) * 1000  # ms
-
-                search_results[query] = {
-                    'results': results,
-                    'search_time_ms': search_time,
-                    'result_count': len(results)
-                }
+                search_results = retriever.search_batch(queries, top_k=top_k)
+                batch_time_ms = (time.time() - start_time) * 1000
 
             # 성능 지표 계산 (예상 키워드 포함)
             metrics = self.metrics_calculator.calculate_metrics(
                 search_results,
-                expected_keywords=self.expected_keywords if self.expected_keywords else None
+                expected_keywords=self.expected_keywords if self.expected_keywords else None,
+                batch_time_ms=batch_time_ms
             )
 
             # 결과 정리
@@ -152,6 +166,7 @@ class RAGEvaluator:
                 'total_queries': len(queries),
                 'successful_queries': metrics.successful_queries,
                 'use_reranking': use_reranking,
+                'latency_mode': 'per_query' if batch_time_ms is None else 'batch',
                 'metrics': self.metrics_calculator.to_dict(metrics),
                 'timestamp': datetime.now().isoformat()
             }
@@ -190,7 +205,8 @@ class RAGEvaluator:
         queries: List[str] = None,
         top_k: int = 5,
         compare_reranking: bool = False,
-        save_search_results: bool = False
+        save_search_results: bool = False,
+        per_query_latency: bool = False
     ) -> Dict[str, Any]:
         """
         여러 모델의 성능을 평가하고 비교합니다.
@@ -201,6 +217,7 @@ class RAGEvaluator:
             top_k: 검색할 결과 수
             compare_reranking: 리랭킹 전후 성능 비교 여부
             save_search_results: 검색 결과를 저장할지 여부 (기본: False)
+            per_query_latency: 기본 검색도 쿼리별로 측정 (모델 간 latency 비교, 리랭킹 latency 오버헤드 비교 시 필요)
 
         Returns:
             종합 평가 결과
@@ -218,7 +235,8 @@ class RAGEvaluator:
                 result = self.evaluate_model(
                     model_type, queries, top_k,
                     use_reranking=False,
-                    save_search_results=save_search_results
+                    save_search_results=save_search_results,
+                    per_query_latency=per_query_latency
                 )
                 results[f"{model_type.value}_baseline"] = result
 
@@ -255,6 +273,117 @@ class RAGEvaluator:
             'timestamp': datetime.now().isoformat()
         }
 
+    def evaluate_cascade(
+        self,
+        candidate_model: EmbeddingModelType = EmbeddingModelType.MULTILINGUAL_E5_SMALL,
+        rescore_model: EmbeddingModelType = EmbeddingModelType.MULTILINGUAL_E5_LARGE,
+        queries: List[str] = None,
+        top_k: int = 5,
+        candidate_k: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        캐스케이드 검색을 단일 모델 검색과 비교합니다.
+        (후보 모델 단독, 재정렬 모델 단독, 캐스케이드 - 모두 배치 검색, 리랭킹 없음)
+
+        Args:
+            candidate_model: 후보 검색 모델 (작은 모델)
+            rescore_model: 재정렬 모델 (큰 모델)
+            queries: 테스트 쿼리
+            top_k: 검색할 결과 수
+            candidate_k: 캐스케이드 후보 수 (None이면 RAG_CASCADE_CANDIDATES 또는 max(top_k * 10, 50))
+
+        Returns:
+            {'evaluation_results', 'comparison', 'overlap_with_rescore_model', 'summary', 'timestamp'}
+            overlap_with_rescore_model: 재정렬 모델 단독 top-k 대비 캐스케이드 top-k 일치율 평균
+        """
+        if queries is None:
+            queries = self.test_queries
+
+        logger.info(
+            f"캐스케이드 평가 시작: {candidate_model.value} 후보 → {rescore_model.value} 재정렬"
+        )
+
+        results = {}
+        search_results_by_name = {}
+        expected_keywords = self.expected_keywords if self.expected_keywords else None
+
+        for model_type in (candidate_model, rescore_model):
+            retriever = VectorRetriever(model_type, self.db_config)
+            try:
+                start_time = time.time()
+                search_results = retriever.search_batch(queries, top_k=top_k)
+                batch_time_ms = (time.time() - start_time) * 1000
+            finally:
+                retriever.close()
+            name = f"{model_type.value}_baseline"
+            search_results_by_name[name] = search_results
+            metrics = self.metrics_calculator.calculate_metrics(
+                search_results, expected_keywords=expected_keywords, batch_time_ms=batch_time_ms
+            )
+            self.metrics_calculator.print_metrics(metrics, name)
+            results[name] = {
+                'model_name': model_type.value,
+                'total_queries': len(queries),
+                'successful_queries': metrics.successful_queries,
+                'metrics': self.metrics_calculator.to_dict(metrics),
+                'timestamp': datetime.now().isoformat()
+            }
+
+        cascade = CascadeRetriever(
+            model_type=rescore_model,
+            db_config=self.db_config,
+            candidate_model_type=candidate_model,
+            candidate_k=candidate_k
+        )
+        # 캐시 적중으로 지연 시간이 왜곡되지 않도록 시맨틱 캐시 미사용
+        cascade.semantic_cache = None
+        try:
+            start_time = time.time()
+            cascade_results = cascade.search_batch(queries, top_k=top_k, use_reranker=False)
+            batch_time_ms = (time.time() - start_time) * 1000
+            candidates = cascade._candidates(top_k)
+        finally:
+            cascade.close()
+
+        cascade_name = f"cascade_{candidate_model.value}_{rescore_model.value}"
+        metrics = self.metrics_calculator.calculate_metrics(
+            cascade_results, expected_keywords=expected_keywords, batch_time_ms=batch_time_ms
+        )
+        self.metrics_calculator.print_metrics(metrics, cascade_name)
+        results[cascade_name] = {
+            'model_name': cascade_name,
+            'candidate_model': candidate_model.value,
+            'rescore_model': rescore_model.value,
+            'candidate_k': candidates,
+            'total_queries': len(queries),
+            'successful_queries': metrics.successful_queries,
+            'metrics': self.metrics_calculator.to_dict(metrics),
+            'timestamp': datetime.now().isoformat()
+        }
+
+        # 재정렬 모델 단독 결과를 기준으로 한 top-k 일치율
+        reference = search_results_by_name[f"{rescore_model.value}_baseline"]
+        overlaps = []
+        for query in queries:
+            expected = {r['chunk_id'] for r in reference.get(query, {}).get('results', [])}
+            if not expected:
+                continue
+            found = {r['chunk_id'] for r in cascade_results.get(query, {}).get('results', [])}
+            overlaps.append(len(found & expected) / len(expected))
+        overlap = sum(overlaps) / len(overlaps) if overlaps else 0.0
+
+        comparison = self._compare_models(results)
+        summary = self._generate_summary(results, comparison)
+        summary += f"🔗 캐스케이드 top-{top_k} 일치율 (vs {rescore_model.value}): {overlap:.2%} (후보 {candidates}개)\n"
+
+        return {
+            'evaluation_results': results,
+            'comparison': comparison,
+            'overlap_with_rescore_model': overlap,
+            'summary': summary,
+            'timestamp': datetime.now().isoformat()
+        }
+
     def _compare_models(self, results: Dict[str, Any]) -> Dict[str, Any]:
         """모델들을 비교합니다."""
 
@@ -266,6 +395,7 @@ class RAGEvaluator:
         # 주요 메트릭 추출
         comparisons = {
             'latency': {},
+            'throughput': {},
             'accuracy': {},
             'recall': {},
             'mrr': {},
@@ -284,6 +414,14 @@ class RAGEvaluator:
                     'p99': lm['p99_latency_ms']
                 }
 
+            # 처리량 (배치 검색, 쿼리별 latency 없음)
+            if metrics.get('throughput_metrics'):
+                tm = metrics['throughput_metrics']
+                comparisons['throughput'][model_name] = {
+                    'batch_time_ms': tm['batch_time_ms'],
+                    'queries_per_second': tm['queries_per_second']
+                }
+
             # Accuracy (유사도)
             comparisons['accuracy'][model_name] = metrics.get('avg_similarity', 0)
 
@@ -298,6 +436,9 @@ class RAGEvaluator:
         rankings = {}
         rankings['fastest'] = sorted(comparisons['latency'].items(),
                                      key=lambda x: x[1]['avg'])[0][0] if comparisons['latency'] else None
+        rankings['highest_throughput'] = sorted(comparisons['throughput'].items(),
+                                                key=lambda x: x[1]['queries_per_second'],
+                                                reverse=True)[0][0] if comparisons['throughput'] else None
         rankings['most_accurate'] = sorted(comparisons['accuracy'].items(),
                                           key=lambda x: x[1], reverse=True)[0][0] if comparisons['accuracy'] else None
         rankings['best_recall'] = sorted(comparisons['recall'].items(),
@@ -367,7 +508,8 @@ class RAGEvaluator:
 ✅ 성공: {successful_count}개
 ❌ 실패: {failed_count}개
 
-🏃‍♂️ 가장 빠른 모델: {rankings.get('fastest', 'N/A')}
+🏃‍♂️ 가장 빠른 모델 (쿼리별 latency): {rankings.get('fastest') or 'N/A'}
+🚀 최고 처리량 모델 (배치): {rankings.get('highest_throughput') or 'N/A'}
 🎯 가장 정확한 모델: {rankings.get('most_accurate', 'N/A')}
 🔍 Best Recall: {rankings.get('best_recall', 'N/A')}
 ⭐ Best MRR: {rankings.get('best_mrr', 'N/A')}
@@ -18,6 +18,9 @@ sys.path.insert(0, str(project_root))
 from backend.services.rag.models.config import EmbeddingModelType
 from backend.services.rag.models.encoder import EmbeddingEncoder
 from backend.services.rag.vectorstore.ingestion.store import PgVectorStore
+from backend.services.rag.vectorstore.local_index import get_local_index
+from backend.services.rag.retrieval.semantic_cache import invalidate_semantic_cache
+from backend.services.rag.retrieval.keywords import KeywordExtractor
 
 logger = logging.getLogger(__name__)
 
@@ -138,6 +141,62 @@ class DataIngestionPipeline:
         
         return chunks
 
+    def extract_keywords(
+        self,
+        chunks: List[Dict[str, Any]],
+        use_llm: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        청크 키워드 추출 (저장 후 KeywordReranker가 검색 시 재추출 없이 사용)
+        LLM 요청은 RAG_KEYWORD_WORKERS개 스레드에서 병렬 실행, 실패 시 정규식으로 대체
+
+        Args:
+            chunks: 청크 리스트
+            use_llm: LLM 키워드 추출 여부 (False면 정규식)
+        """
+        extractor = KeywordExtractor(use_llm=use_llm, cache_size=0)
+        logger.info(f"Extracting keywords for {len(chunks)} chunks ({extractor.method})")
+
+        try:
+            keywords = extractor.extract_batch([chunk['content'] for chunk in chunks])
+        finally:
+            extractor.close()
+
+        for chunk, chunk_keywords in zip(chunks, keywords):
+            chunk['keywords'] = chunk_keywords
+
+        logger.info(f"Extracted keywords for {len(chunks)} chunks")
+        return chunks
+
+    def backfill_keywords(self, use_llm: bool = True, batch_size: int = 200) -> int:
+        """
+        키워드가 없는 기존 청크의 키워드 추출 및 저장
+
+        Args:
+            use_llm: LLM 키워드 추출 여부 (False면 정규식)
+            batch_size: 한 번에 추출/저장할 청크 수
+
+        Returns:
+            키워드를 저장한 청크 수
+        """
+        extractor = KeywordExtractor(use_llm=use_llm, cache_size=0)
+        total = 0
+        last_id = 0
+        try:
+            while True:
+                chunks = self.vector_store.fetch_chunks_without_keywords(limit=batch_size, after_id=last_id)
+                if not chunks:
+                    break
+                keywords = extractor.extract_batch([chunk['content'] for chunk in chunks])
+                total += self.vector_store.update_chunk_keywords(
+                    {chunk['id']: chunk_keywords for chunk, chunk_keywords in zip(chunks, keywords)}
+                )
+                last_id = chunks[-1]['id']
+                logger.info(f"Keyword backfill: {total} chunks ({extractor.method})")
+        finally:
+            extractor.close()
+        return total
+
     def create_embeddings(
         self,
         chunks: List[Dict[str, Any]],
@@ -145,7 +204,11 @@ class DataIngestionPipeline:
         batch_size: int = 32,
         show_progress: bool = True
     ) -> List[Dict[str, Any]]:
-        """청크들에 대한 임베딩 생성"""
+        """
+        청크들에 대한 임베딩 생성
+        임베딩은 (n, dim) float32 행렬 하나로 만들고 각 청크의 'embedding'에는 행 view를 넣음
+        (청크별 파이썬 float 리스트를 만들지 않음, 저장 단계의 바이너리 COPY가 그대로 사용)
+        """
         logger.info(f"Creating embeddings with {model_type.value}")
         
         encoder = EmbeddingEncoder(model_type, self.device)
@@ -154,7 +217,7 @@ class DataIngestionPipeline:
         texts = [chunk['content'] for chunk in chunks]
         
         # 배치별로 임베딩 생성
-        embeddings = encoder.encode_documents(
+        embeddings = encoder.encode_documents_array(
             texts=texts,
             batch_size=batch_size,
             show_progress=show_progress
@@ -195,6 +258,12 @@ class DataIngestionPipeline:
             logger.info("Creating vector index...")
             self.vector_store.create_vector_index(model_type, lists=100)
             
+            # 로컬 벡터 인덱스 동기화 (인덱스를 사용하는 경우)
+            self._sync_local_index(model_type)
+
+            # 같은 프로세스의 시맨틱 캐시 무효화 (다른 프로세스는 데이터 버전 확인으로 감지)
+            invalidate_semantic_cache()
+            
             logger.info(f"Successfully stored {inserted_count} documents with embeddings")
             return inserted_count
             
@@ -204,6 +273,19 @@ class DataIngestionPipeline:
         finally:
             self.vector_store.disconnect()
 
+    def _sync_local_index(self, model_type: EmbeddingModelType):
+        """로컬 벡터 인덱스가 있으면 새 임베딩을 반영 (증분 추가 또는 재생성)"""
+        local_index = get_local_index(model_type)
+        if not local_index.exists():
+            return
+
+        try:
+            count = local_index.sync(self.vector_store)
+            logger.info(f"Local vector index synced: {count} vectors")
+        except Exception as e:
+            # 인덱스 동기화 실패는 저장 결과에 영향을 주지 않음 (다음 동기화 시 재시도)
+            logger.warning(f"Local vector index sync failed: {e}")
+
     def _initialize_schema(self):
         """데이터베이스 스키마 초기화"""
         try:
@@ -245,9 +327,15 @@ class DataIngestionPipeline:
         chunk_size: int = 500,
         chunk_overlap: int = 50,
         batch_size: int = 32,
-        skip_chunking: bool = False
+        skip_chunking: bool = False,
+        keyword_extraction: str = "llm"
     ) -> Dict[str, Any]:
-        """전체 파이프라인 실행"""
+        """
+        전체 파이프라인 실행
+
+        Args:
+            keyword_extraction: 청크 키워드 추출 방식 ('llm', 'regex', 'none')
+        """
         logger.info("Starting full ingestion pipeline")
         
         pipeline_stats = {
@@ -257,6 +345,7 @@ class DataIngestionPipeline:
             'chunk_size': chunk_size,
             'chunk_overlap': chunk_overlap,
             'batch_size': batch_size,
+            'keyword_extraction': keyword_extraction,
             'steps': {}
         }
         
@@ -270,6 +359,12 @@ class DataIngestionPipeline:
             logger.info("Step 2: Processing documents into chunks")
             chunks = self.process_documents(documents, chunk_size, chunk_overlap, skip_chunking)
             pipeline_stats['steps']['chunks_created'] = len(chunks)
+
+            # 2.5 청크 키워드 추출 (검색 시 LLM 호출 제거)
+            if keyword_extraction != "none":
+                logger.info("Step 2.5: Extracting chunk keywords")
+                self.extract_keywords(chunks, use_llm=keyword_extraction == "llm")
+                pipeline_stats['steps']['keywords_extracted'] = len(chunks)
             
             # 3. 임베딩 생성
             logger.info("Step 3: Creating embeddings")
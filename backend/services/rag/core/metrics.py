@@ -5,7 +5,8 @@
 - 기본 검색 메트릭 (유사도, 검색 시간)
 - 정보 검색 표준 메트릭 (Precision@K, Recall@K, F1@K, MRR, NDCG)
 - 한국어 이해도 메트릭 (키워드 정확도, 도메인 특화성)
-- Latency 메트릭 (percentiles)
+- Latency 메트릭 (percentiles, 쿼리별로 측정한 경우만)
+- 처리량 메트릭 (배치 검색: 쿼리별 시간이 없으므로 latency 대신 사용)
 """
 
 import logging
@@ -56,6 +57,14 @@ class LatencyMetrics:
     p99_latency_ms: float = 0.0  # 99th percentile
 
 
+@dataclass
+class ThroughputMetrics:
+    """배치 검색 처리량 메트릭 (배치 전체 시간 기준, 쿼리별 latency 분포는 알 수 없음)"""
+    batch_time_ms: float = 0.0
+    queries_per_second: float = 0.0
+    avg_time_per_query_ms: float = 0.0
+
+
 @dataclass
 class KoreanMetrics:
     """한국어 특화 메트릭"""
@@ -85,9 +94,12 @@ class ComprehensiveMetrics:
     # 표준 메트릭
     standard_metrics: Optional[StandardMetrics] = None
 
-    # Latency 메트릭
+    # Latency 메트릭 (배치 검색이면 None)
     latency_metrics: Optional[LatencyMetrics] = None
 
+    # 처리량 메트릭 (배치 검색만)
+    throughput_metrics: Optional[ThroughputMetrics] = None
+
     # 한국어 메트릭
     korean_metrics: Optional[KoreanMetrics] = None
 
@@ -126,7 +138,8 @@ class MetricsCalculator:
     def calculate_metrics(
         self,
         search_results: Dict[str, Dict[str, Any]],
-        expected_keywords: Optional[Dict[str, List[str]]] = None
+        expected_keywords: Optional[Dict[str, List[str]]] = None,
+        batch_time_ms: Optional[float] = None
     ) -> ComprehensiveMetrics:
         """
         검색 결과로부터 종합 성능 지표를 계산합니다.
@@ -134,6 +147,8 @@ class MetricsCalculator:
         Args:
             search_results: 검색 결과 딕셔너리 {query: {results, search_time_ms, result_count}}
             expected_keywords: 쿼리별 예상 키워드 딕셔너리 {query: [keywords]}
+            batch_time_ms: 배치 검색 전체 시간 (지정 시 쿼리별 search_time_ms는 균등 분배 값이므로
+                latency percentile 대신 처리량 메트릭만 계산)
 
         Returns:
             종합 메트릭
@@ -160,8 +175,17 @@ class MetricsCalculator:
         successful_queries = len([r for r in result_counts if r > 0])
         success_rate = successful_queries / total_queries if total_queries else 0
 
-        # Latency 메트릭 계산
-        latency_metrics = self._calculate_latency_metrics(search_times)
+        # Latency 메트릭 계산 (배치 검색은 처리량만)
+        latency_metrics = None
+        throughput_metrics = None
+        if batch_time_ms is None:
+            latency_metrics = self._calculate_latency_metrics(search_times)
+        else:
+            throughput_metrics = ThroughputMetrics(
+                batch_time_ms=batch_time_ms,
+                queries_per_second=total_queries / (batch_time_ms / 1000) if batch_time_ms > 0 else 0.0,
+                avg_time_per_query_ms=batch_time_ms / total_queries if total_queries else 0.0
+            )
 
         # 표준 메트릭 계산 (예상 키워드가 있는 경우)
         standard_metrics = None
@@ -187,6 +211,7 @@ class MetricsCalculator:
             # 서브 메트릭
             standard_metrics=standard_metrics,
             latency_metrics=latency_metrics,
+            throughput_metrics=throughput_metrics,
             korean_metrics=korean_metrics
         )
 
@@ -469,6 +494,14 @@ class MetricsCalculator:
             print(f"  최소: {lm.min_latency_ms:.2f}ms")
             print(f"  최대: {lm.max_latency_ms:.2f}ms")
 
+        # 처리량 메트릭 (배치 검색)
+        if metrics.throughput_metrics:
+            tm = metrics.throughput_metrics
+            print(f"\n[처리량 메트릭 (배치 검색, 쿼리별 Latency 해당 없음)]")
+            print(f"  배치 시간: {tm.batch_time_ms:.2f}ms")
+            print(f"  초당 쿼리: {tm.queries_per_second:.2f}")
+            print(f"  쿼리당 평균: {tm.avg_time_per_query_ms:.2f}ms")
+
         # 유사도 메트릭
         print(f"\n[유사도 메트릭]")
         print(f"  평균: {metrics.avg_similarity:.4f}")
@@ -8,13 +8,14 @@
 import time
 import logging
 import os
-import numpy as np
-import psycopg2
 from typing import List, Dict, Any, Optional
 
 from dotenv import load_dotenv
 from ..models.config import EmbeddingModelType, get_model_config
-from ..models.encoder import EmbeddingEncoder
+from ..models.remote import create_encoder
+from ..vectorstore.pool import PgConnectionPool, get_pool
+from ..vectorstore.recall import apply_recall_profile, get_recall_profile
+from ..vectorstore.vector_adapter import PgVector
 
 logger = logging.getLogger(__name__)
 
@@ -48,8 +49,8 @@ class VectorRetriever:
         self.model_type = model_type
         self.db_config = db_config or get_db_config_from_env()
         
-        # EmbeddingEncoder 초기화 (임베딩 생성용)
-        self.encoder = EmbeddingEncoder(model_type=model_type)
+        # 임베딩 인코더 초기화 (RAG_EMBEDDING_WORKER 설정 시 임베딩 워커 클라이언트)
+        self.encoder = create_encoder(model_type)
         self.config = get_model_config(model_type)
         
         # 모델별 테이블 매핑
@@ -60,22 +61,11 @@ class VectorRetriever:
             EmbeddingModelType.KAKAOBANK_DEBERTA: 'embeddings_kakaobank',
         }
         
-        self._conn = None
+        # 프로세스 전역 커넥션 풀 (search_path: vector_db, public)
+        self.pool: PgConnectionPool = get_pool(self.db_config)
         
         logger.info(f"VectorRetriever initialized: {self.config.display_name}")
     
-    def _connect(self):
-        """PostgreSQL 연결"""
-        if self._conn and not self._conn.closed:
-            return self._conn
-
-        self._conn = psycopg2.connect(**self.db_config)
-        # vector_db 스키마와 public 스키마를 모두 검색 경로에 추가
-        cur = self._conn.cursor()
-        cur.execute("SET search_path TO vector_db, public;")
-        cur.close()
-        return self._conn
-    
     def _get_embedding_table(self) -> str:
         """모델 타입에 따라 테이블명 반환"""
         return self.table_mapping.get(
@@ -83,7 +73,13 @@ class VectorRetriever:
             'embeddings_e5_large'  # 기본값
         )
     
-    def search(self, query: str, top_k: int = 5, min_similarity: float = 0.0) -> List[Dict[str, Any]]:
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        min_similarity: float = 0.0,
+        recall_profile: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """
         쿼리에 대한 유사 문서를 검색합니다.
         
@@ -91,43 +87,43 @@ class VectorRetriever:
             query: 검색 쿼리 텍스트
             top_k: 반환할 최대 결과 수
             min_similarity: 최소 유사도 임계값 (0.0 ~ 1.0)
+            recall_profile: 검색 정확도 프로파일 ('fast', 'balanced', 'exact')
         
         Returns:
             검색 결과 리스트 [{'content': str, 'similarity': float, 'chunk_id': int}]
         """
         try:
             # 1. 쿼리 임베딩 생성
-            query_embedding = self.encoder.encode_query(query)
-            query_embedding = np.array(query_embedding, dtype=np.float32)
-            
-            # 2. 벡터를 PostgreSQL 형식 문자열로 변환
-            query_vec_str = "[" + ",".join(map(str, query_embedding.tolist())) + "]"
+            query_embedding = PgVector(self.encoder.encode_query_array(query))
             
-            # 3. 테이블명 가져오기
+            # 2. 테이블명 가져오기
             embedding_table = self._get_embedding_table()
             
-            # 4. PostgreSQL 연결
-            conn = self._connect()
-            cur = conn.cursor()
-            
-            # 5. SQL 쿼리 실행 (pgvector 유사도 검색)
+            # 3. SQL 쿼리 (pgvector 유사도 검색)
+            # 쿼리 벡터는 CTE로 한 번만 바인딩 (PgVector는 vector 어댑터가 변환)
+            # 스칼라 서브쿼리(InitPlan)로 참조해야 HNSW 인덱스 정렬이 유지됨
             sql = f"""
+            WITH q AS MATERIALIZED (SELECT %s AS embedding)
             SELECT 
                 dc.id AS chunk_id,
                 dc.content,
-                1 - (e.embedding <=> %s::vector) AS similarity
+                1 - (e.embedding <=> (SELECT embedding FROM q)) AS similarity
             FROM vector_db.{embedding_table} e
             JOIN vector_db.document_chunks dc ON e.chunk_id = dc.id
             WHERE e.embedding IS NOT NULL
-              AND (1 - (e.embedding <=> %s::vector)) >= %s
-            ORDER BY e.embedding <=> %s::vector
+              AND (1 - (e.embedding <=> (SELECT embedding FROM q))) >= %s
+            ORDER BY e.embedding <=> (SELECT embedding FROM q)
             LIMIT %s
             """
             
-            cur.execute(sql, (query_vec_str, query_vec_str, min_similarity, query_vec_str, top_k))
-            rows = cur.fetchall()
+            # 4. 풀에서 커넥션을 빌려 실행 (프로파일 설정은 트랜잭션 범위)
+            profile = get_recall_profile(recall_profile)
+            with self.pool.connection() as conn, conn.cursor() as cur:
+                apply_recall_profile(cur, profile, top_k, filtered=min_similarity > 0)
+                cur.execute(sql, (query_embedding, min_similarity, top_k))
+                rows = cur.fetchall()
             
-            # 6. 결과 포맷팅
+            # 5. 결과 포맷팅
             results = []
             for row in rows:
                 chunk_id, content, similarity = row
@@ -144,31 +140,96 @@ class VectorRetriever:
             logger.error(f"검색 실패: {e}", exc_info=True)
             return []
     
-    def search_multiple_queries(self, queries: List[str], top_k: int = 5) -> Dict[str, List[Dict[str, Any]]]:
-        """여러 쿼리에 대한 검색을 수행합니다."""
+    def search_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        min_similarity: float = 0.0,
+        recall_profile: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        여러 쿼리를 한 번에 검색합니다.
+        쿼리 임베딩은 한 번의 배치 forward pass로 생성하고,
+        unnest + LATERAL로 모든 쿼리의 top-k를 한 번의 SQL로 조회합니다.
         
-        results = {}
+        Args:
+            queries: 검색 쿼리 리스트
+            top_k: 쿼리별 반환할 최대 결과 수
+            min_similarity: 최소 유사도 임계값
+            recall_profile: 검색 정확도 프로파일 ('fast', 'balanced', 'exact')
         
-        for query in queries:
-            logger.info(f"쿼리 검색 중: {query}")
-            
-            start_time = time.time()
-            search_results = self.search(query, top_k)
-            search_time = (time.time() - start_time) * 1000
+        Returns:
+            {쿼리: {'results', 'search_time_ms'(배치 시간 / 쿼리 수), 'result_count'}}
+        """
+        if not queries:
+            return {}
+        
+        start_time = time.time()
+        
+        # 1. 쿼리 임베딩 배치 생성
+        # vector[] 파라미터는 행 단위 PgVector 리스트 (행렬의 행 view, 복사 없음)
+        query_vectors = [PgVector(embedding) for embedding in self.encoder.encode_queries_array(queries)]
+        encode_time = (time.time() - start_time) * 1000
+        
+        # 2. 쿼리별 top-k를 LATERAL 서브쿼리로 한 번에 조회 (쿼리 벡터는 파라미터로 HNSW 사용)
+        embedding_table = self._get_embedding_table()
+        sql = f"""
+        SELECT q.idx, r.chunk_id, r.content, r.similarity
+        FROM unnest(%s::vector[]) WITH ORDINALITY AS q(embedding, idx)
+        CROSS JOIN LATERAL (
+            SELECT 
+                dc.id AS chunk_id,
+                dc.content,
+                1 - (e.embedding <=> q.embedding) AS similarity
+            FROM vector_db.{embedding_table} e
+            JOIN vector_db.document_chunks dc ON e.chunk_id = dc.id
+            WHERE e.embedding IS NOT NULL
+              AND (1 - (e.embedding <=> q.embedding)) >= %s
+            ORDER BY e.embedding <=> q.embedding
+            LIMIT %s
+        ) r
+        ORDER BY q.idx, r.similarity DESC
+        """
+        
+        batch_results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        profile = get_recall_profile(recall_profile)
+        try:
+            with self.pool.connection() as conn, conn.cursor() as cur:
+                apply_recall_profile(cur, profile, top_k, filtered=min_similarity > 0)
+                cur.execute(sql, (query_vectors, min_similarity, top_k))
+                rows = cur.fetchall()
             
+            for idx, chunk_id, content, similarity in rows:
+                batch_results[idx - 1].append({
+                    'chunk_id': chunk_id,
+                    'content': content,
+                    'similarity': float(similarity)
+                })
+        except Exception as e:
+            logger.error(f"배치 검색 실패: {e}", exc_info=True)
+        
+        # 3. 쿼리별 결과 정리 (쿼리당 시간은 배치 시간을 균등 분배)
+        batch_time = (time.time() - start_time) * 1000
+        per_query_time = batch_time / len(queries)
+        
+        results = {}
+        for query, search_results in zip(queries, batch_results):
             results[query] = {
                 'results': search_results,
-                'search_time_ms': search_time,
+                'search_time_ms': per_query_time,
                 'result_count': len(search_results)
             }
-            
-            logger.info(f"쿼리 '{query}' 완료: {len(search_results)}개 결과, {search_time:.2f}ms")
         
+        logger.info(
+            f"배치 검색 완료: {len(queries)}개 쿼리, {batch_time:.2f}ms "
+            f"(인코딩: {encode_time:.2f}ms)"
+        )
         return results
     
+    def search_multiple_queries(self, queries: List[str], top_k: int = 5) -> Dict[str, Dict[str, Any]]:
+        """여러 쿼리에 대한 검색을 수행합니다. (search_batch 사용)"""
+        return self.search_batch(queries, top_k)
+    
     def close(self):
-        """리소스를 정리합니다."""
-        if self._conn and not self._conn.closed:
-            self._conn.close()
-            self._conn = None
-            logger.info("DB 연결 종료")
+        """리소스를 정리합니다. (커넥션은 공유 풀이 관리하므로 닫지 않음)"""
+        logger.debug(f"VectorRetriever closed: {self.config.display_name}")
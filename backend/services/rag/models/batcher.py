@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+쿼리 임베딩 마이크로 배치 디스패처
+동시에 들어온 encode_query 요청을 짧은 시간 창(max_wait) 동안 모아 모델별로 한 번의 배치 forward pass로 처리
+- 요청 스레드는 Future를 받고 결과를 기다림 (동기: encode_query, 비동기: encode_query_async)
+- 캐시 적중은 대기 없이 호출 스레드에서 바로 반환
+- 배치 크기 / 큐 대기 시간 / forward 시간 히스토그램 제공
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+LATENCY_MS_BUCKETS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class Histogram:
+    """고정 구간 히스토그램 (구간별 누적이 아닌 개별 카운트 + 합계)"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """값 기록"""
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns:
+            {'buckets': {'<=경계': 개수, ..., '+Inf': 개수}, 'count', 'sum', 'mean'}
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        labels = [f"<={bound:g}" for bound in self.buckets] + ['+Inf']
+        return {
+            'buckets': dict(zip(labels, counts)),
+            'count': count,
+            'sum': total,
+            'mean': total / count if count else 0.0
+        }
+
+
+@dataclass
+class _PendingQuery:
+    query: str
+    future: Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class EmbeddingBatcher:
+    """모델 하나의 쿼리 임베딩 마이크로 배치 디스패처 (백그라운드 스레드 1개)"""
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        encoder,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Args:
+            encoder: EmbeddingEncoder (배치는 encode_queries_array로 실행)
+            max_batch_size: 한 번에 인코딩할 최대 쿼리 수
+            max_wait_ms: 첫 요청 이후 다른 요청을 기다리는 최대 시간 (밀리초)
+        """
+        self.encoder = encoder
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        # 메트릭
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(LATENCY_MS_BUCKETS)
+        self.forward_ms = Histogram(LATENCY_MS_BUCKETS)
+        self.requests = 0
+        self.cache_hits = 0
+        self.batches = 0
+        self.failed_batches = 0
+
+    # ------------------------------------------------------------------
+    # 요청 경로
+    # ------------------------------------------------------------------
+
+    def submit(self, query: str) -> Future:
+        """
+        쿼리 인코딩 요청 (블로킹 없음)
+
+        Returns:
+            쿼리 벡터((dim,) float32 ndarray)로 완료되는 Future
+        """
+        self.requests += 1
+        cached = self.encoder.get_cached_query_array(query)
+        if cached is not None:
+            self.cache_hits += 1
+            future: Future = Future()
+            future.set_result(cached)
+            return future
+
+        self._ensure_started()
+        pending = _PendingQuery(query, Future())
+        self._queue.put(pending)
+        return pending.future
+
+    def encode_query(self, query: str, timeout: Optional[float] = None) -> np.ndarray:
+        """동기 호출용: 배치 처리 결과를 기다려 반환"""
+        return self.submit(query).result(timeout=timeout)
+
+    async def encode_query_async(self, query: str) -> np.ndarray:
+        """비동기 호출용: 이벤트 루프를 막지 않고 배치 처리 결과를 기다림"""
+        return await asyncio.wrap_future(self.submit(query))
+
+    def queue_depth(self) -> int:
+        """현재 대기 중인 요청 수"""
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, Any]:
+        """디스패처 메트릭 (배치 크기 / 큐 대기 / forward 시간 히스토그램 포함)"""
+        return {
+            'model': self.encoder.get_model_type().value,
+            'backend': getattr(self.encoder, 'backend', 'torch'),
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'queue_depth': self.queue_depth(),
+            'requests': self.requests,
+            'cache_hits': self.cache_hits,
+            'batches': self.batches,
+            'failed_batches': self.failed_batches,
+            'batch_size': self.batch_sizes.snapshot(),
+            'queue_wait_ms': self.queue_wait_ms.snapshot(),
+            'forward_ms': self.forward_ms.snapshot(),
+            'running': self._thread is not None and self._thread.is_alive()
+        }
+
+    # ------------------------------------------------------------------
+    # 백그라운드 스레드
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        """첫 요청부터 max_wait 동안 또는 max_batch_size까지 모아 배치 인코딩"""
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+
+            batch = [item]
+            deadline = item.enqueued_at + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    # 시간 창이 지나도 이미 도착한 요청은 함께 처리
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._encode_batch(batch)
+            if stop:
+                return
+
+    def _encode_batch(self, batch: List[_PendingQuery]):
+        """배치 1회 forward pass 후 각 Future 완료"""
+        start = time.perf_counter()
+        for pending in batch:
+            self.queue_wait_ms.observe((start - pending.enqueued_at) * 1000)
+        self.batch_sizes.observe(len(batch))
+        self.batches += 1
+
+        try:
+            embeddings = self.encoder.encode_queries_array(
+                [pending.query for pending in batch], raise_on_error=True
+            )
+        except Exception as e:
+            self.failed_batches += 1
+            logger.error(f"Batched query encoding failed: {e}", exc_info=True)
+            for pending in batch:
+                _resolve(pending.future, exception=e)
+            return
+        finally:
+            self.forward_ms.observe((time.perf_counter() - start) * 1000)
+
+        for pending, embedding in zip(batch, embeddings):
+            _resolve(pending.future, result=embedding)
+
+    def close(self, timeout: float = 5.0):
+        """남은 요청을 처리하고 스레드 종료"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(self._STOP)
+        self._thread.join(timeout)
+
+
+def _resolve(future: Future, result: Any = None, exception: Optional[BaseException] = None):
+    """Future 완료 (호출자가 이미 취소했으면 무시)"""
+    if future.done():
+        return
+    try:
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+    except Exception:
+        # 완료 직전에 취소된 경우
+        pass
+
+
+# ============================================================================
+# 프로세스 전역 디스패처 (모델 + 백엔드별 1개)
+# ============================================================================
+
+_batchers: Dict[Tuple[str, str], EmbeddingBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_embedding_batcher(
+    encoder,
+    max_batch_size: Optional[int] = None,
+    max_wait_ms: Optional[float] = None
+) -> EmbeddingBatcher:
+    """
+    인코더 모델별 공유 디스패처 반환 (같은 모델의 인코더는 같은 디스패처 사용)
+    환경 변수로 설정 가능:
+    - RAG_EMBED_BATCH_SIZE: 최대 배치 크기 (기본값: 32)
+    - RAG_EMBED_BATCH_WAIT_MS: 최대 대기 시간 (기본값: 5)
+    """
+    key = (encoder.get_model_type().value, getattr(encoder, 'backend', 'torch'))
+    with _batchers_lock:
+        batcher = _batchers.get(key)
+        if batcher is None:
+            if max_batch_size is None:
+                max_batch_size = int(os.getenv('RAG_EMBED_BATCH_SIZE', '32'))
+            if max_wait_ms is None:
+                max_wait_ms = float(os.getenv('RAG_EMBED_BATCH_WAIT_MS', '5'))
+            batcher = EmbeddingBatcher(encoder, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+            _batchers[key] = batcher
+            logger.info(
+                f"Embedding batcher ready: {key[0]} ({key[1]}, "
+                f"max_batch={batcher.max_batch_size}, max_wait={batcher.max_wait * 1000:g}ms)"
+            )
+        return batcher
+
+
+def get_batcher_stats() -> Dict[str, Dict[str, Any]]:
+    """모든 디스패처 메트릭 반환"""
+    with _batchers_lock:
+        batchers = dict(_batchers)
+    return {f"{model}|{backend}": batcher.stats() for (model, backend), batcher in batchers.items()}
+
+
+@atexit.register
+def _close_all_batchers():
+    """프로세스 종료 시 대기 중인 요청 처리"""
+    with _batchers_lock:
+        batchers = list(_batchers.values())
+    for batcher in batchers:
+        batcher.close()
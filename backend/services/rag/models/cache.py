@@ -0,0 +1,324 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+쿼리 임베딩 캐시
+(model_type, prefix가 붙은 쿼리 텍스트) 단위로 쿼리 벡터를 캐싱
+- 메모리: 크기 제한 LRU
+- 디스크(선택): SQLite 파일 (재시작 후에도 인기 쿼리 벡터 유지)
+  SQLite 연결은 fork를 넘어 사용할 수 없으므로 프로세스별로 (pid 변경 시) 다시 연결
+  디스크 I/O는 메모리 LRU 잠금 밖에서 수행 (메모리 히트가 SQLite를 기다리지 않도록),
+  용량 정리는 N번 저장마다, 읽기의 last_used 갱신은 모아서 다음 쓰기와 함께 커밋
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str]
+
+# 디스크 용량 정리(DELETE ... OFFSET max_persist_size) 주기 (저장 횟수)
+TRIM_INTERVAL = 256
+
+# 이 수만큼 읽기의 last_used 갱신이 쌓이면 쓰기가 없어도 커밋
+TOUCH_FLUSH_SIZE = 256
+
+
+class QueryEmbeddingCache:
+    """크기 제한 LRU 쿼리 임베딩 캐시 (선택적 SQLite 영속 계층)"""
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        persist_path: Optional[str] = None,
+        max_persist_size: int = 100_000
+    ):
+        """
+        Args:
+            max_size: 메모리에 유지할 최대 벡터 수
+            persist_path: SQLite 파일 경로 (None이면 메모리만 사용)
+            max_persist_size: 디스크에 유지할 최대 벡터 수
+        """
+        self.max_size = max_size
+        self.persist_path = persist_path
+        self.max_persist_size = max_persist_size
+
+        self._memory: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        # SQLite 연결 / 디스크 I/O 전용 잠금 (메모리 LRU 잠금과 분리)
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_pid: Optional[int] = None
+        # 디스크 히트 후 아직 기록하지 않은 last_used
+        self._touched: Dict[CacheKey, float] = {}
+        self._puts_since_trim = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if persist_path:
+            with self._db_lock:
+                self._connection()
+
+        logger.info(
+            f"QueryEmbeddingCache initialized (max_size={max_size}, "
+            f"persist_path={persist_path or 'disabled'})"
+        )
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """현재 프로세스의 SQLite 연결 (fork된 자식이면 부모의 연결을 버리고 새로 연결, _db_lock 안에서 호출)"""
+        if not self.persist_path:
+            return None
+        pid = os.getpid()
+        if self._db_pid != pid:
+            # 부모에서 열린 연결은 자식에서 사용하거나 닫지 않음 (잠금/WAL 상태를 부모와 공유하게 됨)
+            self._db = None
+            self._db_pid = pid
+            self._touched.clear()
+            self._puts_since_trim = 0
+            self._open_db(self.persist_path)
+        return self._db
+
+    def _open_db(self, path: str):
+        """SQLite 영속 계층 초기화"""
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            # 여러 워커 프로세스가 같은 파일을 공유하므로 WAL 모드 + 대기 시간 설정
+            self._db = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS query_embeddings (
+                    model_name TEXT NOT NULL,
+                    query_text TEXT NOT NULL,
+                    dimension INTEGER NOT NULL,
+                    vector BLOB NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (model_name, query_text)
+                )
+            """)
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_query_embeddings_last_used "
+                "ON query_embeddings(last_used)"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Query cache persistence disabled ({path}): {e}")
+            self._db = None
+
+    def get(self, model_name: str, text: str) -> Optional[np.ndarray]:
+        """
+        캐시 조회 (메모리 → 디스크 순)
+
+        Args:
+            model_name: 모델 이름 (EmbeddingModelType.value)
+            text: prefix가 적용된 쿼리 텍스트
+
+        Returns:
+            float32 벡터 또는 None
+        """
+        key = (model_name, text)
+
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return vector
+
+        vector = self._load_from_disk(key)
+
+        with self._lock:
+            if vector is not None:
+                self._remember(key, vector)
+                self.hits += 1
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+        return vector
+
+    def put(self, model_name: str, text: str, vector) -> None:
+        """캐시 저장 (메모리 + 디스크)"""
+        key = (model_name, text)
+        # 항상 복사 (배치 결과 행렬의 행 view를 그대로 보관하면 행렬 전체가 메모리에 남고,
+        # 호출자에게 돌려준 배열까지 읽기 전용이 됨)
+        array = np.array(vector, dtype=np.float32)
+        # 캐시된 벡터가 호출자에 의해 변경되지 않도록 읽기 전용으로 고정
+        array.setflags(write=False)
+
+        with self._lock:
+            self._remember(key, array)
+        self._save_to_disk(key, array)
+
+    def _remember(self, key: CacheKey, vector: np.ndarray):
+        """메모리 LRU에 저장 (용량 초과 시 가장 오래된 항목 제거)"""
+        if self.max_size <= 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def _load_from_disk(self, key: CacheKey) -> Optional[np.ndarray]:
+        """디스크 조회 (last_used 갱신은 모아 두었다가 다음 쓰기에서 함께 커밋)"""
+        if not self.persist_path:
+            return None
+        with self._db_lock:
+            db = self._connection()
+            if db is None:
+                return None
+            try:
+                row = db.execute(
+                    "SELECT dimension, vector FROM query_embeddings "
+                    "WHERE model_name = ? AND query_text = ?",
+                    key
+                ).fetchone()
+                if row is None:
+                    return None
+                self._touched[key] = time.time()
+                if len(self._touched) >= TOUCH_FLUSH_SIZE:
+                    self._flush_touched(db)
+                    db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Query cache disk lookup failed: {e}")
+                return None
+
+        vector = np.frombuffer(row[1], dtype=np.float32)
+        if vector.shape[0] != row[0]:
+            return None
+        return vector
+
+    def _save_to_disk(self, key: CacheKey, vector: np.ndarray):
+        if not self.persist_path:
+            return
+        with self._db_lock:
+            db = self._connection()
+            if db is None:
+                return
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO query_embeddings "
+                    "(model_name, query_text, dimension, vector, last_used) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (*key, int(vector.shape[0]), vector.tobytes(), time.time())
+                )
+                self._flush_touched(db)
+                self._puts_since_trim += 1
+                if self._puts_since_trim >= TRIM_INTERVAL:
+                    # 디스크 용량 제한: 가장 오래 사용되지 않은 항목부터 삭제 (TRIM_INTERVAL번 저장마다)
+                    self._puts_since_trim = 0
+                    db.execute(
+                        "DELETE FROM query_embeddings WHERE rowid IN ("
+                        "  SELECT rowid FROM query_embeddings ORDER BY last_used DESC "
+                        "  LIMIT -1 OFFSET ?"
+                        ")",
+                        (self.max_persist_size,)
+                    )
+                db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Query cache disk write failed: {e}")
+
+    def _flush_touched(self, db: sqlite3.Connection):
+        """모아 둔 last_used 갱신 실행 (커밋은 호출자, _db_lock 안에서 호출)"""
+        if not self._touched:
+            return
+        touched, self._touched = self._touched, {}
+        db.executemany(
+            "UPDATE query_embeddings SET last_used = ? "
+            "WHERE model_name = ? AND query_text = ?",
+            [(last_used, *key) for key, last_used in touched.items()]
+        )
+
+    def clear(self, include_disk: bool = False):
+        """캐시 비우기"""
+        with self._lock:
+            self._memory.clear()
+        if include_disk:
+            with self._db_lock:
+                db = self._connection()
+                if db is not None:
+                    self._touched.clear()
+                    db.execute("DELETE FROM query_embeddings")
+                    db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._memory),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                # 연결 실패로 비활성화된 경우만 False (fork 전 close 후에는 다음 접근 시 다시 연결)
+                'persistent': bool(self.persist_path) and not (self._db is None and self._db_pid == os.getpid())
+            }
+
+    def close(self):
+        """SQLite 연결 종료 (남은 last_used 갱신을 기록하고, 다음 디스크 조회/저장 시 다시 연결)"""
+        with self._db_lock:
+            if self._db is not None and self._db_pid == os.getpid():
+                try:
+                    self._flush_touched(self._db)
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Query cache last_used update failed: {e}")
+                self._db.close()
+            self._db = None
+            self._db_pid = None
+            self._touched.clear()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+
+# ============================================================================
+# 프로세스 전역 캐시
+# ============================================================================
+
+_query_cache: Optional[QueryEmbeddingCache] = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> Optional[QueryEmbeddingCache]:
+    """
+    프로세스 전역 쿼리 임베딩 캐시 반환
+    환경 변수로 설정 가능:
+    - RAG_QUERY_CACHE_SIZE: 메모리 캐시 크기 (기본값: 1024, 0이면 비활성화)
+    - RAG_QUERY_CACHE_PATH: SQLite 파일 경로 (미설정 시 메모리만 사용)
+    """
+    global _query_cache
+
+    if _query_cache is not None:
+        return _query_cache
+
+    with _query_cache_lock:
+        if _query_cache is None:
+            max_size = int(os.getenv('RAG_QUERY_CACHE_SIZE', '1024'))
+            if max_size <= 0:
+                return None
+            _query_cache = QueryEmbeddingCache(
+                max_size=max_size,
+                persist_path=os.getenv('RAG_QUERY_CACHE_PATH') or None
+            )
+    return _query_cache
+
+
+def close_query_cache():
+    """
+    전역 캐시의 SQLite 연결 종료 (preload 마스터에서 fork 직전 호출)
+    메모리 캐시는 유지하고, 각 워커는 처음 디스크에 접근할 때 자신의 연결을 엶
+    """
+    if _query_cache is not None:
+        _query_cache.close()
@@ -469,7 +469,7 @@ class ModelComparator:
         # 통계 계산
         stats = {}
         for model_name, data in results.items():
-            embeddings = np.array(data["embeddings"])
+            embeddings = np.asarray(data["embeddings"], dtype=np.float32)
 
             stats[model_name] = {
                 "model_name": data["model_name"],
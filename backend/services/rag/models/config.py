@@ -149,6 +149,23 @@ def get_model_config(model_type: EmbeddingModelType) -> ModelConfig:
     return MODEL_CONFIGS[model_type]
 
 
+# 모델별 pgvector 임베딩 테이블 (vector_db 스키마)
+EMBEDDING_TABLES: Dict[EmbeddingModelType, str] = {
+    EmbeddingModelType.MULTILINGUAL_E5_SMALL: 'embeddings_e5_small',
+    EmbeddingModelType.MULTILINGUAL_E5_BASE: 'embeddings_e5_base',
+    EmbeddingModelType.MULTILINGUAL_E5_LARGE: 'embeddings_e5_large',
+    EmbeddingModelType.KAKAOBANK_DEBERTA: 'embeddings_kakaobank',
+}
+
+
+def get_embedding_table(model_type: EmbeddingModelType) -> str:
+    """모델 타입으로 임베딩 테이블 이름 가져오기"""
+    table = EMBEDDING_TABLES.get(model_type)
+    if table is None:
+        raise ValueError(f"Unknown model type: {model_type}")
+    return table
+
+
 def get_all_model_names() -> list[str]:
     """모든 모델 이름 반환"""
     return [model.value for model in EmbeddingModelType]
@@ -162,6 +179,15 @@ def get_model_by_name(model_name: str) -> Optional[ModelConfig]:
     return None
 
 
+# CLI / 환경 변수에서 쓰는 모델 별칭
+MODEL_ALIASES: Dict[str, EmbeddingModelType] = {
+    'E5_SMALL': EmbeddingModelType.MULTILINGUAL_E5_SMALL,
+    'E5_BASE': EmbeddingModelType.MULTILINGUAL_E5_BASE,
+    'E5_LARGE': EmbeddingModelType.MULTILINGUAL_E5_LARGE,
+    'KAKAO': EmbeddingModelType.KAKAOBANK_DEBERTA,
+}
+
+
 def get_default_model_type() -> EmbeddingModelType:
     """
     기본 임베딩 모델 타입 반환
@@ -176,15 +202,29 @@ def get_default_model_type() -> EmbeddingModelType:
     import os
 
     model_env = os.getenv('RAG_EMBEDDING_MODEL', 'E5_LARGE').upper()
+    return MODEL_ALIASES.get(model_env, EmbeddingModelType.MULTILINGUAL_E5_LARGE)
 
-    model_mapping = {
-        'E5_SMALL': EmbeddingModelType.MULTILINGUAL_E5_SMALL,
-        'E5_BASE': EmbeddingModelType.MULTILINGUAL_E5_BASE,
-        'E5_LARGE': EmbeddingModelType.MULTILINGUAL_E5_LARGE,
-        'KAKAO': EmbeddingModelType.KAKAOBANK_DEBERTA,
-    }
 
-    return model_mapping.get(model_env, EmbeddingModelType.MULTILINGUAL_E5_LARGE)
+# 임베딩 추론 백엔드 (torch: SentenceTransformer/Transformers, onnx: ONNX Runtime + int8)
+ENCODER_BACKENDS = ('torch', 'onnx')
+
+
+def get_encoder_backend(model_type: EmbeddingModelType) -> str:
+    """
+    모델별 임베딩 추론 백엔드 반환
+    환경 변수 RAG_ENCODER_BACKEND_<별칭> (예: RAG_ENCODER_BACKEND_E5_LARGE=onnx) →
+    RAG_ENCODER_BACKEND 순으로 조회 (기본값: torch)
+    """
+    import os
+
+    alias = next((name for name, value in MODEL_ALIASES.items() if value == model_type), None)
+    backend = (
+        (os.getenv(f'RAG_ENCODER_BACKEND_{alias}') if alias else None)
+        or os.getenv('RAG_ENCODER_BACKEND', 'torch')
+    ).lower()
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown encoder backend: {backend} (available: {', '.join(ENCODER_BACKENDS)})")
+    return backend
 
 
 def print_model_comparison():
@@ -6,16 +6,21 @@
 모든 모델의 특수 처리 포함
 """
 
+import asyncio
 import logging
+from contextlib import contextmanager
+import os
+import time
 import numpy as np
 import torch
 import torch.nn.functional as F
-from typing import List, Union, Optional
+from typing import Any, Dict, List, Union, Optional, Sequence
 from sentence_transformers import SentenceTransformer
 from transformers import AutoModel, AutoTokenizer
 
-from .config import EmbeddingModelType, ModelConfig, get_model_config
+from .config import EmbeddingModelType, ModelConfig, get_model_config, get_encoder_backend
 from .loader import ModelFactory, EmbeddingModel
+from .cache import QueryEmbeddingCache, get_query_cache
 
 logger = logging.getLogger(__name__)
 
@@ -32,30 +37,93 @@ def set_deterministic_mode(seed: int = 42):
         torch.backends.cudnn.benchmark = False
 
 
+# 길이 버킷팅 시 배치당 최대 문서 수 (짧은 문서가 토큰 예산만으로 과도하게 묶이지 않도록)
+MAX_BUCKET_BATCH_SIZE = 512
+
+
+def plan_length_buckets(
+    lengths: Sequence[int],
+    token_budget: int,
+    max_batch_size: int = MAX_BUCKET_BATCH_SIZE
+) -> List[List[int]]:
+    """
+    토큰 길이 기반 배치 구성
+    길이 내림차순으로 정렬한 뒤 (문서 수 × 배치 내 최대 길이) ≤ token_budget이 되도록 순서대로 묶음
+    (가장 긴 배치가 먼저 실행되어 메모리 부족을 초기에 드러냄)
+
+    Args:
+        lengths: 문서별 토큰 수
+        token_budget: 배치당 패딩 포함 토큰 수
+        max_batch_size: 배치당 최대 문서 수
+
+    Returns:
+        배치별 원본 인덱스 리스트
+    """
+    order = sorted(range(len(lengths)), key=lambda i: (-lengths[i], i))
+    buckets: List[List[int]] = []
+    current: List[int] = []
+    longest = 0
+    for i in order:
+        if current and ((len(current) + 1) * longest > token_budget or len(current) >= max_batch_size):
+            buckets.append(current)
+            current = []
+        if not current:
+            longest = max(lengths[i], 1)
+        current.append(i)
+    if current:
+        buckets.append(current)
+    return buckets
+
+
+def padding_efficiency(lengths: Sequence[int], batches: List[List[int]]) -> float:
+    """실제 토큰 수 / 패딩 포함 토큰 수 (1.0이면 패딩 없음)"""
+    padded = sum(len(batch) * max(lengths[i] for i in batch) for batch in batches if batch)
+    return sum(lengths) / padded if padded else 1.0
+
+
 class EmbeddingEncoder:
     """임베딩 인코더 (데이터 & 쿼리 임베딩)"""
 
     def __init__(
         self,
         model_type: EmbeddingModelType = EmbeddingModelType.MULTILINGUAL_E5_SMALL,
-        device: Optional[str] = None
+        device: Optional[str] = None,
+        query_cache: Optional[QueryEmbeddingCache] = None,
+        backend: Optional[str] = None
     ):
         """
         Args:
             model_type: 사용할 모델 타입
             device: 디바이스 ('cuda', 'cpu', None)
+            query_cache: 쿼리 임베딩 캐시 (None이면 프로세스 전역 캐시 사용)
+            backend: 추론 백엔드 ('torch', 'onnx', None이면 환경 변수 RAG_ENCODER_BACKEND_<별칭> /
+                RAG_ENCODER_BACKEND). onnx는 CPU 전용이며 사용할 수 없으면 torch로 대체
         """
         self.model_type = model_type
         self.config: ModelConfig = get_model_config(model_type)
+        self.query_cache = query_cache if query_cache is not None else get_query_cache()
 
-        # 모델 래퍼 생성 (지연 로딩)
-        self.model_wrapper: EmbeddingModel = ModelFactory.create_model(
-            model_type, device, auto_load=True
-        )
+        self.onnx_runner = None
+        if (backend or get_encoder_backend(model_type)) == 'onnx' and device != 'cuda':
+            from .onnx_encoder import load_onnx_embedding_runner
+            try:
+                self.onnx_runner = load_onnx_embedding_runner(model_type)
+            except Exception as e:
+                logger.error(f"ONNX encoder load failed: {e}, using PyTorch encoder", exc_info=True)
+        self.backend = 'onnx' if self.onnx_runner is not None else 'torch'
+
+        if self.onnx_runner is not None:
+            # PyTorch 모델은 로드하지 않음
+            self.model_wrapper: Optional[EmbeddingModel] = None
+            self.device = 'cpu'
+        else:
+            # 모델 래퍼 생성 (메모리 예산 초과 시 ModelFactory가 내보낼 수 있으므로
+            # 모델/토크나이저는 참조를 보관하지 않고 래퍼에서 읽음)
+            self.model_wrapper = ModelFactory.create_model(
+                model_type, device, auto_load=True
+            )
 
-        self.device = self.model_wrapper.device
-        self.model = self.model_wrapper.model
-        self.tokenizer = self.model_wrapper.tokenizer
+            self.device = self.model_wrapper.device
         
         # 결정론적 동작 설정 (재현 가능한 임베딩)
         set_deterministic_mode(42)
@@ -66,11 +134,39 @@ class EmbeddingEncoder:
         elif hasattr(self.model, 'model') and hasattr(self.model.model, 'eval'):
             self.model.model.eval()
 
+        # 쿼리 캐시 키 (ONNX 벡터는 PyTorch 벡터와 미세하게 다르므로 분리)
+        self.cache_model_key = model_type.value if self.backend == 'torch' else f"{model_type.value}|onnx"
+
+        # 동시 요청 마이크로 배치 디스패처 (enable_batching 호출 시 사용)
+        self.batcher = None
+
         logger.info(
             f"EmbeddingEncoder initialized: {self.config.display_name} "
-            f"(dim={self.config.dimension}, device={self.device}, deterministic=True)"
+            f"(dim={self.config.dimension}, device={self.device}, backend={self.backend}, deterministic=True)"
         )
 
+    @property
+    def model(self):
+        """PyTorch 모델 (ONNX 백엔드이거나 내보내진 상태면 None)"""
+        return self.model_wrapper.model if self.model_wrapper is not None else None
+
+    @property
+    def tokenizer(self):
+        """토크나이저 (SentenceTransformer로 로드된 경우 None)"""
+        if self.onnx_runner is not None:
+            return self.onnx_runner.tokenizer
+        return self.model_wrapper.tokenizer if self.model_wrapper is not None else None
+
+    @contextmanager
+    def _model_in_use(self):
+        """인코딩하는 동안 모델이 내보내지지 않도록 잡아둠 (내보내졌으면 다시 로드)"""
+        if self.onnx_runner is not None:
+            yield
+            return
+        with ModelFactory.use(self.model_type, self.device) as wrapper:
+            self.model_wrapper = wrapper
+            yield
+
     def _prepare_text_for_model(self, text: str, is_query: bool = False) -> str:
         """
         모델별 텍스트 전처리 (prefix, instruction 등)
@@ -97,7 +193,13 @@ class EmbeddingEncoder:
         else:
             return text
 
-    def encode_query(self, query: str) -> List[float]:
+    # ------------------------------------------------------------------
+    # ndarray API: 결과는 C-contiguous float32 ((dim,) 또는 (n, dim))
+    # 벡터 원소마다 파이썬 float 객체를 만들지 않으므로 대량 수집/배치 검색은 이 API 사용
+    # (캐시 적중 벡터는 읽기 전용이므로 결과를 제자리에서 수정하지 말 것)
+    # ------------------------------------------------------------------
+
+    def encode_query_array(self, query: str) -> np.ndarray:
         """
         쿼리 인코딩 (단일)
 
@@ -105,74 +207,268 @@ class EmbeddingEncoder:
             query: 검색 쿼리
 
         Returns:
-            쿼리 벡터
+            쿼리 벡터 (dim,) float32
         """
         if not query.strip():
             logger.warning("Empty query provided")
-            return [0.0] * self.config.dimension
+            return self._zeros()
+
+        if self.batcher is not None:
+            # 동시 요청과 모아서 한 번의 forward pass로 인코딩
+            try:
+                return self.batcher.encode_query(query)
+            except Exception as e:
+                logger.error(f"Query encoding failed: {e}", exc_info=True)
+                return self._zeros()
+
+        # 캐시 조회 (키: 모델 + prefix 적용된 쿼리)
+        cache_text = self._prepare_text_for_model(query, is_query=True)
+        if self.query_cache is not None:
+            cached = self.query_cache.get(self.cache_model_key, cache_text)
+            if cached is not None:
+                return cached
 
         try:
-            # SentenceTransformer 사용
-            if isinstance(self.model, SentenceTransformer):
-                return self._encode_with_sentence_transformer(
-                    [query], is_query=True
-                )[0]
-            # Transformers 사용
-            else:
-                return self._encode_with_transformers(
-                    [query], is_query=True
-                )[0]
+            embedding = self._encode([query], is_query=True)[0]
+
+            # 성공한 인코딩만 캐싱 (실패 시의 영벡터는 저장하지 않음)
+            if self.query_cache is not None:
+                self.query_cache.put(self.cache_model_key, cache_text, embedding)
+            return embedding
 
         except Exception as e:
             logger.error(f"Query encoding failed: {e}", exc_info=True)
-            return [0.0] * self.config.dimension
+            return self._zeros()
 
-    def encode_documents(
+    async def encode_query_array_async(self, query: str) -> np.ndarray:
+        """
+        쿼리 인코딩 (비동기, 이벤트 루프를 막지 않음)
+        배치 디스패처가 있으면 디스패처 Future를, 없으면 스레드 풀 실행 결과를 기다림
+        """
+        if self.batcher is not None and query.strip():
+            try:
+                return await self.batcher.encode_query_async(query)
+            except Exception as e:
+                logger.error(f"Query encoding failed: {e}", exc_info=True)
+                return self._zeros()
+        return await asyncio.to_thread(self.encode_query_array, query)
+
+    def get_cached_query_array(self, query: str) -> Optional[np.ndarray]:
+        """캐시된 쿼리 벡터 (없으면 None, 인코딩하지 않음)"""
+        if self.query_cache is None:
+            return None
+        return self.query_cache.get(self.cache_model_key, self._prepare_text_for_model(query, is_query=True))
+
+    def enable_batching(self, max_batch_size: Optional[int] = None, max_wait_ms: Optional[float] = None):
+        """
+        동시 encode_query 호출을 모델별 공유 디스패처로 모아 배치 인코딩
+
+        Args:
+            max_batch_size: 최대 배치 크기 (None이면 환경 변수 RAG_EMBED_BATCH_SIZE, 기본값: 32)
+            max_wait_ms: 최대 대기 시간 (None이면 환경 변수 RAG_EMBED_BATCH_WAIT_MS, 기본값: 5)
+        """
+        from .batcher import get_embedding_batcher
+        self.batcher = get_embedding_batcher(self, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+
+    def encode_queries_array(self, queries: List[str], raise_on_error: bool = False) -> np.ndarray:
+        """
+        쿼리 인코딩 (배치, 캐시 미스만 한 번의 forward pass로 인코딩)
+
+        Args:
+            queries: 검색 쿼리 리스트
+            raise_on_error: True면 인코딩 실패 시 영벡터 대신 예외 전파 (배치 디스패처용)
+
+        Returns:
+            쿼리 벡터 행렬 (len(queries), dim) float32 (입력 순서 유지, 빈 쿼리/실패는 영벡터)
+        """
+        embeddings = np.zeros((len(queries), self.config.dimension), dtype=np.float32)
+        pending: Dict[str, List[int]] = {}
+
+        for i, query in enumerate(queries):
+            if not query.strip():
+                continue
+            cache_text = self._prepare_text_for_model(query, is_query=True)
+            if self.query_cache is not None:
+                cached = self.query_cache.get(self.cache_model_key, cache_text)
+                if cached is not None:
+                    embeddings[i] = cached
+                    continue
+            # 같은 쿼리가 여러 번 있으면 한 번만 인코딩
+            pending.setdefault(query, []).append(i)
+
+        if pending:
+            unique_queries = list(pending)
+            try:
+                encoded = self._encode(unique_queries, is_query=True, batch_size=self.config.batch_size)
+            except Exception as e:
+                if raise_on_error:
+                    raise
+                logger.error(f"Batch query encoding failed: {e}", exc_info=True)
+                return embeddings
+
+            for j, query in enumerate(unique_queries):
+                embeddings[pending[query]] = encoded[j]
+                if self.query_cache is not None:
+                    self.query_cache.put(
+                        self.cache_model_key,
+                        self._prepare_text_for_model(query, is_query=True),
+                        encoded[j]
+                    )
+
+        return embeddings
+
+    def encode_documents_array(
         self,
         texts: List[str],
         batch_size: Optional[int] = None,
-        show_progress: bool = False
-    ) -> List[List[float]]:
+        show_progress: bool = False,
+        length_bucketing: bool = True,
+        token_budget: Optional[int] = None
+    ) -> np.ndarray:
         """
         문서 인코딩 (배치)
+        기본적으로 토큰 길이순으로 정렬한 뒤 배치당 (배치 크기 × 최대 길이)가 토큰 예산을 넘지 않도록
+        묶어 패딩을 줄이고, 결과는 입력 순서로 되돌림
 
         Args:
             texts: 문서 텍스트 리스트
-            batch_size: 배치 크기 (None이면 config 사용)
+            batch_size: 배치 크기 (None이면 config 사용, 길이 버킷팅 시 토큰 예산 기본값 계산에 사용)
             show_progress: 진행률 표시 여부
+            length_bucketing: 토큰 길이 버킷팅 사용 여부 (False면 입력 순서대로 고정 크기 배치)
+            token_budget: 배치당 패딩 포함 토큰 수 (None이면 환경 변수 RAG_ENCODE_TOKEN_BUDGET,
+                미설정 시 batch_size × 256)
 
         Returns:
-            벡터 리스트
+            벡터 행렬 (len(texts), dim) float32 (입력 순서)
         """
         if not texts:
             logger.warning("Empty text list provided")
-            return []
+            return np.zeros((0, self.config.dimension), dtype=np.float32)
 
         # Batch size 설정
         if batch_size is None:
             batch_size = self.config.batch_size
 
         try:
+            if not length_bucketing or len(texts) == 1:
+                return self._encode(texts, is_query=False, batch_size=batch_size, show_progress=show_progress)
+
+            with self._model_in_use():
+                lengths = self.token_lengths(texts, is_query=False)
+                buckets = plan_length_buckets(lengths, self._token_budget(batch_size, token_budget))
+                # 결과 행렬을 한 번 할당하고 버킷 결과를 원래 위치에 채움
+                embeddings = np.empty((len(texts), self.config.dimension), dtype=np.float32)
+                processed = 0
+                for bucket in buckets:
+                    embeddings[bucket] = self._encode(
+                        [texts[i] for i in bucket], is_query=False, batch_size=len(bucket)
+                    )
+                    processed += len(bucket)
+                    if show_progress:
+                        print(f"Processed {processed}/{len(texts)}")
+            return embeddings
+
+        except Exception as e:
+            logger.error(f"Document encoding failed: {e}", exc_info=True)
+            return np.zeros((len(texts), self.config.dimension), dtype=np.float32)
+
+    # ------------------------------------------------------------------
+    # 리스트 API (호환용): 위 ndarray API 결과를 파이썬 리스트로 변환
+    # ------------------------------------------------------------------
+
+    def encode_query(self, query: str) -> List[float]:
+        """쿼리 인코딩 (단일, 리스트 반환, encode_query_array 참고)"""
+        return self.encode_query_array(query).tolist()
+
+    async def encode_query_async(self, query: str) -> List[float]:
+        """쿼리 인코딩 (비동기, 리스트 반환, encode_query_array_async 참고)"""
+        return (await self.encode_query_array_async(query)).tolist()
+
+    def get_cached_query(self, query: str) -> Optional[List[float]]:
+        """캐시된 쿼리 벡터 (리스트, 없으면 None)"""
+        cached = self.get_cached_query_array(query)
+        return cached.tolist() if cached is not None else None
+
+    def encode_queries(self, queries: List[str]) -> List[List[float]]:
+        """쿼리 인코딩 (배치, 리스트 반환, encode_queries_array 참고)"""
+        return self.encode_queries_array(queries).tolist()
+
+    def encode_documents(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None,
+        show_progress: bool = False,
+        length_bucketing: bool = True,
+        token_budget: Optional[int] = None
+    ) -> List[List[float]]:
+        """문서 인코딩 (배치, 리스트 반환, encode_documents_array 참고)"""
+        return self.encode_documents_array(
+            texts,
+            batch_size=batch_size,
+            show_progress=show_progress,
+            length_bucketing=length_bucketing,
+            token_budget=token_budget
+        ).tolist()
+
+    def token_lengths(self, texts: List[str], is_query: bool = False) -> List[int]:
+        """전처리(prefix) 후 토큰 수 (special token 포함, max_seq_length로 절단)"""
+        processed_texts = [self._prepare_text_for_model(text, is_query) for text in texts]
+        tokenizer = self.tokenizer if self.tokenizer is not None else getattr(self.model, 'tokenizer', None)
+        if tokenizer is None:
+            # 토크나이저가 없으면 글자 수로 근사
+            return [min(len(text), self.config.max_seq_length) for text in processed_texts]
+        encoded = tokenizer(
+            processed_texts,
+            add_special_tokens=True,
+            truncation=True,
+            max_length=self.config.max_seq_length
+        )
+        return [len(ids) for ids in encoded['input_ids']]
+
+    def _token_budget(self, batch_size: int, token_budget: Optional[int] = None) -> int:
+        if token_budget is None:
+            token_budget = int(os.getenv('RAG_ENCODE_TOKEN_BUDGET', '0')) or batch_size * 256
+        return max(token_budget, self.config.max_seq_length)
+
+    def _encode(
+        self,
+        texts: List[str],
+        is_query: bool = False,
+        batch_size: Optional[int] = None,
+        show_progress: bool = False
+    ) -> np.ndarray:
+        """백엔드별 인코딩 (ONNX → SentenceTransformer → Transformers), 결과는 (n, dim) float32"""
+        if self.onnx_runner is not None:
+            return self._encode_with_onnx(texts, is_query=is_query, batch_size=batch_size)
+        with self._model_in_use():
             # SentenceTransformer 사용
             if isinstance(self.model, SentenceTransformer):
                 return self._encode_with_sentence_transformer(
-                    texts, 
-                    is_query=False,
-                    batch_size=batch_size,
-                    show_progress=show_progress
-                )
-            # Transformers 사용
-            else:
-                return self._encode_with_transformers(
                     texts,
-                    is_query=False,
+                    is_query=is_query,
                     batch_size=batch_size,
                     show_progress=show_progress
                 )
-
-        except Exception as e:
-            logger.error(f"Document encoding failed: {e}", exc_info=True)
-            return [[0.0] * self.config.dimension] * len(texts)
+            # Transformers 사용
+            return self._encode_with_transformers(
+                texts,
+                is_query=is_query,
+                batch_size=batch_size or 32,
+                show_progress=show_progress
+            )
+
+    def _encode_with_onnx(
+        self,
+        texts: List[str],
+        is_query: bool = False,
+        batch_size: Optional[int] = None
+    ) -> np.ndarray:
+        """ONNX Runtime으로 인코딩 (풀링/정규화는 numpy)"""
+        processed_texts = [
+            self._prepare_text_for_model(text, is_query)
+            for text in texts
+        ]
+        return self._as_matrix(self.onnx_runner.encode(processed_texts, batch_size or self.config.batch_size))
 
     def _encode_with_sentence_transformer(
         self,
@@ -180,7 +476,7 @@ class EmbeddingEncoder:
         is_query: bool = False,
         batch_size: Optional[int] = None,
         show_progress: bool = False
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
         """
         SentenceTransformer로 인코딩
 
@@ -191,11 +487,8 @@ class EmbeddingEncoder:
             show_progress: 진행률 표시
 
         Returns:
-            벡터 리스트
+            벡터 행렬 (n, dim) float32
         """
-        # 결정론적 동작 보장
-        set_deterministic_mode(42)
-        
         if batch_size is None:
             batch_size = self.config.batch_size
 
@@ -207,6 +500,7 @@ class EmbeddingEncoder:
 
         # 모델별 특수 처리
         encode_kwargs = {
+            "convert_to_numpy": True,
             "convert_to_tensor": False,
             "normalize_embeddings": self.config.normalize_embeddings,
             "batch_size": batch_size,
@@ -214,11 +508,7 @@ class EmbeddingEncoder:
         }
 
         embeddings = self.model.encode(processed_texts, **encode_kwargs)
-
-        # numpy array를 list로 변환
-        if isinstance(embeddings, np.ndarray):
-            return embeddings.tolist()
-        return embeddings
+        return self._as_matrix(embeddings)
 
     def _encode_with_transformers(
         self,
@@ -226,7 +516,7 @@ class EmbeddingEncoder:
         is_query: bool = False,
         batch_size: int = 32,
         show_progress: bool = False
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
         """
         HuggingFace Transformers로 인코딩 수행
 
@@ -237,7 +527,7 @@ class EmbeddingEncoder:
             show_progress: 진행률 표시 여부
 
         Returns:
-            벡터 리스트
+            벡터 행렬 (n, dim) float32
         """
         # 텍스트 전처리
         processed_texts = [
@@ -247,9 +537,11 @@ class EmbeddingEncoder:
 
         all_embeddings = []
 
-        # 결정론적 동작 보장
-        set_deterministic_mode(42)
-        
+        # Model dtype 설정 (배치마다가 아니라 호출당 1회, 시드는 __init__에서 1회 설정)
+        dtype = self._get_model_dtype()
+        if dtype and self.device == "cuda":
+            self.model_wrapper.model = self.model.to(dtype)
+
         with torch.no_grad():
             for i in range(0, len(processed_texts), batch_size):
                 batch_texts = processed_texts[i:i + batch_size]
@@ -265,11 +557,6 @@ class EmbeddingEncoder:
                 # Tokenize
                 inputs = self.tokenizer(batch_texts, **tokenize_kwargs).to(self.device)
 
-                # Model dtype 설정
-                dtype = self._get_model_dtype()
-                if dtype and self.device == "cuda":
-                    self.model = self.model.to(dtype)
-
                 # Forward pass
                 outputs = self.model(**inputs)
 
@@ -289,8 +576,18 @@ class EmbeddingEncoder:
                     print(f"Processed {min(i + batch_size, len(processed_texts))}/{len(processed_texts)}")
 
         # Concatenate all batches
-        all_embeddings = np.vstack(all_embeddings)
-        return all_embeddings.tolist()
+        return self._as_matrix(np.vstack(all_embeddings))
+
+    def _as_matrix(self, embeddings) -> np.ndarray:
+        """백엔드 출력을 (n, dim) C-contiguous float32 행렬로 정리 (이미 그 형태면 복사 없음)"""
+        matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(-1, self.config.dimension)
+        return matrix
+
+    def _zeros(self) -> np.ndarray:
+        """인코딩 실패/빈 쿼리용 영벡터"""
+        return np.zeros(self.config.dimension, dtype=np.float32)
 
     def _pool_embeddings(
         self,
@@ -369,6 +666,12 @@ class EmbeddingEncoder:
         """모델 타입 반환"""
         return self.model_type
 
+    def get_cache_stats(self) -> dict:
+        """쿼리 임베딩 캐시 통계 반환"""
+        if self.query_cache is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.query_cache.stats()}
+
 
 
 # ============================================================================
@@ -419,12 +722,12 @@ class MultiModelEncoder:
         texts: List[str],
         show_progress: bool = False
     ) -> dict:
-        """모든 모델로 문서 인코딩"""
+        """모든 모델로 문서 인코딩 (모델별 'embeddings'는 (n, dim) float32 행렬)"""
         results = {}
         for model_type, encoder in self.encoders.items():
             try:
                 logger.info(f"Encoding with {encoder.get_display_name()}...")
-                embeddings = encoder.encode_documents(texts, show_progress=show_progress)
+                embeddings = encoder.encode_documents_array(texts, show_progress=show_progress)
                 results[model_type.value] = {
                     "embeddings": embeddings,
                     "dimension": encoder.get_dimension(),
@@ -441,6 +744,63 @@ class MultiModelEncoder:
         return [encoder.get_display_name() for encoder in self.encoders.values()]
 
 
+# ============================================================================
+# 문서 배치 처리량 벤치마크
+# ============================================================================
+
+def benchmark_document_batching(
+    encoder: EmbeddingEncoder,
+    texts: List[str],
+    batch_size: Optional[int] = None,
+    token_budget: Optional[int] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    고정 크기 배치(입력 순서) vs 길이 버킷팅 배치 처리량 비교
+
+    Args:
+        encoder: 인코더
+        texts: 문서 텍스트 (수집 코퍼스 샘플)
+        batch_size: 고정 배치 크기 (None이면 config)
+        token_budget: 길이 버킷팅 토큰 예산 (None이면 기본값)
+
+    Returns:
+        {'fixed': {...}, 'bucketed': {...}}, 각 항목은
+        {'seconds', 'docs_per_second', 'batches', 'padding_efficiency'}
+        (bucketed에는 고정 배치 결과와의 최대 절대 오차 'max_abs_diff' 추가)
+    """
+    batch_size = batch_size or encoder.config.batch_size
+    lengths = encoder.token_lengths(texts)
+    fixed_batches = [list(range(i, min(i + batch_size, len(texts)))) for i in range(0, len(texts), batch_size)]
+    if isinstance(encoder.model, SentenceTransformer):
+        # SentenceTransformer는 호출 내부에서 글자 길이순으로 정렬한 뒤 고정 크기로 자름
+        order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+        fixed_batches = [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+    bucketed_batches = plan_length_buckets(lengths, encoder._token_budget(batch_size, token_budget))
+
+    encoder.encode_documents_array(texts[:batch_size], batch_size=batch_size)  # 워밍업
+
+    report: Dict[str, Dict[str, Any]] = {}
+    outputs = {}
+    for name, bucketing, batches in (
+        ('fixed', False, fixed_batches),
+        ('bucketed', True, bucketed_batches)
+    ):
+        start = time.perf_counter()
+        outputs[name] = encoder.encode_documents_array(
+            texts, batch_size=batch_size, length_bucketing=bucketing, token_budget=token_budget
+        )
+        seconds = time.perf_counter() - start
+        report[name] = {
+            'seconds': seconds,
+            'docs_per_second': len(texts) / seconds if seconds > 0 else 0.0,
+            'batches': len(batches),
+            'padding_efficiency': padding_efficiency(lengths, batches),
+        }
+    # 패딩 차이로 인한 수치 차이 (결과 순서 복원 확인 포함)
+    report['bucketed']['max_abs_diff'] = float(np.abs(outputs['fixed'] - outputs['bucketed']).max())
+    return report
+
+
 if __name__ == "__main__":
     # 테스트는 comparator에서 수행
     print("EmbeddingEncoder 모듈 - 테스트는 comparator에서 수행하세요")
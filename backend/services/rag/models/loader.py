@@ -7,13 +7,18 @@
 
 import logging
 import os
-from typing import Optional, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Callable, Iterator, Set, Union
 import torch
 from sentence_transformers import SentenceTransformer
 from transformers import AutoModel, AutoTokenizer
 from dotenv import load_dotenv
 
-from .config import EmbeddingModelType, ModelConfig, get_model_config
+from .batcher import Histogram, LATENCY_MS_BUCKETS
+from .config import EmbeddingModelType, ModelConfig, MODEL_ALIASES, get_model_config
 
 # .env 파일 로드
 load_dotenv()
@@ -163,9 +168,30 @@ class EmbeddingModel:
 
 
 class ModelFactory:
-    """임베딩 모델 팩토리"""
+    """
+    임베딩 모델 팩토리 (프로세스 전역 레지스트리)
+    - 모델별 상주 메모리(파라미터 + 버퍼) 추적, 메모리 예산(RAG_MODEL_MEMORY_BUDGET_MB) 초과 시
+      가장 오래 사용하지 않은 모델부터 unload
+    - 고정(pin)된 모델과 사용 중인 모델은 내보내지 않음 (RAG_PINNED_MODELS 또는 pin())
+    - 임베딩 모델이 아닌 모델(요약 모델 등)도 register_external로 같은 예산에 포함
+    - 로드/내보내기 횟수, 로드 시간, 사용 시간 메트릭 (stats())
+    """
 
     _instances: Dict[EmbeddingModelType, EmbeddingModel] = {}
+    _external: Dict[str, Callable[[], None]] = {}
+    _lru: "OrderedDict[str, None]" = OrderedDict()
+    _memory: Dict[str, int] = {}
+    _known_sizes: Dict[str, int] = {}
+    _in_use: Dict[str, int] = {}
+    _pinned: Set[str] = set()
+    _pinned_from_env = False
+    _load_locks: Dict[str, threading.Lock] = {}
+    _lock = threading.RLock()
+
+    # 메트릭
+    _counters: Dict[str, Dict[str, int]] = {}
+    _load_seconds: Dict[str, Histogram] = {}
+    _use_ms: Dict[str, Histogram] = {}
 
     @classmethod
     def create_model(
@@ -175,7 +201,7 @@ class ModelFactory:
         auto_load: bool = True
     ) -> EmbeddingModel:
         """
-        모델 생성 (싱글톤 패턴)
+        모델 생성 (싱글톤 패턴, 내보내진 모델은 다시 로드)
 
         Args:
             model_type: 모델 타입
@@ -185,31 +211,112 @@ class ModelFactory:
         Returns:
             EmbeddingModel 인스턴스
         """
-        # 기존 인스턴스가 있으면 재사용
-        if model_type in cls._instances:
-            logger.info(f"Reusing existing instance: {model_type.value}")
-            return cls._instances[model_type]
-
-        # 새 인스턴스 생성
-        model = EmbeddingModel(model_type, device)
+        with cls._lock:
+            model = cls._instances.get(model_type)
+            if model is not None and (model.is_loaded() or not auto_load):
+                # 기존 인스턴스가 있으면 재사용
+                logger.debug(f"Reusing existing instance: {model_type.value}")
+                cls._count(model_type.value, 'hits')
+                cls._touch(model_type.value)
+                return model
+            if model is None:
+                # 새 인스턴스 생성
+                model = EmbeddingModel(model_type, device)
+                cls._instances[model_type] = model
 
         if auto_load:
-            model.load()
-
-        cls._instances[model_type] = model
+            cls._load(model_type, model)
         return model
 
+    @classmethod
+    @contextmanager
+    def use(cls, model_type: EmbeddingModelType, device: Optional[str] = None) -> Iterator[EmbeddingModel]:
+        """
+        사용하는 동안 내보내지지 않도록 모델을 잡아두는 컨텍스트 (내보내졌으면 다시 로드)
+
+        Example:
+            with ModelFactory.use(model_type) as wrapper:
+                wrapper.model.encode(...)
+        """
+        key = model_type.value
+        with cls._lock:
+            cls._in_use[key] = cls._in_use.get(key, 0) + 1
+        start = time.perf_counter()
+        try:
+            yield cls.create_model(model_type, device, auto_load=True)
+        finally:
+            with cls._lock:
+                cls._in_use[key] -= 1
+                cls._touch(key)
+                cls._histogram(cls._use_ms, key, _USE_MS_BUCKETS).observe((time.perf_counter() - start) * 1000)
+
     @classmethod
     def get_model(cls, model_type: EmbeddingModelType) -> Optional[EmbeddingModel]:
         """기존 모델 인스턴스 반환"""
         return cls._instances.get(model_type)
 
+    @classmethod
+    def pin(cls, model_type: Union[EmbeddingModelType, str]):
+        """메모리 예산 초과 시에도 내보내지 않을 모델 지정 (예: 운영 임베딩 모델)"""
+        with cls._lock:
+            cls._pinned.add(_key(model_type))
+        logger.info(f"Pinned model: {_key(model_type)}")
+
+    @classmethod
+    def unpin(cls, model_type: Union[EmbeddingModelType, str]):
+        """모델 고정 해제"""
+        with cls._lock:
+            cls._pinned.discard(_key(model_type))
+
+    @classmethod
+    def register_external(cls, name: str, module, unload: Callable[[], None]):
+        """
+        임베딩 모델이 아닌 모델(요약 모델 등)을 메모리 예산에 포함
+
+        Args:
+            name: 모델 이름 (예: 'google/mt5-base')
+            module: 메모리 측정할 torch 모듈
+            unload: 내보낼 때 호출할 함수 (모델 참조 해제)
+        """
+        memory_bytes = module_memory_bytes(module)
+        with cls._lock:
+            cls._external[name] = unload
+            cls._memory[name] = memory_bytes
+            cls._known_sizes[name] = memory_bytes
+            cls._count(name, 'loads')
+            cls._touch(name)
+        logger.info(f"Registered external model: {name} ({memory_bytes / 2**20:.0f} MB)")
+        cls._make_room(0, exclude=name)
+
+    @classmethod
+    def touch(cls, name: Union[EmbeddingModelType, str]):
+        """사용 기록 갱신 (외부 모델용, 임베딩 모델은 use()/create_model이 갱신)"""
+        with cls._lock:
+            cls._touch(_key(name))
+
+    @classmethod
+    def memory_budget_bytes(cls) -> int:
+        """메모리 예산 (환경 변수 RAG_MODEL_MEMORY_BUDGET_MB, 0이면 무제한)"""
+        return int(float(os.getenv('RAG_MODEL_MEMORY_BUDGET_MB', '0')) * 2**20)
+
+    @classmethod
+    def resident_bytes(cls) -> int:
+        """현재 로드된 모델의 메모리 합계"""
+        with cls._lock:
+            return sum(cls._memory.values())
+
     @classmethod
     def unload_all(cls):
         """모든 모델 언로드"""
-        for model in cls._instances.values():
-            model.unload()
-        cls._instances.clear()
+        with cls._lock:
+            for model in cls._instances.values():
+                model.unload()
+            for unload in cls._external.values():
+                unload()
+            cls._instances.clear()
+            cls._external.clear()
+            cls._memory.clear()
+            cls._lru.clear()
         logger.info("All models unloaded")
 
     @classmethod
@@ -221,6 +328,152 @@ class ModelFactory:
             if model.is_loaded()
         ]
 
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """레지스트리 메트릭 (예산, 상주 메모리, 모델별 로드/내보내기/로드 시간/사용 시간)"""
+        with cls._lock:
+            cls._load_pinned_from_env()
+            names = list(dict.fromkeys([*cls._counters, *cls._memory]))
+            return {
+                'budget_bytes': cls.memory_budget_bytes(),
+                'resident_bytes': sum(cls._memory.values()),
+                'lru': list(cls._lru),
+                'models': {
+                    name: {
+                        'loaded': name in cls._memory,
+                        'memory_bytes': cls._memory.get(name, cls._known_sizes.get(name, 0)),
+                        'pinned': name in cls._pinned,
+                        'in_use': cls._in_use.get(name, 0),
+                        **cls._counters.get(name, {}),
+                        'load_seconds': cls._histogram(cls._load_seconds, name, _LOAD_SECONDS_BUCKETS).snapshot(),
+                        'use_ms': cls._histogram(cls._use_ms, name, _USE_MS_BUCKETS).snapshot(),
+                    }
+                    for name in names
+                }
+            }
+
+    # ------------------------------------------------------------------
+    # 내부
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _load(cls, model_type: EmbeddingModelType, model: EmbeddingModel):
+        """예산 확보 후 로드 (같은 모델 동시 로드는 1회만)"""
+        key = model_type.value
+        with cls._lock:
+            load_lock = cls._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            if model.is_loaded():
+                return
+            # 이전에 로드한 적이 있으면 그 크기만큼 미리 비움 (피크 메모리 억제)
+            cls._make_room(cls._known_sizes.get(key, 0), exclude=key)
+
+            start = time.perf_counter()
+            model.load()
+            elapsed = time.perf_counter() - start
+            memory_bytes = module_memory_bytes(model.model)
+
+            with cls._lock:
+                cls._memory[key] = memory_bytes
+                cls._known_sizes[key] = memory_bytes
+                cls._count(key, 'loads')
+                cls._histogram(cls._load_seconds, key, _LOAD_SECONDS_BUCKETS).observe(elapsed)
+                cls._touch(key)
+            logger.info(
+                f"Model loaded: {model.get_display_name()} ({memory_bytes / 2**20:.0f} MB, {elapsed:.1f}s, "
+                f"resident {cls.resident_bytes() / 2**20:.0f} MB)"
+            )
+            cls._make_room(0, exclude=key)
+
+    @classmethod
+    def _make_room(cls, incoming_bytes: int, exclude: Optional[str] = None):
+        """예산을 넘으면 사용 중이 아니고 고정되지 않은 모델을 LRU 순으로 내보냄"""
+        budget = cls.memory_budget_bytes()
+        if budget <= 0:
+            return
+        with cls._lock:
+            cls._load_pinned_from_env()
+            while sum(cls._memory.values()) + incoming_bytes > budget:
+                victim = next(
+                    (
+                        name for name in cls._lru
+                        if name != exclude and name in cls._memory
+                        and name not in cls._pinned and cls._in_use.get(name, 0) == 0
+                    ),
+                    None
+                )
+                if victim is None:
+                    logger.warning(
+                        f"Model memory over budget ({(sum(cls._memory.values()) + incoming_bytes) / 2**20:.0f} MB "
+                        f"> {budget / 2**20:.0f} MB) but every loaded model is pinned or in use"
+                    )
+                    return
+                cls._evict(victim)
+
+    @classmethod
+    def _evict(cls, name: str):
+        """모델 내보내기 (락 보유 상태에서 호출)"""
+        memory_bytes = cls._memory.pop(name, 0)
+        cls._lru.pop(name, None)
+        model = next((m for t, m in cls._instances.items() if t.value == name), None)
+        if model is not None:
+            model.unload()
+        else:
+            unload = cls._external.pop(name, None)
+            if unload is not None:
+                unload()
+        cls._count(name, 'evictions')
+        logger.info(f"Evicted model: {name} ({memory_bytes / 2**20:.0f} MB, LRU)")
+
+    @classmethod
+    def _touch(cls, name: str):
+        cls._lru[name] = None
+        cls._lru.move_to_end(name)
+
+    @classmethod
+    def _count(cls, name: str, counter: str):
+        counters = cls._counters.setdefault(name, {'loads': 0, 'evictions': 0, 'hits': 0})
+        counters[counter] += 1
+
+    @staticmethod
+    def _histogram(histograms: Dict[str, Histogram], name: str, buckets) -> Histogram:
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = Histogram(buckets)
+        return histogram
+
+    @classmethod
+    def _load_pinned_from_env(cls):
+        """환경 변수 RAG_PINNED_MODELS (쉼표 구분 별칭, 예: E5_LARGE,E5_SMALL) 1회 반영"""
+        if cls._pinned_from_env:
+            return
+        cls._pinned_from_env = True
+        for alias in filter(None, (a.strip().upper() for a in os.getenv('RAG_PINNED_MODELS', '').split(','))):
+            model_type = MODEL_ALIASES.get(alias)
+            if model_type is None:
+                logger.warning(f"Unknown model alias in RAG_PINNED_MODELS: {alias}")
+                continue
+            cls._pinned.add(model_type.value)
+
+
+_LOAD_SECONDS_BUCKETS = (0.5, 1, 2, 5, 10, 30, 60, 120)
+_USE_MS_BUCKETS = LATENCY_MS_BUCKETS
+
+
+def _key(model: Union[EmbeddingModelType, str]) -> str:
+    return model.value if isinstance(model, EmbeddingModelType) else model
+
+
+def module_memory_bytes(module) -> int:
+    """torch 모듈의 파라미터 + 버퍼 메모리 (바이트, 측정할 수 없으면 0)"""
+    if module is None or not hasattr(module, 'parameters'):
+        return 0
+    total = sum(p.numel() * p.element_size() for p in module.parameters())
+    if hasattr(module, 'buffers'):
+        total += sum(b.numel() * b.element_size() for b in module.buffers())
+    return total
+
 
 # ============================================================================
 #  유틸리티 함수
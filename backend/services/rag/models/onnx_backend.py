@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+ONNX Runtime CPU 추론 백엔드
+HuggingFace PyTorch 모델을 ONNX로 내보내고 동적 int8 양자화한 뒤 onnxruntime 세션으로 실행
+- 내보낸 파일은 HF 캐시 옆(RAG_ONNX_CACHE_DIR, 기본값: $HF_HOME/onnx)에 모델별로 보관
+- onnxruntime은 선택 의존성 (pip install onnxruntime), 없으면 호출자가 PyTorch 경로 사용
+- 수치 검증 결과(PyTorch 대비 코사인 유사도)는 ONNX 파일 옆 JSON에 보관해 재검증 생략
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_UNSAFE_PATH = re.compile(r'[^A-Za-z0-9._-]+')
+_export_lock = threading.Lock()
+
+
+def is_onnxruntime_available() -> bool:
+    """onnxruntime 설치 여부"""
+    try:
+        import onnxruntime  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_onnx_cache_dir() -> Path:
+    """ONNX 내보내기 디렉토리 (환경 변수 RAG_ONNX_CACHE_DIR로 변경 가능)"""
+    if os.getenv('RAG_ONNX_CACHE_DIR'):
+        return Path(os.environ['RAG_ONNX_CACHE_DIR'])
+    hf_home = os.getenv('HF_HOME') or os.path.join(os.path.expanduser('~'), '.cache', 'huggingface')
+    return Path(hf_home) / 'onnx'
+
+
+def onnx_model_path(model_name: str, task: str, quantize: bool = True) -> Path:
+    """모델별 ONNX 파일 경로 (예: .../onnx/intfloat--multilingual-e5-small/feature.int8.onnx)"""
+    directory = get_onnx_cache_dir() / _UNSAFE_PATH.sub('-', model_name.replace('/', '--'))
+    return directory / f"{task}{'.int8' if quantize else ''}.onnx"
+
+
+def export_onnx(
+    model,
+    tokenizer,
+    output_path: Path,
+    output_axes: Dict[str, Dict[int, str]],
+    pair: bool = False,
+    opset: int = 17
+) -> Path:
+    """
+    PyTorch 모델을 ONNX로 내보내기 (배치/시퀀스 길이 동적 축)
+
+    Args:
+        model: transformers PyTorch 모델 (eval 모드)
+        tokenizer: 입력 이름 확인용 토크나이저
+        output_path: 저장 경로
+        output_axes: 출력 이름별 동적 축 (예: {'logits': {0: 'batch'}})
+        pair: 문장 쌍 입력 모델 여부 (cross-encoder)
+        opset: ONNX opset 버전
+
+    Returns:
+        저장 경로
+    """
+    import torch
+
+    sample = tokenizer(["onnx export"], ["sample"], return_tensors='pt') if pair \
+        else tokenizer(["onnx export"], return_tensors='pt')
+    input_names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in sample]
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes.update(output_axes)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix('.tmp')
+    model.eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            str(tmp_path),
+            input_names=input_names,
+            output_names=list(output_axes),
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            do_constant_folding=True
+        )
+    os.replace(tmp_path, output_path)
+    logger.info(f"Exported ONNX model: {output_path}")
+    return output_path
+
+
+def quantize_onnx(input_path: Path, output_path: Path) -> Path:
+    """ONNX 모델 동적 int8 양자화 (가중치 int8, 활성값은 실행 시 양자화)"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    tmp_path = output_path.with_suffix('.tmp')
+    quantize_dynamic(str(input_path), str(tmp_path), weight_type=QuantType.QInt8)
+    os.replace(tmp_path, output_path)
+    logger.info(f"Quantized ONNX model (int8): {output_path}")
+    return output_path
+
+
+def ensure_onnx_model(
+    model_name: str,
+    task: str,
+    load_torch_model,
+    tokenizer,
+    output_axes: Dict[str, Dict[int, str]],
+    pair: bool = False,
+    quantize: bool = True
+) -> Path:
+    """
+    캐시된 ONNX 파일 반환 (없으면 내보내기 + 양자화, 프로세스 내 중복 내보내기 방지)
+
+    Args:
+        model_name: HuggingFace 모델 이름
+        task: 파일 구분 ('feature', 'cross-encoder' 등)
+        load_torch_model: PyTorch 모델을 반환하는 함수 (내보낼 때만 호출)
+        tokenizer: 토크나이저
+        output_axes: ONNX 출력 이름별 동적 축
+        pair: 문장 쌍 입력 모델 여부
+        quantize: int8 양자화 여부
+    """
+    target = onnx_model_path(model_name, task, quantize)
+    if target.exists():
+        return target
+
+    with _export_lock:
+        if target.exists():
+            return target
+        fp32_path = onnx_model_path(model_name, task, quantize=False)
+        if not fp32_path.exists():
+            export_onnx(load_torch_model(), tokenizer, fp32_path, output_axes, pair=pair)
+        if quantize:
+            quantize_onnx(fp32_path, target)
+    return target
+
+
+def validation_report_path(onnx_path: Path) -> Path:
+    """수치 검증 결과 파일 경로 (예: feature.int8.onnx → feature.int8.validation.json)"""
+    return onnx_path.with_suffix('.validation.json')
+
+
+def load_validation_report(onnx_path: Path) -> Optional[Dict[str, Any]]:
+    """저장된 수치 검증 결과 (없거나 ONNX 파일보다 오래되었으면 None)"""
+    report_path = validation_report_path(onnx_path)
+    try:
+        if report_path.stat().st_mtime < onnx_path.stat().st_mtime:
+            return None
+        with open(report_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_validation_report(onnx_path: Path, report: Dict[str, Any]):
+    """수치 검증 결과 저장"""
+    report_path = validation_report_path(onnx_path)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def cosine_agreement(reference: np.ndarray, candidate: np.ndarray) -> Dict[str, float]:
+    """
+    두 임베딩 행렬의 행별 코사인 유사도 요약
+
+    Args:
+        reference: 기준 벡터 (n, dim), 예: PyTorch 출력
+        candidate: 비교 벡터 (n, dim), 예: ONNX 출력
+
+    Returns:
+        {'min_cosine', 'mean_cosine'}
+    """
+    reference = np.asarray(reference, dtype=np.float64)
+    candidate = np.asarray(candidate, dtype=np.float64)
+    norms = np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    norms[norms == 0] = 1.0
+    cosines = np.einsum('ij,ij->i', reference, candidate) / norms
+    return {'min_cosine': float(cosines.min()), 'mean_cosine': float(cosines.mean())}
+
+
+class OnnxSession:
+    """onnxruntime CPU 추론 세션 (토크나이저 출력 dict → numpy 출력)"""
+
+    def __init__(self, path: Path, intra_op_threads: Optional[int] = None):
+        """
+        Args:
+            path: ONNX 파일 경로
+            intra_op_threads: 연산 내부 스레드 수 (None이면 환경 변수 RAG_ONNX_THREADS, 0이면 onnxruntime 기본값)
+        """
+        import onnxruntime as ort
+
+        if intra_op_threads is None:
+            intra_op_threads = int(os.getenv('RAG_ONNX_THREADS', '0'))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.path = path
+        self.session = ort.InferenceSession(str(path), options, providers=['CPUExecutionProvider'])
+        self.input_names: List[str] = [i.name for i in self.session.get_inputs()]
+        self.output_names: List[str] = [o.name for o in self.session.get_outputs()]
+        logger.info(f"ONNX Runtime session ready: {path.name} (inputs: {', '.join(self.input_names)})")
+
+    def run(self, encoded) -> Dict[str, np.ndarray]:
+        """
+        추론 실행
+
+        Args:
+            encoded: 토크나이저 출력 (return_tensors='np' 또는 'pt')
+
+        Returns:
+            {출력 이름: numpy 배열}
+        """
+        feeds = {}
+        for name in self.input_names:
+            value = encoded[name]
+            if hasattr(value, 'numpy'):
+                value = value.numpy()
+            feeds[name] = np.asarray(value, dtype=np.int64)
+        outputs = self.session.run(self.output_names, feeds)
+        return dict(zip(self.output_names, outputs))
@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+ONNX Runtime 임베딩 백엔드 (CPU)
+EmbeddingEncoder의 PyTorch 경로 대신 ONNX + 동적 int8 양자화 모델로 인코딩
+- 모델별 선택: RAG_ENCODER_BACKEND_<별칭> 또는 RAG_ENCODER_BACKEND (config.get_encoder_backend)
+- 내보낸 파일은 onnx_backend 캐시 디렉토리에 보관 (첫 사용 시 1회 내보내기)
+- 처음 내보낸 모델은 PyTorch 출력과 코사인 유사도를 비교해 기준(RAG_ONNX_MIN_COSINE, 기본값: 0.99)
+  미달이면 사용하지 않음 (EmbeddingEncoder가 PyTorch로 대체)
+- PyTorch 모델 가중치는 내보내기/검증 때만 메모리에 올림
+"""
+
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .config import EmbeddingModelType, ModelConfig, get_model_config
+from .onnx_backend import (
+    OnnxSession,
+    cosine_agreement,
+    ensure_onnx_model,
+    is_onnxruntime_available,
+    load_validation_report,
+    save_validation_report,
+)
+
+logger = logging.getLogger(__name__)
+
+ONNX_TASK = 'feature'
+ONNX_OUTPUT_AXES = {'last_hidden_state': {0: 'batch', 1: 'sequence'}}
+
+# 수치 검증용 텍스트 (짧은 쿼리 ~ 긴 문단, 패딩이 섞이도록 길이를 다르게 구성)
+VALIDATION_TEXTS = [
+    "신혼부부 전세자금 대출 조건",
+    "청년 월세 지원 신청 방법은?",
+    "LH 행복주택 입주 자격과 소득 기준",
+    "신혼부부 임차보증금 이자지원사업은 서울시에서 운영하는 주거지원 정책으로, "
+    "무주택 신혼부부에게 임차보증금 대출 이자의 일부를 지원합니다.",
+    "신청 자격은 부부합산 연소득 1억 3천만원 이하이며, 지원 기간은 최장 10년입니다. "
+    "대출 한도는 임차보증금의 90% 이내 최대 2억원이고 금리는 연소득에 따라 차등 적용됩니다.",
+    "Youth housing policy: rent subsidy of up to 200,000 KRW per month for 12 months.",
+]
+
+
+class OnnxEmbeddingRunner:
+    """ONNX 세션 + 토크나이저 + numpy 풀링/정규화 (PyTorch 경로와 같은 전처리 결과를 입력으로 받음)"""
+
+    def __init__(self, config: ModelConfig, tokenizer, session: OnnxSession):
+        self.config = config
+        self.tokenizer = tokenizer
+        self.session = session
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        전처리(prefix 적용)된 텍스트 인코딩
+
+        Args:
+            texts: 텍스트 리스트
+            batch_size: 배치 크기
+
+        Returns:
+            (n, dim) float32 배열
+        """
+        batches = []
+        for i in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[i:i + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.config.max_seq_length,
+                return_tensors='np'
+            )
+            hidden_states = self.session.run(encoded)['last_hidden_state']
+            batches.append(pool_hidden_states(
+                hidden_states, encoded['attention_mask'], self.config.pooling_mode
+            ))
+
+        embeddings = np.vstack(batches).astype(np.float32, copy=False)
+        if self.config.normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            embeddings = embeddings / norms
+        return embeddings
+
+
+def pool_hidden_states(hidden_states: np.ndarray, attention_mask: np.ndarray, pooling_mode: str) -> np.ndarray:
+    """
+    numpy 풀링 (EmbeddingEncoder._pool_embeddings와 같은 방식)
+
+    Args:
+        hidden_states: (batch, seq, dim)
+        attention_mask: (batch, seq)
+        pooling_mode: 'mean', 'cls', 'max'
+    """
+    mask = np.asarray(attention_mask, dtype=np.float32)[:, :, None]
+    if pooling_mode == "mean":
+        return (hidden_states * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+    if pooling_mode == "cls":
+        return hidden_states[:, 0, :]
+    if pooling_mode == "max":
+        return np.where(mask > 0, hidden_states, -1e9).max(axis=1)
+    raise ValueError(f"Unknown pooling mode: {pooling_mode}")
+
+
+def load_onnx_embedding_runner(
+    model_type: EmbeddingModelType,
+    quantize: bool = True,
+    min_cosine: Optional[float] = None
+) -> Optional[OnnxEmbeddingRunner]:
+    """
+    ONNX 임베딩 러너 생성 (필요 시 내보내기 + 양자화 + PyTorch 대비 수치 검증)
+
+    Args:
+        model_type: 임베딩 모델
+        quantize: int8 동적 양자화 여부
+        min_cosine: 최소 코사인 유사도 (None이면 환경 변수 RAG_ONNX_MIN_COSINE, 기본값: 0.99)
+
+    Returns:
+        OnnxEmbeddingRunner (onnxruntime 미설치 또는 검증 실패 시 None)
+    """
+    if not is_onnxruntime_available():
+        logger.warning("onnxruntime is not installed, using PyTorch encoder")
+        return None
+    if min_cosine is None:
+        min_cosine = float(os.getenv('RAG_ONNX_MIN_COSINE', '0.99'))
+
+    from transformers import AutoTokenizer
+
+    config = get_model_config(model_type)
+    hf_token = _hf_token()
+    tokenizer = AutoTokenizer.from_pretrained(
+        config.model_name, trust_remote_code=config.trust_remote_code, token=hf_token
+    )
+
+    torch_model = None
+
+    def load_torch_model():
+        nonlocal torch_model
+        if torch_model is None:
+            from transformers import AutoModel
+            torch_model = AutoModel.from_pretrained(
+                config.model_name, trust_remote_code=config.trust_remote_code, token=hf_token
+            )
+            torch_model.eval()
+        return torch_model
+
+    path = ensure_onnx_model(
+        config.model_name, ONNX_TASK, load_torch_model, tokenizer,
+        output_axes=ONNX_OUTPUT_AXES, quantize=quantize
+    )
+    runner = OnnxEmbeddingRunner(config, tokenizer, OnnxSession(path))
+
+    report = load_validation_report(path)
+    if report is None:
+        report = validate_onnx_runner(runner, load_torch_model(), min_cosine)
+        save_validation_report(path, report)
+    torch_model = None
+
+    if report['min_cosine'] < min_cosine:
+        logger.error(
+            f"ONNX encoder for {config.display_name} failed validation "
+            f"(min cosine {report['min_cosine']:.4f} < {min_cosine}), using PyTorch encoder"
+        )
+        return None
+
+    logger.info(
+        f"ONNX encoder ready: {config.display_name} ({path.name}, "
+        f"min cosine vs PyTorch {report['min_cosine']:.4f})"
+    )
+    return runner
+
+
+def validate_onnx_runner(runner: OnnxEmbeddingRunner, torch_model, min_cosine: float) -> Dict[str, Any]:
+    """
+    같은 토큰 입력에 대한 PyTorch fp32 출력과 ONNX 출력의 코사인 유사도 비교
+
+    Returns:
+        {'model', 'path', 'texts', 'min_cosine', 'mean_cosine', 'threshold', 'passed'}
+    """
+    import torch
+
+    config = runner.config
+    texts = [_prefixed(config, text, is_query=i % 2 == 0) for i, text in enumerate(VALIDATION_TEXTS)]
+    encoded = runner.tokenizer(
+        texts, padding=True, truncation=True, max_length=config.max_seq_length, return_tensors='pt'
+    )
+    with torch.inference_mode():
+        hidden_states = torch_model(**encoded)[0].float().numpy()
+    reference = pool_hidden_states(hidden_states, encoded['attention_mask'].numpy(), config.pooling_mode)
+
+    report = {
+        'model': config.model_name,
+        'path': str(runner.session.path),
+        'texts': len(texts),
+        **cosine_agreement(reference, runner.encode(texts)),
+        'threshold': min_cosine,
+    }
+    report['passed'] = report['min_cosine'] >= min_cosine
+    logger.info(
+        f"ONNX validation {config.display_name}: min cosine {report['min_cosine']:.4f}, "
+        f"mean {report['mean_cosine']:.4f} ({'passed' if report['passed'] else 'FAILED'})"
+    )
+    return report
+
+
+def benchmark_encoder_backends(
+    model_type: EmbeddingModelType,
+    queries: List[str],
+    documents: List[str]
+) -> Dict[str, Any]:
+    """
+    PyTorch vs ONNX 인코더 비교 (코사인 유사도, 쿼리 지연 시간, 문서 처리량)
+
+    Args:
+        model_type: 임베딩 모델
+        queries: 단건 encode_query_array로 측정할 쿼리
+        documents: encode_documents_array로 측정할 문서
+
+    Returns:
+        {'torch': {...}, 'onnx': {...}, 'query_cosine': {...}, 'document_cosine': {...}}
+    """
+    from .encoder import EmbeddingEncoder
+
+    report: Dict[str, Any] = {}
+    outputs: Dict[str, Dict[str, np.ndarray]] = {}
+    for backend in ('torch', 'onnx'):
+        encoder = EmbeddingEncoder(model_type, device='cpu', backend=backend)
+        if encoder.backend != backend:
+            raise RuntimeError(f"{backend} encoder backend is unavailable")
+        encoder.query_cache = None  # 캐시 없이 측정
+
+        encoder.encode_documents_array(documents[:2])  # 워밍업
+        latencies, query_vectors = [], []
+        for query in queries:
+            start = time.perf_counter()
+            query_vectors.append(encoder.encode_query_array(query))
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        document_vectors = encoder.encode_documents_array(documents)
+        elapsed = time.perf_counter() - start
+
+        outputs[backend] = {'queries': np.asarray(query_vectors, dtype=np.float32), 'documents': document_vectors}
+        report[backend] = {
+            'query_p50_ms': float(np.percentile(latencies, 50)) if latencies else 0.0,
+            'query_p95_ms': float(np.percentile(latencies, 95)) if latencies else 0.0,
+            'documents_per_second': len(documents) / elapsed if elapsed > 0 else 0.0,
+        }
+        del encoder
+
+    if queries:
+        report['query_cosine'] = cosine_agreement(outputs['torch']['queries'], outputs['onnx']['queries'])
+    if documents:
+        report['document_cosine'] = cosine_agreement(outputs['torch']['documents'], outputs['onnx']['documents'])
+    return report
+
+
+def _prefixed(config: ModelConfig, text: str, is_query: bool) -> str:
+    prefix_key = "query_prefix" if is_query else "passage_prefix"
+    return config.extra_params.get(prefix_key, "") + text
+
+
+def _hf_token() -> Optional[str]:
+    return os.getenv('HF_API_TOKEN') or os.getenv('HF_TOKEN') or os.getenv('HUGGING_FACE_HUB_TOKEN')
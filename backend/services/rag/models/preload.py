@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+preload 후 fork 서빙 지원
+마스터 프로세스에서 모델 가중치를 한 번 로드한 뒤 워커를 fork하면 가중치 페이지를
+copy-on-write로 공유 (가중치는 읽기 전용이므로 워커 수와 무관하게 메모리 1벌)
+- 마스터는 로드만 하고 forward는 실행하지 않음 (OpenMP 스레드 풀/배치 스레드를 fork 전에 만들지 않기 위해)
+- 마스터 로드 중 torch 스레드는 1개 (GNU OpenMP는 fork 이전에 만든 스레드 풀을 자식에서 쓰면 멈출 수 있음)
+- fork 직전 gc.freeze()로 로드된 객체를 GC 대상에서 제외 (GC가 객체 헤더를 써서 페이지가 복사되는 것 방지)
+- 워커는 fork 후 torch 스레드 수를 CPU 코어 / 워커 수로 설정 (RAG_TORCH_THREADS로 지정 가능)
+- CUDA는 fork 이후 재초기화할 수 없으므로 GPU가 있으면 preload하지 않음 (워커별 로드)
+"""
+
+import gc
+import logging
+import os
+import time
+from typing import Any, Dict, List, Union
+
+from .cache import close_query_cache
+from .config import EmbeddingModelType
+
+logger = logging.getLogger(__name__)
+
+
+def can_preload() -> bool:
+    """preload 후 fork가 안전한지 (GPU를 쓰는 경우 False)"""
+    import torch
+
+    if torch.cuda.is_available():
+        logger.warning("CUDA is available, skipping model preload (CUDA cannot be used after fork)")
+        return False
+    return True
+
+
+def limit_threads_for_preload():
+    """마스터 로드 중 torch 스레드 1개로 제한 (fork 전에 OpenMP 스레드 풀을 만들지 않음)"""
+    import torch
+
+    torch.set_num_threads(1)
+
+
+def prepare_for_fork():
+    """
+    fork 직전 호출: 쿼리 캐시 SQLite 연결을 닫고 (fork를 넘어 공유하면 안 됨),
+    로드된 객체를 GC 대상에서 제외해 워커에서 페이지 복사를 줄임
+    """
+    close_query_cache()
+    gc.collect()
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
+    logger.info(f"Prepared for fork (frozen objects: {gc.get_freeze_count() if hasattr(gc, 'get_freeze_count') else 'n/a'})")
+
+
+def configure_worker_threads(workers: int = 1) -> int:
+    """
+    fork 이후 워커에서 호출: torch 스레드 수 설정
+
+    Args:
+        workers: 같은 머신의 워커 수 (코어를 나눠 쓰도록)
+
+    Returns:
+        설정한 스레드 수 (환경 변수 RAG_TORCH_THREADS가 있으면 그 값)
+    """
+    import torch
+
+    threads = int(os.getenv('RAG_TORCH_THREADS', '0'))
+    if threads <= 0:
+        threads = max(1, (os.cpu_count() or 1) // max(1, workers))
+    torch.set_num_threads(threads)
+    return threads
+
+
+def process_memory(pid: Union[int, str] = 'self') -> Dict[str, int]:
+    """
+    프로세스 메모리 (바이트, Linux /proc/<pid>/smaps_rollup)
+    - rss: 상주 메모리 (공유 페이지 포함, 워커별 합은 과대 계산)
+    - pss: 공유 페이지를 공유 프로세스 수로 나눈 값 (프로세스별 합이 실제 사용량)
+    - uss: 이 프로세스만 쓰는 페이지 (private clean + dirty)
+    - shared: 다른 프로세스와 공유 중인 페이지
+
+    Returns:
+        {'rss', 'pss', 'uss', 'shared'} (smaps_rollup이 없으면 빈 dict)
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", 'r') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 3 and parts[-1] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[-2]) * 1024
+    except OSError:
+        return {}
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'uss': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+        'shared': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+    }
+
+
+def benchmark_fork_sharing(
+    model_type: EmbeddingModelType,
+    texts: List[str],
+    workers: int = 4
+) -> Dict[str, Any]:
+    """
+    워커별 로드 vs preload 후 fork 메모리 비교
+    각 모드에서 워커 프로세스를 fork해 쿼리를 인코딩한 뒤 모든 워커가 살아 있는 상태에서 메모리 측정
+
+    Args:
+        model_type: 임베딩 모델
+        texts: 워커마다 인코딩할 쿼리
+        workers: 워커 수
+
+    Returns:
+        {'per_worker': {...}, 'preload': {...}}
+        모드별: 'total_pss' (마스터 + 워커 PSS 합, 실제 사용량), 'total_rss', 'worker_uss' (워커 평균 전용 메모리),
+        'worker_shared' (워커 평균 공유 메모리), 'load_seconds' (워커 기준 모델 준비 시간 평균)
+    """
+    import multiprocessing
+
+    ctx = multiprocessing.get_context('fork')
+    report: Dict[str, Any] = {}
+    for mode in ('per_worker', 'preload'):
+        encoder = None
+        if mode == 'preload':
+            if not can_preload():
+                raise RuntimeError("preload-fork benchmark requires CPU-only torch")
+            from .encoder import EmbeddingEncoder
+            limit_threads_for_preload()
+            encoder = EmbeddingEncoder(model_type, device='cpu')
+            prepare_for_fork()
+
+        results = ctx.Queue()
+        done = ctx.Event()
+        processes = [
+            ctx.Process(target=_benchmark_worker, args=(model_type, texts, workers, encoder, results, done))
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            load_seconds = [results.get(timeout=600) for _ in processes]
+            memories = [process_memory(process.pid) for process in processes]
+            master = process_memory()
+        finally:
+            done.set()
+            for process in processes:
+                process.join()
+
+        if encoder is not None:
+            if hasattr(gc, 'unfreeze'):
+                gc.unfreeze()
+            del encoder
+            from .loader import ModelFactory
+            ModelFactory.unload_all()
+            gc.collect()
+
+        report[mode] = {
+            'workers': workers,
+            'total_pss': master.get('pss', 0) + sum(m.get('pss', 0) for m in memories),
+            'total_rss': master.get('rss', 0) + sum(m.get('rss', 0) for m in memories),
+            'worker_uss': sum(m.get('uss', 0) for m in memories) / workers,
+            'worker_shared': sum(m.get('shared', 0) for m in memories) / workers,
+            'load_seconds': sum(load_seconds) / workers,
+        }
+    return report
+
+
+def _benchmark_worker(model_type, texts, workers, encoder, results, done):
+    """벤치마크 워커: (preload 모드가 아니면) 모델 로드 → 인코딩 → 측정이 끝날 때까지 대기"""
+    configure_worker_threads(workers)
+    start = time.perf_counter()
+    if encoder is None:
+        from .encoder import EmbeddingEncoder
+        encoder = EmbeddingEncoder(model_type, device='cpu')
+    encoder.query_cache = None
+    encoder.encode_queries_array(texts)
+    results.put(time.perf_counter() - start)
+    done.wait()
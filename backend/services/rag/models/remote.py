@@ -0,0 +1,561 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+임베딩 워커 프로세스 (IPC)
+호스트당 1개의 워커 프로세스가 임베딩 모델을 소유하고, 웹 프로세스(FastAPI, Django, LangGraph 도구)는
+Unix 소켓으로 인코딩을 요청하는 얇은 클라이언트만 사용 (모델 메모리는 호스트당 1벌, 웹 프로세스는 모델 로드 없이 시작)
+- 서버: rag worker --socket PATH --models E5_LARGE,E5_SMALL
+- 클라이언트: 환경 변수 RAG_EMBEDDING_WORKER=PATH 설정 시 create_encoder()가 RemoteEmbeddingEncoder 반환
+- 프로토콜: multiprocessing.connection (AF_UNIX, 길이 프리픽스 프레임, RAG_EMBEDDING_WORKER_AUTHKEY로 HMAC 상호 인증)
+  요청 {'op', 'model', ...} → 응답 {'ok': True, 'result': ...} 또는 {'ok': False, 'error': ...}
+- 메시지는 pickle로 직렬화되므로 인증 키 없이는 서버/클라이언트 모두 시작하지 않음
+  (상호 인증이 끝나기 전에는 pickle을 읽지 않음, 키가 없으면 같은 호스트의 다른 사용자가 소켓을 선점해 코드 실행 가능)
+- 기본 소켓 경로는 $XDG_RUNTIME_DIR 또는 현재 사용자만 접근 가능한(0700) 임시 디렉토리
+- 서버는 연결별 스레드로 처리하고, 단건 쿼리는 모델별 마이크로 배치 디스패처로 모아 인코딩
+  (여러 웹 프로세스의 동시 쿼리가 한 번의 forward pass로 처리됨)
+- 벡터는 float32 ndarray로 전송
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import stat
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .cache import QueryEmbeddingCache, get_query_cache
+from .config import EmbeddingModelType, ModelConfig, get_model_config
+
+logger = logging.getLogger(__name__)
+
+SOCKET_NAME = "rag-embedding-worker.sock"
+
+
+def get_embedding_worker_address() -> Optional[str]:
+    """임베딩 워커 소켓 경로 (환경 변수 RAG_EMBEDDING_WORKER, 미설정 시 None = 프로세스 내 인코딩)"""
+    return os.getenv('RAG_EMBEDDING_WORKER') or None
+
+
+def default_socket_path() -> str:
+    """
+    기본 소켓 경로 ($XDG_RUNTIME_DIR/rag-embedding-worker.sock, 없으면 <임시 디렉토리>/rag-embedding-worker-<uid>/)
+    임시 디렉토리 아래 디렉토리는 0700으로 만들고, 다른 사용자 소유이거나 다른 사용자가 접근 가능하면 거부
+    """
+    runtime_dir = os.getenv('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, SOCKET_NAME)
+
+    directory = os.path.join(tempfile.gettempdir(), f"rag-embedding-worker-{os.getuid()}")
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise EmbeddingWorkerError(
+            f"Refusing to use {directory} for the embedding worker socket "
+            f"(must be a directory owned by uid {os.getuid()} with mode 0700)"
+        )
+    return os.path.join(directory, SOCKET_NAME)
+
+
+def _authkey() -> bytes:
+    """연결 인증 키 (환경 변수 RAG_EMBEDDING_WORKER_AUTHKEY, 없으면 EmbeddingWorkerError)"""
+    key = os.getenv('RAG_EMBEDDING_WORKER_AUTHKEY')
+    if not key:
+        raise EmbeddingWorkerError(
+            "RAG_EMBEDDING_WORKER_AUTHKEY is required for the embedding worker "
+            "(messages are pickled, so unauthenticated connections are refused)"
+        )
+    return key.encode('utf-8')
+
+
+def create_encoder(model_type: EmbeddingModelType, device: Optional[str] = None):
+    """
+    임베딩 인코더 생성 (Retriever, VectorRetriever 등 공용)
+
+    Returns:
+        RAG_EMBEDDING_WORKER가 설정되어 있으면 RemoteEmbeddingEncoder, 아니면 EmbeddingEncoder
+    """
+    address = get_embedding_worker_address()
+    if address:
+        return RemoteEmbeddingEncoder(model_type, address)
+    from .encoder import EmbeddingEncoder
+    return EmbeddingEncoder(model_type, device)
+
+
+class EmbeddingWorkerError(Exception):
+    """임베딩 워커 호출 실패 (연결 실패, 타임아웃, 워커 측 예외, 인증 키/소켓 경로 설정 오류)"""
+    pass
+
+
+_QUERY_PREFIX_MODELS = (
+    EmbeddingModelType.MULTILINGUAL_E5_SMALL,
+    EmbeddingModelType.MULTILINGUAL_E5_BASE,
+    EmbeddingModelType.MULTILINGUAL_E5_LARGE,
+)
+
+
+# ============================================================================
+# 클라이언트
+# ============================================================================
+
+class RemoteEmbeddingEncoder:
+    """임베딩 워커 클라이언트 (EmbeddingEncoder와 같은 인터페이스, 모델은 로드하지 않음)"""
+
+    def __init__(
+        self,
+        model_type: EmbeddingModelType = EmbeddingModelType.MULTILINGUAL_E5_SMALL,
+        address: Optional[str] = None,
+        query_cache: Optional[QueryEmbeddingCache] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        Args:
+            model_type: 사용할 모델 타입
+            address: 워커 소켓 경로 (None이면 환경 변수 RAG_EMBEDDING_WORKER, 기본값: default_socket_path())
+            query_cache: 쿼리 임베딩 캐시 (None이면 프로세스 전역 캐시, 반복 쿼리는 IPC 없이 반환)
+            timeout: 요청 타임아웃 (초, None이면 환경 변수 RAG_EMBEDDING_WORKER_TIMEOUT, 기본값: 30)
+
+        Raises:
+            EmbeddingWorkerError: RAG_EMBEDDING_WORKER_AUTHKEY가 없을 때
+        """
+        if timeout is None:
+            timeout = float(os.getenv('RAG_EMBEDDING_WORKER_TIMEOUT', '30'))
+
+        self.model_type = model_type
+        self.config: ModelConfig = get_model_config(model_type)
+        self._authkey = _authkey()
+        self.address = address or get_embedding_worker_address() or default_socket_path()
+        self.query_cache = query_cache if query_cache is not None else get_query_cache()
+        self.timeout = timeout
+        self.backend = 'remote'
+        self.device = 'remote'
+        self.batcher = None  # 배치는 워커가 처리
+
+        self._local = threading.local()
+        self._cache_model_key: Optional[str] = None
+
+        logger.info(f"RemoteEmbeddingEncoder initialized: {self.config.display_name} (worker: {self.address})")
+
+    @property
+    def model(self):
+        """모델은 워커 프로세스에 있음"""
+        return None
+
+    @property
+    def cache_model_key(self) -> str:
+        """쿼리 캐시 키 (워커의 백엔드에 따라 결정, 첫 사용 시 1회 조회)"""
+        if self._cache_model_key is None:
+            self._cache_model_key = self._call('info')['cache_model_key']
+        return self._cache_model_key
+
+    def ping(self) -> Dict[str, Any]:
+        """워커 상태 확인 (연결 실패 시 EmbeddingWorkerError)"""
+        return self._call('ping')
+
+    def encode_query_array(self, query: str) -> np.ndarray:
+        """쿼리 인코딩 (단일, (dim,) float32, 실패 시 영벡터)"""
+        if not query.strip():
+            logger.warning("Empty query provided")
+            return self._zeros()
+
+        try:
+            cache_text = self._cache_text(query)
+            if self.query_cache is not None:
+                cached = self.query_cache.get(self.cache_model_key, cache_text)
+                if cached is not None:
+                    return cached
+
+            embedding = self._call('encode_query', text=query)
+            if self.query_cache is not None:
+                self.query_cache.put(self.cache_model_key, cache_text, embedding)
+            return embedding
+
+        except Exception as e:
+            logger.error(f"Query encoding failed: {e}", exc_info=True)
+            return self._zeros()
+
+    async def encode_query_array_async(self, query: str) -> np.ndarray:
+        """쿼리 인코딩 (비동기, 이벤트 루프를 막지 않음)"""
+        return await asyncio.to_thread(self.encode_query_array, query)
+
+    def get_cached_query_array(self, query: str) -> Optional[np.ndarray]:
+        """캐시된 쿼리 벡터 (없으면 None, 인코딩하지 않음)"""
+        if self.query_cache is None:
+            return None
+        return self.query_cache.get(self.cache_model_key, self._cache_text(query))
+
+    def enable_batching(self, max_batch_size: Optional[int] = None, max_wait_ms: Optional[float] = None):
+        """워커가 모든 클라이언트의 쿼리를 모아 배치 인코딩하므로 아무것도 하지 않음"""
+        return None
+
+    def encode_queries_array(self, queries: List[str], raise_on_error: bool = False) -> np.ndarray:
+        """쿼리 인코딩 (배치, (n, dim) float32, 캐시 미스만 워커에 요청, 실패 시 영벡터, raise_on_error면 예외 전파)"""
+        embeddings = np.zeros((len(queries), self.config.dimension), dtype=np.float32)
+        pending: Dict[str, List[int]] = {}
+
+        try:
+            for i, query in enumerate(queries):
+                if not query.strip():
+                    continue
+                if self.query_cache is not None:
+                    cached = self.query_cache.get(self.cache_model_key, self._cache_text(query))
+                    if cached is not None:
+                        embeddings[i] = cached
+                        continue
+                pending.setdefault(query, []).append(i)
+
+            if pending:
+                unique_queries = list(pending)
+                encoded = self._call('encode_queries', texts=unique_queries)
+                for query, embedding in zip(unique_queries, encoded):
+                    if self.query_cache is not None:
+                        self.query_cache.put(self.cache_model_key, self._cache_text(query), embedding)
+                    embeddings[pending[query]] = embedding
+        except Exception as e:
+            if raise_on_error:
+                raise
+            logger.error(f"Batch query encoding failed: {e}", exc_info=True)
+
+        return embeddings
+
+    def encode_documents_array(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None,
+        show_progress: bool = False,
+        length_bucketing: bool = True,
+        token_budget: Optional[int] = None
+    ) -> np.ndarray:
+        """문서 인코딩 ((n, dim) float32, 워커에서 길이 버킷팅 배치 처리, 실패 시 예외)"""
+        if not texts:
+            return np.zeros((0, self.config.dimension), dtype=np.float32)
+        return self._call(
+            'encode_documents',
+            texts=list(texts),
+            batch_size=batch_size,
+            length_bucketing=length_bucketing,
+            token_budget=token_budget
+        )
+
+    # 리스트 API (호환용)
+
+    def encode_query(self, query: str) -> List[float]:
+        """쿼리 인코딩 (단일, 리스트 반환)"""
+        return self.encode_query_array(query).tolist()
+
+    async def encode_query_async(self, query: str) -> List[float]:
+        """쿼리 인코딩 (비동기, 리스트 반환)"""
+        return (await self.encode_query_array_async(query)).tolist()
+
+    def get_cached_query(self, query: str) -> Optional[List[float]]:
+        """캐시된 쿼리 벡터 (리스트, 없으면 None)"""
+        cached = self.get_cached_query_array(query)
+        return cached.tolist() if cached is not None else None
+
+    def encode_queries(self, queries: List[str]) -> List[List[float]]:
+        """쿼리 인코딩 (배치, 리스트 반환)"""
+        return self.encode_queries_array(queries).tolist()
+
+    def encode_documents(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None,
+        show_progress: bool = False,
+        length_bucketing: bool = True,
+        token_budget: Optional[int] = None
+    ) -> List[List[float]]:
+        """문서 인코딩 (리스트 반환)"""
+        return self.encode_documents_array(
+            texts,
+            batch_size=batch_size,
+            show_progress=show_progress,
+            length_bucketing=length_bucketing,
+            token_budget=token_budget
+        ).tolist()
+
+    def get_dimension(self) -> int:
+        """임베딩 차원 반환"""
+        return self.config.dimension
+
+    def get_model_name(self) -> str:
+        """모델 이름 반환"""
+        return self.config.model_name
+
+    def get_display_name(self) -> str:
+        """표시 이름 반환"""
+        return self.config.display_name
+
+    def get_model_type(self) -> EmbeddingModelType:
+        """모델 타입 반환"""
+        return self.model_type
+
+    def get_cache_stats(self) -> dict:
+        """쿼리 임베딩 캐시 통계 반환 (클라이언트 측 캐시)"""
+        if self.query_cache is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.query_cache.stats()}
+
+    def close(self):
+        """현재 스레드의 연결 종료"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _cache_text(self, query: str) -> str:
+        """캐시 키 텍스트 (EmbeddingEncoder._prepare_text_for_model과 같은 규칙)"""
+        if self.model_type in _QUERY_PREFIX_MODELS:
+            return self.config.extra_params.get("query_prefix", "") + query
+        return query
+
+    def _zeros(self) -> np.ndarray:
+        return np.zeros(self.config.dimension, dtype=np.float32)
+
+    def _connection(self) -> Connection:
+        """스레드별 연결 (fork된 자식은 부모의 연결을 쓰지 않고 새로 연결)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        try:
+            conn = Client(self.address, family='AF_UNIX', authkey=self._authkey)
+        except (OSError, EOFError) as e:
+            raise EmbeddingWorkerError(f"Cannot connect to embedding worker at {self.address}: {e}") from e
+        except Exception as e:
+            # 상호 인증 실패 (AuthenticationError, 키가 다른 워커이거나 워커가 아닌 프로세스)
+            raise EmbeddingWorkerError(f"Embedding worker authentication failed at {self.address}: {e}") from e
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _call(self, op: str, **payload) -> Any:
+        """요청 1회 (연결이 끊겼으면 1회 재연결 후 재시도)"""
+        request = {'op': op, 'model': self.model_type.value, **payload}
+        for attempt in (0, 1):
+            conn = self._connection()
+            try:
+                conn.send(request)
+                if not conn.poll(self.timeout):
+                    # 늦게 도착한 응답이 다음 요청과 섞이지 않도록 연결 폐기
+                    self.close()
+                    raise EmbeddingWorkerError(f"Embedding worker timed out after {self.timeout:g}s ({op})")
+                response = conn.recv()
+            except (OSError, EOFError) as e:
+                self.close()
+                if attempt == 1:
+                    raise EmbeddingWorkerError(f"Embedding worker connection lost ({op}): {e}") from e
+                continue
+            if not response.get('ok'):
+                raise EmbeddingWorkerError(f"Embedding worker error ({op}): {response.get('error')}")
+            return response['result']
+
+
+# ============================================================================
+# 서버
+# ============================================================================
+
+class EmbeddingWorkerServer:
+    """임베딩 워커 서버 (모델 소유, 연결별 스레드)"""
+
+    def __init__(
+        self,
+        address: Optional[str] = None,
+        model_types: Sequence[EmbeddingModelType] = (),
+        device: Optional[str] = None
+    ):
+        """
+        Args:
+            address: 소켓 경로 (None이면 환경 변수 RAG_EMBEDDING_WORKER, 기본값: default_socket_path())
+            model_types: 시작 시 미리 로드할 모델 (다른 모델은 첫 요청 시 로드)
+            device: 디바이스 ('cuda', 'cpu', None)
+
+        Raises:
+            EmbeddingWorkerError: RAG_EMBEDDING_WORKER_AUTHKEY가 없을 때 (모델 로드 전에 실패)
+        """
+        self._authkey = _authkey()
+        self.address = address or get_embedding_worker_address() or default_socket_path()
+        self.device = device
+        self._encoders: Dict[EmbeddingModelType, Any] = {}
+        self._encoders_lock = threading.Lock()
+        self._listener: Optional[Listener] = None
+        self._stopped = threading.Event()
+
+        # 메트릭
+        self.started_at = time.time()
+        self.connections = 0
+        self.requests: Dict[str, int] = {}
+        self.errors = 0
+
+        for model_type in model_types:
+            self.encoder(model_type)
+
+    def encoder(self, model_type: EmbeddingModelType):
+        """모델별 인코더 (첫 요청 시 로드, 단건 쿼리 마이크로 배치 활성화)"""
+        encoder = self._encoders.get(model_type)
+        if encoder is not None:
+            return encoder
+        with self._encoders_lock:
+            encoder = self._encoders.get(model_type)
+            if encoder is None:
+                from .encoder import EmbeddingEncoder
+                from .loader import ModelFactory
+                encoder = EmbeddingEncoder(model_type, self.device)
+                encoder.enable_batching()
+                ModelFactory.pin(model_type)
+                self._encoders[model_type] = encoder
+        return encoder
+
+    def serve_forever(self):
+        """연결 수락 루프 (close() 또는 KeyboardInterrupt까지)"""
+        self._remove_stale_socket()
+        self._listener = Listener(self.address, family='AF_UNIX', authkey=self._authkey)
+        os.chmod(self.address, 0o660)
+        logger.info(
+            f"Embedding worker listening on {self.address} "
+            f"(models: {', '.join(t.value for t in self._encoders) or 'on demand'}, pid: {os.getpid()})"
+        )
+        try:
+            while not self._stopped.is_set():
+                try:
+                    conn = self._listener.accept()
+                except (ConnectionError, EOFError) as e:
+                    # 인증 전에 끊긴 연결 (다른 워커의 소켓 사용 중 확인 등)
+                    logger.debug(f"Embedding worker connection closed during handshake: {e}")
+                    continue
+                except OSError:
+                    if self._stopped.is_set():
+                        break
+                    logger.warning("Embedding worker accept failed", exc_info=True)
+                    continue
+                except Exception as e:
+                    # 인증 실패 등 (해당 연결만 거부)
+                    logger.warning(f"Rejected embedding worker connection: {e}")
+                    continue
+                self.connections += 1
+                threading.Thread(target=self._handle, args=(conn,), name="embedding-worker-conn", daemon=True).start()
+        finally:
+            self.close()
+
+    def _remove_stale_socket(self):
+        """
+        이전 실행에서 남은 소켓 파일만 삭제
+        소켓이 아니거나, 다른 사용자 소유이거나, 아직 연결을 받는(다른 워커가 실행 중인) 소켓이면 EmbeddingWorkerError
+        """
+        try:
+            info = os.lstat(self.address)
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+            raise EmbeddingWorkerError(
+                f"{self.address} exists and is not a socket owned by uid {os.getuid()}, refusing to replace it"
+            )
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.address)
+        except (ConnectionRefusedError, FileNotFoundError):
+            # 연결을 받는 프로세스가 없음 (비정상 종료로 남은 파일)
+            os.unlink(self.address)
+            return
+        finally:
+            probe.close()
+        raise EmbeddingWorkerError(f"Another embedding worker is already listening on {self.address}")
+
+    def close(self):
+        """수락 중지 및 소켓 파일 삭제"""
+        self._stopped.set()
+        if self._listener is not None:
+            listener, self._listener = self._listener, None
+            listener.close()
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+
+    def stats(self) -> Dict[str, Any]:
+        """워커 메트릭 (요청 수, 모델 레지스트리, 배치 디스패처)"""
+        from .batcher import get_batcher_stats
+        from .loader import ModelFactory
+        return {
+            'pid': os.getpid(),
+            'uptime_seconds': time.time() - self.started_at,
+            'connections': self.connections,
+            'requests': dict(self.requests),
+            'errors': self.errors,
+            'models': [model_type.value for model_type in self._encoders],
+            'model_registry': ModelFactory.stats(),
+            'batchers': get_batcher_stats(),
+        }
+
+    def _handle(self, conn: Connection):
+        """연결 1개의 요청 처리 루프 (요청 순서대로 응답)"""
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                op = request.get('op', '')
+                self.requests[op] = self.requests.get(op, 0) + 1
+                try:
+                    response = {'ok': True, 'result': self._dispatch(op, request)}
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"Embedding worker request failed ({op}): {e}", exc_info=True)
+                    response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+                try:
+                    conn.send(response)
+                except (EOFError, OSError):
+                    return
+
+    def _dispatch(self, op: str, request: Dict[str, Any]) -> Any:
+        if op == 'ping':
+            return {'pid': os.getpid(), 'models': [model_type.value for model_type in self._encoders]}
+        if op == 'stats':
+            return self.stats()
+
+        encoder = self.encoder(EmbeddingModelType(request['model']))
+        if op == 'info':
+            return {
+                'model': encoder.get_model_name(),
+                'dimension': encoder.get_dimension(),
+                'backend': encoder.backend,
+                'device': encoder.device,
+                'cache_model_key': encoder.cache_model_key,
+            }
+        # 실패를 영벡터로 감추지 않고 클라이언트에 에러로 전달 (클라이언트가 영벡터를 캐싱하지 않도록)
+        if op == 'encode_query':
+            if encoder.batcher is not None:
+                # 다른 클라이언트의 동시 쿼리와 모아서 인코딩
+                return encoder.batcher.encode_query(request['text'])
+            return encoder.encode_queries_array([request['text']], raise_on_error=True)[0]
+        if op == 'encode_queries':
+            return encoder.encode_queries_array(request['texts'], raise_on_error=True)
+        if op == 'encode_documents':
+            return encoder.encode_documents_array(
+                request['texts'],
+                batch_size=request.get('batch_size'),
+                length_bucketing=request.get('length_bucketing', True),
+                token_budget=request.get('token_budget')
+            )
+        raise ValueError(f"Unknown op: {op}")
+
+
+def get_embedding_worker_stats(address: Optional[str] = None) -> Dict[str, Any]:
+    """임베딩 워커 메트릭 조회 (워커를 쓰지 않으면 {'enabled': False})"""
+    address = address or get_embedding_worker_address()
+    if not address:
+        return {'enabled': False}
+    try:
+        with Client(address, family='AF_UNIX', authkey=_authkey()) as conn:
+            conn.send({'op': 'stats'})
+            if not conn.poll(5.0):
+                raise EmbeddingWorkerError("Embedding worker timed out (stats)")
+            response = conn.recv()
+        return {'enabled': True, 'address': address, **response.get('result', {})}
+    except Exception as e:
+        return {'enabled': True, 'address': address, 'error': str(e)}
@@ -6,11 +6,16 @@ Retrieval + Augmentation + Generation을 통합한 완전한 RAG 시스템
 """
 
 import logging
+import os
 from typing import List, Dict, Any, Optional, Union
 from dataclasses import dataclass
 
 from .retrieval.retriever import Retriever
-from .retrieval.reranker import BaseReranker, KeywordReranker, SemanticReranker, CombinedReranker
+from .retrieval.hybrid import HybridRetriever
+from .retrieval.cascade import CascadeRetriever
+from .retrieval.semantic_cache import SemanticCache
+from .vectorstore.filters import SearchFilter
+from .retrieval.reranker import BaseReranker, KeywordReranker, SemanticReranker, CombinedReranker, create_reranker
 from .augmentation.augmenter import DocumentAugmenter, AugmentedContext
 from .augmentation.formatters import BaseFormatter, PromptFormatter, MarkdownFormatter
 from .generation.generator import LLMGenerator, OllamaGenerator, GenerationConfig, GeneratedAnswer
@@ -46,30 +51,49 @@ class RAGSystem:
         max_context_length: int = 4000,
         max_documents: int = 5,
         llm_generator: Optional[LLMGenerator] = None,
-        enable_generation: bool = False
+        enable_generation: bool = False,
+        vector_backend: Optional[str] = None,
+        retrieval_mode: Optional[str] = None,
+        semantic_cache: Optional[SemanticCache] = None
     ):
         """
         Args:
             model_type: 사용할 임베딩 모델 (None이면 환경 변수 RAG_EMBEDDING_MODEL에서 읽음, 기본값: E5_LARGE)
             db_config: 데이터베이스 연결 설정
             device: 디바이스
-            reranker: 리랭킹 모듈
+            reranker: 리랭킹 모듈 (None이면 환경 변수 RAG_RERANKER로 생성, 기본값: none)
             formatter: 문서 포맷터
             max_context_length: 최대 컨텍스트 길이
             max_documents: 최대 문서 수
             llm_generator: LLM 생성기
             enable_generation: 생성 기능 활성화 여부
+            vector_backend: 벡터 검색 백엔드 ('pgvector' 또는 'local', None이면 RAG_VECTOR_BACKEND)
+            retrieval_mode: 검색 방식 ('vector', 'hybrid'(FTS + 벡터 RRF) 또는
+                'cascade'(작은 모델 후보 + model_type 저장 벡터 재정렬), None이면 환경 변수 RAG_RETRIEVAL_MODE, 기본값: vector)
+            semantic_cache: 시맨틱 결과/답변 캐시 (None이면 프로세스 전역 캐시,
+                RAG_SEMANTIC_CACHE_SIZE 미설정 시 비활성화)
         """
         # 기본 모델 타입 설정
         if model_type is None:
             model_type = get_default_model_type()
 
+        # 리랭커 (미지정 시 RAG_RERANKER)
+        if reranker is None:
+            reranker = create_reranker()
+
         # Retrieval 컴포넌트
-        self.retriever = Retriever(
+        retrieval_mode = (retrieval_mode or os.getenv('RAG_RETRIEVAL_MODE', 'vector')).lower()
+        retriever_classes = {'vector': Retriever, 'hybrid': HybridRetriever, 'cascade': CascadeRetriever}
+        if retrieval_mode not in retriever_classes:
+            raise ValueError(f"Unknown retrieval mode: {retrieval_mode}")
+        retriever_class = retriever_classes[retrieval_mode]
+        self.retriever = retriever_class(
             model_type=model_type,
             db_config=db_config,
             device=device,
-            reranker=reranker
+            reranker=reranker,
+            vector_backend=vector_backend,
+            semantic_cache=semantic_cache
         )
 
         # Augmentation 컴포넌트
@@ -93,7 +117,8 @@ class RAGSystem:
         top_k: int = 5,
         min_similarity: float = 0.0,
         use_reranker: bool = True,
-        context_type: str = "general"
+        context_type: str = "general",
+        filters: Optional[SearchFilter] = None
     ) -> RAGResponse:
         """
         검색 및 증강 수행 (R + A)
@@ -104,6 +129,7 @@ class RAGSystem:
             min_similarity: 최소 유사도
             use_reranker: 리랭킹 사용 여부
             context_type: 컨텍스트 타입
+            filters: 메타데이터 필터 (소스 타입, 청크 타입, 문서 ID)
             
         Returns:
             RAG 응답 (검색 + 증강 결과)
@@ -115,7 +141,8 @@ class RAGSystem:
             query=query,
             top_k=top_k,
             min_similarity=min_similarity,
-            use_reranker=use_reranker
+            use_reranker=use_reranker,
+            filters=filters
         )
         
         # 2. Augmentation: 컨텍스트 생성
@@ -145,7 +172,8 @@ class RAGSystem:
         query: str,
         top_k: int = 5,
         min_similarity: float = 0.0,
-        use_reranker: bool = True
+        use_reranker: bool = True,
+        filters: Optional[SearchFilter] = None
     ) -> List[Dict[str, Any]]:
         """
         검색만 수행 (R만)
@@ -155,6 +183,7 @@ class RAGSystem:
             top_k: 검색할 문서 수
             min_similarity: 최소 유사도
             use_reranker: 리랭킹 사용 여부
+            filters: 메타데이터 필터 (소스 타입, 청크 타입, 문서 ID)
             
         Returns:
             검색 결과 리스트
@@ -163,7 +192,8 @@ class RAGSystem:
             query=query,
             top_k=top_k,
             min_similarity=min_similarity,
-            use_reranker=use_reranker
+            use_reranker=use_reranker,
+            filters=filters
         )
     
     def augment_only(
@@ -196,7 +226,8 @@ class RAGSystem:
         min_similarity: float = 0.0,
         use_reranker: bool = True,
         context_type: str = "general",
-        generation_config: Optional[GenerationConfig] = None
+        generation_config: Optional[GenerationConfig] = None,
+        filters: Optional[SearchFilter] = None
     ) -> RAGResponse:
         """
         전체 RAG 파이프라인 수행 (R + A + G)
@@ -208,6 +239,7 @@ class RAGSystem:
             use_reranker: 리랭킹 사용 여부
             context_type: 컨텍스트 타입
             generation_config: 생성 설정
+            filters: 메타데이터 필터 (소스 타입, 청크 타입, 문서 ID)
 
         Returns:
             완전한 RAG 응답 (검색 + 증강 + 생성)
@@ -223,9 +255,27 @@ class RAGSystem:
             top_k=top_k,
             min_similarity=min_similarity,
             use_reranker=use_reranker,
-            context_type=context_type
+            context_type=context_type,
+            filters=filters
         )
 
+        # 의미가 같은 이전 질문의 답변이 있으면 생성 생략 (더 엄격한 임계값 + 같은 검색 결과일 때만)
+        semantic_cache = self.retriever.semantic_cache
+        chunk_ids = [doc.get('chunk_id') for doc in response.retrieved_documents]
+        if semantic_cache is not None:
+            query_embedding = self.retriever.encoder.encode_query_array(query)  # 쿼리 임베딩 캐시 적중
+            cache_namespace = self.retriever.cache_namespace(
+                top_k, min_similarity, True, use_reranker, filters=filters
+            )
+            answer_key = self._answer_cache_key(generation_config, context_type)
+            cached_answer = semantic_cache.get_answer(cache_namespace, query_embedding, answer_key, chunk_ids)
+            if cached_answer is not None:
+                logger.info("Semantic cache hit: reusing generated answer")
+                response.generated_answer = cached_answer
+                response.metadata['generation_enabled'] = True
+                response.metadata['semantic_cache_hit'] = True
+                return response
+
         # 2. Generation
         generated_answer = self.generator.generate(
             query=query,
@@ -236,9 +286,27 @@ class RAGSystem:
         response.generated_answer = generated_answer
         response.metadata['generation_enabled'] = True
 
+        if semantic_cache is not None:
+            semantic_cache.put_answer(cache_namespace, query_embedding, answer_key, generated_answer, chunk_ids)
+
         logger.info(f"Full RAG pipeline completed: answer length = {len(generated_answer.answer)} chars")
         return response
 
+    def _answer_cache_key(
+        self,
+        generation_config: Optional[GenerationConfig],
+        context_type: str
+    ) -> str:
+        """답변 캐시 키 (생성 설정 + 포맷터)"""
+        if generation_config is None:
+            config_key = 'default'
+        else:
+            config_key = (
+                f"{generation_config.model}|{generation_config.temperature}|"
+                f"{generation_config.max_tokens}|{generation_config.top_p}"
+            )
+        return f"{type(self.generator).__name__}|{config_key}|{self.formatter.name}|{context_type}"
+
     def get_context_for_llm(
         self,
         query: str,
@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+2단계 캐스케이드 검색
+작은 모델(E5-small, 384차원) 쿼리로 넓은 후보를 HNSW 검색한 뒤,
+후보의 저장된 큰 모델(E5-large) 임베딩을 chunk_id로 조회해 큰 모델 쿼리로 재정렬
+- 문서 재인코딩 없음 (임베딩 테이블에 이미 저장된 벡터 사용)
+- 인덱스 탐색은 작은 인덱스에서만, 큰 모델 거리 계산은 후보 수만큼만 수행
+- pgvector 백엔드는 두 단계를 한 번의 SQL로 실행
+"""
+
+import logging
+import os
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from .retriever import Retriever
+from .reranker import BaseReranker
+from .semantic_cache import SemanticCache
+from ..models.remote import create_encoder
+from ..models.config import EmbeddingModelType, MODEL_ALIASES, get_embedding_table
+from ..vectorstore.local_index import LocalVectorIndex, get_local_index
+from ..vectorstore.recall import RecallProfile
+from ..vectorstore.vector_adapter import PgVector
+from ..vectorstore.filters import SearchFilter, distance_order
+
+logger = logging.getLogger(__name__)
+
+
+class CascadeRetriever(Retriever):
+    """작은 모델 후보 검색 + 큰 모델 저장 벡터 재정렬 리트리버"""
+
+    result_fields = ('candidate_similarity', 'candidate_rank')
+
+    def __init__(
+        self,
+        model_type: EmbeddingModelType = EmbeddingModelType.MULTILINGUAL_E5_LARGE,
+        db_config: Optional[Dict[str, str]] = None,
+        device: Optional[str] = None,
+        reranker: Optional[BaseReranker] = None,
+        vector_backend: Optional[str] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        recall_profile: Optional[str] = None,
+        candidate_model_type: Optional[EmbeddingModelType] = None,
+        candidate_k: Optional[int] = None
+    ):
+        """
+        Args:
+            model_type: 재정렬(최종 순위)에 사용할 모델
+            db_config: 데이터베이스 연결 설정
+            device: 디바이스 ('cuda', 'cpu', None)
+            reranker: 리랭킹 모듈 (선택사항)
+            vector_backend: 벡터 검색 백엔드 ('pgvector' 또는 'local')
+            semantic_cache: 시맨틱 결과 캐시 (None이면 프로세스 전역 캐시)
+            recall_profile: 기본 검색 정확도 프로파일 (None이면 RAG_RECALL_PROFILE)
+            candidate_model_type: 후보 검색 모델 (None이면 환경 변수 RAG_CASCADE_CANDIDATE_MODEL,
+                기본값: E5_SMALL)
+            candidate_k: 후보 수 (None이면 환경 변수 RAG_CASCADE_CANDIDATES,
+                기본값: max(top_k * 10, 50))
+        """
+        super().__init__(
+            model_type=model_type,
+            db_config=db_config,
+            device=device,
+            reranker=reranker,
+            vector_backend=vector_backend,
+            semantic_cache=semantic_cache,
+            recall_profile=recall_profile
+        )
+        if candidate_model_type is None:
+            alias = os.getenv('RAG_CASCADE_CANDIDATE_MODEL', 'E5_SMALL').upper()
+            if alias not in MODEL_ALIASES:
+                raise ValueError(f"Unknown cascade candidate model: {alias}")
+            candidate_model_type = MODEL_ALIASES[alias]
+        self.candidate_model_type = candidate_model_type
+        self.candidate_encoder = create_encoder(candidate_model_type, device)
+        self.candidate_table = get_embedding_table(candidate_model_type)
+        self.rescore_table = get_embedding_table(model_type)
+
+        env_candidates = os.getenv('RAG_CASCADE_CANDIDATES')
+        self.candidate_k = candidate_k if candidate_k is not None else (
+            int(env_candidates) if env_candidates else None
+        )
+        self.candidate_index: Optional[LocalVectorIndex] = (
+            get_local_index(candidate_model_type) if self.local_index is not None else None
+        )
+        if self.candidate_index is not None and not self.candidate_index.exists():
+            # 후보 모델 인덱스가 없으면 두 단계 모두 pgvector로 검색
+            logger.warning(
+                f"Local vector index not found at {self.candidate_index.path}, "
+                f"cascade falls back to pgvector"
+            )
+            self.vector_backend = 'pgvector'
+            self.local_index = None
+            self.candidate_index = None
+
+        logger.info(
+            f"Cascade retrieval enabled: {self.candidate_encoder.get_display_name()} candidates "
+            f"→ {self.encoder.get_display_name()} rescoring"
+        )
+
+    def _candidates(self, top_k: int) -> int:
+        return self.candidate_k or max(top_k * 10, 50)
+
+    def cache_namespace(self, *args, **kwargs) -> str:
+        return f"{super().cache_namespace(*args, **kwargs)}|{self.candidate_model_type.value}"
+
+    def _retrieve(
+        self,
+        query: str,
+        query_embedding: np.ndarray,
+        top_k: int,
+        min_similarity: float,
+        profile: RecallProfile,
+        filters: Optional[SearchFilter] = None
+    ) -> List[Dict[str, Any]]:
+        """후보 모델로 후보 검색 후 저장된 재정렬 모델 벡터로 순위 재계산"""
+        candidate_embedding = self.candidate_encoder.encode_query_array(query)
+        if self.local_index is not None:
+            return self._retrieve_local(
+                candidate_embedding, query_embedding, top_k, min_similarity, profile, filters
+            )
+        return self._retrieve_sql(
+            np.atleast_2d(candidate_embedding), np.atleast_2d(query_embedding),
+            top_k, min_similarity, profile, filters
+        )[0]
+
+    def _retrieve_batch(
+        self,
+        queries: List[str],
+        query_embeddings: np.ndarray,
+        top_k: int,
+        min_similarity: float,
+        profile: RecallProfile,
+        filters: Optional[SearchFilter] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """배치 캐스케이드 검색 (후보 모델 인코딩 1회 + SQL 1회)"""
+        candidate_embeddings = self.candidate_encoder.encode_queries_array(queries)
+        if self.local_index is not None:
+            return [
+                self._retrieve_local(candidate, query_embedding, top_k, min_similarity, profile, filters)
+                for candidate, query_embedding in zip(candidate_embeddings, query_embeddings)
+            ]
+        return self._retrieve_sql(
+            candidate_embeddings, query_embeddings, top_k, min_similarity, profile, filters
+        )
+
+    def _retrieve_sql(
+        self,
+        candidate_embeddings: np.ndarray,
+        query_embeddings: np.ndarray,
+        top_k: int,
+        min_similarity: float,
+        profile: RecallProfile,
+        filters: Optional[SearchFilter] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """두 단계를 unnest + LATERAL 한 번의 쿼리로 수행 (큰 모델 벡터는 chunk_id 유니크 인덱스로 조회)"""
+        candidates = self._candidates(top_k)
+        filter_sql, filter_params = filters.to_sql('e', 'dc') if filters else ('', [])
+        filter_join = "JOIN vector_db.document_chunks dc ON e.chunk_id = dc.id" if filter_sql else ''
+
+        with self.vector_store.pool.connection() as conn, conn.cursor() as cur:
+            strategy = self.vector_store.apply_search_settings(
+                cur, self.candidate_table, profile, candidates, filters=filters
+            )
+            candidate_order = distance_order('e.embedding', 'q.candidate', strategy)
+            sql = f"""
+                SELECT q.idx, r.chunk_id, r.content, r.similarity, r.metadata,
+                       r.candidate_similarity, r.candidate_rank
+                FROM unnest(%s::vector[], %s::vector[]) WITH ORDINALITY AS q(candidate, rescore, idx)
+                CROSS JOIN LATERAL (
+                    SELECT dc.id AS chunk_id, dc.content,
+                           1 - (l.embedding <=> q.rescore) AS similarity,
+                           dc.metadata, c.candidate_similarity, c.candidate_rank
+                    FROM (
+                        SELECT s.chunk_id,
+                               1 - s.distance AS candidate_similarity,
+                               ROW_NUMBER() OVER (ORDER BY s.distance, s.chunk_id) AS candidate_rank
+                        FROM (
+                            SELECT e.chunk_id, e.embedding <=> q.candidate AS distance
+                            FROM vector_db.{self.candidate_table} e
+                            {filter_join}
+                            WHERE TRUE{filter_sql}
+                            ORDER BY {candidate_order}
+                            LIMIT %s
+                        ) s
+                    ) c
+                    JOIN vector_db.{self.rescore_table} l ON l.chunk_id = c.chunk_id
+                    JOIN vector_db.document_chunks dc ON dc.id = c.chunk_id
+                    WHERE 1 - (l.embedding <=> q.rescore) >= %s
+                    ORDER BY l.embedding <=> q.rescore, dc.id
+                    LIMIT %s
+                ) r
+                ORDER BY q.idx, r.similarity DESC
+            """
+            # vector[] 파라미터는 행 단위 PgVector 리스트 (행렬의 행 view, 복사 없음)
+            params = [
+                [PgVector(e) for e in np.asarray(candidate_embeddings, dtype=np.float32)],
+                [PgVector(e) for e in np.asarray(query_embeddings, dtype=np.float32)],
+                *filter_params, candidates, min_similarity, top_k
+            ]
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+
+        batch_results: List[List[Dict[str, Any]]] = [[] for _ in query_embeddings]
+        for row in rows:
+            batch_results[row[0] - 1].append({
+                'chunk_id': row[1],
+                'content': row[2],
+                'similarity': float(row[3]),
+                'metadata': row[4],
+                'candidate_similarity': float(row[5]),
+                'candidate_rank': row[6]
+            })
+        return batch_results
+
+    def _retrieve_local(
+        self,
+        candidate_embedding: np.ndarray,
+        query_embedding: np.ndarray,
+        top_k: int,
+        min_similarity: float,
+        profile: RecallProfile,
+        filters: Optional[SearchFilter] = None
+    ) -> List[Dict[str, Any]]:
+        """로컬 인덱스: 후보 모델 인덱스 검색 + 재정렬 모델 인덱스의 저장 벡터로 내적"""
+        hits = self.candidate_index.search(
+            candidate_embedding, self._candidates(top_k), 0.0, nprobe=profile.local_nprobe,
+            allowed_ids=self._allowed_chunk_ids(filters)
+        )
+        if not hits:
+            return []
+
+        vectors = self.local_index.get_vectors([chunk_id for chunk_id, _ in hits])
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        query = query / norm if norm else query
+
+        scored = []
+        for rank, (chunk_id, candidate_similarity) in enumerate(hits, start=1):
+            vector = vectors.get(chunk_id)
+            if vector is None:
+                # 재정렬 모델 임베딩이 없는 청크
+                continue
+            similarity = float(vector @ query)
+            if similarity >= min_similarity:
+                scored.append((similarity, chunk_id, candidate_similarity, rank))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        scored = scored[:top_k]
+
+        chunks = self.vector_store.fetch_chunks([chunk_id for _, chunk_id, _, _ in scored])
+        results = []
+        for similarity, chunk_id, candidate_similarity, rank in scored:
+            chunk = chunks.get(chunk_id)
+            if chunk is None:
+                continue
+            results.append({
+                'chunk_id': chunk_id,
+                'content': chunk['content'],
+                'similarity': similarity,
+                'metadata': chunk['metadata'],
+                'candidate_similarity': candidate_similarity,
+                'candidate_rank': rank
+            })
+        return results
@@ -0,0 +1,354 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+하이브리드 리트리버
+document_chunks 전문 검색(FTS, GIN 인덱스)과 HNSW 벡터 검색을 한 번의 쿼리로 수행하고
+Reciprocal Rank Fusion(RRF)으로 결합
+- 상품명, 조항 번호 등 정확한 용어가 포함된 질의도 후보 수를 늘리지 않고 검색
+- 키워드 점수 계산을 Python이 아닌 DB에서 수행
+"""
+
+import logging
+import os
+import re
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from ..models.config import EmbeddingModelType, get_embedding_table
+from ..vectorstore.recall import RecallProfile
+from ..vectorstore.vector_adapter import PgVector
+from ..vectorstore.filters import SearchFilter, distance_order
+from .reranker import BaseReranker
+from .retriever import Retriever
+from .semantic_cache import SemanticCache
+
+logger = logging.getLogger(__name__)
+
+# schema.sql의 idx_document_chunks_content_fts와 같은 텍스트 검색 설정
+FTS_CONFIG = 'simple'
+
+_TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def build_tsquery(query: str, prefix_min_length: int = 2) -> str:
+    """
+    질의를 OR 결합 tsquery 문자열로 변환
+    조사가 붙은 한국어 어절도 매칭되도록 2글자 이상 토큰은 접두 검색(:*) 사용
+
+    Returns:
+        to_tsquery()에 넘길 문자열 (토큰이 없으면 빈 문자열)
+    """
+    terms = []
+    seen = set()
+    for token in _TOKEN_PATTERN.findall(query.lower()):
+        if token in seen:
+            continue
+        seen.add(token)
+        if len(token) >= prefix_min_length:
+            terms.append(f"'{token}':*")
+        elif token.isdigit():
+            terms.append(f"'{token}'")
+    return ' | '.join(terms)
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: List[List[int]],
+    weights: Optional[List[float]] = None,
+    k: int = 60
+) -> Dict[int, float]:
+    """
+    RRF 점수 계산: sum(weight / (k + rank))
+
+    Args:
+        ranked_lists: 순위 순서의 chunk_id 리스트들
+        weights: 리스트별 가중치 (기본값: 모두 1.0)
+        k: RRF 상수
+
+    Returns:
+        {chunk_id: rrf_score}
+    """
+    weights = weights or [1.0] * len(ranked_lists)
+    scores: Dict[int, float] = {}
+    for ranked, weight in zip(ranked_lists, weights):
+        for rank, chunk_id in enumerate(ranked, start=1):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + weight / (k + rank)
+    return scores
+
+
+class HybridRetriever(Retriever):
+    """FTS + 벡터 검색 RRF 결합 리트리버"""
+
+    result_fields = ('rrf_score', 'vector_rank', 'lexical_rank', 'lexical_score')
+
+    def __init__(
+        self,
+        model_type: EmbeddingModelType = EmbeddingModelType.MULTILINGUAL_E5_SMALL,
+        db_config: Optional[Dict[str, str]] = None,
+        device: Optional[str] = None,
+        reranker: Optional[BaseReranker] = None,
+        vector_backend: Optional[str] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        recall_profile: Optional[str] = None,
+        rrf_k: Optional[int] = None,
+        candidate_k: Optional[int] = None,
+        vector_weight: float = 1.0,
+        lexical_weight: float = 1.0
+    ):
+        """
+        Args:
+            model_type: 사용할 임베딩 모델
+            db_config: 데이터베이스 연결 설정
+            device: 디바이스 ('cuda', 'cpu', None)
+            reranker: 리랭킹 모듈 (선택사항)
+            vector_backend: 벡터 검색 백엔드 ('pgvector' 또는 'local')
+            semantic_cache: 시맨틱 결과 캐시 (None이면 프로세스 전역 캐시)
+            recall_profile: 기본 검색 정확도 프로파일 (None이면 RAG_RECALL_PROFILE)
+            rrf_k: RRF 상수 (None이면 환경 변수 RAG_HYBRID_RRF_K, 기본값: 60)
+            candidate_k: 검색 방식별 후보 수 (None이면 환경 변수 RAG_HYBRID_CANDIDATES,
+                기본값: max(top_k * 4, 20))
+            vector_weight: 벡터 검색 순위 가중치
+            lexical_weight: 전문 검색 순위 가중치
+        """
+        super().__init__(
+            model_type=model_type,
+            db_config=db_config,
+            device=device,
+            reranker=reranker,
+            vector_backend=vector_backend,
+            semantic_cache=semantic_cache,
+            recall_profile=recall_profile
+        )
+        self.embedding_table = get_embedding_table(model_type)
+        self.rrf_k = rrf_k if rrf_k is not None else int(os.getenv('RAG_HYBRID_RRF_K', '60'))
+        env_candidates = os.getenv('RAG_HYBRID_CANDIDATES')
+        self.candidate_k = candidate_k if candidate_k is not None else (
+            int(env_candidates) if env_candidates else None
+        )
+        self.vector_weight = vector_weight
+        self.lexical_weight = lexical_weight
+
+        logger.info(
+            f"Hybrid retrieval enabled (rrf_k={self.rrf_k}, "
+            f"weights: vector={vector_weight}, lexical={lexical_weight})"
+        )
+
+    def _candidates(self, top_k: int) -> int:
+        return self.candidate_k or max(top_k * 4, 20)
+
+    def _retrieve(
+        self,
+        query: str,
+        query_embedding: np.ndarray,
+        top_k: int,
+        min_similarity: float,
+        profile: RecallProfile,
+        filters: Optional[SearchFilter] = None
+    ) -> List[Dict[str, Any]]:
+        """FTS + 벡터 후보를 RRF로 결합"""
+        tsquery = build_tsquery(query)
+        if not tsquery:
+            # 검색어 토큰이 없으면 벡터 검색만 수행
+            return super()._retrieve(query, query_embedding, top_k, min_similarity, profile, filters)
+
+        if self.local_index is not None:
+            return self._retrieve_local(query_embedding, tsquery, top_k, min_similarity, profile, filters)
+        return self._retrieve_sql(query_embedding, tsquery, top_k, min_similarity, profile, filters)
+
+    def _retrieve_batch(
+        self,
+        queries: List[str],
+        query_embeddings: np.ndarray,
+        top_k: int,
+        min_similarity: float,
+        profile: RecallProfile,
+        filters: Optional[SearchFilter] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """쿼리별 하이브리드 검색 (인코딩은 배치로 이미 수행됨)"""
+        return [
+            self._retrieve(query, query_embedding, top_k, min_similarity, profile, filters)
+            for query, query_embedding in zip(queries, query_embeddings)
+        ]
+
+    def _retrieve_sql(
+        self,
+        query_embedding: np.ndarray,
+        tsquery: str,
+        top_k: int,
+        min_similarity: float,
+        profile: RecallProfile,
+        filters: Optional[SearchFilter] = None
+    ) -> List[Dict[str, Any]]:
+        """FTS와 HNSW 검색 및 RRF 결합을 하나의 쿼리로 수행"""
+        table = self.embedding_table
+        vector_filter, vector_filter_params = ('', {})
+        lexical_filter, lexical_filter_params = ('', {})
+        vector_join = ''
+        if filters is not None and not filters.is_empty():
+            vector_filter, vector_filter_params = filters.to_named_sql('e', 'fdc', prefix='vec')
+            lexical_filter, lexical_filter_params = filters.to_named_sql(None, 'dc', prefix='lex')
+            vector_join = 'JOIN vector_db.document_chunks fdc ON fdc.id = e.chunk_id'
+        candidates = self._candidates(top_k)
+        with self.vector_store.pool.connection() as conn, conn.cursor() as cur:
+            # 최소 유사도는 후보 LIMIT 이후에 적용되므로 인덱스 단계 조건은 메타데이터 필터뿐
+            strategy = self.vector_store.apply_search_settings(cur, table, profile, candidates, filters=filters)
+            vector_order = distance_order('e.embedding', '(SELECT embedding FROM q)', strategy)
+            # 쿼리 벡터/tsquery는 CTE로 한 번만 바인딩, 스칼라 서브쿼리로 참조해야 인덱스 사용
+            sql = f"""
+                WITH q AS MATERIALIZED (
+                    SELECT %(embedding)s AS embedding,
+                           to_tsquery('{FTS_CONFIG}', %(tsquery)s) AS tsq
+                ),
+                vec AS (
+                    SELECT chunk_id, 1 - distance AS similarity,
+                           ROW_NUMBER() OVER (ORDER BY distance) AS rank
+                    FROM (
+                        SELECT e.chunk_id, e.embedding <=> (SELECT embedding FROM q) AS distance
+                        FROM vector_db.{table} e
+                        {vector_join}
+                        WHERE TRUE{vector_filter}
+                        ORDER BY {vector_order}
+                        LIMIT %(candidates)s
+                    ) v
+                    WHERE 1 - distance >= %(min_similarity)s
+                ),
+                lex AS (
+                    SELECT chunk_id, score,
+                           ROW_NUMBER() OVER (ORDER BY score DESC, chunk_id) AS rank
+                    FROM (
+                        SELECT dc.id AS chunk_id,
+                               ts_rank_cd(to_tsvector('{FTS_CONFIG}', dc.content), (SELECT tsq FROM q)) AS score
+                        FROM vector_db.document_chunks dc
+                        WHERE to_tsvector('{FTS_CONFIG}', dc.content) @@ (SELECT tsq FROM q){lexical_filter}
+                        ORDER BY score DESC, dc.id
+                        LIMIT %(candidates)s
+                    ) l
+                ),
+                fused AS (
+                    SELECT COALESCE(vec.chunk_id, lex.chunk_id) AS chunk_id,
+                           COALESCE(%(vector_weight)s / (%(rrf_k)s + vec.rank), 0)
+                             + COALESCE(%(lexical_weight)s / (%(rrf_k)s + lex.rank), 0) AS rrf_score,
+                           vec.similarity, vec.rank AS vector_rank,
+                           lex.rank AS lexical_rank, lex.score AS lexical_score
+                    FROM vec FULL OUTER JOIN lex ON vec.chunk_id = lex.chunk_id
+                    ORDER BY rrf_score DESC, chunk_id
+                    LIMIT %(top_k)s
+                )
+                SELECT f.chunk_id, dc.content,
+                       COALESCE(f.similarity, 1 - (e.embedding <=> (SELECT embedding FROM q)), 0) AS similarity,
+                       dc.metadata, f.rrf_score, f.vector_rank, f.lexical_rank, f.lexical_score
+                FROM fused f
+                JOIN vector_db.document_chunks dc ON dc.id = f.chunk_id
+                LEFT JOIN vector_db.{table} e ON e.chunk_id = f.chunk_id
+                ORDER BY f.rrf_score DESC, f.chunk_id
+            """
+            params = {
+                'embedding': PgVector(query_embedding),
+                'tsquery': tsquery,
+                'candidates': candidates,
+                'min_similarity': min_similarity,
+                'vector_weight': float(self.vector_weight),
+                'lexical_weight': float(self.lexical_weight),
+                'rrf_k': self.rrf_k,
+                'top_k': top_k,
+                **vector_filter_params,
+                **lexical_filter_params
+            }
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+
+        return [
+            {
+                'chunk_id': row[0],
+                'content': row[1],
+                'similarity': float(row[2]),
+                'metadata': row[3],
+                'rrf_score': float(row[4]),
+                'vector_rank': row[5],
+                'lexical_rank': row[6],
+                'lexical_score': float(row[7]) if row[7] is not None else None
+            }
+            for row in rows
+        ]
+
+    def _retrieve_local(
+        self,
+        query_embedding: np.ndarray,
+        tsquery: str,
+        top_k: int,
+        min_similarity: float,
+        profile: RecallProfile,
+        filters: Optional[SearchFilter] = None
+    ) -> List[Dict[str, Any]]:
+        """로컬 벡터 인덱스 + DB 전문 검색 후 RRF 결합"""
+        candidates = self._candidates(top_k)
+        vector_hits = self.local_index.search(
+            query_embedding, candidates, min_similarity, nprobe=profile.local_nprobe,
+            allowed_ids=self._allowed_chunk_ids(filters)
+        )
+        lexical_hits = self._lexical_search(tsquery, candidates, filters)
+
+        vector_ranked = [chunk_id for chunk_id, _ in vector_hits]
+        lexical_ranked = [chunk_id for chunk_id, _ in lexical_hits]
+        scores = reciprocal_rank_fusion(
+            [vector_ranked, lexical_ranked],
+            [self.vector_weight, self.lexical_weight],
+            self.rrf_k
+        )
+        fused = sorted(scores, key=lambda chunk_id: (-scores[chunk_id], chunk_id))[:top_k]
+
+        similarities = dict(vector_hits)
+        missing = [chunk_id for chunk_id in fused if chunk_id not in similarities]
+        if missing:
+            for chunk_id, vector in self.local_index.get_vectors(missing).items():
+                similarities[chunk_id] = self._cosine(query_embedding, vector)
+
+        vector_rank = {chunk_id: rank for rank, chunk_id in enumerate(vector_ranked, start=1)}
+        lexical = {chunk_id: (rank, score) for rank, (chunk_id, score) in enumerate(lexical_hits, start=1)}
+        chunks = self.vector_store.fetch_chunks(fused)
+
+        results = []
+        for chunk_id in fused:
+            chunk = chunks.get(chunk_id)
+            if chunk is None:
+                continue
+            lexical_rank, lexical_score = lexical.get(chunk_id, (None, None))
+            results.append({
+                'chunk_id': chunk_id,
+                'content': chunk['content'],
+                'similarity': float(similarities.get(chunk_id, 0.0)),
+                'metadata': chunk['metadata'],
+                'rrf_score': scores[chunk_id],
+                'vector_rank': vector_rank.get(chunk_id),
+                'lexical_rank': lexical_rank,
+                'lexical_score': lexical_score
+            })
+        return results
+
+    def _lexical_search(
+        self,
+        tsquery: str,
+        limit: int,
+        filters: Optional[SearchFilter] = None
+    ) -> List[Tuple[int, float]]:
+        """전문 검색 (GIN 인덱스 사용)"""
+        filter_sql, filter_params = filters.to_sql(None, 'dc') if filters else ('', [])
+        with self.vector_store.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT dc.id, ts_rank_cd(to_tsvector('{FTS_CONFIG}', dc.content), q) AS score
+                FROM vector_db.document_chunks dc, to_tsquery('{FTS_CONFIG}', %s) q
+                WHERE to_tsvector('{FTS_CONFIG}', dc.content) @@ q{filter_sql}
+                ORDER BY score DESC, dc.id
+                LIMIT %s
+                """,
+                [tsquery, *filter_params, limit]
+            )
+            return [(row[0], float(row[1])) for row in cur.fetchall()]
+
+    @staticmethod
+    def _cosine(a, b) -> float:
+        a = np.asarray(a, dtype=np.float32)
+        b = np.asarray(b, dtype=np.float32)
+        denom = float(np.linalg.norm(a) * np.linalg.norm(b))
+        return float(np.dot(a, b) / denom) if denom else 0.0
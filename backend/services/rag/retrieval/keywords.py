@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+키워드 추출
+KeywordReranker와 데이터 수집 파이프라인이 공유하는 키워드 추출기
+- 정규식: 한글/영문/숫자 2글자 이상 단어
+- LLM(Ollama): 도메인 핵심 키워드 + 동의어, 실패 시 정규식으로 대체
+- 청크 키워드는 수집 시 한 번 추출해 document_chunks.keywords에 저장하고,
+  검색 시에는 쿼리 키워드만 추출 (크기 제한 LRU 캐시, 백그라운드 선행 추출)
+"""
+
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEYWORD_MODEL = "gemma3:4b"
+
+
+def extract_keywords_with_regex(text: str) -> List[str]:
+    """정규식 기반 키워드 추출 (기본 방식)"""
+    # 한글, 영문, 숫자만 추출
+    words = re.findall(r'[가-힣a-zA-Z0-9]+', text.lower())
+    # 2글자 이상만 유효한 키워드로 간주
+    return [word for word in words if len(word) >= 2]
+
+
+class KeywordExtractor:
+    """LLM/정규식 키워드 추출기 (크기 제한 LRU 캐시 + 병렬 배치 추출)"""
+
+    def __init__(
+        self,
+        use_llm: bool = True,
+        llm_generator=None,
+        llm_model: str = DEFAULT_KEYWORD_MODEL,
+        cache_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        timeout: float = 10.0
+    ):
+        """
+        Args:
+            use_llm: LLM을 사용한 키워드 추출 여부
+            llm_generator: LLM 생성기 인스턴스 (None이면 OLLAMA_BASE_URL로 자동 초기화)
+            llm_model: LLM 모델명
+            cache_size: 캐시할 텍스트 수 (None이면 환경 변수 RAG_KEYWORD_CACHE_SIZE, 기본값: 1024)
+            max_workers: 병렬 LLM 요청 수 (None이면 환경 변수 RAG_KEYWORD_WORKERS, 기본값: 4)
+            timeout: LLM 요청 타임아웃 (초)
+        """
+        if cache_size is None:
+            cache_size = int(os.getenv('RAG_KEYWORD_CACHE_SIZE', '1024'))
+        if max_workers is None:
+            max_workers = int(os.getenv('RAG_KEYWORD_WORKERS', '4'))
+
+        self.use_llm = use_llm
+        self.llm_model = llm_model
+        self.cache_size = cache_size
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+
+        self.llm_generator = None
+        if self.use_llm:
+            if llm_generator is None:
+                from ..generation.generator import OllamaGenerator
+                # 환경 변수에서 Ollama URL 읽기 (Docker에서 호스트 접근용)
+                ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+                self.llm_generator = OllamaGenerator(
+                    base_url=ollama_base_url,
+                    default_model=self.llm_model
+                )
+                logger.info(f"KeywordExtractor: LLM 키워드 추출 활성화 (모델: {self.llm_model}, URL: {ollama_base_url})")
+            else:
+                self.llm_generator = llm_generator
+
+        self._cache: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def method(self) -> str:
+        """추출 방식 이름 (저장된 키워드 출처 기록용)"""
+        return f"llm:{self.llm_model}" if self.use_llm and self.llm_generator else "regex"
+
+    def extract(self, text: str) -> List[str]:
+        """
+        텍스트 키워드 추출 (캐시 → 진행 중인 선행 추출 → 새로 추출)
+
+        Args:
+            text: 쿼리 또는 청크 텍스트
+
+        Returns:
+            키워드 리스트
+        """
+        if not text:
+            return []
+
+        with self._lock:
+            keywords = self._cache.get(text)
+            if keywords is not None:
+                self._cache.move_to_end(text)
+                return keywords
+            pending = self._pending.get(text)
+
+        if pending is not None:
+            return pending.result()
+
+        keywords = self._extract_uncached(text)
+        self._remember(text, keywords)
+        return keywords
+
+    def prefetch(self, text: str) -> Optional[Future]:
+        """
+        백그라운드 키워드 추출 시작 (쿼리 임베딩/벡터 검색과 LLM 호출을 겹치기 위해 사용)
+        이후 extract(text)는 이 결과를 기다려 재사용
+
+        Returns:
+            Future (캐시에 있거나 정규식 방식이면 None)
+        """
+        if not text or not self.use_llm or self.llm_generator is None:
+            return None
+
+        with self._lock:
+            if text in self._cache:
+                return None
+            future = self._pending.get(text)
+            if future is not None:
+                return future
+            future = self._get_executor().submit(self._extract_and_remember, text)
+            self._pending[text] = future
+        return future
+
+    def extract_batch(self, texts: Sequence[str]) -> List[List[str]]:
+        """
+        여러 텍스트 키워드 추출 (LLM 요청은 스레드 풀에서 병렬 실행, 결과는 입력 순서)
+
+        Args:
+            texts: 텍스트 리스트
+
+        Returns:
+            텍스트별 키워드 리스트
+        """
+        if not self.use_llm or self.llm_generator is None:
+            return [extract_keywords_with_regex(text) if text else [] for text in texts]
+
+        unique_texts = list(dict.fromkeys(text for text in texts if text))
+        results: Dict[str, List[str]] = {}
+        to_extract = []
+        with self._lock:
+            for text in unique_texts:
+                keywords = self._cache.get(text)
+                if keywords is not None:
+                    results[text] = keywords
+                else:
+                    to_extract.append(text)
+
+        if to_extract:
+            executor = self._get_executor()
+            for text, keywords in zip(to_extract, executor.map(self._extract_uncached, to_extract)):
+                results[text] = keywords
+                self._remember(text, keywords)
+
+        return [results.get(text, []) if text else [] for text in texts]
+
+    def close(self):
+        """스레드 풀 종료"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="keyword")
+        return self._executor
+
+    def _extract_and_remember(self, text: str) -> List[str]:
+        try:
+            keywords = self._extract_uncached(text)
+            self._remember(text, keywords)
+            return keywords
+        finally:
+            with self._lock:
+                self._pending.pop(text, None)
+
+    def _remember(self, text: str, keywords: List[str]):
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[text] = keywords
+            self._cache.move_to_end(text)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _extract_uncached(self, text: str) -> List[str]:
+        if self.use_llm and self.llm_generator:
+            return self._extract_with_llm(text)
+        return extract_keywords_with_regex(text)
+
+    def _extract_with_llm(self, text: str) -> List[str]:
+        """LLM을 사용한 키워드 추출"""
+        try:
+            if isinstance(self.llm_generator, type):  # 클래스인 경우
+                raise ValueError("llm_generator must be an instance, not a class")
+
+            # Ollama API 직접 호출 (generate 메서드의 프롬프트 템플릿 우회)
+            payload = {
+                "model": self.llm_model,
+                "prompt": self._create_prompt(text),
+                "stream": False,
+                "options": {
+                    "temperature": 0.3,
+                    "num_predict": 200
+                }
+            }
+            response = requests.post(self.llm_generator.api_url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+
+            answer_text = response.json().get("response", "").strip()
+            keywords = self._parse_response(answer_text)
+
+            if not keywords:
+                # LLM 실패 시 정규식 방식으로 fallback
+                logger.warning(f"LLM keyword extraction failed, falling back to regex. Text: {text[:50]}...")
+                return extract_keywords_with_regex(text)
+
+            return keywords
+
+        except Exception as e:
+            logger.warning(f"LLM keyword extraction error: {e}, falling back to regex")
+            return extract_keywords_with_regex(text)
+
+    @staticmethod
+    def _create_prompt(text: str) -> str:
+        """키워드 추출용 프롬프트 생성"""
+        return f"""다음 텍스트에서 핵심 키워드만 추출해주세요.
+
+텍스트:
+{text}
+
+지시사항:
+1. 청년 주거 정책 도메인에 관련된 핵심 키워드만 추출
+2. 동의어나 유사어도 함께 고려 (예: "대출" = "융자", "차입")
+3. 2글자 이상의 단어만 추출
+4. 키워드는 쉼표로 구분하여 나열
+5. 불필요한 설명 없이 키워드만 출력
+
+키워드:"""
+
+    @staticmethod
+    def _parse_response(response: str) -> List[str]:
+        """LLM 응답에서 키워드 파싱"""
+        if not response:
+            return []
+
+        # "키워드:" 이후의 텍스트 추출
+        lines = response.split('\n')
+        keywords_line = None
+
+        for line in lines:
+            if '키워드' in line and ':' in line:
+                keywords_line = line.split(':', 1)[-1].strip()
+                break
+
+        # 키워드 라인을 찾지 못하면 마지막 줄 사용
+        if keywords_line is None:
+            keywords_line = lines[-1].strip()
+
+        # 쉼표 또는 줄바꿈으로 분리
+        keywords = []
+        for part in keywords_line.replace('\n', ',').split(','):
+            keyword = part.strip().lower()
+            # 불필요한 문자 제거
+            keyword = re.sub(r'[^\w가-힣]', '', keyword)
+            if len(keyword) >= 2:  # 2글자 이상만
+                keywords.append(keyword)
+
+        return keywords
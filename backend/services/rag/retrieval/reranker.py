@@ -5,14 +5,19 @@
 검색 결과의 품질을 향상시키기 위한 다양한 리랭킹 전략
 """
 
+import hashlib
 import logging
 import os
 import re
-import requests
+import threading
 import time
-from typing import List, Dict, Any, Optional, Callable
-from collections import Counter
-import math
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from typing import List, Dict, Any, Optional, Callable, Tuple
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+from .keywords import DEFAULT_KEYWORD_MODEL, KeywordExtractor
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +48,10 @@ class BaseReranker:
         """
         raise NotImplementedError
 
+    def prefetch(self, query: str):
+        """검색 전에 쿼리 관련 작업을 미리 시작 (기본: 없음)"""
+        pass
+
     def _normalize_score(self, score: float, min_score: float, max_score: float) -> float:
         """점수를 0-1 범위로 정규화"""
         if max_score == min_score:
@@ -51,14 +60,22 @@ class BaseReranker:
 
 
 class KeywordReranker(BaseReranker):
-    """키워드 기반 리랭커"""
+    """
+    키워드 기반 리랭커
+    청크 키워드는 수집 시 저장된 document_chunks.keywords를 사용하고 검색 시에는 쿼리 키워드만 추출
+    (키워드가 저장되지 않은 청크만 추출기로 병렬 추출)
+    """
+
+    score_key = 'keyword_score'
 
     def __init__(
         self,
         weight: float = 0.3,
         use_llm_extraction: bool = True,
         llm_generator = None,
-        llm_model: str = "gemma3:4b"
+        llm_model: str = DEFAULT_KEYWORD_MODEL,
+        vector_store=None,
+        use_stored_keywords: bool = True
     ):
         """
         Args:
@@ -66,28 +83,25 @@ class KeywordReranker(BaseReranker):
             use_llm_extraction: LLM을 사용한 키워드 추출 여부 (기본값: True)
             llm_generator: LLM 생성기 인스턴스 (None이면 자동 초기화)
             llm_model: LLM 모델명 (기본값: gemma3:4b)
+            vector_store: 저장된 청크 키워드 조회용 PgVectorStore (None이면 첫 사용 시 생성)
+            use_stored_keywords: 수집 시 저장된 청크 키워드 사용 여부
         """
         super().__init__("KeywordReranker")
         self.weight = weight
         self.use_llm_extraction = use_llm_extraction
         self.llm_model = llm_model
-        self._keyword_cache = {}  # 키워드 추출 결과 캐싱
-        
-        # LLM 추출 활성화 시 LLM 생성기 자동 초기화
-        if self.use_llm_extraction:
-            if llm_generator is None:
-                from ..generation.generator import OllamaGenerator
-                # 환경 변수에서 Ollama URL 읽기 (Docker에서 호스트 접근용)
-                ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-                self.llm_generator = OllamaGenerator(
-                    base_url=ollama_base_url,
-                    default_model=self.llm_model
-                )
-                logger.info(f"KeywordReranker: LLM 키워드 추출 활성화 (모델: {self.llm_model}, URL: {ollama_base_url})")
-            else:
-                self.llm_generator = llm_generator
-        else:
-            self.llm_generator = None
+        self.extractor = KeywordExtractor(
+            use_llm=use_llm_extraction,
+            llm_generator=llm_generator,
+            llm_model=llm_model
+        )
+        self.llm_generator = self.extractor.llm_generator
+        self.vector_store = vector_store
+        self.use_stored_keywords = use_stored_keywords
+
+    def prefetch(self, query: str):
+        """쿼리 키워드 LLM 추출을 백그라운드에서 시작 (벡터 검색과 병행)"""
+        self.extractor.prefetch(query)
 
     def rerank(
         self,
@@ -100,10 +114,10 @@ class KeywordReranker(BaseReranker):
             return candidates
 
         query_words = set(self._extract_keywords(query))
+        candidate_keywords = self._candidate_keywords(candidates)
         
-        for candidate in candidates:
-            content = candidate['content']
-            content_words = set(self._extract_keywords(content))
+        for candidate, keywords in zip(candidates, candidate_keywords):
+            content_words = set(keywords)
             
             # 키워드 겹침 점수 계산
             overlap = len(query_words.intersection(content_words))
@@ -122,130 +136,46 @@ class KeywordReranker(BaseReranker):
         return reranked[:top_k] if top_k else reranked
 
     def _extract_keywords(self, text: str) -> List[str]:
-        """텍스트에서 키워드 추출"""
-        if not text:
-            return []
-            
-        # 캐시 확인
-        if text in self._keyword_cache:
-            return self._keyword_cache[text]
-        
-        # LLM 기반 추출
-        if self.use_llm_extraction and self.llm_generator:
-            keywords = self._extract_keywords_with_llm(text)
-        else:
-            # 정규식 기반 추출 (기본 방식)
-            keywords = self._extract_keywords_with_regex(text)
-        
-        # 캐시 저장
-        self._keyword_cache[text] = keywords
+        """텍스트에서 키워드 추출 (LRU 캐시)"""
+        return self.extractor.extract(text)
+
+    def _candidate_keywords(self, candidates: List[Dict[str, Any]]) -> List[List[str]]:
+        """후보별 키워드 (저장된 키워드 우선, 없는 후보만 배치 추출)"""
+        stored: Dict[int, List[str]] = {}
+        if self.use_stored_keywords:
+            chunk_ids = [c['chunk_id'] for c in candidates if c.get('chunk_id') is not None]
+            stored = self._stored_keywords(chunk_ids) if chunk_ids else {}
+
+        keywords: List[Optional[List[str]]] = [stored.get(c.get('chunk_id')) for c in candidates]
+        missing = [i for i, words in enumerate(keywords) if words is None]
+        if missing:
+            if self.use_stored_keywords:
+                logger.debug(
+                    f"{len(missing)}/{len(candidates)} candidates have no stored keywords "
+                    f"(run 'rag keywords backfill')"
+                )
+            extracted = self.extractor.extract_batch([candidates[i]['content'] for i in missing])
+            for i, words in zip(missing, extracted):
+                keywords[i] = words
         return keywords
-    
-    def _extract_keywords_with_regex(self, text: str) -> List[str]:
-        """정규식 기반 키워드 추출 (기본 방식)"""
-        # 한글, 영문, 숫자만 추출
-        words = re.findall(r'[가-힣a-zA-Z0-9]+', text.lower())
-        # 2글자 이상만 유효한 키워드로 간주
-        return [word for word in words if len(word) >= 2]
-    
-    def _extract_keywords_with_llm(self, text: str) -> List[str]:
-        """LLM을 사용한 키워드 추출"""
+
+    def _stored_keywords(self, chunk_ids: List[int]) -> Dict[int, List[str]]:
+        """수집 시 저장된 청크 키워드 조회 (실패 시 빈 결과 → 추출)"""
         try:
-            # 프롬프트 생성
-            prompt = self._create_keyword_extraction_prompt(text)
-            
-            # LLM 직접 호출 (generate 메서드의 프롬프트 템플릿 우회)
-            
-            if isinstance(self.llm_generator, type):  # 클래스인 경우
-                raise ValueError("llm_generator must be an instance, not a class")
-            
-            # Ollama API 직접 호출
-            api_url = self.llm_generator.api_url
-            payload = {
-                "model": self.llm_model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.3,
-                    "num_predict": 200
-                }
-            }
-            
-            start_time = time.time()
-            response = requests.post(
-                api_url,
-                json=payload,
-                timeout=10
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            answer_text = result.get("response", "").strip()
-            
-            # 키워드 파싱
-            keywords = self._parse_keywords_from_llm_response(answer_text)
-            
-            if not keywords:
-                # LLM 실패 시 정규식 방식으로 fallback
-                logger.warning(f"LLM keyword extraction failed, falling back to regex. Text: {text[:50]}...")
-                return self._extract_keywords_with_regex(text)
-            
-            return keywords
-            
+            if self.vector_store is None:
+                from ..vectorstore.ingestion.store import PgVectorStore
+                self.vector_store = PgVectorStore()
+            return self.vector_store.fetch_chunk_keywords(chunk_ids)
         except Exception as e:
-            logger.warning(f"LLM keyword extraction error: {e}, falling back to regex")
-            return self._extract_keywords_with_regex(text)
-    
-    def _create_keyword_extraction_prompt(self, text: str) -> str:
-        """키워드 추출용 프롬프트 생성"""
-        prompt = f"""다음 텍스트에서 핵심 키워드만 추출해주세요. 
-
-텍스트:
-{text}
-
-지시사항:
-1. 청년 주거 정책 도메인에 관련된 핵심 키워드만 추출
-2. 동의어나 유사어도 함께 고려 (예: "대출" = "융자", "차입")
-3. 2글자 이상의 단어만 추출
-4. 키워드는 쉼표로 구분하여 나열
-5. 불필요한 설명 없이 키워드만 출력
-
-키워드:"""
-        return prompt
-    
-    def _parse_keywords_from_llm_response(self, response: str) -> List[str]:
-        """LLM 응답에서 키워드 파싱"""
-        if not response:
-            return []
-        
-        # "키워드:" 또는 "키워드:" 이후의 텍스트 추출
-        lines = response.split('\n')
-        keywords_line = None
-        
-        for line in lines:
-            if '키워드' in line and ':' in line:
-                keywords_line = line.split(':', 1)[-1].strip()
-                break
-        
-        # 키워드 라인을 찾지 못하면 마지막 줄 사용
-        if keywords_line is None:
-            keywords_line = lines[-1].strip()
-        
-        # 쉼표 또는 줄바꿈으로 분리
-        keywords = []
-        for part in keywords_line.replace('\n', ',').split(','):
-            keyword = part.strip().lower()
-            # 불필요한 문자 제거
-            keyword = re.sub(r'[^\w가-힣]', '', keyword)
-            if len(keyword) >= 2:  # 2글자 이상만
-                keywords.append(keyword)
-        
-        return keywords
+            logger.warning(f"Stored keyword lookup failed: {e}, extracting keywords")
+            return {}
 
 
 class LengthReranker(BaseReranker):
     """길이 기반 리랭커"""
 
+    score_key = 'length_score'
+
     def __init__(self, optimal_length: int = 200, weight: float = 0.1):
         super().__init__("LengthReranker")
         self.optimal_length = optimal_length
@@ -284,6 +214,8 @@ class LengthReranker(BaseReranker):
 class PositionReranker(BaseReranker):
     """위치 기반 리랭커 (문서 내 위치 고려)"""
 
+    score_key = 'position_score'
+
     def __init__(self, weight: float = 0.1):
         super().__init__("PositionReranker")
         self.weight = weight
@@ -320,13 +252,29 @@ class PositionReranker(BaseReranker):
 
 
 class CombinedReranker(BaseReranker):
-    """여러 리랭커를 조합한 통합 리랭커"""
+    """
+    여러 리랭커를 조합한 통합 리랭커
+    - 하위 리랭커는 스레드 풀에서 동시에 실행 (원본 후보는 공유 읽기 전용, 각 리랭커는 얕은 복사본에 점수 기록)
+    - 리랭커별 타임아웃: 시간 안에 끝나지 않은 리랭커 점수는 0으로 처리
+    - 점수는 (후보 × 리랭커) 행렬로 모아 리랭커별 min-max 정규화 후 가중합
+    - 남은 리랭커가 최대 점수를 받아도 상위 top_k 순서가 바뀌지 않으면 기다리지 않고 종료
+    - 결과마다 단계별 소요 시간(rerank_timings_ms)과 반영되지 않은 리랭커(rerank_skipped) 기록
+    """
 
     def __init__(
         self,
         rerankers: List[BaseReranker],
-        weights: Optional[List[float]] = None
+        weights: Optional[List[float]] = None,
+        timeouts_ms: Optional[List[float]] = None,
+        max_workers: Optional[int] = None
     ):
+        """
+        Args:
+            rerankers: 하위 리랭커 리스트
+            weights: 리랭커별 가중치 (기본값: 모두 1.0)
+            timeouts_ms: 리랭커별 타임아웃 (None이면 환경 변수 RAG_RERANKER_TIMEOUT_MS, 0이면 무제한)
+            max_workers: 스레드 풀 크기 (None이면 환경 변수 RAG_RERANKER_WORKERS, 기본값: 리랭커 수 × 4)
+        """
         super().__init__("CombinedReranker")
         self.rerankers = rerankers
         self.weights = weights or [1.0] * len(rerankers)
@@ -334,53 +282,218 @@ class CombinedReranker(BaseReranker):
         if len(self.weights) != len(self.rerankers):
             raise ValueError("Weights length must match rerankers length")
 
+        if timeouts_ms is None:
+            timeouts_ms = [float(os.getenv('RAG_RERANKER_TIMEOUT_MS', '0'))] * len(rerankers)
+        if len(timeouts_ms) != len(self.rerankers):
+            raise ValueError("Timeouts length must match rerankers length")
+        self.timeouts_ms = timeouts_ms
+
+        if max_workers is None:
+            max_workers = int(os.getenv('RAG_RERANKER_WORKERS', '0')) or len(rerankers) * 4
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="reranker")
+
+        self.score_keys = [
+            getattr(reranker, 'score_key', f"{reranker.name.lower()}_score") for reranker in rerankers
+        ]
+        # 최종 점수 = (유사도 * 0.5 + Σ 가중치 * 정규화 점수 * 0.5) / 분모 (빠진 리랭커도 분모에 포함해 후보 간 비교 일관성 유지)
+        self._weight_vector = np.asarray(self.weights, dtype=np.float64)
+        self._denominator = 0.5 + float(self._weight_vector.sum()) * 0.5
+
+        # 통계
+        self.timed_out = 0
+        self.early_exits = 0
+
+    def prefetch(self, query: str):
+        """하위 리랭커의 선행 작업 시작"""
+        for reranker in self.rerankers:
+            reranker.prefetch(query)
+
     def rerank(
         self,
         query: str,
         candidates: List[Dict[str, Any]],
         top_k: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """여러 리랭커의 결과를 조합하여 최종 리랭킹"""
+        """여러 리랭커를 동시에 실행하고 결과를 조합하여 최종 리랭킹"""
         if not candidates:
             return candidates
 
-        # 각 리랭커로 점수 계산
-        for reranker in self.rerankers:
-            candidates = reranker.rerank(query, candidates, top_k=None)
+        start = time.perf_counter()
+        similarities = np.asarray([c.get('similarity', 0.0) for c in candidates], dtype=np.float64)
+        # 후보 × 리랭커 정규화 점수 (아직 없는 값은 0)
+        scores = np.zeros((len(candidates), len(self.rerankers)), dtype=np.float64)
+        done = np.zeros(len(self.rerankers), dtype=bool)
+        timings: Dict[str, float] = {}
 
-        # 가중 평균으로 최종 점수 계산
-        for candidate in candidates:
-            scores = []
-            for i, reranker in enumerate(self.rerankers):
-                score_key = f"{reranker.name.lower()}_score"
-                if score_key in candidate:
-                    scores.append(candidate[score_key] * self.weights[i])
-            
-            if scores:
-                # 원본 유사도도 포함
-                original_similarity = candidate.get('similarity', 0.0)
-                final_score = (original_similarity * 0.5 + sum(scores) * 0.5) / (0.5 + sum(self.weights) * 0.5)
-                candidate['final_rerank_score'] = final_score
-            else:
-                candidate['final_rerank_score'] = candidate.get('similarity', 0.0)
+        if not self._is_stable(similarities, scores, done, top_k):
+            self._run_rerankers(query, candidates, similarities, scores, done, timings, top_k, start)
+        else:
+            self.early_exits += 1
+
+        combine_start = time.perf_counter()
+        final_scores = self._combine(similarities, scores)
+        order = np.argsort(-final_scores, kind='stable')
+        if top_k:
+            order = order[:top_k]
+
+        skipped = [reranker.name for reranker, finished in zip(self.rerankers, done) if not finished]
+        timings['combine'] = (time.perf_counter() - combine_start) * 1000
+        timings['total'] = (time.perf_counter() - start) * 1000
+
+        reranked = []
+        for i in order.tolist():
+            candidate = candidates[i]
+            for j, key in enumerate(self.score_keys):
+                if done[j]:
+                    candidate[key] = float(scores[i, j])
+            candidate['final_rerank_score'] = float(final_scores[i])
+            candidate['rerank_timings_ms'] = timings
+            candidate['rerank_skipped'] = skipped
+            reranked.append(candidate)
+        return reranked
+
+    def close(self):
+        """스레드 풀 종료"""
+        self._executor.shutdown(wait=False)
+
+    def _run_rerankers(
+        self,
+        query: str,
+        candidates: List[Dict[str, Any]],
+        similarities: np.ndarray,
+        scores: np.ndarray,
+        done: np.ndarray,
+        timings: Dict[str, float],
+        top_k: Optional[int],
+        start: float
+    ):
+        """하위 리랭커 동시 실행 (완료될 때마다 점수 반영 + 조기 종료 판단)"""
+        pending = {}
+        for j, reranker in enumerate(self.rerankers):
+            future = self._executor.submit(self._score_with, reranker, query, candidates)
+            deadline = start + self.timeouts_ms[j] / 1000 if self.timeouts_ms[j] > 0 else None
+            pending[future] = (j, deadline)
+
+        while pending:
+            deadlines = [deadline for _, deadline in pending.values() if deadline is not None]
+            timeout = max(0.0, min(deadlines) - time.perf_counter()) if deadlines else None
+            finished, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in finished:
+                j, _ = pending.pop(future)
+                reranker = self.rerankers[j]
+                try:
+                    raw, elapsed_ms = future.result()
+                except Exception as e:
+                    logger.warning(f"{reranker.name} failed in combined reranking: {e}")
+                    continue
+                timings[reranker.name] = elapsed_ms
+                if raw is not None:
+                    scores[:, j] = _min_max(raw)
+                    done[j] = True
+
+            now = time.perf_counter()
+            for future, (j, deadline) in list(pending.items()):
+                if deadline is not None and now >= deadline:
+                    del pending[future]
+                    self.timed_out += 1
+                    logger.warning(
+                        f"{self.rerankers[j].name} exceeded timeout ({self.timeouts_ms[j]:.0f}ms), "
+                        f"combining without its scores"
+                    )
+
+            if pending and self._is_stable(similarities, scores, done, top_k, [j for j, _ in pending.values()]):
+                self.early_exits += 1
+                logger.debug(
+                    f"Top-{top_k} stable, skipping {len(pending)} pending reranker(s)"
+                )
+                break
 
-        # 최종 점수로 정렬
-        reranked = sorted(candidates, key=lambda x: x['final_rerank_score'], reverse=True)
-        
-        return reranked[:top_k] if top_k else reranked
+    def _score_with(
+        self,
+        reranker: BaseReranker,
+        query: str,
+        candidates: List[Dict[str, Any]]
+    ) -> Tuple[Optional[np.ndarray], float]:
+        """
+        후보 얕은 복사본으로 하위 리랭커 실행 (원본 후보는 수정하지 않음)
+
+        Returns:
+            (후보 순서의 원점수 배열, 점수가 없으면 None), 소요 시간 (ms)
+        """
+        start = time.perf_counter()
+        views = [dict(candidate) for candidate in candidates]
+        positions = {id(view): i for i, view in enumerate(views)}
+        reranked = reranker.rerank(query, views, top_k=None)
+
+        score_key = getattr(reranker, 'score_key', f"{reranker.name.lower()}_score")
+        raw = np.full(len(candidates), np.nan, dtype=np.float64)
+        for view in reranked:
+            i = positions.get(id(view))
+            if i is not None and score_key in view:
+                raw[i] = view[score_key]
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return (None if np.isnan(raw).all() else raw), elapsed_ms
+
+    def _combine(self, similarities: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """유사도와 정규화 점수 행렬의 가중합"""
+        return (similarities * 0.5 + (scores @ self._weight_vector) * 0.5) / self._denominator
+
+    def _is_stable(
+        self,
+        similarities: np.ndarray,
+        scores: np.ndarray,
+        done: np.ndarray,
+        top_k: Optional[int],
+        pending: Optional[List[int]] = None
+    ) -> bool:
+        """
+        남은 리랭커가 모든 후보에 0~1 중 어떤 점수를 주더라도 상위 top_k 순서가 그대로인지 여부
+        (각 상위 후보의 하한 ≥ 다음 후보의 상한)
+        """
+        if not top_k:
+            return False
+        if pending is None:
+            pending = [j for j in range(len(self.rerankers)) if not done[j]]
+        slack = float(self._weight_vector[pending].sum()) * 0.5 / self._denominator
+        if slack == 0:
+            return True
+
+        lower = np.sort(self._combine(similarities, scores))[::-1]
+        k = min(top_k, len(lower) - 1)
+        if k <= 0:
+            return len(lower) <= 1
+        return bool(np.all(lower[:k] - lower[1:k + 1] >= slack))
 
 
 class SemanticReranker(BaseReranker):
-    """의미적 유사도 기반 리랭커 (추가 임베딩 모델 사용)"""
+    """
+    의미적 유사도 기반 리랭커 (추가 임베딩 모델 사용)
+    후보 임베딩은 해당 모델의 embeddings_* 테이블(또는 로컬 인덱스)에 저장된 벡터를 사용하고,
+    저장된 벡터가 없는 후보만 한 번의 배치 encode_documents_array로 인코딩
+    """
+
+    score_key = 'semantic_score'
 
     def __init__(
         self,
         encoder,
-        weight: float = 0.4
+        weight: float = 0.4,
+        vector_store=None,
+        local_index=None
     ):
+        """
+        Args:
+            encoder: 리랭킹에 사용할 EmbeddingEncoder
+            weight: 의미 점수의 가중치 (0.0 ~ 1.0)
+            vector_store: 저장된 임베딩 조회용 PgVectorStore (None이면 첫 사용 시 생성)
+            local_index: 저장된 임베딩 조회용 LocalVectorIndex (지정 시 DB 대신 사용)
+        """
         super().__init__("SemanticReranker")
         self.encoder = encoder
         self.weight = weight
+        self.vector_store = vector_store
+        self.local_index = local_index
 
     def rerank(
         self,
@@ -393,17 +506,14 @@ class SemanticReranker(BaseReranker):
             return candidates
 
         try:
-            # 쿼리 임베딩
-            query_embedding = self.encoder.encode_query(query)
-            
-            # 각 후보에 대한 의미적 유사도 계산
-            for candidate in candidates:
-                content = candidate['content']
-                content_embedding = self.encoder.encode_query(content)
-                
-                # 코사인 유사도 계산
-                semantic_similarity = self._cosine_similarity(query_embedding, content_embedding)
-                
+            # 쿼리 임베딩 1회 + 후보 벡터 행렬과의 내적 1회
+            query_embedding = _normalize(self.encoder.encode_query_array(query))
+            candidate_matrix = self._candidate_matrix(candidates)
+            norms = np.linalg.norm(candidate_matrix, axis=1)
+            norms[norms == 0] = 1.0
+            semantic_scores = (candidate_matrix @ query_embedding) / norms
+
+            for candidate, semantic_similarity in zip(candidates, semantic_scores.tolist()):
                 # 기존 유사도와 결합
                 original_similarity = candidate.get('similarity', 0.0)
                 combined_score = (1 - self.weight) * original_similarity + self.weight * semantic_similarity
@@ -423,19 +533,331 @@ class SemanticReranker(BaseReranker):
         
         return reranked[:top_k] if top_k else reranked
 
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """코사인 유사도 계산"""
-        if len(vec1) != len(vec2):
-            return 0.0
-        
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = math.sqrt(sum(a * a for a in vec1))
-        norm2 = math.sqrt(sum(a * a for a in vec2))
-        
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-        
-        return dot_product / (norm1 * norm2)
+    def _candidate_matrix(self, candidates: List[Dict[str, Any]]) -> np.ndarray:
+        """후보 벡터 행렬 (저장된 임베딩 우선, 없는 후보만 배치 인코딩)"""
+        chunk_ids = [candidate['chunk_id'] for candidate in candidates if candidate.get('chunk_id') is not None]
+        stored = self._stored_embeddings(chunk_ids) if chunk_ids else {}
+
+        matrix = np.zeros((len(candidates), self.encoder.get_dimension()), dtype=np.float32)
+        missing = []
+        for i, candidate in enumerate(candidates):
+            vector = stored.get(candidate.get('chunk_id'))
+            if vector is not None:
+                matrix[i] = vector
+            else:
+                missing.append(i)
+
+        if missing:
+            logger.debug(f"Encoding {len(missing)}/{len(candidates)} candidates without stored embeddings")
+            matrix[missing] = self.encoder.encode_documents_array([candidates[i]['content'] for i in missing])
+        return matrix
+
+    def _stored_embeddings(self, chunk_ids: List[int]) -> Dict[int, np.ndarray]:
+        """인코더 모델의 저장된 청크 임베딩 조회 (실패 시 빈 결과 → 재인코딩)"""
+        try:
+            if self.local_index is not None:
+                return self.local_index.get_vectors(chunk_ids)
+            if self.vector_store is None:
+                from ..vectorstore.ingestion.store import PgVectorStore
+                self.vector_store = PgVectorStore()
+            return self.vector_store.fetch_embeddings(self.encoder.get_model_type(), chunk_ids)
+        except Exception as e:
+            logger.warning(f"Stored embedding lookup failed: {e}, encoding candidates")
+            return {}
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    """L2 정규화 (영벡터는 그대로)"""
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+def _min_max(values: np.ndarray) -> np.ndarray:
+    """0-1 min-max 정규화 (모두 같으면 0.5, 값이 없는 후보는 0)"""
+    present = ~np.isnan(values)
+    low, high = values[present].min(), values[present].max()
+    if high == low:
+        normalized = np.full_like(values, 0.5)
+    else:
+        normalized = (values - low) / (high - low)
+    return np.where(present, normalized, 0.0)
+
+
+class CrossEncoderReranker(BaseReranker):
+    """
+    Cross-Encoder 리랭커 (CPU)
+    (쿼리, 청크) 쌍을 하나의 패딩 배치로 점수화
+    - 긴 청크는 쿼리 단어가 가장 많이 등장하는 구간만 남기고 문서 쪽만 토큰 절단 (쿼리는 보존)
+    - 쌍 점수는 (쿼리 해시, chunk_id) 단위 LRU 캐시
+    - 지연 시간 예산을 넘기면 입력 순서를 그대로 반환 (진행 중인 점수화는 백그라운드에서 끝나 캐시에 저장)
+    - 예산이 있을 때 이전 점수화가 아직 진행 중이면 새 작업을 쌓지 않고 입력 순서를 바로 반환
+    - backend='onnx'이면 ONNX Runtime + int8 가중치, 'torch'면 PyTorch (quantize=True면 동적 int8)
+    """
+
+    score_key = 'cross_encoder_score'
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        weight: float = 1.0,
+        max_length: int = 512,
+        batch_size: int = 32,
+        latency_budget_ms: Optional[float] = None,
+        cache_size: Optional[int] = None,
+        backend: Optional[str] = None,
+        quantize: bool = True
+    ):
+        """
+        Args:
+            model_name: HuggingFace cross-encoder 모델 (None이면 환경 변수 RAG_CROSS_ENCODER_MODEL,
+                기본값: cross-encoder/mmarco-mMiniLMv2-L12-H384-v1 - 다국어)
+            weight: cross-encoder 점수의 가중치 (1.0이면 cross-encoder 점수만으로 정렬)
+            max_length: 쌍 입력 최대 토큰 수
+            batch_size: 한 번의 forward pass에 넣을 최대 쌍 수
+            latency_budget_ms: 지연 시간 예산 (None이면 환경 변수 RAG_CROSS_ENCODER_BUDGET_MS, 0이면 무제한)
+            cache_size: 쌍 점수 캐시 크기 (None이면 환경 변수 RAG_CROSS_ENCODER_CACHE_SIZE, 기본값: 10000)
+            backend: 'torch' 또는 'onnx' (None이면 환경 변수 RAG_CROSS_ENCODER_BACKEND, 기본값: torch)
+            quantize: int8 가중치 사용 여부
+        """
+        super().__init__("CrossEncoderReranker")
+        self.model_name = model_name or os.getenv(
+            'RAG_CROSS_ENCODER_MODEL', 'cross-encoder/mmarco-mMiniLMv2-L12-H384-v1'
+        )
+        self.weight = weight
+        self.max_length = max_length
+        self.batch_size = batch_size
+        if latency_budget_ms is None:
+            latency_budget_ms = float(os.getenv('RAG_CROSS_ENCODER_BUDGET_MS', '0'))
+        self.latency_budget_ms = latency_budget_ms
+        if cache_size is None:
+            cache_size = int(os.getenv('RAG_CROSS_ENCODER_CACHE_SIZE', '10000'))
+        self.cache_size = cache_size
+        self.backend = (backend or os.getenv('RAG_CROSS_ENCODER_BACKEND', 'torch')).lower()
+        if self.backend not in ('torch', 'onnx'):
+            raise ValueError(f"Unknown cross-encoder backend: {self.backend}")
+        self.quantize = quantize
+
+        self.tokenizer = None
+        self.model = None
+        self.session = None
+        self._load_lock = threading.Lock()
+        self._score_cache: "OrderedDict[Tuple[str, Any], float]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # 예산 초과 시 호출 스레드는 기다리지 않도록 점수화는 전용 스레드에서 실행
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cross-encoder")
+        self._pending = 0  # 대기 중이거나 실행 중인 점수화 작업 수
+        self._pending_lock = threading.Lock()
+
+        self.budget_exceeded = 0
+        self.load_shed = 0
+
+    def rerank(
+        self,
+        query: str,
+        candidates: List[Dict[str, Any]],
+        top_k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """cross-encoder 점수를 기반으로 리랭킹 (예산 초과 시 입력 순서 유지)"""
+        if not candidates:
+            return candidates
+
+        query_hash = hashlib.sha1(query.encode('utf-8')).hexdigest()[:16]
+        keys = [(query_hash, c.get('chunk_id', c['content'])) for c in candidates]
+        scores = self._cached_scores(keys)
+        missing = [i for i, score in enumerate(scores) if score is None]
+
+        if missing:
+            budgeted = self.latency_budget_ms > 0
+            with self._pending_lock:
+                # 예산이 있으면 작업을 하나만 허용 (밀린 작업 뒤에서 기다리다 모두 예산을 넘기는 것 방지)
+                busy = budgeted and self._pending > 0
+                if busy:
+                    self.load_shed += 1
+                else:
+                    self._pending += 1
+            if busy:
+                logger.debug(f"Cross-encoder busy, skipping scoring of {len(missing)} pairs")
+                return candidates[:top_k] if top_k else candidates
+
+            try:
+                future = self._executor.submit(
+                    self._score_and_cache, query, [candidates[i]['content'] for i in missing], [keys[i] for i in missing]
+                )
+            except RuntimeError as e:
+                self._job_done(None)
+                logger.warning(f"Cross-encoder reranking failed: {e}, keeping incoming order")
+                return candidates[:top_k] if top_k else candidates
+            future.add_done_callback(self._job_done)
+
+            try:
+                timeout = self.latency_budget_ms / 1000 if budgeted else None
+                computed = future.result(timeout=timeout)
+            except FutureTimeoutError:
+                future.cancel()
+                self.budget_exceeded += 1
+                logger.warning(
+                    f"Cross-encoder exceeded latency budget ({self.latency_budget_ms:.0f}ms, "
+                    f"{len(missing)} pairs), keeping incoming order"
+                )
+                return candidates[:top_k] if top_k else candidates
+            except Exception as e:
+                logger.warning(f"Cross-encoder reranking failed: {e}, keeping incoming order")
+                return candidates[:top_k] if top_k else candidates
+            for i, score in zip(missing, computed):
+                scores[i] = score
+
+        for candidate, score in zip(candidates, scores):
+            original_similarity = candidate.get('similarity', 0.0)
+            candidate[self.score_key] = score
+            candidate['rerank_score'] = (1 - self.weight) * original_similarity + self.weight * score
+
+        # 리랭킹 점수로 정렬
+        reranked = sorted(candidates, key=lambda x: x['rerank_score'], reverse=True)
+
+        return reranked[:top_k] if top_k else reranked
+
+    def score_pairs(self, query: str, contents: List[str]) -> List[float]:
+        """(쿼리, 문서) 쌍 점수 (0~1, 캐시 미사용)"""
+        self._ensure_loaded()
+        texts = [self._trim_content(query, content) for content in contents]
+
+        scores: List[float] = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            # 쿼리는 보존하고 문서 쪽만 절단, 배치 내 최장 길이로만 패딩
+            encoded = self.tokenizer(
+                [query] * len(batch), batch,
+                padding=True,
+                truncation='only_second',
+                max_length=self.max_length,
+                return_tensors='np' if self.session is not None else 'pt'
+            )
+            scores.extend(self._logits_to_scores(self._forward(encoded)))
+        return scores
+
+    def close(self):
+        """점수화 스레드 종료"""
+        self._executor.shutdown(wait=False)
+
+    # ------------------------------------------------------------------
+    # 내부 구현
+    # ------------------------------------------------------------------
+
+    def _job_done(self, _future):
+        with self._pending_lock:
+            self._pending = max(0, self._pending - 1)
+
+    def _score_and_cache(self, query: str, contents: List[str], keys: List[Tuple[str, Any]]) -> List[float]:
+        start = time.perf_counter()
+        scores = self.score_pairs(query, contents)
+        with self._cache_lock:
+            for key, score in zip(keys, scores):
+                self._score_cache[key] = score
+                self._score_cache.move_to_end(key)
+            while len(self._score_cache) > self.cache_size:
+                self._score_cache.popitem(last=False)
+        logger.debug(f"Cross-encoder scored {len(contents)} pairs in {(time.perf_counter() - start) * 1000:.1f}ms")
+        return scores
+
+    def _cached_scores(self, keys: List[Tuple[str, Any]]) -> List[Optional[float]]:
+        with self._cache_lock:
+            scores = []
+            for key in keys:
+                score = self._score_cache.get(key)
+                if score is not None:
+                    self._score_cache.move_to_end(key)
+                scores.append(score)
+            return scores
+
+    def _trim_content(self, query: str, content: str) -> str:
+        """
+        긴 청크에서 쿼리 단어가 가장 많이 등장하는 구간 선택
+        (토큰 절단은 뒤쪽만 자르므로 관련 구간이 청크 뒤쪽에 있으면 놓치는 문제 방지)
+        """
+        # 한국어 기준 토큰당 약 2자 → max_length 토큰에 들어갈 문자 수 근사
+        window = self.max_length * 2
+        if len(content) <= window:
+            return content
+
+        terms = {w for w in re.findall(r'[가-힣a-zA-Z0-9]+', query.lower()) if len(w) >= 2}
+        if not terms:
+            return content[:window]
+
+        lowered = content.lower()
+        positions = sorted(
+            match.start() for term in terms for match in re.finditer(re.escape(term), lowered)
+        )
+        if not positions:
+            return content[:window]
+
+        # 창 안에 들어오는 등장 횟수가 가장 많은 시작 위치 (투 포인터)
+        best_start, best_count, right = 0, 0, 0
+        for left, position in enumerate(positions):
+            while right < len(positions) and positions[right] < position + window:
+                right += 1
+            if right - left > best_count:
+                best_start, best_count = position, right - left
+
+        # 앞 문맥을 조금 포함
+        start = max(0, min(best_start - window // 8, len(content) - window))
+        return content[start:start + window]
+
+    def _ensure_loaded(self):
+        """모델 지연 로딩 (첫 리랭킹 시)"""
+        if self.tokenizer is not None:
+            return
+        with self._load_lock:
+            if self.tokenizer is not None:
+                return
+
+            from transformers import AutoTokenizer
+            tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+
+            if self.backend == 'onnx':
+                from ..models.onnx_backend import OnnxSession, ensure_onnx_model, is_onnxruntime_available
+                if is_onnxruntime_available():
+                    path = ensure_onnx_model(
+                        self.model_name, 'cross-encoder', self._load_torch_model, tokenizer,
+                        output_axes={'logits': {0: 'batch'}}, pair=True, quantize=self.quantize
+                    )
+                    self.session = OnnxSession(path)
+                else:
+                    logger.warning("onnxruntime is not installed, falling back to PyTorch cross-encoder")
+
+            if self.session is None:
+                self.model = self._load_torch_model()
+                if self.quantize:
+                    import torch
+                    self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+            self.tokenizer = tokenizer
+            logger.info(
+                f"Cross-encoder loaded: {self.model_name} "
+                f"(backend: {'onnx' if self.session is not None else 'torch'}, int8: {self.quantize})"
+            )
+
+    def _load_torch_model(self):
+        from transformers import AutoModelForSequenceClassification
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+        model.eval()
+        return model
+
+    def _forward(self, encoded) -> np.ndarray:
+        if self.session is not None:
+            return self.session.run(encoded)['logits']
+
+        import torch
+        with torch.inference_mode():
+            return self.model(**encoded).logits.float().numpy()
+
+    @staticmethod
+    def _logits_to_scores(logits: np.ndarray) -> List[float]:
+        """로짓 → 0~1 관련성 점수 (단일 출력은 sigmoid, 다중 클래스는 마지막 클래스 softmax 확률)"""
+        logits = np.asarray(logits, dtype=np.float32)
+        if logits.ndim == 1 or logits.shape[1] == 1:
+            return (1.0 / (1.0 + np.exp(-logits.reshape(-1)))).tolist()
+        shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return (shifted[:, -1] / shifted.sum(axis=1)).tolist()
 
 
 def create_default_reranker() -> CombinedReranker:
@@ -450,6 +872,35 @@ def create_default_reranker() -> CombinedReranker:
     )
 
 
+def create_reranker(name: Optional[str] = None) -> Optional[BaseReranker]:
+    """
+    이름으로 리랭커 생성
+    None이면 환경 변수 RAG_RERANKER (기본값: none)
+
+    Args:
+        name: 'none', 'keyword', 'default'(키워드+길이+위치), 'cross_encoder',
+            'keyword_cross_encoder'(키워드 + cross-encoder 조합)
+
+    Returns:
+        리랭커 (none이면 None)
+    """
+    name = (name or os.getenv('RAG_RERANKER', 'none')).lower().replace('-', '_')
+    if name == 'none':
+        return None
+    if name == 'keyword':
+        return KeywordReranker()
+    if name == 'default':
+        return create_default_reranker()
+    if name == 'cross_encoder':
+        return CrossEncoderReranker()
+    if name == 'keyword_cross_encoder':
+        return CombinedReranker(
+            rerankers=[KeywordReranker(), CrossEncoderReranker()],
+            weights=[0.3, 0.7]
+        )
+    raise ValueError(f"Unknown reranker: {name}")
+
+
 if __name__ == "__main__":
     # 테스트
     import logging
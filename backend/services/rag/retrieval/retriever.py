@@ -6,14 +6,23 @@ pgvector를 사용한 유사도 검색 및 결과 후처리
 """
 
 import logging
+import math
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
-import psycopg2
+import numpy as np
+import torch
 from psycopg2.extras import RealDictCursor
 
-from ..models.encoder import EmbeddingEncoder
+from ..models.remote import create_encoder
 from ..models.config import EmbeddingModelType
 from ..vectorstore.ingestion.store import PgVectorStore
+from ..vectorstore.local_index import LocalVectorIndex, get_local_index
+from ..vectorstore.recall import RecallProfile, get_recall_profile
+from ..vectorstore.filters import SearchFilter
+from .search_logger import SearchLogEntry, SearchLogWriter, get_search_log_writer
+from .semantic_cache import SemanticCache, get_semantic_cache
 from .reranker import BaseReranker, KeywordReranker, SemanticReranker, CombinedReranker
 
 logger = logging.getLogger(__name__)
@@ -22,12 +31,18 @@ logger = logging.getLogger(__name__)
 class Retriever:
     """통합 검색 리트리버"""
 
+    # 검색 결과에서 그대로 전달할 추가 필드 (하위 클래스용)
+    result_fields: Tuple[str, ...] = ()
+
     def __init__(
         self,
         model_type: EmbeddingModelType = EmbeddingModelType.MULTILINGUAL_E5_SMALL,
         db_config: Optional[Dict[str, str]] = None,
         device: Optional[str] = None,
-        reranker: Optional[BaseReranker] = None
+        reranker: Optional[BaseReranker] = None,
+        vector_backend: Optional[str] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        recall_profile: Optional[str] = None
     ):
         """
         Args:
@@ -35,13 +50,45 @@ class Retriever:
             db_config: 데이터베이스 연결 설정
             device: 디바이스 ('cuda', 'cpu', None)
             reranker: 리랭킹 모듈 (선택사항)
+            vector_backend: 벡터 검색 백엔드 ('pgvector' 또는 'local',
+                None이면 환경 변수 RAG_VECTOR_BACKEND, 기본값: pgvector)
+            semantic_cache: 시맨틱 결과 캐시 (None이면 프로세스 전역 캐시,
+                RAG_SEMANTIC_CACHE_SIZE 미설정 시 비활성화)
+            recall_profile: 기본 검색 정확도 프로파일 ('fast', 'balanced', 'exact',
+                None이면 환경 변수 RAG_RECALL_PROFILE, 기본값: balanced)
         """
         self.model_type = model_type
-        self.encoder = EmbeddingEncoder(model_type, device)
+        self.recall_profile = get_recall_profile(recall_profile)
+        # RAG_EMBEDDING_WORKER 설정 시 임베딩 워커 프로세스 클라이언트 (모델 로드 없음)
+        self.encoder = create_encoder(model_type, device)
         self.vector_store = PgVectorStore(db_config)
+        self.search_log_writer: SearchLogWriter = get_search_log_writer(self.vector_store.db_config)
         self.reranker = reranker
+
+        self.vector_backend = (vector_backend or os.getenv('RAG_VECTOR_BACKEND', 'pgvector')).lower()
+        if self.vector_backend not in ('pgvector', 'local'):
+            raise ValueError(f"Unknown vector backend: {self.vector_backend}")
+        self.local_index: Optional[LocalVectorIndex] = (
+            get_local_index(model_type) if self.vector_backend == 'local' else None
+        )
+        if self.local_index is not None and not self.local_index.exists():
+            # 인덱스 없이 local로 검색하면 모든 결과가 빈 리스트가 되므로 pgvector로 대체
+            logger.warning(
+                f"Local vector index not found at {self.local_index.path}, falling back to pgvector "
+                f"(build it with `rag index build`)"
+            )
+            self.vector_backend = 'pgvector'
+            self.local_index = None
+
+        self.semantic_cache = semantic_cache if semantic_cache is not None else get_semantic_cache()
+        if self.semantic_cache is not None and not self.semantic_cache.has_version_source():
+            # 다른 프로세스에서 수집한 새 청크도 감지하도록 DB 데이터 버전 확인
+            self.semantic_cache.set_version_source(self.vector_store.get_data_version)
         
-        logger.info(f"Retriever initialized with {self.encoder.get_display_name()}")
+        logger.info(
+            f"Retriever initialized with {self.encoder.get_display_name()} "
+            f"(backend: {self.vector_backend}, recall: {self.recall_profile.name})"
+        )
         if self.reranker:
             logger.info(f"Reranker enabled: {self.reranker.name}")
 
@@ -51,7 +98,9 @@ class Retriever:
         top_k: int = 5,
         min_similarity: float = 0.0,
         include_metadata: bool = True,
-        use_reranker: bool = True
+        use_reranker: bool = True,
+        recall_profile: Optional[str] = None,
+        filters: Optional[SearchFilter] = None
     ) -> List[Dict[str, Any]]:
         """
         쿼리에 대한 유사도 검색 수행
@@ -62,41 +111,43 @@ class Retriever:
             min_similarity: 최소 유사도 임계값
             include_metadata: 메타데이터 포함 여부
             use_reranker: 리랭킹 사용 여부
+            recall_profile: 검색 정확도 프로파일 ('fast', 'balanced', 'exact',
+                None이면 리트리버 기본값)
+            filters: 메타데이터 필터 (소스 타입, 청크 타입, 문서 ID - SQL에서 적용)
 
         Returns:
             검색 결과 리스트
         """
         start_time = time.time()
+        profile = get_recall_profile(recall_profile) if recall_profile else self.recall_profile
         
         try:
             # 쿼리 임베딩 생성
-            query_embedding = self.encoder.encode_query(query)
+            query_embedding = self.encoder.encode_query_array(query)
+
+            # 의미가 같은 이전 질의의 결과 재사용
+            cache_namespace = None
+            if self.semantic_cache is not None:
+                cache_namespace = self.cache_namespace(
+                    top_k, min_similarity, include_metadata, use_reranker, profile.name, filters
+                )
+                cached_results = self.semantic_cache.get_results(cache_namespace, query_embedding)
+                if cached_results is not None:
+                    logger.info(f"Semantic cache hit: {len(cached_results)} results")
+                    return cached_results
             
-            # 벡터 검색 수행
-            results = self.vector_store.search_similar(
-                query_embedding=query_embedding,
-                model_type=self.model_type,
-                top_k=top_k,
-                min_similarity=min_similarity
-            )
+            # 리랭커의 쿼리 키워드 추출(LLM)을 벡터 검색과 병행
+            if use_reranker and self.reranker:
+                self.reranker.prefetch(query)
+
+            # 후보 검색 수행
+            results = self._retrieve(query, query_embedding, top_k, min_similarity, profile, filters)
             
             # 검색 시간 계산
             search_time = (time.time() - start_time) * 1000  # ms
             
             # 결과 후처리
-            processed_results = []
-            for result in results:
-                processed_result = {
-                    'chunk_id': result['chunk_id'],
-                    'content': result['content'],
-                    'similarity': float(result['similarity']),
-                    'search_time_ms': search_time
-                }
-                
-                if include_metadata and result.get('metadata'):
-                    processed_result['metadata'] = result['metadata']
-                
-                processed_results.append(processed_result)
+            processed_results = self._process_results(results, search_time, include_metadata)
             
             # 리랭킹 적용 (선택사항)
             if use_reranker and self.reranker:
@@ -105,6 +156,9 @@ class Retriever:
             
             # 검색 로그 저장
             self._log_search(query, query_embedding, processed_results, search_time)
+
+            if cache_namespace is not None:
+                self.semantic_cache.put(cache_namespace, query_embedding, query, processed_results)
             
             logger.info(f"Search completed: {len(processed_results)} results in {search_time:.2f}ms")
             return processed_results
@@ -113,6 +167,218 @@ class Retriever:
             logger.error(f"Search failed: {e}")
             raise
 
+    def cache_namespace(
+        self,
+        top_k: int,
+        min_similarity: float = 0.0,
+        include_metadata: bool = True,
+        use_reranker: bool = True,
+        recall_profile: Optional[str] = None,
+        filters: Optional[SearchFilter] = None
+    ) -> str:
+        """시맨틱 캐시 구분 키 (검색 결과에 영향을 주는 설정 조합)"""
+        reranker_name = self.reranker.name if (use_reranker and self.reranker) else 'none'
+        profile_name = recall_profile or self.recall_profile.name
+        filter_key = filters.cache_key() if filters else ''
+        return (
+            f"{self.model_type.value}|{type(self).__name__}|{self.vector_backend}|"
+            f"{top_k}|{min_similarity}|{int(include_metadata)}|{reranker_name}|{profile_name}|{filter_key}"
+        )
+
+    def search_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        min_similarity: float = 0.0,
+        include_metadata: bool = True,
+        use_reranker: bool = True,
+        recall_profile: Optional[str] = None,
+        filters: Optional[SearchFilter] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        여러 쿼리를 한 번에 검색 (배치 인코딩 1회 + SQL 1회 왕복 또는 로컬 인덱스 행렬 곱)
+
+        Args:
+            queries: 검색 쿼리 리스트
+            top_k: 쿼리별 반환할 결과 수
+            min_similarity: 최소 유사도 임계값
+            include_metadata: 메타데이터 포함 여부
+            use_reranker: 리랭킹 사용 여부
+            recall_profile: 검색 정확도 프로파일 (None이면 리트리버 기본값)
+            filters: 메타데이터 필터 (모든 쿼리에 공통 적용)
+
+        Returns:
+            {쿼리: {'results', 'search_time_ms'(배치 시간 / 쿼리 수), 'result_count'}}
+        """
+        if not queries:
+            return {}
+
+        start_time = time.time()
+        profile = get_recall_profile(recall_profile) if recall_profile else self.recall_profile
+
+        try:
+            if use_reranker and self.reranker:
+                for query in queries:
+                    self.reranker.prefetch(query)
+
+            query_embeddings = self.encoder.encode_queries_array(queries)
+            encode_time = (time.time() - start_time) * 1000
+
+            batch_results = self._retrieve_batch(
+                queries, query_embeddings, top_k, min_similarity, profile, filters
+            )
+
+            batch_time = (time.time() - start_time) * 1000  # ms
+            # 쿼리별 시간은 배치 시간을 균등 분배 (평가 지표의 쿼리당 지연 시간과 호환)
+            per_query_time = batch_time / len(queries)
+
+            output = {}
+            for query, query_embedding, results in zip(queries, query_embeddings, batch_results):
+                processed_results = self._process_results(results, per_query_time, include_metadata)
+
+                if use_reranker and self.reranker:
+                    processed_results = self.reranker.rerank(query, processed_results, top_k)
+
+                self._log_search(query, query_embedding, processed_results, per_query_time)
+
+                output[query] = {
+                    'results': processed_results,
+                    'search_time_ms': per_query_time,
+                    'result_count': len(processed_results)
+                }
+
+            logger.info(
+                f"Batch search completed: {len(queries)} queries in {batch_time:.2f}ms "
+                f"(encoding: {encode_time:.2f}ms)"
+            )
+            return output
+
+        except Exception as e:
+            logger.error(f"Batch search failed: {e}")
+            raise
+
+    def _process_results(
+        self,
+        results: List[Dict[str, Any]],
+        search_time: float,
+        include_metadata: bool
+    ) -> List[Dict[str, Any]]:
+        """검색 결과 후처리"""
+        processed_results = []
+        for result in results:
+            processed_result = {
+                'chunk_id': result['chunk_id'],
+                'content': result['content'],
+                'similarity': float(result['similarity']),
+                'search_time_ms': search_time
+            }
+
+            if include_metadata and result.get('metadata'):
+                processed_result['metadata'] = result['metadata']
+
+            for key in self.result_fields:
+                if key in result:
+                    processed_result[key] = result[key]
+
+            processed_results.append(processed_result)
+        return processed_results
+
+    def _retrieve_batch(
+        self,
+        queries: List[str],
+        query_embeddings: np.ndarray,
+        top_k: int,
+        min_similarity: float,
+        profile: RecallProfile,
+        filters: Optional[SearchFilter] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """배치 벡터 검색 (쿼리 순서대로 결과 반환)"""
+        if self.local_index is not None:
+            hits_per_query = self.local_index.search_batch(
+                query_embeddings, top_k, min_similarity, nprobe=profile.local_nprobe,
+                allowed_ids=self._allowed_chunk_ids(filters)
+            )
+            # 모든 쿼리의 청크를 한 번에 조회
+            chunk_ids = {chunk_id for hits in hits_per_query for chunk_id, _ in hits}
+            chunks = self.vector_store.fetch_chunks(list(chunk_ids))
+            return [
+                [
+                    {
+                        'chunk_id': chunk_id,
+                        'content': chunks[chunk_id]['content'],
+                        'similarity': similarity,
+                        'metadata': chunks[chunk_id]['metadata']
+                    }
+                    for chunk_id, similarity in hits
+                    if chunk_id in chunks
+                ]
+                for hits in hits_per_query
+            ]
+        return self.vector_store.search_similar_batch(
+            query_embeddings=query_embeddings,
+            model_type=self.model_type,
+            top_k=top_k,
+            min_similarity=min_similarity,
+            recall_profile=profile.name,
+            filters=filters
+        )
+
+    def _retrieve(
+        self,
+        query: str,
+        query_embedding: np.ndarray,
+        top_k: int,
+        min_similarity: float,
+        profile: RecallProfile,
+        filters: Optional[SearchFilter] = None
+    ) -> List[Dict[str, Any]]:
+        """벡터 검색 (하위 클래스에서 검색 방식 교체 가능)"""
+        if self.local_index is not None:
+            return self._search_local(query_embedding, top_k, min_similarity, profile, filters)
+        return self.vector_store.search_similar(
+            query_embedding=query_embedding,
+            model_type=self.model_type,
+            top_k=top_k,
+            min_similarity=min_similarity,
+            recall_profile=profile.name,
+            filters=filters
+        )
+
+    def _allowed_chunk_ids(self, filters: Optional[SearchFilter]) -> Optional[List[int]]:
+        """로컬 인덱스 검색 대상 chunk_id (필터가 없으면 None = 전체)"""
+        if filters is None or filters.is_empty():
+            return None
+        return self.vector_store.filter_chunk_ids(self.model_type, filters)
+
+    def _search_local(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int,
+        min_similarity: float,
+        profile: RecallProfile,
+        filters: Optional[SearchFilter] = None
+    ) -> List[Dict[str, Any]]:
+        """로컬 인덱스로 검색 후 청크 내용은 DB에서 기본 키로 조회"""
+        hits = self.local_index.search(
+            query_embedding, top_k, min_similarity, nprobe=profile.local_nprobe,
+            allowed_ids=self._allowed_chunk_ids(filters)
+        )
+        chunks = self.vector_store.fetch_chunks([chunk_id for chunk_id, _ in hits])
+
+        results = []
+        for chunk_id, similarity in hits:
+            chunk = chunks.get(chunk_id)
+            if chunk is None:
+                # 인덱스 재생성 전 삭제된 청크
+                continue
+            results.append({
+                'chunk_id': chunk_id,
+                'content': chunk['content'],
+                'similarity': similarity,
+                'metadata': chunk['metadata']
+            })
+        return results
+
     def search_with_reranking(
         self,
         query: str,
@@ -192,23 +458,13 @@ class Retriever:
     def _log_search(
         self,
         query: str,
-        query_embedding: List[float],
+        query_embedding: np.ndarray,
         results: List[Dict[str, Any]],
         search_time: float
     ):
-        """검색 로그 저장"""
+        """검색 로그 저장 (백그라운드 배치 기록기에 전달, DB 왕복 없음)"""
         try:
-            self.vector_store.connect()
-            
-            # 모델 ID 조회
-            self.vector_store.cursor.execute(
-                "SELECT id FROM vector_db.embedding_models WHERE model_name = %s",
-                (self.encoder.get_model_name(),)
-            )
-            model_id = self.vector_store.cursor.fetchone()[0]
-            
             # 평균 유사도 계산 (NaN 값 필터링)
-            import math
             valid_similarities = [
                 r['similarity'] for r in results 
                 if not (math.isnan(r['similarity']) or math.isinf(r['similarity']))
@@ -224,57 +480,47 @@ class Retriever:
                 ]
             }
             
-            # 로그 저장
-            self.vector_store.cursor.execute("""
-                INSERT INTO vector_db.search_logs 
-                (model_id, query, query_embedding, top_k, search_time_ms, results, avg_similarity)
-                VALUES (%s, %s, %s::vector, %s, %s, %s, %s)
-            """, (
-                model_id,
-                query,
-                '[' + ','.join(map(str, query_embedding)) + ']',
-                len(results),
-                search_time,
-                psycopg2.extras.Json(results_json),
-                avg_similarity
+            self.search_log_writer.submit(SearchLogEntry(
+                model_name=self.encoder.get_model_name(),
+                query=query,
+                query_embedding=query_embedding,
+                top_k=len(results),
+                search_time_ms=search_time,
+                results=results_json,
+                avg_similarity=avg_similarity
             ))
             
-            self.vector_store.conn.commit()
-            
         except Exception as e:
             logger.warning(f"Failed to log search: {e}")
-            if self.vector_store.conn:
-                self.vector_store.conn.rollback()
 
     def get_model_stats(self) -> Dict[str, Any]:
         """현재 모델의 통계 정보 반환"""
         try:
-            self.vector_store.connect()
-            
-            # 모델 정보
-            self.vector_store.cursor.execute("""
-                SELECT display_name, dimension, COUNT(ce.id) as embedding_count
-                FROM vector_db.embedding_models em
-                LEFT JOIN vector_db.chunk_embeddings ce ON em.id = ce.model_id
-                WHERE em.model_name = %s
-                GROUP BY em.id, em.display_name, em.dimension
-            """, (self.encoder.get_model_name(),))
-            
-            model_info = self.vector_store.cursor.fetchone()
-            
-            # 최근 검색 통계
-            self.vector_store.cursor.execute("""
-                SELECT 
-                    AVG(search_time_ms) as avg_search_time,
-                    AVG(avg_similarity) as avg_similarity,
-                    COUNT(*) as total_searches
-                FROM vector_db.search_logs sl
-                JOIN vector_db.embedding_models em ON sl.model_id = em.id
-                WHERE em.model_name = %s
-                AND sl.created_at >= NOW() - INTERVAL '7 days'
-            """, (self.encoder.get_model_name(),))
-            
-            search_stats = self.vector_store.cursor.fetchone()
+            with self.vector_store.pool.connection() as conn, conn.cursor() as cur:
+                # 모델 정보
+                cur.execute("""
+                    SELECT display_name, dimension, COUNT(ce.id) as embedding_count
+                    FROM vector_db.embedding_models em
+                    LEFT JOIN vector_db.chunk_embeddings ce ON em.id = ce.model_id
+                    WHERE em.model_name = %s
+                    GROUP BY em.id, em.display_name, em.dimension
+                """, (self.encoder.get_model_name(),))
+                
+                model_info = cur.fetchone()
+                
+                # 최근 검색 통계
+                cur.execute("""
+                    SELECT 
+                        AVG(search_time_ms) as avg_search_time,
+                        AVG(avg_similarity) as avg_similarity,
+                        COUNT(*) as total_searches
+                    FROM vector_db.search_logs sl
+                    JOIN vector_db.embedding_models em ON sl.model_id = em.id
+                    WHERE em.model_name = %s
+                    AND sl.created_at >= NOW() - INTERVAL '7 days'
+                """, (self.encoder.get_model_name(),))
+                
+                search_stats = cur.fetchone()
             
             return {
                 'model_name': model_info[0] if model_info else 'Unknown',
@@ -282,7 +528,9 @@ class Retriever:
                 'embedding_count': model_info[2] if model_info else 0,
                 'avg_search_time_ms': float(search_stats[0]) if search_stats[0] else 0.0,
                 'avg_similarity': float(search_stats[1]) if search_stats[1] else 0.0,
-                'total_searches_7d': search_stats[2] if search_stats[2] else 0
+                'total_searches_7d': search_stats[2] if search_stats[2] else 0,
+                'pool': self.vector_store.pool.stats(),
+                'search_log': self.search_log_writer.stats()
             }
             
         except Exception as e:
@@ -296,25 +544,30 @@ class Retriever:
 
 
 class MultiModelRetriever:
-    """다중 모델 리트리버 (모델 비교용)"""
+    """다중 모델 리트리버 (모델 비교용, 모델별 검색을 스레드 풀에서 동시 수행)"""
 
     def __init__(
         self,
         model_types: List[EmbeddingModelType],
         db_config: Optional[Dict[str, str]] = None,
-        device: Optional[str] = None
+        device: Optional[str] = None,
+        threads_per_model: Optional[int] = None
     ):
         """
         Args:
             model_types: 사용할 모델 타입 리스트
             db_config: 데이터베이스 연결 설정
             device: 디바이스
+            threads_per_model: torch intra-op 스레드 수 (None이면 코어 수 / 모델 수)
+                모델별 분할이 아니라 프로세스 전역 상한(ATen 설정)이므로 생성 시 한 번만 적용되며
+                같은 프로세스의 다른 torch 연산에도 영향을 줌
         """
-        self.retrievers = {}
+        self.retrievers: Dict[EmbeddingModelType, Retriever] = {}
         
         for model_type in model_types:
             try:
-                self.retrievers[model_type] = VectorRetriever(
+                # 모든 리트리버는 같은 DB 설정의 공유 커넥션 풀 사용
+                self.retrievers[model_type] = Retriever(
                     model_type=model_type,
                     db_config=db_config,
                     device=device
@@ -323,6 +576,68 @@ class MultiModelRetriever:
             except Exception as e:
                 logger.error(f"Failed to load {model_type.value}: {e}")
 
+        # 스레드 수는 프로세스 전역이므로 요청마다 바꾸거나 복구하지 않음 (동시 요청 / 다른 스레드와 경합)
+        worker_count = max(1, len(self.retrievers))
+        if threads_per_model is None:
+            # 동시 인코딩이 각자 모든 코어를 쓰면 과다 구독되므로 코어를 모델 수로 나눔
+            threads_per_model = (os.cpu_count() or 1) // worker_count
+        torch.set_num_threads(max(1, threads_per_model))
+        self.threads_per_model = torch.get_num_threads()
+        self.executor = ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="multi-model")
+
+        logger.info(
+            f"MultiModelRetriever: {len(self.retrievers)} models, "
+            f"{self.threads_per_model} torch intra-op threads"
+        )
+
+    def _search_one(
+        self,
+        retriever: Retriever,
+        query: str,
+        top_k: int,
+        min_similarity: float
+    ) -> Tuple[List[Dict[str, Any]], float]:
+        """워커 스레드에서 단일 모델 검색 (결과, 소요 시간 ms)"""
+        start_time = time.time()
+        results = retriever.search(
+            query=query,
+            top_k=top_k,
+            min_similarity=min_similarity
+        )
+        return results, (time.time() - start_time) * 1000
+
+    def _search_all(
+        self,
+        query: str,
+        top_k: int,
+        min_similarity: float
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, float], float]:
+        """모든 모델 동시 검색 (모델별 결과, 모델별 지연 시간, 전체 소요 시간)"""
+        start_time = time.time()
+        futures = {
+            model_type: self.executor.submit(self._search_one, retriever, query, top_k, min_similarity)
+            for model_type, retriever in self.retrievers.items()
+        }
+
+        results = {}
+        latencies = {}
+        for model_type, future in futures.items():
+            try:
+                model_results, latency = future.result()
+                results[model_type.value] = model_results
+                latencies[model_type.value] = latency
+            except Exception as e:
+                logger.error(f"Search failed for {model_type.value}: {e}")
+                results[model_type.value] = []
+                latencies[model_type.value] = 0.0
+
+        wall_clock = (time.time() - start_time) * 1000
+        logger.info(
+            f"Multi-model search: {len(results)} models in {wall_clock:.2f}ms "
+            f"(sum of model latencies: {sum(latencies.values()):.2f}ms)"
+        )
+        return results, latencies, wall_clock
+
     def search_all_models(
         self,
         query: str,
@@ -340,21 +655,7 @@ class MultiModelRetriever:
         Returns:
             모델별 검색 결과
         """
-        results = {}
-        
-        for model_type, retriever in self.retrievers.items():
-            try:
-                model_results = retriever.search(
-                    query=query,
-                    top_k=top_k,
-                    min_similarity=min_similarity
-                )
-                results[model_type.value] = model_results
-                
-            except Exception as e:
-                logger.error(f"Search failed for {model_type.value}: {e}")
-                results[model_type.value] = []
-        
+        results, _, _ = self._search_all(query, top_k, min_similarity)
         return results
 
     def compare_models(
@@ -372,32 +673,32 @@ class MultiModelRetriever:
             min_similarity: 최소 유사도 임계값
 
         Returns:
-            비교 결과
+            비교 결과 (모델별 지연 시간 + 전체 wall-clock 시간)
         """
-        all_results = self.search_all_models(query, top_k, min_similarity)
+        all_results, latencies, wall_clock = self._search_all(query, top_k, min_similarity)
         
         comparison = {
             'query': query,
             'timestamp': time.time(),
+            'wall_clock_ms': wall_clock,
             'models': {}
         }
         
         for model_name, results in all_results.items():
             if results:
                 avg_similarity = sum(r['similarity'] for r in results) / len(results)
-                search_time = results[0]['search_time_ms'] if results else 0.0
                 
                 comparison['models'][model_name] = {
                     'result_count': len(results),
                     'avg_similarity': avg_similarity,
-                    'search_time_ms': search_time,
+                    'search_time_ms': latencies.get(model_name, 0.0),
                     'top_result_similarity': results[0]['similarity'] if results else 0.0
                 }
             else:
                 comparison['models'][model_name] = {
                     'result_count': 0,
                     'avg_similarity': 0.0,
-                    'search_time_ms': 0.0,
+                    'search_time_ms': latencies.get(model_name, 0.0),
                     'top_result_similarity': 0.0
                 }
         
@@ -405,6 +706,7 @@ class MultiModelRetriever:
 
     def close(self):
         """모든 리트리버 정리"""
+        self.executor.shutdown(wait=True)
         for retriever in self.retrievers.values():
             retriever.close()
 
@@ -417,7 +719,7 @@ if __name__ == "__main__":
     print("=== Vector Retriever Test ===\n")
     
     # 단일 모델 테스트
-    retriever = VectorRetriever(EmbeddingModelType.MULTILINGUAL_E5_SMALL)
+    retriever = Retriever(EmbeddingModelType.MULTILINGUAL_E5_SMALL)
     
     query = "신혼부부 임차보증금 이자지원"
     results = retriever.search(query, top_k=3)
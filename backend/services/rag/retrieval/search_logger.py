@@ -0,0 +1,400 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+검색 로그 비동기 배치 기록기
+Retriever의 검색 로그를 요청 경로에서 분리하여 백그라운드 스레드에서 배치 INSERT
+- 제한된 크기의 큐 (가득 차면 디스크로 spill 또는 drop)
+- N개 / T밀리초마다 multi-row INSERT 후 1회 커밋
+- 배치 INSERT 실패 시 한 건씩 재시도해 정상 로그는 기록하고, 실패한 로그만 시도 횟수를 늘려 spill
+  (MAX_WRITE_ATTEMPTS번 실패한 로그는 버림, 항상 실패하는 행이 정상 로그를 계속 끌고 다니지 않도록)
+- model_id 캐싱
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+import psycopg2
+from psycopg2.extras import Json, execute_values
+
+from ..vectorstore.pool import PgConnectionPool, PoolTimeoutError, get_pool
+from ..vectorstore.vector_adapter import PgVector
+
+logger = logging.getLogger(__name__)
+
+# 로그 한 건의 최대 INSERT 시도 횟수 (spill 후 재전송 포함)
+MAX_WRITE_ATTEMPTS = 3
+
+# 행 데이터가 아닌 DB 연결 문제 (한 건씩 재시도해도 실패)
+_CONNECTION_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError, PoolTimeoutError)
+
+
+@dataclass
+class SearchLogEntry:
+    """검색 로그 한 건"""
+    model_name: str
+    query: str
+    query_embedding: List[float]
+    top_k: int
+    search_time_ms: float
+    results: Dict[str, Any]
+    avg_similarity: float
+    created_at: float = field(default_factory=time.time)
+    attempts: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'model_name': self.model_name,
+            'query': self.query,
+            'query_embedding': [float(v) for v in self.query_embedding],
+            'top_k': self.top_k,
+            'search_time_ms': self.search_time_ms,
+            'results': self.results,
+            'avg_similarity': self.avg_similarity,
+            'created_at': self.created_at,
+            'attempts': self.attempts
+        }
+
+
+class SearchLogWriter:
+    """백그라운드 배치 검색 로그 기록기"""
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        db_pool: PgConnectionPool,
+        batch_size: int = 100,
+        flush_interval_ms: int = 1000,
+        max_queue_size: int = 10_000,
+        spill_path: Optional[str] = None
+    ):
+        """
+        Args:
+            db_pool: 커넥션 풀
+            batch_size: 한 번에 INSERT할 최대 행 수
+            flush_interval_ms: 배치가 차지 않아도 기록하는 주기 (밀리초)
+            max_queue_size: 큐 최대 크기 (초과 시 spill 또는 drop)
+            spill_path: 큐가 가득 찼을 때 로그를 기록할 JSONL 파일 (None이면 drop)
+        """
+        self.db_pool = db_pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.spill_path = Path(spill_path) if spill_path else None
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._model_ids: Dict[str, int] = {}
+        self._spill_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        # 메트릭
+        self.written = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.failed_batches = 0
+        self.last_flush_ms = 0.0
+
+    # ------------------------------------------------------------------
+    # 요청 경로 (논블로킹)
+    # ------------------------------------------------------------------
+
+    def submit(self, entry: SearchLogEntry) -> bool:
+        """
+        로그 추가 (블로킹 없음)
+
+        Returns:
+            큐에 들어갔으면 True, spill/drop 되었으면 False
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            self._overflow([entry])
+            return False
+
+    def queue_depth(self) -> int:
+        """현재 큐에 대기 중인 로그 수"""
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, Any]:
+        """기록기 메트릭"""
+        return {
+            'queue_depth': self.queue_depth(),
+            'queue_capacity': self._queue.maxsize,
+            'written': self.written,
+            'dropped': self.dropped,
+            'spilled': self.spilled,
+            'failed_batches': self.failed_batches,
+            'last_flush_ms': self.last_flush_ms,
+            'running': self._thread is not None and self._thread.is_alive()
+        }
+
+    # ------------------------------------------------------------------
+    # 백그라운드 스레드
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="search-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        """N개 또는 T밀리초마다 배치 기록"""
+        while True:
+            batch = []
+            deadline = time.time() + self.flush_interval
+            stop = False
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            if batch:
+                self._write_batch(batch)
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[SearchLogEntry]):
+        """multi-row INSERT + 1회 커밋, 실패 시 한 건씩 재시도 후 실패한 로그만 spill"""
+        start = time.time()
+        try:
+            self.written += self._insert(batch)
+        except _CONNECTION_ERRORS as e:
+            self.failed_batches += 1
+            logger.warning(f"Failed to write {len(batch)} search logs (database unavailable): {e}")
+            self._overflow(batch)
+            return
+        except Exception as e:
+            self.failed_batches += 1
+            logger.warning(f"Failed to write {len(batch)} search logs, retrying one by one: {e}")
+            self._write_individually(batch)
+        self.last_flush_ms = (time.time() - start) * 1000
+
+        # DB가 응답하므로 spill 파일 재전송 (커밋 이후라 실패해도 이미 기록된 배치는 다시 spill하지 않음)
+        try:
+            self._replay_spill()
+        except Exception as e:
+            logger.warning(f"Search log spill replay failed: {e}")
+
+    def _insert(self, entries: List[SearchLogEntry]) -> int:
+        """multi-row INSERT + 1회 커밋 (기록한 행 수 반환, 모델 미등록 로그는 건너뜀)"""
+        with self.db_pool.connection() as conn, conn.cursor() as cur:
+            rows = []
+            for entry in entries:
+                model_id = self._get_model_id(cur, entry.model_name)
+                if model_id is None:
+                    continue
+                rows.append(self._to_row(model_id, entry))
+
+            if rows:
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO vector_db.search_logs
+                    (model_id, query, query_embedding, top_k, search_time_ms, results, avg_similarity, created_at)
+                    VALUES %s
+                    """,
+                    rows,
+                    template="(%s, %s, %s, %s, %s, %s, %s, to_timestamp(%s))",
+                    page_size=self.batch_size
+                )
+            conn.commit()
+        return len(rows)
+
+    def _write_individually(self, batch: List[SearchLogEntry]):
+        """한 건씩 INSERT (실패한 로그만 시도 횟수 증가, 연결 문제면 남은 로그는 그대로 spill)"""
+        failed = []
+        for i, entry in enumerate(batch):
+            try:
+                self.written += self._insert([entry])
+            except _CONNECTION_ERRORS as e:
+                logger.warning(f"Database unavailable while retrying search logs: {e}")
+                self._overflow(batch[i:])
+                break
+            except Exception as e:
+                logger.warning(f"Failed to write search log ({entry.query[:50]!r}): {e}")
+                failed.append(entry)
+        if failed:
+            self._retry_later(failed)
+
+    def _retry_later(self, entries: List[SearchLogEntry]):
+        """시도 횟수를 늘려 spill (MAX_WRITE_ATTEMPTS에 도달한 로그는 버림)"""
+        retry = []
+        for entry in entries:
+            entry.attempts += 1
+            if entry.attempts >= MAX_WRITE_ATTEMPTS:
+                self.dropped += 1
+            else:
+                retry.append(entry)
+        if len(retry) < len(entries):
+            logger.warning(
+                f"Dropped {len(entries) - len(retry)} search logs after {MAX_WRITE_ATTEMPTS} failed attempts"
+            )
+        if retry:
+            self._overflow(retry)
+
+    def _get_model_id(self, cur, model_name: str) -> Optional[int]:
+        """모델 ID 조회 (프로세스 내 캐싱)"""
+        model_id = self._model_ids.get(model_name)
+        if model_id is not None:
+            return model_id
+        cur.execute(
+            "SELECT id FROM vector_db.embedding_models WHERE model_name = %s",
+            (model_name,)
+        )
+        row = cur.fetchone()
+        if row is None:
+            logger.warning(f"Model not registered, skipping search log: {model_name}")
+            return None
+        self._model_ids[model_name] = row[0]
+        return row[0]
+
+    @staticmethod
+    def _to_row(model_id: int, entry: SearchLogEntry) -> Tuple:
+        return (
+            model_id,
+            entry.query,
+            PgVector(entry.query_embedding),
+            entry.top_k,
+            entry.search_time_ms,
+            Json(entry.results),
+            entry.avg_similarity,
+            entry.created_at
+        )
+
+    # ------------------------------------------------------------------
+    # 과부하 처리
+    # ------------------------------------------------------------------
+
+    def _overflow(self, entries: List[SearchLogEntry]):
+        """큐 초과/DB 실패 시 디스크로 spill (경로 미설정 시 drop)"""
+        if self.spill_path is None:
+            self.dropped += len(entries)
+            return
+        try:
+            with self._spill_lock:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.spill_path, 'a', encoding='utf-8') as f:
+                    for entry in entries:
+                        f.write(json.dumps(entry.to_dict(), ensure_ascii=False) + '\n')
+            self.spilled += len(entries)
+        except OSError as e:
+            logger.warning(f"Search log spill failed: {e}")
+            self.dropped += len(entries)
+
+    def _replay_spill(self):
+        """spill 파일을 큐로 다시 적재 (큐 여유분만큼)"""
+        if self.spill_path is None or not self.spill_path.exists():
+            return
+        with self._spill_lock:
+            replay_path = self.spill_path.with_suffix('.replay')
+            try:
+                os.replace(self.spill_path, replay_path)
+            except OSError:
+                return
+
+        leftover = []
+        with open(replay_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = SearchLogEntry(**json.loads(line))
+                except (ValueError, TypeError):
+                    continue
+                try:
+                    self._queue.put_nowait(entry)
+                except queue.Full:
+                    leftover.append(entry)
+        replay_path.unlink(missing_ok=True)
+
+        if leftover:
+            self.spilled -= len(leftover)
+            self._overflow(leftover)
+
+    # ------------------------------------------------------------------
+    # 종료
+    # ------------------------------------------------------------------
+
+    def close(self, timeout: float = 5.0):
+        """남은 로그를 기록하고 스레드 종료"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Search log queue full at shutdown, remaining logs dropped")
+            return
+        self._thread.join(timeout)
+
+
+# ============================================================================
+# 프로세스 전역 기록기
+# ============================================================================
+
+_writers: Dict[int, SearchLogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_search_log_writer(db_config: Optional[Dict[str, str]] = None) -> SearchLogWriter:
+    """
+    DB별 공유 검색 로그 기록기 반환
+    환경 변수로 설정 가능:
+    - RAG_SEARCH_LOG_BATCH_SIZE (기본값: 100)
+    - RAG_SEARCH_LOG_FLUSH_MS (기본값: 1000)
+    - RAG_SEARCH_LOG_QUEUE_SIZE (기본값: 10000)
+    - RAG_SEARCH_LOG_SPILL_PATH (미설정 시 과부하 로그는 drop)
+    """
+    db_pool = get_pool(db_config)
+    with _writers_lock:
+        writer = _writers.get(id(db_pool))
+        if writer is None:
+            writer = SearchLogWriter(
+                db_pool,
+                batch_size=int(os.getenv('RAG_SEARCH_LOG_BATCH_SIZE', '100')),
+                flush_interval_ms=int(os.getenv('RAG_SEARCH_LOG_FLUSH_MS', '1000')),
+                max_queue_size=int(os.getenv('RAG_SEARCH_LOG_QUEUE_SIZE', '10000')),
+                spill_path=os.getenv('RAG_SEARCH_LOG_SPILL_PATH') or None
+            )
+            _writers[id(db_pool)] = writer
+        return writer
+
+
+def get_search_log_stats() -> Dict[str, Dict[str, Any]]:
+    """모든 기록기 메트릭 반환"""
+    with _writers_lock:
+        writers = list(_writers.values())
+    return {
+        writer.db_pool.db_config.get('database', str(i)): writer.stats()
+        for i, writer in enumerate(writers)
+    }
+
+
+@atexit.register
+def _flush_all_writers():
+    """프로세스 종료 시 남은 로그 기록"""
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.close()
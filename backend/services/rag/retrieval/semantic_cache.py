@@ -0,0 +1,363 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+시맨틱 결과 캐시
+표현만 다른 같은 질문에 대해 검색 결과(및 생성된 답변)를 재사용
+- 쿼리 임베딩 코사인 유사도가 임계값 이상인 이전 질의를 조회
+- 답변 재사용은 더 엄격한 임계값 + 같은 검색 결과(chunk_id)일 때만
+  (E5 계열은 상위 유사도가 좁게 몰려 있어 지역/숫자만 다른 질문도 0.95를 넘음)
+- 임계값은 임베딩 모델마다 분포가 달라 모델별로 조정해야 함
+- TTL, 용량 초과 시 LRU 제거
+- 데이터 수집 시 무효화 (같은 프로세스: 직접 호출, 다른 프로세스: DB 데이터 버전 확인)
+"""
+
+import copy
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Callable, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedAnswer:
+    """생성된 답변 (답변을 만든 질의의 임베딩과 검색 결과 chunk_id 포함)"""
+    embedding: np.ndarray
+    chunk_ids: Tuple[Any, ...]
+    answer: Any
+
+
+@dataclass
+class SemanticCacheEntry:
+    """캐시 항목 (검색 결과 + 생성 설정별 답변)"""
+    query: str
+    embedding: np.ndarray
+    results: List[Dict[str, Any]]
+    answers: Dict[str, CachedAnswer] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    hits: int = 0
+
+
+class SemanticCache:
+    """쿼리 임베딩 근방 기반 결과 캐시"""
+
+    def __init__(
+        self,
+        max_size: int = 512,
+        similarity_threshold: float = 0.95,
+        ttl_seconds: float = 3600.0,
+        version_check_interval: float = 30.0,
+        answer_threshold: float = 0.98
+    ):
+        """
+        Args:
+            max_size: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+            similarity_threshold: 검색 결과 재사용 최소 코사인 유사도 (임베딩 모델별로 조정)
+            answer_threshold: 생성 답변 재사용 최소 코사인 유사도 (similarity_threshold보다 낮으면 그 값 사용)
+            ttl_seconds: 항목 유효 시간 (초, 0 이하면 만료 없음)
+            version_check_interval: 데이터 버전 확인 주기 (초)
+        """
+        self.max_size = max_size
+        self.similarity_threshold = similarity_threshold
+        self.answer_threshold = max(answer_threshold, similarity_threshold)
+        self.ttl_seconds = ttl_seconds
+        self.version_check_interval = version_check_interval
+
+        # namespace(모델 + 검색 옵션) -> 항목 리스트 / 정규화 임베딩 행렬
+        self._entries: Dict[str, List[SemanticCacheEntry]] = {}
+        self._matrices: Dict[str, Optional[np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+        self._version_fn: Optional[Callable[[], Any]] = None
+        self._data_version: Any = None
+        self._last_version_check = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.answer_hits = 0
+        self.answer_misses = 0
+        self.invalidations = 0
+
+        logger.info(
+            f"SemanticCache initialized (max_size={max_size}, "
+            f"threshold={similarity_threshold}, answer_threshold={self.answer_threshold}, ttl={ttl_seconds}s)"
+        )
+
+    # ------------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------------
+
+    def lookup(self, namespace: str, embedding, record: bool = True) -> Optional[SemanticCacheEntry]:
+        """
+        임계값 이상으로 가장 가까운 캐시 항목 조회
+
+        Args:
+            namespace: 캐시 구분 키 (모델, top_k 등 결과에 영향을 주는 옵션)
+            embedding: 쿼리 임베딩
+            record: 적중/미스 통계 기록 여부
+
+        Returns:
+            캐시 항목 (없으면 None)
+        """
+        self._check_data_version()
+        query = self._normalize(embedding)
+
+        with self._lock:
+            self._expire(namespace)
+            matrix = self._matrix(namespace)
+            entry = None
+            if matrix is not None:
+                scores = matrix @ query
+                best = int(np.argmax(scores))
+                if scores[best] >= self.similarity_threshold:
+                    entry = self._entries[namespace][best]
+
+            if entry is None:
+                if record:
+                    self.misses += 1
+                return None
+
+            entry.last_used = time.time()
+            if record:
+                entry.hits += 1
+                self.hits += 1
+            return entry
+
+    def get_results(self, namespace: str, embedding) -> Optional[List[Dict[str, Any]]]:
+        """캐시된 검색 결과 조회 (호출자가 수정해도 안전하도록 복사본 반환)"""
+        entry = self.lookup(namespace, embedding)
+        if entry is None:
+            return None
+        return copy.deepcopy(entry.results)
+
+    def put(
+        self,
+        namespace: str,
+        embedding,
+        query: str,
+        results: List[Dict[str, Any]]
+    ) -> SemanticCacheEntry:
+        """검색 결과 저장"""
+        entry = SemanticCacheEntry(
+            query=query,
+            embedding=self._normalize(embedding),
+            results=copy.deepcopy(results)
+        )
+        with self._lock:
+            self._entries.setdefault(namespace, []).append(entry)
+            self._matrices[namespace] = None
+            self._evict()
+        return entry
+
+    def get_answer(
+        self,
+        namespace: str,
+        embedding,
+        answer_key: str,
+        chunk_ids: Sequence[Any]
+    ) -> Optional[Any]:
+        """
+        캐시된 생성 답변 조회
+        답변을 만든 질의와 answer_threshold 이상 유사하고 이번 검색 결과(chunk_id 순서)가 같을 때만 반환
+
+        Args:
+            namespace: 캐시 구분 키
+            embedding: 쿼리 임베딩
+            answer_key: 생성 설정 키
+            chunk_ids: 이번 질의의 검색 결과 chunk_id (순서 포함)
+        """
+        entry = self.lookup(namespace, embedding, record=False)
+        cached = entry.answers.get(answer_key) if entry is not None else None
+        hit = (
+            cached is not None
+            and tuple(chunk_ids) == cached.chunk_ids
+            and float(cached.embedding @ self._normalize(embedding)) >= self.answer_threshold
+        )
+        with self._lock:
+            if hit:
+                self.answer_hits += 1
+            else:
+                self.answer_misses += 1
+        return cached.answer if hit else None
+
+    def put_answer(
+        self,
+        namespace: str,
+        embedding,
+        answer_key: str,
+        answer: Any,
+        chunk_ids: Sequence[Any]
+    ) -> bool:
+        """
+        생성된 답변을 가장 가까운 검색 결과 항목에 저장 (질의 임베딩, 검색 결과 chunk_id와 함께)
+
+        Returns:
+            저장 여부 (대응하는 검색 결과 항목이 없으면 False)
+        """
+        entry = self.lookup(namespace, embedding, record=False)
+        if entry is None:
+            return False
+        cached = CachedAnswer(embedding=self._normalize(embedding), chunk_ids=tuple(chunk_ids), answer=answer)
+        with self._lock:
+            entry.answers[answer_key] = cached
+        return True
+
+    # ------------------------------------------------------------------
+    # 무효화
+    # ------------------------------------------------------------------
+
+    def invalidate(self):
+        """전체 캐시 무효화 (새 청크 수집 시)"""
+        with self._lock:
+            self._entries.clear()
+            self._matrices.clear()
+            self.invalidations += 1
+        logger.info("Semantic cache invalidated")
+
+    def set_version_source(self, version_fn: Callable[[], Any]):
+        """
+        데이터 버전 조회 함수 등록
+        다른 프로세스(수집 파이프라인)의 변경을 감지하기 위해 주기적으로 호출됨
+        """
+        self._version_fn = version_fn
+
+    def has_version_source(self) -> bool:
+        return self._version_fn is not None
+
+    def _check_data_version(self):
+        if self._version_fn is None:
+            return
+        now = time.time()
+        if now - self._last_version_check < self.version_check_interval:
+            return
+        self._last_version_check = now
+        try:
+            version = self._version_fn()
+        except Exception as e:
+            logger.warning(f"Semantic cache version check failed: {e}")
+            return
+        if self._data_version is not None and version != self._data_version:
+            logger.info("Vector data changed, invalidating semantic cache")
+            self.invalidate()
+        self._data_version = version
+
+    # ------------------------------------------------------------------
+    # 내부 유틸
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def _matrix(self, namespace: str) -> Optional[np.ndarray]:
+        entries = self._entries.get(namespace)
+        if not entries:
+            return None
+        matrix = self._matrices.get(namespace)
+        if matrix is None:
+            matrix = np.stack([entry.embedding for entry in entries])
+            self._matrices[namespace] = matrix
+        return matrix
+
+    def _expire(self, namespace: str):
+        if self.ttl_seconds <= 0:
+            return
+        entries = self._entries.get(namespace)
+        if not entries:
+            return
+        cutoff = time.time() - self.ttl_seconds
+        alive = [entry for entry in entries if entry.created_at >= cutoff]
+        if len(alive) != len(entries):
+            self._entries[namespace] = alive
+            self._matrices[namespace] = None
+
+    def _evict(self):
+        total = sum(len(entries) for entries in self._entries.values())
+        while total > self.max_size:
+            namespace, index = min(
+                (
+                    (ns, i)
+                    for ns, entries in self._entries.items()
+                    for i in range(len(entries))
+                ),
+                key=lambda item: self._entries[item[0]][item[1]].last_used
+            )
+            del self._entries[namespace][index]
+            self._matrices[namespace] = None
+            total -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환"""
+        with self._lock:
+            size = sum(len(entries) for entries in self._entries.values())
+            total = self.hits + self.misses
+            return {
+                'size': size,
+                'max_size': self.max_size,
+                'threshold': self.similarity_threshold,
+                'answer_threshold': self.answer_threshold,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'answer_hits': self.answer_hits,
+                'answer_misses': self.answer_misses,
+                'invalidations': self.invalidations
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(entries) for entries in self._entries.values())
+
+
+# ============================================================================
+# 프로세스 전역 캐시
+# ============================================================================
+
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """
+    프로세스 전역 시맨틱 캐시 반환 (기본 비활성화)
+    환경 변수로 설정 가능:
+    - RAG_SEMANTIC_CACHE_SIZE: 최대 항목 수 (기본값: 0 = 비활성화)
+    - RAG_SEMANTIC_CACHE_THRESHOLD: 검색 결과 재사용 코사인 유사도 (기본값: 0.95)
+    - RAG_SEMANTIC_ANSWER_THRESHOLD: 생성 답변 재사용 코사인 유사도 (기본값: 0.98)
+    임계값은 임베딩 모델의 유사도 분포에 따라 다르므로 사용하는 모델로 검증 후 설정
+    - RAG_SEMANTIC_CACHE_TTL: 유효 시간 초 (기본값: 3600)
+    - RAG_SEMANTIC_CACHE_VERSION_CHECK: 데이터 버전 확인 주기 초 (기본값: 30)
+    """
+    global _semantic_cache
+
+    if _semantic_cache is not None:
+        return _semantic_cache
+
+    with _semantic_cache_lock:
+        if _semantic_cache is None:
+            max_size = int(os.getenv('RAG_SEMANTIC_CACHE_SIZE', '0'))
+            if max_size <= 0:
+                return None
+            _semantic_cache = SemanticCache(
+                max_size=max_size,
+                similarity_threshold=float(os.getenv('RAG_SEMANTIC_CACHE_THRESHOLD', '0.95')),
+                ttl_seconds=float(os.getenv('RAG_SEMANTIC_CACHE_TTL', '3600')),
+                version_check_interval=float(os.getenv('RAG_SEMANTIC_CACHE_VERSION_CHECK', '30')),
+                answer_threshold=float(os.getenv('RAG_SEMANTIC_ANSWER_THRESHOLD', '0.98'))
+            )
+    return _semantic_cache
+
+
+def invalidate_semantic_cache():
+    """프로세스 전역 시맨틱 캐시 무효화 (캐시가 생성된 경우에만)"""
+    if _semantic_cache is not None:
+        _semantic_cache.invalidate()
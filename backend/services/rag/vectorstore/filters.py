@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+메타데이터 필터 검색
+소스 타입 / 청크 타입 / 문서 ID 조건을 SQL WHERE 절로 컴파일하고,
+필터 선택도에 따라 검색 전략을 선택
+- partial_index: 단일 소스 타입 + 소스 타입별 부분 HNSW 인덱스 존재
+- prefilter: 조건에 맞는 행이 적음 → HNSW 인덱스 없이 필터(btree) 후 정확 정렬
+- iterative: 그 외 → 전체 HNSW + iterative scan (필터로 top_k 미만 절단 방지)
+
+부분 인덱스 조건은 인덱스 대상 테이블의 컬럼만 참조할 수 있으므로
+임베딩 테이블에 source_type을 비정규화해 둡니다 (schema.sql 트리거가 채움).
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from psycopg2 import sql
+
+logger = logging.getLogger(__name__)
+
+STRATEGY_PARTIAL_INDEX = 'partial_index'
+STRATEGY_PREFILTER = 'prefilter'
+STRATEGY_ITERATIVE = 'iterative'
+
+_IDENTIFIER_UNSAFE = re.compile(r'[^a-z0-9_]+')
+
+# pg_get_expr(indpred) 형태: ((source_type)::text = '청년 정책'::text)
+_SOURCE_TYPE_PREDICATE = re.compile(
+    r"^\(*\s*\(?source_type\)?(?:::[a-z ]+)?\s*=\s*'((?:[^']|'')*)'(?:::[a-z ]+)?\s*\)*$"
+)
+
+
+def _as_tuple(value) -> tuple:
+    if value is None:
+        return ()
+    if isinstance(value, (str, int)):
+        return (value,)
+    return tuple(value)
+
+
+@dataclass(frozen=True)
+class SearchFilter:
+    """검색 필터 (각 항목은 OR, 항목 간은 AND)"""
+    source_types: Tuple[str, ...] = ()   # document_sources.source_type
+    chunk_types: Tuple[str, ...] = ()    # document_chunks.chunk_type
+    document_ids: Tuple[int, ...] = ()   # document_sources.id (= document_chunks.source_id)
+
+    @classmethod
+    def create(
+        cls,
+        source_type: Union[str, Iterable[str], None] = None,
+        chunk_type: Union[str, Iterable[str], None] = None,
+        document_id: Union[int, Iterable[int], None] = None
+    ) -> Optional['SearchFilter']:
+        """단일 값 또는 목록으로 필터 생성 (조건이 없으면 None)"""
+        search_filter = cls(
+            source_types=tuple(sorted(set(_as_tuple(source_type)))),
+            chunk_types=tuple(sorted(set(_as_tuple(chunk_type)))),
+            document_ids=tuple(sorted(set(int(i) for i in _as_tuple(document_id))))
+        )
+        return None if search_filter.is_empty() else search_filter
+
+    def is_empty(self) -> bool:
+        return not (self.source_types or self.chunk_types or self.document_ids)
+
+    def cache_key(self) -> str:
+        """캐시 구분 키"""
+        return (
+            f"s={','.join(self.source_types)};c={','.join(self.chunk_types)};"
+            f"d={','.join(map(str, self.document_ids))}"
+        )
+
+    def to_sql(
+        self,
+        embedding_alias: Optional[str] = 'e',
+        chunk_alias: str = 'dc'
+    ) -> Tuple[str, List[Any]]:
+        """
+        WHERE 절 조건 생성 (' AND ...' 형태, 조건이 없으면 빈 문자열)
+
+        Args:
+            embedding_alias: 임베딩 테이블 별칭 (None이면 source_type을 document_sources에서 확인)
+            chunk_alias: document_chunks 별칭
+
+        Returns:
+            (SQL 조각, 위치 파라미터 리스트)
+        """
+        clauses = self._clauses(embedding_alias, chunk_alias)
+        if not clauses:
+            return '', []
+        sql_text = ' AND ' + ' AND '.join(template.format(param='%s') for template, _, _ in clauses)
+        return sql_text, [value for _, _, value in clauses]
+
+    def to_named_sql(
+        self,
+        embedding_alias: Optional[str] = 'e',
+        chunk_alias: str = 'dc',
+        prefix: str = 'filter'
+    ) -> Tuple[str, Dict[str, Any]]:
+        """to_sql과 같은 조건을 이름 있는 파라미터(%(name)s)로 생성"""
+        clauses = self._clauses(embedding_alias, chunk_alias)
+        if not clauses:
+            return '', {}
+        sql_text = ' AND ' + ' AND '.join(
+            template.format(param=f'%({prefix}_{name})s') for template, name, _ in clauses
+        )
+        return sql_text, {f'{prefix}_{name}': value for _, name, value in clauses}
+
+    def _clauses(self, embedding_alias: Optional[str], chunk_alias: str) -> List[Tuple[str, str, Any]]:
+        """[(조건 템플릿, 파라미터 이름, 값)]"""
+        clauses: List[Tuple[str, str, Any]] = []
+
+        if self.source_types:
+            if embedding_alias is None:
+                clauses.append((
+                    f"EXISTS (SELECT 1 FROM vector_db.document_sources ds "
+                    f"WHERE ds.id = {chunk_alias}.source_id AND ds.source_type = ANY({{param}}))",
+                    'source_types', list(self.source_types)
+                ))
+            elif len(self.source_types) == 1:
+                # 부분 인덱스 조건(source_type = '...')과 일치해야 플래너가 부분 인덱스를 사용
+                clauses.append((f"{embedding_alias}.source_type = {{param}}", 'source_type', self.source_types[0]))
+            else:
+                clauses.append((f"{embedding_alias}.source_type = ANY({{param}})", 'source_types', list(self.source_types)))
+
+        if self.chunk_types:
+            clauses.append((f"{chunk_alias}.chunk_type = ANY({{param}})", 'chunk_types', list(self.chunk_types)))
+
+        if self.document_ids:
+            clauses.append((f"{chunk_alias}.source_id = ANY({{param}})", 'document_ids', list(self.document_ids)))
+
+        return clauses
+
+
+def partial_index_name(table: str, source_type: str) -> str:
+    """
+    소스 타입별 부분 HNSW 인덱스 이름 (ASCII 슬러그 + 원본 값 해시)
+    한글 / 대소문자 / 구분자만 다른 소스 타입도 서로 다른 이름이 되도록 해시를 붙임
+    """
+    prefix = f"idx_{table}_hnsw_"
+    digest = hashlib.md5(source_type.encode('utf-8')).hexdigest()[:8]
+    slug = _IDENTIFIER_UNSAFE.sub('_', source_type.lower()).strip('_')
+    slug = slug[:max(0, 63 - len(prefix) - len(digest) - 1)].rstrip('_')
+    return f"{prefix}{slug}_{digest}" if slug else f"{prefix}{digest}"
+
+
+def predicate_source_type(predicate: Optional[str]) -> Optional[str]:
+    """부분 인덱스 조건(pg_get_expr)이 source_type = '...' 하나면 그 값, 아니면 None"""
+    if not predicate:
+        return None
+    match = _SOURCE_TYPE_PREDICATE.match(predicate.strip())
+    if match is None:
+        return None
+    return match.group(1).replace("''", "'")
+
+
+def distance_order(column: str, query_ref: str, strategy: Optional[str], operator: str = '<=>') -> str:
+    """
+    ORDER BY 거리 식
+    prefilter 전략이면 식을 감싸 HNSW 인덱스 정렬 스캔만 배제
+    (enable_indexscan을 끄지 않으므로 필터의 btree / 기본 키 조회는 그대로 인덱스 사용)
+    """
+    distance = f"{column} {operator} {query_ref}"
+    if strategy == STRATEGY_PREFILTER:
+        return f"({distance}) + 0"
+    return distance
+
+
+class FilterPlanner:
+    """필터 선택도 기반 검색 전략 선택 (행 수 / 부분 인덱스 정보는 TTL 캐시)"""
+
+    def __init__(self, prefilter_max_rows: Optional[int] = None, stats_ttl: Optional[float] = None):
+        """
+        Args:
+            prefilter_max_rows: 이 행 수 이하면 인덱스 없이 정확 검색
+                (None이면 환경 변수 RAG_FILTER_PREFILTER_MAX_ROWS, 기본값: 5000)
+            stats_ttl: 행 수 / 인덱스 정보 캐시 유효 시간 초
+                (None이면 환경 변수 RAG_FILTER_STATS_TTL, 기본값: 300)
+        """
+        if prefilter_max_rows is None:
+            prefilter_max_rows = int(os.getenv('RAG_FILTER_PREFILTER_MAX_ROWS', '5000'))
+        if stats_ttl is None:
+            stats_ttl = float(os.getenv('RAG_FILTER_STATS_TTL', '300'))
+        self.prefilter_max_rows = prefilter_max_rows
+        self.stats_ttl = stats_ttl
+        self._row_counts: Dict[Tuple[str, str], Tuple[float, int]] = {}
+        self._indexes: Dict[str, Tuple[float, Dict[str, Optional[str]]]] = {}
+        self._lock = threading.Lock()
+
+    def plan(self, cursor, table: str, search_filter: SearchFilter) -> str:
+        """
+        검색 전략 선택
+
+        Args:
+            cursor: psycopg2 커서
+            table: 임베딩 테이블 이름
+            search_filter: 검색 필터
+
+        Returns:
+            'partial_index', 'prefilter', 'iterative' 중 하나
+        """
+        if len(search_filter.source_types) == 1 and not search_filter.document_ids:
+            if self.partial_index(cursor, table, search_filter.source_types[0]) is not None:
+                return STRATEGY_PARTIAL_INDEX
+
+        if self._matching_rows(cursor, table, search_filter) <= self.prefilter_max_rows:
+            return STRATEGY_PREFILTER
+        return STRATEGY_ITERATIVE
+
+    def invalidate(self):
+        """캐시된 행 수 / 인덱스 정보 삭제 (부분 인덱스 생성, 데이터 수집 후)"""
+        with self._lock:
+            self._row_counts.clear()
+            self._indexes.clear()
+
+    def table_indexes(self, cursor, table: str) -> frozenset:
+        """vector_db 테이블의 유효한 인덱스 이름 목록 (TTL 캐시)"""
+        return frozenset(self._index_predicates(cursor, table))
+
+    def partial_index(self, cursor, table: str, source_type: str) -> Optional[str]:
+        """소스 타입 부분 인덱스 이름 (이름과 인덱스 조건이 모두 이 소스 타입과 일치할 때만, 없으면 None)"""
+        index_name = partial_index_name(table, source_type)
+        predicates = self._index_predicates(cursor, table)
+        if index_name not in predicates:
+            return None
+        if predicate_source_type(predicates[index_name]) != source_type:
+            logger.warning(f"Partial index {index_name} predicate does not match source_type {source_type!r}")
+            return None
+        return index_name
+
+    def _index_predicates(self, cursor, table: str) -> Dict[str, Optional[str]]:
+        """{인덱스 이름: 부분 인덱스 조건 (없으면 None)} (유효한 인덱스만, TTL 캐시)"""
+        now = time.time()
+        with self._lock:
+            cached = self._indexes.get(table)
+        if cached and now - cached[0] < self.stats_ttl:
+            return cached[1]
+
+        cursor.execute(
+            """
+            SELECT ic.relname, pg_get_expr(i.indpred, i.indrelid)
+            FROM pg_index i
+            JOIN pg_class ic ON ic.oid = i.indexrelid
+            JOIN pg_class tc ON tc.oid = i.indrelid
+            JOIN pg_namespace n ON n.oid = tc.relnamespace
+            WHERE n.nspname = 'vector_db' AND tc.relname = %s AND i.indisvalid
+            """,
+            (table,)
+        )
+        predicates = {row[0]: row[1] for row in cursor.fetchall()}
+        with self._lock:
+            self._indexes[table] = (now, predicates)
+        return predicates
+
+    def _matching_rows(self, cursor, table: str, search_filter: SearchFilter) -> int:
+        key = (table, search_filter.cache_key())
+        now = time.time()
+        with self._lock:
+            cached = self._row_counts.get(key)
+        if cached and now - cached[0] < self.stats_ttl:
+            return cached[1]
+
+        where, params = search_filter.to_sql()
+        cursor.execute(
+            f"""
+            SELECT COUNT(*)
+            FROM vector_db.{table} e
+            JOIN vector_db.document_chunks dc ON e.chunk_id = dc.id
+            WHERE TRUE{where}
+            """,
+            params
+        )
+        count = cursor.fetchone()[0]
+        with self._lock:
+            self._row_counts[key] = (now, count)
+        logger.debug(f"Filter selectivity on {table}: {count} rows ({search_filter.cache_key()})")
+        return count
+
+
+def create_partial_indexes(cursor, table: str, min_rows: int = 1000) -> List[str]:
+    """
+    소스 타입별 부분 HNSW 인덱스 생성 (행 수가 min_rows 이상인 소스 타입만)
+
+    Args:
+        cursor: psycopg2 커서 (autocommit 불필요, 호출자가 커밋)
+        table: 임베딩 테이블 이름
+        min_rows: 부분 인덱스를 만들 최소 행 수
+
+    Returns:
+        생성된(또는 이미 존재하는) 인덱스 이름 리스트
+    """
+    cursor.execute(
+        f"""
+        SELECT source_type, COUNT(*)
+        FROM vector_db.{table}
+        WHERE source_type IS NOT NULL
+        GROUP BY source_type
+        HAVING COUNT(*) >= %s
+        ORDER BY source_type
+        """,
+        (min_rows,)
+    )
+    created = []
+    for source_type, count in cursor.fetchall():
+        index_name = partial_index_name(table, source_type)
+        cursor.execute(
+            sql.SQL(
+                "CREATE INDEX IF NOT EXISTS {index} ON vector_db.{table} "
+                "USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64) "
+                "WHERE source_type = {source_type}"
+            ).format(
+                index=sql.Identifier(index_name),
+                table=sql.Identifier(table),
+                source_type=sql.Literal(source_type)
+            )
+        )
+        logger.info(f"Partial HNSW index ready: {index_name} ({count} rows)")
+        created.append(index_name)
+    return created
+
+
+# ============================================================================
+# 프로세스 전역 플래너
+# ============================================================================
+
+_filter_planner: Optional[FilterPlanner] = None
+_filter_planner_lock = threading.Lock()
+
+
+def get_filter_planner() -> FilterPlanner:
+    """프로세스 전역 필터 플래너 반환 (행 수 캐시 공유)"""
+    global _filter_planner
+
+    if _filter_planner is None:
+        with _filter_planner_lock:
+            if _filter_planner is None:
+                _filter_planner = FilterPlanner()
+    return _filter_planner
@@ -7,6 +7,7 @@ pgvector 저장 모듈
 
 import sys
 import logging
+import numpy as np
 import psycopg2
 from psycopg2.extras import execute_batch
 from typing import List, Dict, Any, Optional
@@ -17,10 +18,28 @@ from datetime import datetime
 project_root = Path(__file__).parent.parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from backend.services.rag.models.config import EmbeddingModelType, get_model_config
+from backend.services.rag.models.config import (
+    EmbeddingModelType, EMBEDDING_TABLES, get_model_config, get_embedding_table
+)
+from backend.services.rag.vectorstore.pool import get_pool, get_default_db_config
+from backend.services.rag.vectorstore.vector_adapter import PgVector, copy_binary
+from backend.services.rag.vectorstore.recall import (
+    RecallProfile, apply_recall_profile, get_recall_profile
+)
+from backend.services.rag.vectorstore.filters import (
+    STRATEGY_PARTIAL_INDEX, STRATEGY_PREFILTER, SearchFilter,
+    create_partial_indexes, distance_order, get_filter_planner
+)
+from backend.services.rag.vectorstore.quantization import (
+    QuantizationSpec, create_quantized_index, drop_quantized_index, get_quantization,
+    quantized_index_name, quantized_search_sql, relation_sizes, rescore_candidates
+)
 
 logger = logging.getLogger(__name__)
 
+# 경고를 이미 출력한 (없는) 양자화 인덱스
+_missing_quantized_indexes = set()
+
 
 class PgVectorStore:
     """pgvector 저장소 클래스"""
@@ -34,44 +53,43 @@ class PgVectorStore:
             db_config: DB 연결 정보 {'host', 'port', 'database', 'user', 'password'}
         """
         if db_config is None:
-            # 기본 설정 (환경변수나 config 파일에서 가져올 수 있음)
-            import os
-            db_config = {
-                'host': os.getenv('PG_HOST', 'localhost'),
-                'port': os.getenv('PG_PORT', '5432'),
-                'database': os.getenv('PG_DB', 'rey'),
-                'user': os.getenv('PG_USER', 'postgres'),
-                'password': os.getenv('PG_PASSWORD', 'post1234')
-            }
+            # 기본 설정 (환경변수)
+            db_config = get_default_db_config()
 
         self.db_config = db_config
+        # 프로세스 전역 커넥션 풀 (같은 DB 설정의 모든 인스턴스가 공유)
+        self.pool = get_pool(db_config)
         self.conn = None
         self.cursor = None
 
         logger.info(f"PgVectorStore initialized for DB: {db_config['database']}")
 
     def connect(self):
-        """데이터베이스 연결"""
+        """
+        데이터베이스 연결 (풀에서 커넥션 체크아웃)
+
+        트랜잭션 단위 작업(수집 등)용으로 disconnect() 전까지 커넥션을 점유합니다.
+        검색 등 단건 조회는 pool.connection()으로 호출마다 체크아웃합니다.
+        """
         if self.conn is None or self.conn.closed:
             try:
-                self.conn = psycopg2.connect(**self.db_config)
-                # 인코딩 명시적 설정
-                self.conn.set_client_encoding('UTF8')
+                # 인코딩, search_path(vector_db, public)는 풀에서 설정
+                self.conn = self.pool.getconn()
                 self.cursor = self.conn.cursor()
-                # vector_db 스키마와 public 스키마를 모두 검색 경로에 추가
-                self.cursor.execute("SET search_path TO vector_db, public;")
-                logger.info("Connected to PostgreSQL")
+                logger.debug("Checked out PostgreSQL connection from pool")
             except Exception as e:
                 logger.error(f"Database connection failed: {e}")
                 raise
 
     def disconnect(self):
-        """데이터베이스 연결 종료"""
+        """데이터베이스 연결 반납 (풀로 반환)"""
         if self.cursor:
             self.cursor.close()
+            self.cursor = None
         if self.conn:
-            self.conn.close()
-        logger.info("Disconnected from PostgreSQL")
+            self.pool.putconn(self.conn)
+            self.conn = None
+        logger.debug("Returned PostgreSQL connection to pool")
 
     def ensure_model_exists(self, model_type: EmbeddingModelType) -> int:
         """
@@ -141,7 +159,7 @@ class PgVectorStore:
         문서와 임베딩을 pgvector에 저장 (모델별 테이블)
 
         Args:
-            documents: 문서 리스트 [{'id', 'source', 'content', 'embedding'}]
+            documents: 문서 리스트 [{'id', 'source', 'content', 'embedding', 'keywords'(선택)}]
             model_type: 사용된 임베딩 모델
             source_type: 데이터 소스 타입
             batch_size: 배치 크기
@@ -168,6 +186,7 @@ class PgVectorStore:
         try:
             for i in range(0, len(documents), batch_size):
                 batch = documents[i:i + batch_size]
+                embedding_rows = []
 
                 for doc in batch:
                     # 1. document_sources 삽입
@@ -188,8 +207,8 @@ class PgVectorStore:
                     # 2. document_chunks 삽입
                     self.cursor.execute("""
                         INSERT INTO vector_db.document_chunks
-                        (source_id, chunk_index, content, chunk_type, token_count, metadata)
-                        VALUES (%s, %s, %s, %s, %s, %s)
+                        (source_id, chunk_index, content, chunk_type, token_count, metadata, keywords)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s)
                         RETURNING id
                     """, (
                         source_id,
@@ -200,24 +219,27 @@ class PgVectorStore:
                         psycopg2.extras.Json({
                             'original_id': doc.get('id', ''),
                             'source': doc.get('source', '')
-                        })
+                        }),
+                        doc.get('keywords')  # 수집 단계에서 추출 (없으면 NULL)
                     ))
                     chunk_id = self.cursor.fetchone()[0]
 
-                    # 3. 모델별 임베딩 테이블에 삽입
+                    # 3. 임베딩은 배치 단위로 모아서 바이너리 COPY
                     embedding = doc.get('embedding', [])
-                    if embedding:
-                        # pgvector 형식으로 변환
-                        embedding_str = '[' + ','.join(map(str, embedding)) + ']'
-
-                        # 동적 테이블 이름 사용
-                        self.cursor.execute(f"""
-                            INSERT INTO vector_db.{embedding_table} (chunk_id, embedding)
-                            VALUES (%s, %s::vector)
-                        """, (chunk_id, embedding_str))
+                    if len(embedding) > 0:
+                        embedding_rows.append((chunk_id, source_type, embedding))
 
                     inserted_count += 1
 
+                # 모델별 임베딩 테이블에 삽입 (pgvector 바이너리 포맷, 텍스트 변환 없음)
+                if embedding_rows:
+                    copy_binary(
+                        self.cursor,
+                        f"vector_db.{embedding_table}",
+                        [('chunk_id', 'int4'), ('source_type', 'text'), ('embedding', 'vector')],
+                        embedding_rows
+                    )
+
                 # 배치 커밋
                 self.conn.commit()
                 logger.info(f"Inserted {min(i + batch_size, len(documents))}/{len(documents)} documents")
@@ -252,7 +274,10 @@ class PgVectorStore:
         query_embedding: List[float],
         model_type: EmbeddingModelType,
         top_k: int = 5,
-        min_similarity: float = 0.0
+        min_similarity: float = 0.0,
+        recall_profile: Optional[str] = None,
+        filters: Optional[SearchFilter] = None,
+        quantization: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         유사도 검색
@@ -262,29 +287,63 @@ class PgVectorStore:
             model_type: 사용할 모델
             top_k: 반환할 결과 수
             min_similarity: 최소 유사도
+            recall_profile: 검색 정확도 프로파일 ('fast', 'balanced', 'exact',
+                None이면 RAG_RECALL_PROFILE)
+            filters: 메타데이터 필터 (소스 타입, 청크 타입, 문서 ID)
+            quantization: 후보 검색 인덱스 ('none', 'halfvec', 'binary',
+                None이면 RAG_VECTOR_QUANTIZATION, 상위 후보는 float32로 재계산)
 
         Returns:
             검색 결과 리스트
         """
-        self.connect()
+        embedding_table = get_embedding_table(model_type)
+        profile = get_recall_profile(recall_profile)
 
-        config = get_model_config(model_type)
-
-        # 벡터 문자열 생성
-        query_embedding_str = '[' + ','.join(map(str, query_embedding)) + ']'
+        # PgVector는 vector 어댑터가 변환
+        query_vector = PgVector(query_embedding)
 
         try:
-            # SQL 함수 사용
-            self.cursor.execute(
-                """
-                SELECT chunk_id, content, similarity, metadata
-                FROM search_similar_chunks(%s::vector, %s, %s, %s)
-                """,
-                (query_embedding_str, config.model_name, top_k, min_similarity)
-            )
+            # 호출마다 풀에서 커넥션을 빌려 동시 검색이 한 커넥션에 직렬화되지 않도록 함
+            with self.pool.connection() as conn, conn.cursor() as cur:
+                filter_sql, filter_params = filters.to_sql() if filters else ('', [])
+                spec = self._active_quantization(cur, embedding_table, quantization, profile, filters)
+                if spec is not None:
+                    # 양자화 인덱스로 후보 검색 후 float32 거리로 재정렬 (최소 유사도는 재계산 후 적용)
+                    candidates = rescore_candidates(spec, top_k)
+                    self.apply_search_settings(cur, embedding_table, profile, candidates, filters=filters)
+                    search_sql = quantized_search_sql(
+                        embedding_table, get_model_config(model_type).dimension, spec,
+                        '(SELECT embedding FROM q)', filter_sql
+                    )
+                    cur.execute(
+                        f"WITH q AS MATERIALIZED (SELECT %s AS embedding) {search_sql}",
+                        [query_vector, *filter_params, candidates, min_similarity, top_k]
+                    )
+                    rows = cur.fetchall()
+                else:
+                    # ef_search 등은 이 트랜잭션에만 적용 (plpgsql 함수의 캐시된 플랜을 피하려고 직접 SQL 사용)
+                    strategy = self.apply_search_settings(
+                        cur, embedding_table, profile, top_k, min_similarity, filters
+                    )
+                    order_by = distance_order('e.embedding', '(SELECT embedding FROM q)', strategy)
+                    cur.execute(
+                        f"""
+                        WITH q AS MATERIALIZED (SELECT %s AS embedding)
+                        SELECT dc.id, dc.content,
+                               1 - (e.embedding <=> (SELECT embedding FROM q)) AS similarity,
+                               dc.metadata
+                        FROM vector_db.{embedding_table} e
+                        JOIN vector_db.document_chunks dc ON e.chunk_id = dc.id
+                        WHERE 1 - (e.embedding <=> (SELECT embedding FROM q)) >= %s{filter_sql}
+                        ORDER BY {order_by}, dc.id
+                        LIMIT %s
+                        """,
+                        [query_vector, min_similarity, *filter_params, top_k]
+                    )
+                    rows = cur.fetchall()
 
             results = []
-            for row in self.cursor.fetchall():
+            for row in rows:
                 results.append({
                     'chunk_id': row[0],
                     'content': row[1],
@@ -299,6 +358,404 @@ class PgVectorStore:
             logger.error(f"Error searching: {e}")
             raise
 
+    def search_similar_batch(
+        self,
+        query_embeddings: List[List[float]],
+        model_type: EmbeddingModelType,
+        top_k: int = 5,
+        min_similarity: float = 0.0,
+        recall_profile: Optional[str] = None,
+        filters: Optional[SearchFilter] = None,
+        quantization: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        여러 쿼리 유사도 검색 (unnest + LATERAL, 1회 왕복)
+
+        Args:
+            query_embeddings: 쿼리 임베딩 벡터 리스트
+            model_type: 사용할 모델
+            top_k: 쿼리별 반환할 결과 수
+            min_similarity: 최소 유사도
+            recall_profile: 검색 정확도 프로파일 (None이면 RAG_RECALL_PROFILE)
+            filters: 메타데이터 필터 (모든 쿼리에 공통 적용)
+            quantization: 후보 검색 인덱스 (None이면 RAG_VECTOR_QUANTIZATION)
+
+        Returns:
+            쿼리 순서대로의 검색 결과 리스트
+        """
+        if len(query_embeddings) == 0:
+            return []
+
+        embedding_table = get_embedding_table(model_type)
+        profile = get_recall_profile(recall_profile)
+        query_vectors = [PgVector(embedding) for embedding in query_embeddings]
+        batch_results: List[List[Dict[str, Any]]] = [[] for _ in query_vectors]
+
+        try:
+            with self.pool.connection() as conn, conn.cursor() as cur:
+                filter_sql, filter_params = filters.to_sql() if filters else ('', [])
+                spec = self._active_quantization(cur, embedding_table, quantization, profile, filters)
+                if spec is not None:
+                    candidates = rescore_candidates(spec, top_k)
+                    self.apply_search_settings(cur, embedding_table, profile, candidates, filters=filters)
+                    lateral_sql = quantized_search_sql(
+                        embedding_table, get_model_config(model_type).dimension, spec,
+                        'q.embedding', filter_sql
+                    )
+                    params = [query_vectors, *filter_params, candidates, min_similarity, top_k]
+                else:
+                    strategy = self.apply_search_settings(
+                        cur, embedding_table, profile, top_k, min_similarity, filters
+                    )
+                    lateral_sql = f"""
+                        SELECT dc.id AS chunk_id, dc.content,
+                               1 - (e.embedding <=> q.embedding) AS similarity,
+                               dc.metadata
+                        FROM vector_db.{embedding_table} e
+                        JOIN vector_db.document_chunks dc ON e.chunk_id = dc.id
+                        WHERE 1 - (e.embedding <=> q.embedding) >= %s{filter_sql}
+                        ORDER BY {distance_order('e.embedding', 'q.embedding', strategy)}, dc.id
+                        LIMIT %s
+                    """
+                    params = [query_vectors, min_similarity, *filter_params, top_k]
+
+                cur.execute(
+                    f"""
+                    SELECT q.idx, r.chunk_id, r.content, r.similarity, r.metadata
+                    FROM unnest(%s::vector[]) WITH ORDINALITY AS q(embedding, idx)
+                    CROSS JOIN LATERAL ({lateral_sql}) r
+                    ORDER BY q.idx, r.similarity DESC
+                    """,
+                    params
+                )
+                rows = cur.fetchall()
+
+            for row in rows:
+                batch_results[row[0] - 1].append({
+                    'chunk_id': row[1],
+                    'content': row[2],
+                    'similarity': float(row[3]),
+                    'metadata': row[4]
+                })
+
+            logger.info(f"Batch search: {len(query_vectors)} queries, {len(rows)} results")
+            return batch_results
+
+        except Exception as e:
+            logger.error(f"Error in batch search: {e}")
+            raise
+
+    @staticmethod
+    def apply_search_settings(
+        cursor,
+        embedding_table: str,
+        profile: RecallProfile,
+        top_k: int,
+        min_similarity: float = 0.0,
+        filters: Optional[SearchFilter] = None
+    ) -> Optional[str]:
+        """
+        검색 전략(필터 선택도 기준)에 맞는 트랜잭션 설정 적용 (SET LOCAL)
+
+        Args:
+            cursor: 검색을 실행할 커서 (같은 트랜잭션)
+            embedding_table: 임베딩 테이블 이름
+            profile: 검색 정확도 프로파일
+            top_k: 인덱스에서 가져올 행 수
+            min_similarity: 인덱스 스캔과 같은 단계에서 적용되는 최소 유사도
+            filters: 메타데이터 필터
+
+        Returns:
+            검색 전략 (필터가 없으면 None, ORDER BY는 distance_order(..., strategy)로 생성)
+        """
+        if filters is None or filters.is_empty():
+            apply_recall_profile(cursor, profile, top_k, filtered=min_similarity > 0)
+            return None
+
+        strategy = get_filter_planner().plan(cursor, embedding_table, filters)
+        if strategy == STRATEGY_PREFILTER:
+            # 조건에 맞는 행이 적으면 필터 후 정확 정렬이 HNSW 탐색보다 빠르고 누락도 없음
+            # HNSW는 ORDER BY 식(distance_order)으로만 배제하므로 btree 인덱스 스캔을 끄는 설정은 적용하지 않음
+            logger.debug(f"Filtered search on {embedding_table}: strategy={strategy}")
+            return strategy
+        if strategy == STRATEGY_PARTIAL_INDEX:
+            # 부분 인덱스는 이미 소스 타입으로 좁혀져 있으므로 추가 조건이 있을 때만 iterative scan
+            filtered = min_similarity > 0 or bool(filters.chunk_types)
+            apply_recall_profile(cursor, profile, top_k, filtered=filtered)
+        else:
+            apply_recall_profile(cursor, profile, top_k, filtered=True)
+
+        logger.debug(f"Filtered search on {embedding_table}: strategy={strategy}")
+        return strategy
+
+    @staticmethod
+    def _active_quantization(
+        cursor,
+        embedding_table: str,
+        quantization: Optional[str],
+        profile: RecallProfile,
+        filters: Optional[SearchFilter] = None
+    ) -> Optional[QuantizationSpec]:
+        """이번 검색에 사용할 양자화 인덱스 (정확 검색, prefilter 대상이거나 인덱스가 없으면 None = float32)"""
+        spec = get_quantization(quantization)
+        if spec is None or profile.exact:
+            return None
+        if (
+            filters is not None and not filters.is_empty()
+            and get_filter_planner().plan(cursor, embedding_table, filters) == STRATEGY_PREFILTER
+        ):
+            # 필터 후 행이 적으면 float32로 바로 정확 정렬
+            return None
+        index_name = quantized_index_name(embedding_table, spec)
+        if index_name not in get_filter_planner().table_indexes(cursor, embedding_table):
+            if index_name not in _missing_quantized_indexes:
+                _missing_quantized_indexes.add(index_name)
+                logger.warning(
+                    f"Quantized index {index_name} not found, using float32 index "
+                    f"(run: rag quantize build --mode {spec.name})"
+                )
+            return None
+        return spec
+
+    def build_quantized_index(self, model_type: EmbeddingModelType, mode: str) -> Dict[str, Any]:
+        """
+        양자화 HNSW 인덱스 생성 (float32 컬럼은 그대로 유지, 재계산용)
+
+        Args:
+            model_type: 임베딩 모델
+            mode: 'halfvec' 또는 'binary'
+
+        Returns:
+            {'index', 'build_seconds', 'index_bytes', 'float_index_bytes'}
+        """
+        spec = get_quantization(mode)
+        if spec is None:
+            raise ValueError("Quantization mode must be 'halfvec' or 'binary'")
+        table = get_embedding_table(model_type)
+        index_name = quantized_index_name(table, spec)
+
+        self.connect()
+        try:
+            build_seconds = create_quantized_index(
+                self.cursor, table, get_model_config(model_type).dimension, spec
+            )
+            self.conn.commit()
+            sizes = relation_sizes(self.cursor, table)
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Error building quantized index: {e}")
+            raise
+        get_filter_planner().invalidate()
+        return {
+            'index': index_name,
+            'build_seconds': build_seconds,
+            'index_bytes': sizes.get(index_name),
+            'float_index_bytes': sizes.get(f"idx_{table}_hnsw")
+        }
+
+    def drop_quantized_index(self, model_type: EmbeddingModelType, mode: str):
+        """양자화 HNSW 인덱스 삭제"""
+        spec = get_quantization(mode)
+        if spec is None:
+            raise ValueError("Quantization mode must be 'halfvec' or 'binary'")
+        self.connect()
+        try:
+            drop_quantized_index(self.cursor, get_embedding_table(model_type), spec)
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Error dropping quantized index: {e}")
+            raise
+        get_filter_planner().invalidate()
+
+    def get_relation_sizes(self, model_type: EmbeddingModelType) -> Dict[str, int]:
+        """임베딩 테이블/인덱스 크기 (바이트)"""
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            return relation_sizes(cur, get_embedding_table(model_type))
+
+    def create_partial_indexes(self, model_type: EmbeddingModelType, min_rows: int = 1000) -> List[str]:
+        """
+        소스 타입별 부분 HNSW 인덱스 생성 (필터 검색 가속)
+
+        Args:
+            model_type: 임베딩 모델
+            min_rows: 부분 인덱스를 만들 소스 타입의 최소 행 수
+
+        Returns:
+            인덱스 이름 리스트
+        """
+        self.connect()
+        try:
+            index_names = create_partial_indexes(self.cursor, get_embedding_table(model_type), min_rows)
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Error creating partial indexes: {e}")
+            raise
+        get_filter_planner().invalidate()
+        return index_names
+
+    def filter_chunk_ids(self, model_type: EmbeddingModelType, filters: SearchFilter) -> List[int]:
+        """필터 조건에 맞는 chunk_id 목록 (로컬 인덱스 검색용)"""
+        where, params = filters.to_sql()
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT e.chunk_id
+                FROM vector_db.{get_embedding_table(model_type)} e
+                JOIN vector_db.document_chunks dc ON e.chunk_id = dc.id
+                WHERE TRUE{where}
+                """,
+                params
+            )
+            return [row[0] for row in cur.fetchall()]
+
+    def get_data_version(self) -> tuple:
+        """
+        벡터 데이터 버전 (청크/임베딩 테이블의 최대 ID)
+        수집 또는 재임베딩 시 값이 바뀌므로 캐시 무효화 판단에 사용 (기본 키 인덱스만 조회)
+        """
+        tables = ['document_chunks'] + sorted(set(EMBEDDING_TABLES.values()))
+        select_list = ', '.join(
+            f"(SELECT COALESCE(MAX(id), 0) FROM vector_db.{table})" for table in tables
+        )
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(f"SELECT {select_list}")
+            return tuple(cur.fetchone())
+
+    def fetch_chunks(self, chunk_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        chunk_id로 청크 내용/메타데이터 조회 (로컬 인덱스 검색 결과 보강용)
+
+        Args:
+            chunk_ids: 조회할 청크 ID 리스트
+
+        Returns:
+            {chunk_id: {'content', 'metadata'}}
+        """
+        if not chunk_ids:
+            return {}
+
+        try:
+            with self.pool.connection() as conn, conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT id, content, metadata
+                    FROM vector_db.document_chunks
+                    WHERE id = ANY(%s)
+                    """,
+                    (list(chunk_ids),)
+                )
+                rows = cur.fetchall()
+            return {row[0]: {'content': row[1], 'metadata': row[2]} for row in rows}
+
+        except Exception as e:
+            logger.error(f"Error fetching chunks: {e}")
+            raise
+
+    def fetch_embeddings(
+        self,
+        model_type: EmbeddingModelType,
+        chunk_ids: List[int]
+    ) -> Dict[int, np.ndarray]:
+        """
+        chunk_id로 저장된 임베딩 조회 (chunk_id 유니크 인덱스, 리랭킹 시 재인코딩 대신 사용)
+
+        Args:
+            model_type: 임베딩 모델
+            chunk_ids: 조회할 청크 ID 리스트
+
+        Returns:
+            {chunk_id: float32 벡터} (임베딩이 없는 청크는 제외)
+        """
+        if not chunk_ids:
+            return {}
+
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT chunk_id, embedding
+                FROM vector_db.{get_embedding_table(model_type)}
+                WHERE chunk_id = ANY(%s) AND embedding IS NOT NULL
+                """,
+                (list(chunk_ids),)
+            )
+            rows = cur.fetchall()
+        return {row[0]: np.asarray(row[1], dtype=np.float32) for row in rows}
+
+    def fetch_chunk_keywords(self, chunk_ids: List[int]) -> Dict[int, List[str]]:
+        """
+        chunk_id로 수집 시 저장된 키워드 조회
+
+        Returns:
+            {chunk_id: 키워드 리스트} (키워드가 추출되지 않은 청크는 제외)
+        """
+        if not chunk_ids:
+            return {}
+
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT id, keywords
+                FROM vector_db.document_chunks
+                WHERE id = ANY(%s) AND keywords IS NOT NULL
+                """,
+                (list(chunk_ids),)
+            )
+            return {row[0]: row[1] for row in cur.fetchall()}
+
+    def fetch_chunks_without_keywords(self, limit: int = 500, after_id: int = 0) -> List[Dict[str, Any]]:
+        """
+        키워드가 없는 청크 조회 (id 순, 백필용)
+
+        Args:
+            limit: 최대 청크 수
+            after_id: 이 id 이후부터 조회 (페이지 단위 진행)
+
+        Returns:
+            [{'id', 'content'}]
+        """
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT id, content
+                FROM vector_db.document_chunks
+                WHERE keywords IS NULL AND id > %s
+                ORDER BY id
+                LIMIT %s
+                """,
+                (after_id, limit)
+            )
+            return [{'id': row[0], 'content': row[1]} for row in cur.fetchall()]
+
+    def update_chunk_keywords(self, keywords_by_chunk: Dict[int, List[str]]) -> int:
+        """
+        청크 키워드 일괄 저장 (unnest 한 번의 UPDATE)
+
+        Returns:
+            갱신된 청크 수
+        """
+        if not keywords_by_chunk:
+            return 0
+
+        chunk_ids = list(keywords_by_chunk)
+        # text[][]는 행마다 길이가 같아야 하므로 키워드는 구분자로 합쳐 전달 후 분리
+        joined = ['\x1f'.join(keywords_by_chunk[chunk_id]) for chunk_id in chunk_ids]
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE vector_db.document_chunks dc
+                SET keywords = CASE WHEN u.joined = '' THEN '{}'::text[]
+                                    ELSE string_to_array(u.joined, E'\\x1f') END
+                FROM unnest(%s::int[], %s::text[]) AS u(chunk_id, joined)
+                WHERE dc.id = u.chunk_id
+                """,
+                (chunk_ids, joined)
+            )
+            updated = cur.rowcount
+            conn.commit()
+        return updated
+
     def get_statistics(self) -> Dict[str, Any]:
         """데이터베이스 통계 조회"""
         self.connect()
@@ -351,19 +808,29 @@ class PgVectorStore:
         return self
 
     def execute_query(self, query: str, params: tuple = None):
-        """SQL 쿼리를 실행하고 결과를 반환합니다."""
-        if not self.conn:
-            raise Exception("데이터베이스에 연결되지 않았습니다.")
-        
+        """
+        SQL 쿼리를 실행하고 결과를 반환합니다.
+        connect()로 점유한 커넥션이 없으면 풀에서 한 번 빌려 실행합니다.
+        """
+        if self.conn:
+            return self._execute_on(self.conn, query, params)
+
+        with self.pool.connection() as conn:
+            return self._execute_on(conn, query, params)
+
+    def _execute_on(self, conn, query: str, params: tuple = None):
         try:
-            with self.conn.cursor() as cursor:
+            with conn.cursor() as cursor:
                 cursor.execute(query, params)
                 if query.strip().upper().startswith('SELECT'):
-                    return cursor.fetchall()
+                    result = cursor.fetchall()
+                    conn.commit()
+                    return result
                 else:
-                    self.conn.commit()
+                    conn.commit()
                     return cursor.rowcount
         except Exception as e:
+            conn.rollback()
             logger.error(f"쿼리 실행 오류: {e}")
             raise
 
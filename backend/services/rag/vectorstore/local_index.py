@@ -0,0 +1,582 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+로컬 벡터 인덱스 (pgvector 대체 백엔드)
+embeddings_* 테이블을 메모리 맵 행렬(float32/float16) + chunk_id 배열로 내보내고
+NumPy로 top-k 검색 수행 (정확 검색, 대규모 코퍼스용 IVF 분할 선택)
+
+파일 구성 ({index_dir}/{embedding_table}/):
+- vectors.npy     정규화된 임베딩 행렬 (N x dim)
+- chunk_ids.npy   행별 chunk_id (N,)
+- centroids.npy   IVF 중심점 (nlist x dim, IVF 사용 시)
+- list_offsets.npy IVF 리스트 경계 (nlist + 1,)
+- meta.json       dtype, 차원, 행 수, 버전 등
+
+np.load(mmap_mode='r')로 열기 때문에 여러 uvicorn 워커가 같은 페이지 캐시를 공유합니다.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..models.config import EmbeddingModelType, get_model_config, get_embedding_table
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = Path(__file__).resolve().parents[3] / "data" / "vector_index"
+
+# float16 행렬은 블록 단위로 float32로 변환하여 곱셈 (BLAS 사용)
+_SCAN_BLOCK_ROWS = 65536
+
+
+def get_local_index_dir() -> Path:
+    """로컬 인덱스 디렉토리 (환경 변수 RAG_LOCAL_INDEX_DIR로 변경 가능)"""
+    return Path(os.getenv('RAG_LOCAL_INDEX_DIR', str(DEFAULT_INDEX_DIR)))
+
+
+def parse_vector(value) -> np.ndarray:
+    """pgvector 값(텍스트 '[...]' 또는 배열)을 float32 배열로 변환"""
+    if isinstance(value, np.ndarray):
+        return value.astype(np.float32, copy=False)
+    if isinstance(value, str):
+        return np.array(value.strip('[]').split(','), dtype=np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (코사인 유사도 = 내적)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수 내림차순 상위 k개 인덱스"""
+    if k >= scores.shape[0]:
+        return np.argsort(-scores, kind='stable')
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part], kind='stable')]
+
+
+def _train_kmeans(
+    vectors: np.ndarray,
+    nlist: int,
+    iterations: int = 10,
+    sample_size: int = 50_000,
+    seed: int = 42
+) -> np.ndarray:
+    """구면 k-means로 IVF 중심점 학습 (정규화된 벡터 기준)"""
+    rng = np.random.default_rng(seed)
+    n = vectors.shape[0]
+    sample_idx = rng.choice(n, size=min(n, sample_size), replace=False)
+    sample = np.asarray(vectors[np.sort(sample_idx)], dtype=np.float32)
+
+    centroids = sample[rng.choice(sample.shape[0], size=nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(sample @ centroids.T, axis=1)
+        for c in range(nlist):
+            members = sample[assign == c]
+            if len(members):
+                centroids[c] = members.mean(axis=0)
+            else:
+                # 빈 클러스터는 임의 샘플로 재초기화
+                centroids[c] = sample[rng.integers(sample.shape[0])]
+        centroids = _normalize_rows(centroids)
+    return centroids
+
+
+class LocalVectorIndex:
+    """메모리 맵 기반 로컬 벡터 인덱스"""
+
+    def __init__(
+        self,
+        model_type: EmbeddingModelType,
+        index_dir: Optional[str] = None,
+        nprobe: int = 8,
+        reload_check_interval: float = 5.0
+    ):
+        """
+        Args:
+            model_type: 임베딩 모델 타입
+            index_dir: 인덱스 루트 디렉토리 (None이면 RAG_LOCAL_INDEX_DIR)
+            nprobe: IVF 검색 시 탐색할 리스트 수
+            reload_check_interval: 인덱스 파일 변경 확인 주기 (초)
+        """
+        self.model_type = model_type
+        self.config = get_model_config(model_type)
+        self.table = get_embedding_table(model_type)
+        self.path = Path(index_dir) if index_dir else get_local_index_dir()
+        self.path = self.path / self.table
+        self.nprobe = nprobe
+        self.reload_check_interval = reload_check_interval
+
+        self.vectors: Optional[np.ndarray] = None
+        self.chunk_ids: Optional[np.ndarray] = None
+        self.centroids: Optional[np.ndarray] = None
+        self.list_offsets: Optional[np.ndarray] = None
+        self.meta: Dict[str, Any] = {}
+
+        self._lock = threading.RLock()
+        self._last_check = 0.0
+        self._loaded_version = None
+        self._id_to_row: Optional[Dict[int, int]] = None
+
+    # ------------------------------------------------------------------
+    # 파일 입출력
+    # ------------------------------------------------------------------
+
+    def exists(self) -> bool:
+        """인덱스 파일 존재 여부"""
+        return (self.path / "meta.json").exists()
+
+    def _read_meta(self) -> Dict[str, Any]:
+        with open(self.path / "meta.json", 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load(self) -> "LocalVectorIndex":
+        """인덱스를 메모리 맵으로 로드"""
+        with self._lock:
+            if not self.exists():
+                raise FileNotFoundError(f"Local vector index not found: {self.path}")
+
+            meta = self._read_meta()
+            version_dir = self.path / meta['version']
+
+            self.vectors = np.load(version_dir / "vectors.npy", mmap_mode='r')
+            self.chunk_ids = np.load(version_dir / "chunk_ids.npy", mmap_mode='r')
+            if meta.get('nlist', 0) > 0:
+                self.centroids = np.load(version_dir / "centroids.npy")
+                self.list_offsets = np.load(version_dir / "list_offsets.npy")
+            else:
+                self.centroids = None
+                self.list_offsets = None
+
+            self.meta = meta
+            self._loaded_version = meta['version']
+            self._id_to_row = None
+            self._last_check = time.time()
+
+            logger.info(
+                f"Loaded local index {self.table}: {meta['count']} vectors "
+                f"({meta['dtype']}, nlist={meta.get('nlist', 0)})"
+            )
+            return self
+
+    def _maybe_reload(self):
+        """다른 프로세스가 인덱스를 재생성/추가했으면 다시 로드"""
+        now = time.time()
+        if self.vectors is not None and now - self._last_check < self.reload_check_interval:
+            return
+        self._last_check = now
+        try:
+            version = self._read_meta()['version']
+        except (OSError, ValueError, KeyError):
+            return
+        if self.vectors is None or version != self._loaded_version:
+            self.load()
+
+    def _write(
+        self,
+        vectors: np.ndarray,
+        chunk_ids: np.ndarray,
+        dtype: str,
+        nlist: int,
+        ivf_count: int,
+        centroids: Optional[np.ndarray] = None,
+        list_offsets: Optional[np.ndarray] = None
+    ):
+        """새 버전 디렉토리에 기록 후 meta.json을 원자적으로 교체"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        version = f"v{time.time_ns()}"
+        version_dir = self.path / version
+        version_dir.mkdir()
+
+        np.save(version_dir / "vectors.npy", vectors.astype(dtype, copy=False))
+        np.save(version_dir / "chunk_ids.npy", chunk_ids.astype(np.int64, copy=False))
+        if centroids is not None:
+            np.save(version_dir / "centroids.npy", centroids.astype(np.float32))
+            np.save(version_dir / "list_offsets.npy", list_offsets.astype(np.int64))
+
+        meta = {
+            'version': version,
+            'model_name': self.config.model_name,
+            'table': self.table,
+            'dimension': int(vectors.shape[1]) if vectors.ndim == 2 else self.config.dimension,
+            'count': int(vectors.shape[0]),
+            'dtype': dtype,
+            'nlist': nlist,
+            'ivf_count': ivf_count,
+            'max_chunk_id': int(chunk_ids.max()) if len(chunk_ids) else 0,
+            'updated_at': time.time()
+        }
+        tmp_meta = self.path / "meta.json.tmp"
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_meta, self.path / "meta.json")
+
+        self._cleanup_old_versions(keep=version)
+        self.load()
+
+    def _cleanup_old_versions(self, keep: str, keep_last: int = 2):
+        """이전 버전 디렉토리 정리 (다른 워커가 아직 매핑 중일 수 있어 직전 버전은 유지)"""
+        versions = sorted(
+            (p for p in self.path.iterdir() if p.is_dir() and p.name.startswith('v')),
+            key=lambda p: p.name
+        )
+        for old in versions[:-keep_last]:
+            if old.name != keep:
+                shutil.rmtree(old, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # 생성 / 추가
+    # ------------------------------------------------------------------
+
+    def build(
+        self,
+        vector_store,
+        dtype: str = "float32",
+        nlist: int = 0,
+        fetch_size: int = 2000
+    ) -> int:
+        """
+        pgvector 테이블 전체를 내보내 인덱스 재생성
+
+        Args:
+            vector_store: 연결 가능한 PgVectorStore
+            dtype: 저장 dtype ('float32' 또는 'float16')
+            nlist: IVF 리스트 수 (0이면 정확 검색만 사용)
+            fetch_size: 서버 측 커서 배치 크기
+
+        Returns:
+            인덱스에 저장된 벡터 수
+        """
+        chunk_ids, vectors = self._export(vector_store, fetch_size=fetch_size)
+        self.rebuild_from_arrays(chunk_ids, vectors, dtype=dtype, nlist=nlist)
+        return len(chunk_ids)
+
+    def rebuild_from_arrays(
+        self,
+        chunk_ids: Sequence[int],
+        vectors: np.ndarray,
+        dtype: str = "float32",
+        nlist: int = 0
+    ):
+        """메모리 상의 배열로 인덱스 재생성"""
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported dtype: {dtype}")
+
+        chunk_ids = np.asarray(chunk_ids, dtype=np.int64)
+        if len(chunk_ids) == 0:
+            # 빈 임베딩 테이블: 빈 인덱스 기록 (reshape(0, -1)은 차원을 추론할 수 없음)
+            vectors = np.zeros((0, self.config.dimension), dtype=np.float32)
+        else:
+            vectors = _normalize_rows(np.asarray(vectors, dtype=np.float32).reshape(len(chunk_ids), -1))
+
+        with self._lock:
+            if nlist > 0 and len(chunk_ids) >= nlist * 4:
+                centroids = _train_kmeans(vectors, nlist)
+                assign = np.argmax(vectors @ centroids.T, axis=1)
+                order = np.argsort(assign, kind='stable')
+                counts = np.bincount(assign, minlength=nlist)
+                list_offsets = np.concatenate([[0], np.cumsum(counts)])
+                self._write(
+                    vectors[order], chunk_ids[order], dtype,
+                    nlist=nlist, ivf_count=len(chunk_ids),
+                    centroids=centroids, list_offsets=list_offsets
+                )
+            else:
+                if nlist > 0:
+                    logger.warning(f"Too few vectors ({len(chunk_ids)}) for IVF nlist={nlist}, using exact index")
+                self._write(vectors, chunk_ids, dtype, nlist=0, ivf_count=0)
+
+        logger.info(f"Built local index {self.table}: {len(chunk_ids)} vectors")
+
+    def append(self, chunk_ids: Sequence[int], vectors: np.ndarray):
+        """
+        인덱스에 벡터 추가
+        IVF 리스트는 유지하고 새 벡터는 항상 정확 검색하는 꼬리(tail) 영역에 추가
+        """
+        chunk_ids = np.asarray(chunk_ids, dtype=np.int64)
+        if len(chunk_ids) == 0:
+            return
+
+        with self._lock:
+            if not self.exists():
+                self.rebuild_from_arrays(chunk_ids, vectors)
+                return
+            if self.vectors is None:
+                self.load()
+
+            new_vectors = _normalize_rows(
+                np.asarray(vectors, dtype=np.float32).reshape(len(chunk_ids), -1)
+            )
+            merged_vectors = np.concatenate([
+                np.asarray(self.vectors, dtype=np.float32), new_vectors
+            ])
+            merged_ids = np.concatenate([np.asarray(self.chunk_ids), chunk_ids])
+
+            self._write(
+                merged_vectors, merged_ids, self.meta['dtype'],
+                nlist=self.meta.get('nlist', 0),
+                ivf_count=self.meta.get('ivf_count', 0),
+                centroids=self.centroids,
+                list_offsets=self.list_offsets
+            )
+        logger.info(f"Appended {len(chunk_ids)} vectors to local index {self.table}")
+
+    def sync(self, vector_store, dtype: Optional[str] = None, nlist: Optional[int] = None) -> int:
+        """
+        수집(ingestion) 후 DB와 동기화
+        새 chunk_id만 추가된 경우 증분 추가, 그 외(삭제/재생성)에는 전체 재생성
+
+        Returns:
+            동기화 후 벡터 수
+        """
+        if not self.exists():
+            return self.build(vector_store, dtype=dtype or "float32", nlist=nlist or 0)
+
+        self.load()
+        dtype = dtype or self.meta['dtype']
+        nlist = self.meta.get('nlist', 0) if nlist is None else nlist
+
+        vector_store.connect()
+        vector_store.cursor.execute(
+            f"SELECT COUNT(*), COALESCE(MAX(chunk_id), 0) FROM vector_db.{self.table}"
+        )
+        db_count, db_max_id = vector_store.cursor.fetchone()
+        indexed_max_id = self.meta.get('max_chunk_id', 0)
+
+        if db_count == self.meta['count'] and db_max_id == indexed_max_id:
+            logger.info(f"Local index {self.table} already up to date")
+            return db_count
+
+        new_ids, new_vectors = self._export(vector_store, min_chunk_id=indexed_max_id)
+        if db_count == self.meta['count'] + len(new_ids):
+            self.append(new_ids, new_vectors)
+        else:
+            self.build(vector_store, dtype=dtype, nlist=nlist)
+        return db_count
+
+    def _export(
+        self,
+        vector_store,
+        min_chunk_id: int = 0,
+        fetch_size: int = 2000
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """pgvector 테이블에서 (chunk_id, embedding) 스트리밍 조회"""
+        vector_store.connect()
+        conn = vector_store.conn
+        dim = self.config.dimension
+
+        chunk_ids: List[int] = []
+        blocks: List[np.ndarray] = []
+
+        # 서버 측 커서로 대용량 테이블도 일정 메모리로 조회
+        with conn.cursor(name=f"export_{self.table}") as cur:
+            cur.itersize = fetch_size
+            cur.execute(
+                f"SELECT chunk_id, embedding FROM vector_db.{self.table} "
+                f"WHERE chunk_id > %s ORDER BY chunk_id",
+                (min_chunk_id,)
+            )
+            while True:
+                rows = cur.fetchmany(fetch_size)
+                if not rows:
+                    break
+                block = np.empty((len(rows), dim), dtype=np.float32)
+                for i, (chunk_id, embedding) in enumerate(rows):
+                    chunk_ids.append(chunk_id)
+                    block[i] = parse_vector(embedding)
+                blocks.append(block)
+        conn.commit()
+
+        vectors = np.concatenate(blocks) if blocks else np.empty((0, dim), dtype=np.float32)
+        return np.asarray(chunk_ids, dtype=np.int64), vectors
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _scan(vectors: np.ndarray, queries: np.ndarray, start: int, end: int) -> np.ndarray:
+        """행 범위 [start, end)에 대한 (Q x rows) 점수 행렬"""
+        if end <= start:
+            return np.empty((queries.shape[0], 0), dtype=np.float32)
+        if vectors.dtype == np.float32:
+            return queries @ vectors[start:end].T
+        parts = []
+        for s in range(start, end, _SCAN_BLOCK_ROWS):
+            e = min(s + _SCAN_BLOCK_ROWS, end)
+            parts.append(queries @ np.asarray(vectors[s:e], dtype=np.float32).T)
+        return np.concatenate(parts, axis=1)
+
+    @staticmethod
+    def _candidate_ranges(
+        query: np.ndarray,
+        nprobe: int,
+        num_rows: int,
+        centroids: Optional[np.ndarray],
+        list_offsets: Optional[np.ndarray],
+        ivf_count: int
+    ) -> List[Tuple[int, int]]:
+        """IVF: 쿼리별 탐색할 행 범위 (가까운 리스트 + 꼬리 영역)"""
+        ranges = []
+        if centroids is not None:
+            probes = _top_k(centroids @ query, min(nprobe, len(centroids)))
+            for c in probes:
+                ranges.append((int(list_offsets[c]), int(list_offsets[c + 1])))
+            if ivf_count < num_rows:
+                ranges.append((ivf_count, num_rows))
+        else:
+            ranges.append((0, num_rows))
+        return ranges
+
+    def search(
+        self,
+        query_embedding,
+        top_k: int = 5,
+        min_similarity: float = 0.0,
+        nprobe: Optional[int] = None,
+        allowed_ids: Optional[Sequence[int]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        단일 쿼리 검색
+
+        Returns:
+            [(chunk_id, similarity), ...] 유사도 내림차순
+        """
+        return self.search_batch([query_embedding], top_k, min_similarity, nprobe, allowed_ids)[0]
+
+    def search_batch(
+        self,
+        query_embeddings,
+        top_k: int = 5,
+        min_similarity: float = 0.0,
+        nprobe: Optional[int] = None,
+        allowed_ids: Optional[Sequence[int]] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        배치 쿼리 검색 (정확 검색은 한 번의 행렬 곱)
+
+        Args:
+            allowed_ids: 검색 대상 chunk_id (메타데이터 필터 결과, 지정 시 해당 행만 정확 검색)
+
+        Returns:
+            쿼리별 [(chunk_id, similarity), ...]
+        """
+        # 다른 스레드의 재로드와 섞이지 않도록 한 버전의 배열을 한 번에 잡아둠
+        with self._lock:
+            self._maybe_reload()
+            vectors, chunk_ids = self.vectors, self.chunk_ids
+            centroids, list_offsets = self.centroids, self.list_offsets
+            ivf_count = self.meta.get('ivf_count', 0)
+
+        queries = _normalize_rows(np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32)))
+        if vectors is None or vectors.shape[0] == 0:
+            return [[] for _ in range(queries.shape[0])]
+
+        nprobe = nprobe or self.nprobe
+        results = []
+
+        if allowed_ids is not None:
+            # 필터 후 남은 행만 정확 검색 (IVF 리스트 탐색으로 인한 누락 없음)
+            rows = np.flatnonzero(np.isin(chunk_ids, np.asarray(list(allowed_ids), dtype=chunk_ids.dtype)))
+            if rows.shape[0] == 0:
+                return [[] for _ in range(queries.shape[0])]
+            scores = queries @ np.asarray(vectors[rows], dtype=np.float32).T
+            for q in range(queries.shape[0]):
+                results.append(self._collect(scores[q], rows, chunk_ids, top_k, min_similarity))
+            return results
+
+        if centroids is None:
+            scores = self._scan(vectors, queries, 0, vectors.shape[0])
+            for q in range(queries.shape[0]):
+                results.append(self._collect(scores[q], None, chunk_ids, top_k, min_similarity))
+            return results
+
+        for q in range(queries.shape[0]):
+            ranges = self._candidate_ranges(
+                queries[q], nprobe, vectors.shape[0], centroids, list_offsets, ivf_count
+            )
+            rows = np.concatenate([np.arange(s, e) for s, e in ranges]) if ranges else np.empty(0, dtype=np.int64)
+            scores = np.concatenate([self._scan(vectors, queries[q:q + 1], s, e)[0] for s, e in ranges]) if ranges else np.empty(0)
+            results.append(self._collect(scores, rows, chunk_ids, top_k, min_similarity))
+        return results
+
+    @staticmethod
+    def _collect(
+        scores: np.ndarray,
+        rows: Optional[np.ndarray],
+        chunk_ids: np.ndarray,
+        top_k: int,
+        min_similarity: float
+    ) -> List[Tuple[int, float]]:
+        if scores.shape[0] == 0:
+            return []
+        best = _top_k(scores, min(top_k, scores.shape[0]))
+        hits = []
+        for i in best:
+            similarity = float(scores[i])
+            if similarity < min_similarity:
+                break
+            row = rows[i] if rows is not None else i
+            hits.append((int(chunk_ids[row]), similarity))
+        return hits
+
+    def get_vectors(self, chunk_ids: Sequence[int]) -> Dict[int, np.ndarray]:
+        """chunk_id로 저장된 (정규화된) 벡터 조회"""
+        with self._lock:
+            self._maybe_reload()
+            if self.vectors is None:
+                return {}
+            if self._id_to_row is None:
+                self._id_to_row = {int(cid): row for row, cid in enumerate(self.chunk_ids)}
+            id_to_row = self._id_to_row
+            vectors = self.vectors
+
+        found = {}
+        for chunk_id in chunk_ids:
+            row = id_to_row.get(int(chunk_id))
+            if row is not None:
+                found[int(chunk_id)] = np.asarray(vectors[row], dtype=np.float32)
+        return found
+
+    def stats(self) -> Dict[str, Any]:
+        """인덱스 정보 반환"""
+        if self.vectors is None and self.exists():
+            self.load()
+        return {
+            'table': self.table,
+            'path': str(self.path),
+            'loaded': self.vectors is not None,
+            **{k: self.meta.get(k) for k in ('count', 'dimension', 'dtype', 'nlist', 'ivf_count', 'version')}
+        }
+
+
+# ============================================================================
+# 프로세스 전역 인덱스 레지스트리
+# ============================================================================
+
+_indexes: Dict[Tuple[EmbeddingModelType, str], LocalVectorIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_local_index(
+    model_type: EmbeddingModelType,
+    index_dir: Optional[str] = None
+) -> LocalVectorIndex:
+    """모델별 LocalVectorIndex 공유 인스턴스 반환 (로드는 첫 검색 시)"""
+    key = (model_type, str(index_dir or get_local_index_dir()))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = LocalVectorIndex(model_type, index_dir=index_dir)
+            _indexes[key] = index
+        return index
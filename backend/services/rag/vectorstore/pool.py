@@ -0,0 +1,322 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+PostgreSQL 커넥션 풀
+rag/vectorstore 클래스들이 공유하는 프로세스 전역 psycopg2 커넥션 풀
+- 스레드 안전 (최대 크기 초과 시 타임아웃까지 대기)
+- 체크아웃 시 헬스 체크 및 search_path 설정
+- 풀 사용률 메트릭
+"""
+
+import logging
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple
+
+import psycopg2
+from psycopg2 import extensions, pool
+
+from .vector_adapter import register_vector
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEARCH_PATH = "vector_db, public"
+
+
+def get_default_db_config() -> Dict[str, str]:
+    """환경변수에서 DB 설정 가져오기"""
+    return {
+        'host': os.getenv('PG_HOST', 'localhost'),
+        'port': os.getenv('PG_PORT', '5432'),
+        'database': os.getenv('PG_DB', 'rey'),
+        'user': os.getenv('PG_USER', 'postgres'),
+        'password': os.getenv('PG_PASSWORD', 'post1234')
+    }
+
+
+class PoolTimeoutError(Exception):
+    """풀에서 커넥션을 얻지 못한 경우"""
+    pass
+
+
+class PgConnectionPool:
+    """스레드 안전 psycopg2 커넥션 풀"""
+
+    def __init__(
+        self,
+        db_config: Dict[str, str],
+        minconn: int = 1,
+        maxconn: int = 10,
+        search_path: str = DEFAULT_SEARCH_PATH,
+        checkout_timeout: float = 30.0,
+        health_check_interval: float = 30.0
+    ):
+        """
+        Args:
+            db_config: DB 연결 정보 {'host', 'port', 'database', 'user', 'password'}
+            minconn: 최소 유지 커넥션 수
+            maxconn: 최대 커넥션 수
+            search_path: 체크아웃 시 설정할 search_path
+            checkout_timeout: 커넥션 대기 최대 시간 (초)
+            health_check_interval: 이 시간(초) 이상 유휴 상태였던 커넥션은 체크아웃 시 검사
+        """
+        self.db_config = db_config
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.search_path = search_path
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._pool: Optional[pool.ThreadedConnectionPool] = None
+        self._pid = None
+        # 초기화된 커넥션 -> 마지막 반납 시각 (id()는 닫힌 커넥션의 주소가 재사용될 수 있어 쓰지 않음)
+        self._initialized: "weakref.WeakKeyDictionary[Any, float]" = weakref.WeakKeyDictionary()
+        self._conn_hooks = []
+
+        # 메트릭
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._checkouts = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._timeouts = 0
+        self._health_check_failures = 0
+
+    def _ensure_pool(self) -> pool.ThreadedConnectionPool:
+        """풀 생성 (fork 이후에는 부모의 커넥션을 공유하지 않도록 재생성)"""
+        pid = os.getpid()
+        if self._pool is None or self._pid != pid:
+            with self._lock:
+                if self._pool is None or self._pid != pid:
+                    if self._pool is not None:
+                        # 부모 프로세스의 소켓은 닫지 않고 버림
+                        logger.info("Process forked, recreating connection pool")
+                    self._pool = pool.ThreadedConnectionPool(
+                        self.minconn, self.maxconn, **self.db_config
+                    )
+                    # psycopg2는 유휴 커넥션이 minconn개 이상이면 반납된 커넥션을 닫으므로
+                    # 처음에는 minconn개만 열고, 이후 반납된 커넥션은 maxconn개까지 유지
+                    self._pool.minconn = self.maxconn
+                    self._pid = pid
+                    self._initialized = weakref.WeakKeyDictionary()
+                    self._slots = threading.BoundedSemaphore(self.maxconn)
+                    self._in_use = 0
+        return self._pool
+
+    def add_connection_hook(self, hook):
+        """새 커넥션 초기화 시 실행할 함수 등록 (예: 타입 어댑터 등록)"""
+        self._conn_hooks.append(hook)
+
+    def _prepare(self, conn) -> None:
+        """커넥션 초기화 (처음 체크아웃될 때 한 번)"""
+        conn.set_client_encoding('UTF8')
+        with conn.cursor() as cur:
+            cur.execute(f"SET search_path TO {self.search_path};")
+        conn.commit()
+        for hook in self._conn_hooks:
+            hook(conn)
+
+    def _is_healthy(self, conn) -> bool:
+        """유휴 커넥션 헬스 체크"""
+        if conn.closed:
+            return False
+        last_used = self._initialized.get(conn)
+        if last_used is not None and time.time() - last_used < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self, timeout: Optional[float] = None):
+        """
+        커넥션 체크아웃
+
+        Raises:
+            PoolTimeoutError: timeout 내에 커넥션을 얻지 못한 경우
+        """
+        db_pool = self._ensure_pool()
+        timeout = self.checkout_timeout if timeout is None else timeout
+
+        start = time.time()
+        if not self._slots.acquire(timeout=timeout):
+            with self._lock:
+                self._timeouts += 1
+            raise PoolTimeoutError(f"No connection available within {timeout:.1f}s (max={self.maxconn})")
+
+        conn = None
+        try:
+            while True:
+                conn = db_pool.getconn()
+                if conn not in self._initialized:
+                    self._prepare(conn)
+                    self._initialized[conn] = time.time()
+                    break
+                if self._is_healthy(conn):
+                    break
+                with self._lock:
+                    self._health_check_failures += 1
+                logger.warning("Discarding broken pooled connection")
+                self._initialized.pop(conn, None)
+                db_pool.putconn(conn, close=True)
+                conn = None
+        except Exception:
+            if conn is not None:
+                # 초기화에 실패한 커넥션은 닫아서 psycopg2 풀의 슬롯을 돌려줌
+                self._initialized.pop(conn, None)
+                try:
+                    db_pool.putconn(conn, close=True)
+                except Exception as e:
+                    logger.warning(f"Failed to discard connection: {e}")
+            self._slots.release()
+            raise
+
+        waited = time.time() - start
+        with self._lock:
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+            self._checkouts += 1
+            self._wait_time_total += waited
+            self._wait_time_max = max(self._wait_time_max, waited)
+        return conn
+
+    def putconn(self, conn, close: bool = False):
+        """커넥션 반납 (진행 중인 트랜잭션은 롤백)"""
+        if conn is None:
+            return
+        db_pool = self._pool
+        try:
+            if self._pid != os.getpid() or db_pool is None:
+                # fork 이전 커넥션은 이 프로세스의 풀에 속하지 않음
+                return
+            if not conn.closed and conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    close = True
+            close = close or bool(conn.closed)
+            if not close:
+                self._initialized[conn] = time.time()
+            try:
+                db_pool.putconn(conn, close=close)
+            finally:
+                if close or conn.closed:
+                    # psycopg2가 반납 시 닫은 커넥션도 초기화 목록에서 제거
+                    self._initialized.pop(conn, None)
+        finally:
+            with self._lock:
+                self._in_use = max(0, self._in_use - 1)
+            self._slots.release()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """
+        커넥션 컨텍스트 매니저
+
+        Usage:
+            with pool.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(...)
+        """
+        conn = self.getconn(timeout)
+        broken = False
+        try:
+            yield conn
+        except psycopg2.OperationalError:
+            broken = True
+            raise
+        finally:
+            self.putconn(conn, close=broken)
+
+    def stats(self) -> Dict[str, Any]:
+        """풀 사용률 메트릭"""
+        with self._lock:
+            return {
+                'database': self.db_config.get('database'),
+                'minconn': self.minconn,
+                'maxconn': self.maxconn,
+                'in_use': self._in_use,
+                'peak_in_use': self._peak_in_use,
+                'utilization': self._in_use / self.maxconn if self.maxconn else 0.0,
+                'open_connections': len(self._initialized) if self._pid == os.getpid() else 0,
+                'checkouts': self._checkouts,
+                'avg_wait_ms': (self._wait_time_total / self._checkouts * 1000) if self._checkouts else 0.0,
+                'max_wait_ms': self._wait_time_max * 1000,
+                'timeouts': self._timeouts,
+                'health_check_failures': self._health_check_failures
+            }
+
+    def closeall(self):
+        """모든 커넥션 종료"""
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.closeall()
+            self._pool = None
+            self._initialized = weakref.WeakKeyDictionary()
+            self._in_use = 0
+
+
+# ============================================================================
+# 프로세스 전역 풀 레지스트리
+# ============================================================================
+
+_pools: Dict[Tuple, PgConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_key(db_config: Dict[str, str]) -> Tuple:
+    return tuple(sorted((k, str(v)) for k, v in db_config.items()))
+
+
+def get_pool(db_config: Optional[Dict[str, str]] = None) -> PgConnectionPool:
+    """
+    DB 설정별 공유 커넥션 풀 반환
+    환경 변수로 크기 설정 가능:
+    - RAG_DB_POOL_MIN (기본값: 1)
+    - RAG_DB_POOL_MAX (기본값: 10)
+    """
+    db_config = db_config or get_default_db_config()
+    key = _pool_key(db_config)
+
+    with _pools_lock:
+        db_pool = _pools.get(key)
+        if db_pool is None:
+            db_pool = PgConnectionPool(
+                db_config,
+                minconn=int(os.getenv('RAG_DB_POOL_MIN', '1')),
+                maxconn=int(os.getenv('RAG_DB_POOL_MAX', '10'))
+            )
+            # vector 컬럼 ↔ np.ndarray 변환
+            db_pool.add_connection_hook(register_vector)
+            _pools[key] = db_pool
+            logger.info(
+                f"Created connection pool for DB: {db_config.get('database')} "
+                f"(min={db_pool.minconn}, max={db_pool.maxconn})"
+            )
+        return db_pool
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """모든 풀의 사용률 메트릭 반환"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {
+        f"{p.db_config.get('host')}:{p.db_config.get('port')}/{p.db_config.get('database')}": p.stats()
+        for p in pools
+    }
+
+
+def close_all_pools():
+    """모든 풀 종료 (프로세스 종료 시)"""
+    with _pools_lock:
+        for db_pool in _pools.values():
+            db_pool.closeall()
+        _pools.clear()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+양자화 벡터 인덱스 (pgvector 0.7+)
+float32 임베딩 컬럼은 그대로 두고 양자화 표현식에 HNSW 인덱스를 만들어
+후보 검색은 작은 인덱스로, 상위 후보의 최종 순위는 float32 원본으로 재계산
+- halfvec: embedding::halfvec(N) + halfvec_cosine_ops (인덱스 크기 약 1/2)
+- binary: binary_quantize(embedding)::bit(N) + bit_hamming_ops (인덱스 크기 약 1/32)
+
+검색 시 사용할 방식은 환경 변수 RAG_VECTOR_QUANTIZATION (none, halfvec, binary)으로 지정하며
+인덱스는 rag quantize build 명령으로 생성합니다.
+"""
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+QUANTIZATION_NONE = 'none'
+QUANTIZATION_HALFVEC = 'halfvec'
+QUANTIZATION_BINARY = 'binary'
+
+
+@dataclass(frozen=True)
+class QuantizationSpec:
+    """양자화 방식별 인덱스/쿼리 표현식"""
+    name: str
+    expression: str        # 컬럼 표현식 템플릿 ({column}, {dim})
+    opclass: str           # HNSW 연산자 클래스
+    operator: str          # 거리 연산자
+    rescore_factor: int    # 재계산할 후보 수 = top_k * rescore_factor
+
+    def index_expression(self, column: str, dim: int) -> str:
+        """인덱스/정렬에 쓰는 표현식 (인덱스 정의와 글자 그대로 같아야 플래너가 인덱스 사용)"""
+        return self.expression.format(column=column, dim=dim)
+
+
+QUANTIZATION_SPECS: Dict[str, QuantizationSpec] = {
+    QUANTIZATION_HALFVEC: QuantizationSpec(
+        name=QUANTIZATION_HALFVEC,
+        expression='({column})::halfvec({dim})',
+        opclass='halfvec_cosine_ops',
+        operator='<=>',
+        rescore_factor=2
+    ),
+    QUANTIZATION_BINARY: QuantizationSpec(
+        name=QUANTIZATION_BINARY,
+        expression='(binary_quantize({column})::bit({dim}))',
+        opclass='bit_hamming_ops',
+        operator='<~>',
+        rescore_factor=10
+    ),
+}
+
+
+def get_quantization(name: Optional[str] = None) -> Optional[QuantizationSpec]:
+    """
+    양자화 방식 조회
+    None이면 환경 변수 RAG_VECTOR_QUANTIZATION (기본값: none)
+
+    Returns:
+        QuantizationSpec (none이면 None)
+
+    Raises:
+        ValueError: 알 수 없는 방식
+    """
+    name = (name or os.getenv('RAG_VECTOR_QUANTIZATION', QUANTIZATION_NONE)).lower()
+    if name == QUANTIZATION_NONE:
+        return None
+    spec = QUANTIZATION_SPECS.get(name)
+    if spec is None:
+        available = ', '.join([QUANTIZATION_NONE, *QUANTIZATION_SPECS])
+        raise ValueError(f"Unknown vector quantization: {name} (available: {available})")
+    return spec
+
+
+def rescore_candidates(spec: QuantizationSpec, top_k: int) -> int:
+    """
+    float32로 재계산할 후보 수
+    환경 변수 RAG_QUANTIZATION_RESCORE_FACTOR로 배수 변경 가능 (기본값: 방식별 값)
+    """
+    factor = int(os.getenv('RAG_QUANTIZATION_RESCORE_FACTOR', '0')) or spec.rescore_factor
+    return max(top_k * factor, 40)
+
+
+def quantized_index_name(table: str, spec: QuantizationSpec) -> str:
+    """양자화 HNSW 인덱스 이름"""
+    return f"idx_{table}_hnsw_{spec.name}"
+
+
+def create_quantized_index(cursor, table: str, dim: int, spec: QuantizationSpec) -> float:
+    """
+    양자화 표현식 HNSW 인덱스 생성 (schema.sql의 float 인덱스와 같은 m/ef_construction)
+
+    Args:
+        cursor: psycopg2 커서 (호출자가 커밋)
+        table: 임베딩 테이블 이름
+        dim: 임베딩 차원
+        spec: 양자화 방식
+
+    Returns:
+        생성 시간 (초, 이미 있으면 0에 가까움)
+    """
+    start = time.perf_counter()
+    cursor.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS {quantized_index_name(table, spec)}
+        ON vector_db.{table}
+        USING hnsw ({spec.index_expression('embedding', dim)} {spec.opclass})
+        WITH (m = 16, ef_construction = 64)
+        """
+    )
+    elapsed = time.perf_counter() - start
+    logger.info(f"Quantized index ready: {quantized_index_name(table, spec)} ({elapsed:.1f}s)")
+    return elapsed
+
+
+def drop_quantized_index(cursor, table: str, spec: QuantizationSpec):
+    """양자화 HNSW 인덱스 삭제"""
+    cursor.execute(f"DROP INDEX IF EXISTS vector_db.{quantized_index_name(table, spec)}")
+
+
+def relation_sizes(cursor, table: str) -> Dict[str, int]:
+    """
+    테이블/인덱스 크기 (바이트)
+
+    Returns:
+        {'table': 힙+TOAST 크기, 인덱스 이름: 크기, ...}
+    """
+    cursor.execute("SELECT pg_table_size(%s::regclass)", (f"vector_db.{table}",))
+    sizes = {'table': cursor.fetchone()[0]}
+    cursor.execute(
+        """
+        SELECT indexrelid::regclass::text, pg_relation_size(indexrelid)
+        FROM pg_index
+        WHERE indrelid = %s::regclass
+        ORDER BY 1
+        """,
+        (f"vector_db.{table}",)
+    )
+    for index_name, size in cursor.fetchall():
+        sizes[index_name.split('.')[-1]] = size
+    return sizes
+
+
+def quantized_search_sql(
+    table: str,
+    dim: int,
+    spec: QuantizationSpec,
+    query_ref: str,
+    filter_sql: str = ''
+) -> str:
+    """
+    양자화 인덱스 후보 검색 + float32 재계산 SQL (SELECT chunk_id, content, similarity, metadata)
+
+    파라미터 순서: 필터 파라미터..., 후보 수, 최소 유사도, top_k
+
+    Args:
+        table: 임베딩 테이블 이름
+        dim: 임베딩 차원
+        spec: 양자화 방식
+        query_ref: 쿼리 벡터 SQL 참조 (예: '(SELECT embedding FROM q)', 'q.embedding')
+        filter_sql: 메타데이터 필터 조건 (' AND ...', 별칭 e / dc)
+    """
+    filter_join = "JOIN vector_db.document_chunks dc ON e.chunk_id = dc.id" if filter_sql else ''
+    return f"""
+        SELECT dc.id AS chunk_id, dc.content,
+               1 - (c.embedding <=> {query_ref}) AS similarity,
+               dc.metadata
+        FROM (
+            SELECT e.chunk_id, e.embedding
+            FROM vector_db.{table} e
+            {filter_join}
+            WHERE TRUE{filter_sql}
+            ORDER BY {spec.index_expression('e.embedding', dim)} {spec.operator} {spec.index_expression(query_ref, dim)}
+            LIMIT %s
+        ) c
+        JOIN vector_db.document_chunks dc ON dc.id = c.chunk_id
+        WHERE 1 - (c.embedding <=> {query_ref}) >= %s
+        ORDER BY c.embedding <=> {query_ref}, dc.id
+        LIMIT %s
+    """
+
+
+def benchmark_quantization(
+    store,
+    model_type,
+    query_embeddings: List[Any],
+    top_k: int = 5,
+    modes: Optional[List[str]] = None,
+    build: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    float32 인덱스 대비 양자화 인덱스 비교 (인덱스 크기, 생성 시간, recall@k, 지연 시간)
+
+    Args:
+        store: PgVectorStore
+        model_type: 임베딩 모델
+        query_embeddings: 쿼리 임베딩 리스트
+        top_k: 검색 결과 수
+        modes: 비교할 방식 (기본값: none, halfvec, binary)
+        build: 없는 양자화 인덱스를 생성하며 생성 시간 측정
+
+    Returns:
+        방식별 {'mode', 'index', 'index_bytes', 'build_seconds', 'recall', 'p50_ms', 'p95_ms'}
+    """
+    import numpy as np
+    from ..models.config import get_embedding_table, get_model_config
+
+    table = get_embedding_table(model_type)
+    dim = get_model_config(model_type).dimension
+    modes = modes or [QUANTIZATION_NONE, *QUANTIZATION_SPECS]
+
+    build_seconds: Dict[str, Optional[float]] = {}
+    with store.pool.connection() as conn, conn.cursor() as cur:
+        if build:
+            for mode in modes:
+                spec = get_quantization(mode)
+                if spec is not None:
+                    build_seconds[mode] = create_quantized_index(cur, table, dim, spec)
+                    continue
+                # float32 인덱스는 이미 있으므로 같은 설정의 임시 인덱스로 생성 시간만 측정
+                start = time.perf_counter()
+                cur.execute(
+                    f"CREATE INDEX idx_{table}_hnsw_bench ON vector_db.{table} "
+                    f"USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)"
+                )
+                build_seconds[mode] = time.perf_counter() - start
+                cur.execute(f"DROP INDEX vector_db.idx_{table}_hnsw_bench")
+        conn.commit()
+        sizes = relation_sizes(cur, table)
+
+    # 정답 집합: 인덱스를 사용하지 않는 float32 정확 검색
+    ground_truth = [
+        [r['chunk_id'] for r in store.search_similar(q, model_type, top_k=top_k, recall_profile='exact')]
+        for q in query_embeddings
+    ]
+
+    report = []
+    for mode in modes:
+        spec = get_quantization(mode)
+        index_name = f"idx_{table}_hnsw" if spec is None else quantized_index_name(table, spec)
+        latencies, recalls = [], []
+        for query, expected in zip(query_embeddings, ground_truth):
+            start = time.perf_counter()
+            results = store.search_similar(query, model_type, top_k=top_k, quantization=mode)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if expected:
+                found = {r['chunk_id'] for r in results}
+                recalls.append(len(found & set(expected)) / len(expected))
+
+        report.append({
+            'mode': mode,
+            'index': index_name,
+            'index_bytes': sizes.get(index_name),
+            'build_seconds': build_seconds.get(mode),
+            'recall': float(np.mean(recalls)) if recalls else 0.0,
+            'p50_ms': float(np.percentile(latencies, 50)) if latencies else 0.0,
+            'p95_ms': float(np.percentile(latencies, 95)) if latencies else 0.0,
+        })
+    report.append({'mode': 'table', 'index': table, 'index_bytes': sizes.get('table')})
+    return report
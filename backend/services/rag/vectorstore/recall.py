@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+HNSW 검색 정확도/지연 시간 프로파일
+요청 단위로 hnsw.ef_search 등 플래너 설정을 트랜잭션 범위(SET LOCAL)로 적용
+- fast: 작은 ef_search (낮은 지연 시간)
+- balanced: pgvector 기본값 수준 ef_search
+- exact: 인덱스를 사용하지 않는 정확 검색 (재현율 기준선)
+필터(min_similarity 등)가 있으면 iterative scan으로 top_k 미만 절단 방지 (pgvector 0.8+)
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 로컬 인덱스에서 모든 IVF 리스트를 탐색하기 위한 nprobe
+ALL_LISTS = 1 << 30
+
+# pgvector hnsw.ef_search 최대값
+MAX_EF_SEARCH = 1000
+
+
+@dataclass(frozen=True)
+class RecallProfile:
+    """검색 정확도 프로파일"""
+    name: str
+    ef_search: int = 40                   # hnsw.ef_search (top_k보다 작으면 top_k 사용)
+    iterative_scan: str = 'strict_order'  # 필터가 있을 때의 hnsw.iterative_scan
+    exact: bool = False                   # True면 인덱스 스캔 비활성화 (정확 검색)
+    local_nprobe: Optional[int] = None    # 로컬 인덱스 nprobe (None이면 인덱스 기본값)
+
+
+RECALL_PROFILES: Dict[str, RecallProfile] = {
+    'fast': RecallProfile(name='fast', ef_search=16, local_nprobe=2),
+    'balanced': RecallProfile(name='balanced', ef_search=40),
+    'exact': RecallProfile(name='exact', exact=True, local_nprobe=ALL_LISTS),
+}
+
+
+def get_recall_profile(name: Optional[str] = None) -> RecallProfile:
+    """
+    이름으로 프로파일 조회
+    None이면 환경 변수 RAG_RECALL_PROFILE (기본값: balanced)
+
+    Raises:
+        ValueError: 알 수 없는 프로파일 이름
+    """
+    name = (name or os.getenv('RAG_RECALL_PROFILE', 'balanced')).lower()
+    profile = RECALL_PROFILES.get(name)
+    if profile is None:
+        raise ValueError(f"Unknown recall profile: {name} (available: {', '.join(RECALL_PROFILES)})")
+    return profile
+
+
+def apply_recall_profile(cursor, profile: RecallProfile, top_k: int, filtered: bool = False):
+    """
+    현재 트랜잭션에 프로파일 설정 적용 (SET LOCAL, 커밋/롤백 시 원복)
+
+    Args:
+        cursor: psycopg2 커서 (풀 커넥션, 트랜잭션 내부)
+        profile: 적용할 프로파일
+        top_k: 요청 결과 수 (ef_search 하한)
+        filtered: WHERE 필터 존재 여부 (True면 iterative scan 사용)
+    """
+    if profile.exact:
+        # HNSW 인덱스 대신 순차 스캔 + 정렬
+        cursor.execute("SET LOCAL enable_indexscan = off")
+        cursor.execute("SET LOCAL enable_bitmapscan = off")
+        return
+
+    cursor.execute("SET LOCAL hnsw.ef_search = %s", (min(max(profile.ef_search, top_k), MAX_EF_SEARCH),))
+    if filtered and profile.iterative_scan != 'off':
+        cursor.execute("SET LOCAL hnsw.iterative_scan = %s", (profile.iterative_scan,))
@@ -56,6 +56,7 @@ CREATE TABLE IF NOT EXISTS vector_db.document_chunks (
     chunk_type VARCHAR(50),                   -- 'text', 'table', 'header' 등
     token_count INTEGER,                      -- 토큰 수
     metadata JSONB,                           -- 추가 메타데이터 (위치, 페이지 등)
+    keywords TEXT[],                          -- 수집 시 추출한 키워드 (KeywordReranker, NULL이면 미추출)
     created_at TIMESTAMP DEFAULT NOW(),
 
     -- 하나의 소스에서 청크 인덱스는 유일
@@ -70,6 +71,9 @@ CREATE INDEX IF NOT EXISTS idx_document_chunks_type ON vector_db.document_chunks
 CREATE INDEX IF NOT EXISTS idx_document_chunks_content_fts ON vector_db.document_chunks
 USING GIN (to_tsvector('simple', content));
 
+-- 기존 DB 호환: 키워드 컬럼 추가 (기존 청크는 rag keywords backfill로 채움)
+ALTER TABLE vector_db.document_chunks ADD COLUMN IF NOT EXISTS keywords TEXT[];
+
 -- ============================================================================
 -- 4. 벡터 임베딩 테이블 (모델별로 분리) - vector_db 스키마
 -- ============================================================================
@@ -149,6 +153,56 @@ ON vector_db.embeddings_e5_large
 USING hnsw (embedding vector_cosine_ops)
 WITH (m = 16, ef_construction = 64);
 
+-- 5.7 양자화 HNSW 인덱스 (선택, pgvector 0.7+)
+-- float32 컬럼은 유지한 채 표현식 인덱스로 후보 검색 후 float32로 재계산 (RAG_VECTOR_QUANTIZATION)
+-- rag quantize build --mode halfvec|binary 로 생성:
+--   idx_<테이블>_hnsw_halfvec: USING hnsw ((embedding)::halfvec(N) halfvec_cosine_ops)
+--   idx_<테이블>_hnsw_binary:  USING hnsw ((binary_quantize(embedding)::bit(N)) bit_hamming_ops)
+
+-- 5.8 메타데이터 필터용 source_type 비정규화
+-- 부분 인덱스 조건은 인덱스 대상 테이블 컬럼만 참조할 수 있으므로 임베딩 테이블에 source_type 보관
+-- 소스 타입별 부분 HNSW 인덱스: idx_<테이블>_hnsw_<source_type 슬러그>_<md5 8자리> (rag index partial 명령으로 생성)
+CREATE OR REPLACE FUNCTION vector_db.fill_embedding_source_type()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.source_type IS NULL THEN
+        SELECT ds.source_type INTO NEW.source_type
+        FROM vector_db.document_chunks dc
+        JOIN vector_db.document_sources ds ON ds.id = dc.source_id
+        WHERE dc.id = NEW.chunk_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    table_name TEXT;
+BEGIN
+    FOREACH table_name IN ARRAY ARRAY['embeddings_e5_small', 'embeddings_e5_base', 'embeddings_e5_large', 'embeddings_kakaobank']
+    LOOP
+        EXECUTE format('ALTER TABLE vector_db.%I ADD COLUMN IF NOT EXISTS source_type VARCHAR(50)', table_name);
+        EXECUTE format('CREATE INDEX IF NOT EXISTS %I ON vector_db.%I (source_type)', 'idx_' || table_name || '_source_type', table_name);
+
+        -- 기존 행 채우기 (이미 채워진 행은 건너뜀)
+        EXECUTE format(
+            'UPDATE vector_db.%I e SET source_type = ds.source_type
+             FROM vector_db.document_chunks dc
+             JOIN vector_db.document_sources ds ON ds.id = dc.source_id
+             WHERE e.chunk_id = dc.id AND e.source_type IS NULL',
+            table_name
+        );
+
+        IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'fill_' || table_name || '_source_type') THEN
+            EXECUTE format(
+                'CREATE TRIGGER %I BEFORE INSERT ON vector_db.%I
+                 FOR EACH ROW EXECUTE FUNCTION vector_db.fill_embedding_source_type()',
+                'fill_' || table_name || '_source_type', table_name
+            );
+        END IF;
+    END LOOP;
+END $$;
+
 -- 인덱스 없이 사용
 
 -- ============================================================================
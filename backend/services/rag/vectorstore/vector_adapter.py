@@ -0,0 +1,311 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+pgvector 타입 어댑터
+numpy 배열을 문자열 변환 없이 그대로 쿼리 파라미터로 넘기고, vector 컬럼을 numpy 배열로 읽기 위한 계층
+- 파라미터: PgVector(np.ndarray) → '...'::vector 리터럴 (PgVector 타입에만 어댑터 등록,
+  다른 np.ndarray 파라미터(예: ANY(%s)의 id 배열)는 psycopg2 기본 동작 유지)
+- 결과: vector 컬럼 → np.ndarray (커넥션별 타입캐스터, 풀 커넥션 초기화 시 등록)
+- 대량 INSERT: pgvector 바이너리 포맷 COPY (텍스트 파싱 없음)
+
+psycopg2는 쿼리 파라미터를 바이너리로 바인딩할 수 없으므로(항상 텍스트 리터럴로 쿼리에 삽입)
+바이너리 전송은 COPY 경로에서만 사용합니다.
+"""
+
+import io
+import logging
+import struct
+import time
+from typing import Dict, Any, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import psycopg2
+from psycopg2 import extensions
+
+logger = logging.getLogger(__name__)
+
+# COPY ... WITH (FORMAT BINARY) 헤더/트레일러
+_COPY_SIGNATURE = b'PGCOPY\n\xff\r\n\x00'
+_COPY_HEADER = _COPY_SIGNATURE + struct.pack('>ii', 0, 0)
+_COPY_TRAILER = struct.pack('>h', -1)
+_NULL_FIELD = struct.pack('>i', -1)
+
+
+# ============================================================================
+# 인코딩 / 디코딩
+# ============================================================================
+
+def to_vector_literal(vector) -> str:
+    """벡터를 pgvector 텍스트 리터럴('[1.0,2.0,...]')로 변환"""
+    array = np.asarray(vector, dtype=np.float32)
+    if array.ndim != 1:
+        raise ValueError(f"Vector must be 1-dimensional, got shape {array.shape}")
+    return '[' + ','.join(map(str, array.tolist())) + ']'
+
+
+def from_vector_literal(value: Optional[str]) -> Optional[np.ndarray]:
+    """pgvector 텍스트 출력을 float32 배열로 변환"""
+    if value is None:
+        return None
+    return np.fromstring(value[1:-1], dtype=np.float32, sep=',')
+
+
+def encode_vector_binary(vector) -> bytes:
+    """pgvector 바이너리 포맷 (int16 차원, int16 예약, float4[] 빅엔디언)"""
+    array = np.asarray(vector, dtype=np.float32)
+    if array.ndim != 1:
+        raise ValueError(f"Vector must be 1-dimensional, got shape {array.shape}")
+    return struct.pack('>HH', array.shape[0], 0) + array.astype('>f4', copy=False).tobytes()
+
+
+def decode_vector_binary(data: bytes) -> np.ndarray:
+    """pgvector 바이너리 포맷을 float32 배열로 변환"""
+    dim, _ = struct.unpack_from('>HH', data)
+    return np.frombuffer(data, dtype='>f4', count=dim, offset=4).astype(np.float32)
+
+
+# ============================================================================
+# psycopg2 어댑터 / 타입캐스터
+# ============================================================================
+
+class PgVector:
+    """
+    vector 쿼리 파라미터 래퍼 (이 타입으로 감싼 값만 '...'::vector 로 바인딩)
+
+    사용 예:
+        cur.execute("SELECT ... ORDER BY embedding <=> %s", (PgVector(query_embedding),))
+        cur.execute("... unnest(%s::vector[]) ...", ([PgVector(v) for v in query_embeddings],))
+    """
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = np.asarray(value, dtype=np.float32)
+
+    def __repr__(self) -> str:
+        return f"PgVector(dim={self.value.shape[-1] if self.value.ndim else 0})"
+
+
+class VectorAdapter:
+    """PgVector 쿼리 파라미터를 '...'::vector 로 변환하는 psycopg2 어댑터"""
+
+    def __init__(self, value: PgVector):
+        self._value = value.value
+
+    def prepare(self, conn):
+        # 표준 어댑터 인터페이스 (인코딩 정보 불필요)
+        pass
+
+    def getquoted(self) -> bytes:
+        return b"'" + to_vector_literal(self._value).encode('ascii') + b"'::vector"
+
+    def __conform__(self, proto):
+        if proto is extensions.ISQLQuote:
+            return self
+
+
+_adapter_registered = False
+
+
+def register_vector_adapter():
+    """PgVector 파라미터 어댑터 등록 (프로세스 전역, 1회)"""
+    global _adapter_registered
+    if not _adapter_registered:
+        extensions.register_adapter(PgVector, VectorAdapter)
+        _adapter_registered = True
+
+
+def register_vector(conn) -> bool:
+    """
+    커넥션에 vector 타입캐스터 등록 (PgConnectionPool 커넥션 훅)
+    vector 컬럼 조회 결과가 문자열 대신 np.ndarray로 반환됩니다.
+
+    Returns:
+        등록 성공 여부 (pgvector 확장이 없으면 False)
+    """
+    register_vector_adapter()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 'vector'::regtype::oid")
+            oid = cur.fetchone()[0]
+        conn.commit()
+    except psycopg2.Error as e:
+        conn.rollback()
+        logger.debug(f"pgvector type not available, skipping typecaster: {e}")
+        return False
+
+    vector_type = extensions.new_type((oid,), 'VECTOR', lambda value, cur: from_vector_literal(value))
+    extensions.register_type(vector_type, conn)
+    return True
+
+
+# ============================================================================
+# 바이너리 COPY
+# ============================================================================
+
+def _encode_int4(value) -> bytes:
+    return struct.pack('>i', int(value))
+
+
+def _encode_int8(value) -> bytes:
+    return struct.pack('>q', int(value))
+
+
+def _encode_float8(value) -> bytes:
+    return struct.pack('>d', float(value))
+
+
+def _encode_text(value) -> bytes:
+    return str(value).encode('utf-8')
+
+
+_FIELD_ENCODERS = {
+    'int4': _encode_int4,
+    'int8': _encode_int8,
+    'float8': _encode_float8,
+    'text': _encode_text,
+    'vector': encode_vector_binary,
+}
+
+
+def build_copy_buffer(column_types: Sequence[str], rows: Iterable[Sequence[Any]]) -> io.BytesIO:
+    """
+    COPY BINARY 입력 스트림 생성
+
+    Args:
+        column_types: 컬럼별 타입 ('int4', 'int8', 'float8', 'text', 'vector')
+        rows: 행 목록 (None은 NULL)
+    """
+    encoders = []
+    for column_type in column_types:
+        if column_type not in _FIELD_ENCODERS:
+            raise ValueError(f"Unsupported COPY column type: {column_type}")
+        encoders.append(_FIELD_ENCODERS[column_type])
+
+    field_count = struct.pack('>h', len(encoders))
+    buf = io.BytesIO()
+    buf.write(_COPY_HEADER)
+    for row in rows:
+        buf.write(field_count)
+        for encode, value in zip(encoders, row):
+            if value is None:
+                buf.write(_NULL_FIELD)
+                continue
+            data = encode(value)
+            buf.write(struct.pack('>i', len(data)))
+            buf.write(data)
+    buf.write(_COPY_TRAILER)
+    buf.seek(0)
+    return buf
+
+
+def copy_binary(
+    cursor,
+    table: str,
+    columns: Sequence[Tuple[str, str]],
+    rows: Iterable[Sequence[Any]]
+) -> int:
+    """
+    바이너리 COPY로 대량 INSERT
+
+    Args:
+        cursor: psycopg2 커서
+        table: 대상 테이블 (스키마 포함)
+        columns: [(컬럼명, 타입)] 목록
+        rows: 행 목록
+
+    Returns:
+        삽입된 행 수
+    """
+    column_names = ', '.join(name for name, _ in columns)
+    buf = build_copy_buffer([column_type for _, column_type in columns], rows)
+    cursor.copy_expert(f"COPY {table} ({column_names}) FROM STDIN WITH (FORMAT BINARY)", buf)
+    return cursor.rowcount
+
+
+# ============================================================================
+# 마이크로 벤치마크
+# ============================================================================
+
+def benchmark_encodings(dim: int = 1024, n: int = 1000, conn=None) -> Dict[str, float]:
+    """
+    벡터 인코딩 방식 비교 (벡터당 마이크로초)
+
+    Args:
+        dim: 벡터 차원
+        n: 반복 횟수
+        conn: psycopg2 커넥션 (지정 시 DB 왕복 비교도 수행, 임시 테이블만 사용)
+
+    Returns:
+        {측정 항목: 벡터당 마이크로초}
+    """
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    results: Dict[str, float] = {}
+
+    def measure(name: str, func):
+        start = time.perf_counter()
+        func()
+        results[name] = (time.perf_counter() - start) / n * 1e6
+
+    measure('encode_text_literal', lambda: [to_vector_literal(v) for v in vectors])
+    measure('encode_binary', lambda: [encode_vector_binary(v) for v in vectors])
+    literals = [to_vector_literal(v) for v in vectors]
+    measure('decode_text_literal', lambda: [from_vector_literal(s) for s in literals])
+    encoded = [encode_vector_binary(v) for v in vectors]
+    measure('decode_binary', lambda: [decode_vector_binary(b) for b in encoded])
+
+    if conn is None:
+        return results
+
+    register_vector(conn)
+    with conn.cursor() as cur:
+        cur.execute(f"CREATE TEMP TABLE bench_vectors (id INTEGER, embedding vector({dim}))")
+
+        def insert_text():
+            cur.executemany(
+                "INSERT INTO bench_vectors (id, embedding) VALUES (%s, %s::vector)",
+                [(i, to_vector_literal(v)) for i, v in enumerate(vectors)]
+            )
+
+        def insert_copy():
+            copy_binary(cur, 'bench_vectors', [('id', 'int4'), ('embedding', 'vector')],
+                        ((i, v) for i, v in enumerate(vectors)))
+
+        measure('db_insert_text', insert_text)
+        cur.execute("TRUNCATE bench_vectors")
+        measure('db_copy_binary', insert_copy)
+
+        # 쿼리: 리터럴 3회 바인딩 vs CTE 1회 바인딩
+        queries = vectors[:min(n, 100)]
+
+        def query_text_x3():
+            for q in queries:
+                s = to_vector_literal(q)
+                cur.execute(
+                    "SELECT id, 1 - (embedding <=> %s::vector) FROM bench_vectors "
+                    "WHERE 1 - (embedding <=> %s::vector) >= 0 "
+                    "ORDER BY embedding <=> %s::vector LIMIT 5",
+                    (s, s, s)
+                )
+                cur.fetchall()
+
+        def query_cte_once():
+            for q in queries:
+                cur.execute(
+                    "WITH q AS MATERIALIZED (SELECT %s AS v) "
+                    "SELECT id, 1 - (embedding <=> (SELECT v FROM q)) FROM bench_vectors "
+                    "WHERE 1 - (embedding <=> (SELECT v FROM q)) >= 0 "
+                    "ORDER BY embedding <=> (SELECT v FROM q) LIMIT 5",
+                    (PgVector(q),)
+                )
+                cur.fetchall()
+
+        for name, func in (('db_query_text_x3', query_text_x3), ('db_query_cte_once', query_cte_once)):
+            start = time.perf_counter()
+            func()
+            results[name] = (time.perf_counter() - start) / len(queries) * 1e6
+
+        cur.execute("DROP TABLE bench_vectors")
+    conn.rollback()
+    return results